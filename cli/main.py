@@ -74,6 +74,24 @@ from cli.pipeline import StemLooperPipeline
     is_flag=True,
     help="Skip loop export (only separate stems)",
 )
+@click.option(
+    "--single-file",
+    is_flag=True,
+    help="Write one WAV per stem with loop markers + JSON index (WAV only)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stems exported in parallel (default: one per stem, limited by CPU count)",
+)
+@click.option(
+    "--target-bpm",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Also time-stretch all loops to this BPM (uses all CPU cores)",
+)
 @click.option(
     "--device",
     type=click.Choice(["auto", "cpu", "mps", "cuda"]),
@@ -91,6 +109,9 @@ def main(
     bit_depth: str,
     skip_separation: bool,
     skip_loops: bool,
+    single_file: bool,
+    jobs: int,
+    target_bpm: int,
     device: str,
 ):
     """
@@ -104,6 +125,9 @@ def main(
         stemlooper track.mp3 --stems 6 --bars 4
         stemlooper track.mp3 --bpm 128 --output ./export
         stemlooper track.mp3 --skip-separation  # Use existing stems
+        stemlooper track.mp3 --single-file      # One WAV per stem + loop index
+        stemlooper track.mp3 --jobs 2           # Limit parallel stem export
+        stemlooper track.mp3 --target-bpm 120   # Add loops stretched to 120 BPM
     """
     click.echo()
     click.secho("=" * 50, fg="cyan")
@@ -125,8 +149,14 @@ def main(
     click.echo(f"  BPM:         {bpm if bpm else 'auto-detect'}")
     click.echo(f"  Format:      {file_format.upper()} {bit_depth}-bit @ {sample_rate}Hz")
     click.echo(f"  Device:      {device}")
+    if single_file:
+        click.echo("  Container:   one WAV per stem (cue/smpl markers + JSON index)")
+    if target_bpm:
+        click.echo(f"  Stretch to:  {target_bpm} BPM")
     click.echo()
 
+    total_steps = 4 if target_bpm else 3
+
     # Create pipeline
     pipeline = StemLooperPipeline(
         input_file=input_file,
@@ -138,12 +168,14 @@ def main(
         sample_rate=int(sample_rate),
         bit_depth=int(bit_depth),
         device=device,
+        single_container=single_file,
+        jobs=jobs,
     )
 
     try:
         # Step 1: Stem Separation
         if not skip_separation:
-            click.secho("[1/3] Stem Separation", fg="yellow", bold=True)
+            click.secho(f"[1/{total_steps}] Stem Separation", fg="yellow", bold=True)
             with tqdm(total=100, desc="Separating", unit="%", ncols=80) as pbar:
                 def progress_cb(msg: str, pct: int):
                     pbar.set_description(msg[:30])
@@ -155,7 +187,7 @@ def main(
             click.secho(f"  ✓ Stems saved to: {stems_dir}", fg="green")
             click.echo()
         else:
-            click.secho("[1/3] Stem Separation (skipped)", fg="yellow")
+            click.secho(f"[1/{total_steps}] Stem Separation (skipped)", fg="yellow")
             stems_dir = output / "stems"
             if not stems_dir.exists():
                 click.secho(f"  ✗ Error: {stems_dir} not found", fg="red")
@@ -163,7 +195,7 @@ def main(
             click.echo()
 
         # Step 2: Beat Detection
-        click.secho("[2/3] Beat Detection", fg="yellow", bold=True)
+        click.secho(f"[2/{total_steps}] Beat Detection", fg="yellow", bold=True)
         detected_bpm, confidence = pipeline.detect_bpm()
 
         if bpm:
@@ -175,7 +207,7 @@ def main(
 
         # Step 3: Loop Export
         if not skip_loops:
-            click.secho("[3/3] Loop Export", fg="yellow", bold=True)
+            click.secho(f"[3/{total_steps}] Loop Export", fg="yellow", bold=True)
 
             with tqdm(total=100, desc="Exporting", unit="%", ncols=80) as pbar:
                 def loop_progress_cb(msg: str, pct: int):
@@ -198,7 +230,28 @@ def main(
                 else:
                     click.secho(f"    {stem_name}: FAILED - {result.error_message}", fg="red")
         else:
-            click.secho("[3/3] Loop Export (skipped)", fg="yellow")
+            click.secho(f"[3/{total_steps}] Loop Export (skipped)", fg="yellow")
+
+        # Step 4: Time-Stretch (optional)
+        if target_bpm:
+            click.echo()
+            click.secho(f"[4/{total_steps}] Time-Stretch", fg="yellow", bold=True)
+
+            with tqdm(total=100, desc="Stretching", unit="%", ncols=80) as pbar:
+                def stretch_progress_cb(msg: str, pct: int):
+                    pbar.set_description(msg[:30])
+                    pbar.n = pct
+                    pbar.refresh()
+
+                stretched = pipeline.stretch_loops(
+                    target_bpm, progress_callback=stretch_progress_cb
+                )
+
+            stretch_dir = output / "loops" / f"{target_bpm}BPM"
+            click.secho(
+                f"  ✓ Stretched {sum(stretched.values())} loops to: {stretch_dir}",
+                fg="green",
+            )
 
         click.echo()
         click.secho("=" * 50, fg="green")
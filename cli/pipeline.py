@@ -5,10 +5,13 @@ Reuses existing core modules:
 - core/separator.py for stem separation
 - utils/beat_detection.py for BPM detection
 - core/sampler_export.py for loop export
+- core/stretch_scheduler.py for headless time-stretching (process pool)
 """
 
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Callable, Dict, Tuple
 
@@ -29,7 +32,8 @@ class StemLooperPipeline:
     Workflow:
     1. Separate audio into stems (Demucs 4 or 6 stems)
     2. Detect BPM (DeepRhythm/librosa)
-    3. Export each stem as loops (N bars per chunk)
+    3. Export each stem as loops (N bars per chunk, stems exported in parallel)
+    4. Optional: time-stretch all loops to a target BPM (worker processes)
     """
 
     # Model mapping for audio-separator (use .yaml extension)
@@ -54,6 +58,8 @@ class StemLooperPipeline:
         sample_rate: int = 44100,
         bit_depth: int = 24,
         device: str = "auto",
+        single_container: bool = False,
+        jobs: Optional[int] = None,
     ):
         """
         Initialize the pipeline.
@@ -68,6 +74,10 @@ class StemLooperPipeline:
             sample_rate: 44100 or 48000
             bit_depth: 16, 24, or 32
             device: auto, cpu, mps, or cuda
+            single_container: Export one WAV per stem with cue/smpl loop markers
+                              and a JSON index instead of one file per loop
+            jobs: Number of stems exported concurrently (None = one per stem,
+                  limited by CPU count; 1 = serial)
         """
         self.input_file = Path(input_file).resolve()
         self.output_dir = Path(output_dir).resolve()
@@ -78,6 +88,8 @@ class StemLooperPipeline:
         self.sample_rate = sample_rate
         self.bit_depth = bit_depth
         self.device = device
+        self.single_container = single_container
+        self.jobs = jobs
 
         # Derived paths
         self.stems_dir = self.output_dir / "stems"
@@ -232,6 +244,76 @@ class StemLooperPipeline:
         logger.info(f"Detected BPM: {bpm:.1f} (confidence: {confidence})")
         return bpm, confidence
 
+    def _get_job_count(self, num_stems: int) -> int:
+        """
+        Determine number of concurrent stem exports.
+
+        WHY: Export is dominated by resampling, NumPy and libsndfile work, which
+             release the GIL, so threads scale across stems without process overhead.
+
+        Args:
+            num_stems: Number of stems to export
+
+        Returns:
+            Worker count (at least 1, at most num_stems)
+        """
+        if self.jobs is not None and self.jobs > 0:
+            jobs = self.jobs
+        else:
+            jobs = os.cpu_count() or 1
+
+        return max(1, min(jobs, num_stems))
+
+    def _export_stem(
+        self,
+        stem_name: str,
+        stem_path: Path,
+        bpm: int,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+    ) -> ExportResult:
+        """
+        Export loops for a single stem (runs in a worker thread).
+
+        Exceptions are converted into a failed ExportResult so one broken stem
+        never cancels the others.
+
+        Args:
+            stem_name: Stem name (e.g., "vocals")
+            stem_path: Path to stem audio file
+            bpm: Export BPM
+            progress_callback: Optional per-stem callback(message, percent)
+
+        Returns:
+            ExportResult for this stem
+        """
+        logger.info(f"Exporting loops for {stem_name}: {stem_path.name}")
+
+        try:
+            result = export_sampler_loops(
+                input_path=stem_path,
+                output_dir=self.loops_dir,
+                bpm=bpm,
+                bars=self.bars_per_loop,
+                sample_rate=self.sample_rate,
+                bit_depth=self.bit_depth,
+                channels=2,  # Stereo
+                file_format=self.file_format,
+                progress_callback=progress_callback,
+                common_filename=self.input_file.stem,
+                stem_name=stem_name,
+                single_container=self.single_container,
+            )
+        except Exception as e:
+            logger.error(f"  {stem_name}: export raised {type(e).__name__}: {e}", exc_info=True)
+            result = ExportResult(success=False, error_message=str(e))
+
+        if result.success:
+            logger.info(f"  {stem_name}: {result.chunk_count} loops exported")
+        else:
+            logger.error(f"  {stem_name}: FAILED - {result.error_message}")
+
+        return result
+
     def export_loops(
         self,
         progress_callback: Optional[Callable[[str, int], None]] = None,
@@ -239,59 +321,185 @@ class StemLooperPipeline:
         """
         Export all stems as loops.
 
+        Stems are exported concurrently on a thread pool (see jobs). Per-stem
+        progress is aggregated under a lock, so progress_callback is never
+        called from two threads at once.
+
         Args:
             progress_callback: Optional callback(message, percent)
 
         Returns:
-            Dict mapping stem names to ExportResult
+            Dict mapping stem names to ExportResult (in stem order)
         """
         if self._detected_bpm is None:
             self.detect_bpm()
 
         bpm = self.bpm_override or int(round(self._detected_bpm))
-        results = {}
 
         # Find stem files if not already mapped
         if not self._stem_files:
             self._find_stem_files()
 
-        total_stems = len(self._stem_files)
-        common_filename = self.input_file.stem
+        stem_items = list(self._stem_files.items())
+        total_stems = len(stem_items)
+        if total_stems == 0:
+            if progress_callback:
+                progress_callback("Done", 100)
+            return {}
+
+        # Aggregated progress: mean of per-stem percentages
+        progress_lock = threading.Lock()
+        stem_progress = {stem_name: 0 for stem_name, _ in stem_items}
+
+        def make_stem_callback(stem_name: str) -> Callable[[str, int], None]:
+            def stem_callback(message: str, percent: int):
+                with progress_lock:
+                    stem_progress[stem_name] = percent
+                    if progress_callback:
+                        overall = sum(stem_progress.values()) // total_stems
+                        progress_callback(f"Exporting {stem_name}...", min(overall, 99))
+
+            return stem_callback
+
+        jobs = self._get_job_count(total_stems)
+        logger.info(f"Exporting {total_stems} stems with {jobs} parallel job(s)")
+
+        # Pre-fill in stem order so the result dict order is deterministic
+        results: Dict[str, Optional[ExportResult]] = {
+            stem_name: None for stem_name, _ in stem_items
+        }
+
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="stem-export") as pool:
+            futures = {
+                pool.submit(
+                    self._export_stem,
+                    stem_name,
+                    stem_path,
+                    bpm,
+                    make_stem_callback(stem_name),
+                ): stem_name
+                for stem_name, stem_path in stem_items
+            }
+
+            for future in as_completed(futures):
+                stem_name = futures[future]
+                results[stem_name] = future.result()
+
+                # Completed stems count as 100% regardless of their last report
+                make_stem_callback(stem_name)(f"{stem_name} done", 100)
 
-        for idx, (stem_name, stem_path) in enumerate(self._stem_files.items()):
-            # Calculate progress per stem
-            base_progress = int((idx / total_stems) * 100)
+        if progress_callback:
+            progress_callback("Done", 100)
 
-            if progress_callback:
-                progress_callback(f"Exporting {stem_name}...", base_progress)
+        return results
 
-            logger.info(f"Exporting loops for {stem_name}: {stem_path.name}")
+    def stretch_loops(
+        self,
+        target_bpm: float,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Time-stretch every full loop of every stem to target_bpm.
 
-            # Export loops for this stem
-            result = export_sampler_loops(
-                input_path=stem_path,
-                output_dir=self.loops_dir,
-                bpm=bpm,
-                bars=self.bars_per_loop,
-                sample_rate=self.sample_rate,
-                bit_depth=self.bit_depth,
-                channels=2,  # Stereo
-                file_format=self.file_format,
-                common_filename=common_filename,
-                stem_name=stem_name,
-            )
+        Loops are cut on the same N-bar grid as export_loops (from sample 0),
+        stretched on the shared process pool (get_optimal_worker_count()
+        workers) and written to loops/<target>BPM/.
+
+        Args:
+            target_bpm: Target tempo
+            progress_callback: Optional callback(message, percent)
 
-            results[stem_name] = result
+        Returns:
+            Dict mapping stem names to number of loops written
 
-            if result.success:
-                logger.info(f"  {stem_name}: {result.chunk_count} loops exported")
-            else:
-                logger.error(f"  {stem_name}: FAILED - {result.error_message}")
+        Raises:
+            InvalidStretchFactorError: If target_bpm is outside the safe range
+        """
+        import numpy as np
+        import soundfile as sf
+        from core.export_writer import LoopExportWriter
+        from core.stretch_scheduler import StretchScheduler, build_stretch_tasks
+        from core.time_stretcher import calculate_stretch_factor, validate_stretch_factor
+        from utils.audio_processing import resample_audio
+        from utils.loop_grid import LoopGrid
+        from utils.loop_math import compute_samples_per_chunk
+
+        if self._detected_bpm is None:
+            self.detect_bpm()
+
+        bpm = self.bpm_override or int(round(self._detected_bpm))
+        validate_stretch_factor(calculate_stretch_factor(bpm, target_bpm))
+
+        if not self._stem_files:
+            self._find_stem_files()
+        if not self._stem_files:
+            if progress_callback:
+                progress_callback("Done", 100)
+            return {}
+
+        # One grid for all stems (separated stems share length and rate)
+        info = sf.info(str(next(iter(self._stem_files.values()))))
+        samples_per_loop = compute_samples_per_chunk(bpm, self.bars_per_loop, info.samplerate)
+        starts = np.arange(info.frames // samples_per_loop, dtype=np.int64) * samples_per_loop
+        loop_grid = LoopGrid(starts, starts + samples_per_loop, info.samplerate)
+
+        stretch_dir = self.loops_dir / f"{int(round(target_bpm))}BPM"
+        stretch_dir.mkdir(parents=True, exist_ok=True)
+
+        writer = LoopExportWriter(
+            sample_rate=self.sample_rate,
+            bit_depth=self.bit_depth,
+            channels=2,
+            file_format=self.file_format,
+        )
+        extension = f".{self.file_format.lower()}"
+        write_lock = threading.Lock()
+        written: Dict[str, int] = {stem_name.lower(): 0 for stem_name in self._stem_files}
+        tasks = build_stretch_tasks(self._stem_files, loop_grid, bpm, target_bpm)
+        done = [0]
+
+        def report():
+            done[0] += 1
+            if progress_callback:
+                percent = done[0] * 100 // max(1, len(tasks))
+                progress_callback("Time-stretching...", min(percent, 99))
+
+        def on_completed(task, audio):
+            if info.samplerate != self.sample_rate:
+                audio = resample_audio(audio, info.samplerate, self.sample_rate)
+            filename = (
+                f"{self.input_file.stem}_{task.stem_name}_{int(round(target_bpm))}BPM_"
+                f"{self.bars_per_loop}T_{task.loop_index + 1:03d}{extension}"
+            )
+            with write_lock:
+                writer.write(stretch_dir / filename, audio)
+                written[task.stem_name] += 1
+                report()
+
+        def on_failed(task, error):
+            logger.error(f"  {task.task_id}: stretch FAILED - {error}")
+            with write_lock:
+                report()
+
+        logger.info(
+            f"Time-stretching {len(tasks)} loops: {bpm} → {target_bpm} BPM "
+            f"into {stretch_dir}"
+        )
+
+        scheduler = StretchScheduler(
+            on_task_completed=on_completed,
+            on_task_failed=on_failed,
+        )
+        try:
+            scheduler.submit_batch(tasks)
+            scheduler.wait()
+        finally:
+            scheduler.shutdown()
 
         if progress_callback:
             progress_callback("Done", 100)
 
-        return results
+        return written
 
     def _find_stem_files(self) -> None:
         """Find stem files in stems directory."""
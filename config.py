@@ -98,6 +98,18 @@ ICONS_DIR = RESOURCES_DIR / "icons"
 LOGS_DIR = USER_DIR / "logs"
 TEMP_DIR = USER_DIR / "temp"
 
+# Persistent cache of time-stretched loops (created on first use)
+STRETCH_CACHE_DIR = USER_DIR / "cache" / "stretch"
+STRETCH_DISK_CACHE_SIZE_MB = 2048  # Disk tier limit (oldest loops evicted first)
+
+# Decoded stems for playback, memory-mapped instead of held in RAM
+PLAYER_MEMORY_MAPPED_STEMS = True
+STEM_CACHE_DIR = USER_DIR / "cache" / "stems"
+STEM_CACHE_SIZE_MB = 8192  # Oldest decoded stems evicted first
+PLAYER_READ_AHEAD_SECONDS = 2.0  # Every stem kept in RAM ahead of playback
+# Output backend: "sounddevice" or "null" (no sound card, e.g. CI/benchmarks)
+PLAYER_OUTPUT_BACKEND = os.environ.get("STEMSEPARATOR_AUDIO_BACKEND", "sounddevice")
+
 # Erstelle Verzeichnisse falls nicht vorhanden
 for directory in [MODELS_DIR, LOGS_DIR, TEMP_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
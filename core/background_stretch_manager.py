@@ -2,7 +2,7 @@
 Background Stretch Manager - Parallel time-stretching with priority queue
 
 PURPOSE: Manage background processing of time-stretched loops for instant preview.
-         Processes loops in priority order (Drums first) using thread pool.
+         Processes loops in priority order (Drums first) on worker processes.
 
 CONTEXT: Integrated into Export Loops Widget for zero-latency preview.
          Automatically starts when user sets Target BPM.
@@ -12,16 +12,25 @@ ARCHITECTURE:
          ↓
     BackgroundStretchManager.start_batch()
          ↓
-    Priority Queue (Drums priority=0, Vocals=1, Bass=2, Other=3)
+    StretchScheduler (core/stretch_scheduler.py, no Qt)
+         ↓  Priority heap (Drums priority=0, Vocals=1, Bass=2, Other=3)
+         ↓  Process pool (get_optimal_worker_count() workers)
+         ↓  Stems decoded once per batch into shared memory
          ↓
-    Worker Thread Pool (4-8 parallel workers)
+    Queued signals back to the UI thread
          ↓
-    StretchCache (LRU eviction, 500 MB limit)
+    StretchCache (RAM LRU + persistent disk tier, checked before stretching)
          ↓
     Preview/Export (instant access)
 
+    Progressive mode (progressive=True): every loop is first stretched at
+    PREVIEW quality (selected loop and its neighbours first) and becomes
+    playable; EXPORT-quality upgrades follow in the background and replace
+    the previews in place (task_upgraded / upgrades_completed signals).
+
 USAGE:
-    >>> manager = BackgroundStretchManager(max_workers=4)
+    >>> manager = BackgroundStretchManager(max_workers=get_optimal_worker_count(),
+    ...                                    progressive=True)
     >>> manager.progress_updated.connect(on_progress)
     >>> manager.all_completed.connect(on_completed)
     >>>
@@ -30,162 +39,37 @@ USAGE:
     ...     loop_segments=[(0.0, 9.23), (9.23, 18.46), ...],
     ...     original_bpm=104,
     ...     target_bpm=120,
-    ...     sample_rate=44100
+    ...     sample_rate=44100,
+    ...     focus_loop=0
     ... )
     >>>
-    >>> # Later: Get stretched loop
+    >>> # Later: Get stretched loop (any quality / export quality only)
     >>> stretched = manager.get_stretched_loop('drums', 0, 120)
+    >>> final = manager.get_stretched_loop('drums', 0, 120, quality=StretchQuality.EXPORT)
 """
 
 from pathlib import Path
-from typing import Dict, Tuple, Optional, List
-from dataclasses import dataclass, field
-from queue import PriorityQueue
+from typing import Dict, Tuple, Optional, List, Union
 import numpy as np
-import soundfile as sf
-
-from PySide6.QtCore import QObject, QThread, Signal, QMutex, QMutexLocker
 
+from PySide6.QtCore import QObject, Qt, Signal, QMutex, QMutexLocker
+
+from core.stretch_cache import StretchCache
+from core.stretch_scheduler import (
+    PlaybackHints,
+    StretchScheduler,
+    StretchTask,
+    build_stretch_tasks,
+    get_optimal_worker_count,
+    make_task_id,
+)
+from core.time_stretcher import StretchQuality
 from utils.logger import get_logger
+from utils.loop_grid import LoopGrid
 
 logger = get_logger()
 
 
-# ============================================================================
-# Task Definition
-# ============================================================================
-
-@dataclass(order=True)
-class StretchTask:
-    """
-    Task for background time-stretching.
-
-    Priority-based processing order:
-    - Priority 0: Drums (highest - most interesting for users)
-    - Priority 1: Vocals
-    - Priority 2: Bass
-    - Priority 3: Other
-
-    Attributes:
-        priority: Task priority (0 = highest)
-        stem_name: Stem name (e.g., 'drums', 'vocals')
-        loop_index: Loop index (0-based)
-        loop_start: Loop start time in seconds
-        loop_end: Loop end time in seconds
-        stem_path: Path to stem audio file
-        original_bpm: Original BPM
-        target_bpm: Target BPM
-        sample_rate: Sample rate
-        task_id: Unique task identifier
-    """
-
-    priority: int
-    stem_name: str = field(compare=False)
-    loop_index: int = field(compare=False)
-    loop_start: float = field(compare=False)
-    loop_end: float = field(compare=False)
-    stem_path: Path = field(compare=False)
-    original_bpm: float = field(compare=False)
-    target_bpm: float = field(compare=False)
-    sample_rate: int = field(compare=False)
-    task_id: str = field(compare=False)
-
-
-# ============================================================================
-# Worker Thread
-# ============================================================================
-
-class StretchWorker(QThread):
-    """
-    Worker thread for time-stretching a single loop.
-
-    Runs time-stretching in background thread to avoid blocking UI.
-    Emits signals on completion or failure.
-    """
-
-    # Signals
-    task_completed = Signal(str, np.ndarray)  # (task_id, stretched_audio)
-    task_failed = Signal(str, str)  # (task_id, error_message)
-
-    def __init__(self, task: StretchTask):
-        """
-        Initialize worker.
-
-        Args:
-            task: StretchTask to process
-        """
-        super().__init__()
-        self.task = task
-
-    def run(self):
-        """
-        Execute time-stretching task.
-
-        Steps:
-        1. Load loop segment from stem file
-        2. Calculate stretch factor
-        3. Time-stretch using core.time_stretcher
-        4. Emit success or failure signal
-        """
-
-        try:
-            # 1. Load loop segment from stem file
-            audio_data, sr = sf.read(str(self.task.stem_path), always_2d=False)
-
-            loop_start_sample = int(self.task.loop_start * sr)
-            loop_end_sample = int(self.task.loop_end * sr)
-
-            # Validate indices
-            if loop_start_sample < 0 or loop_end_sample > len(audio_data):
-                raise ValueError(
-                    f"Invalid loop bounds: [{loop_start_sample}, {loop_end_sample}] "
-                    f"for audio length {len(audio_data)}"
-                )
-
-            loop_audio = audio_data[loop_start_sample:loop_end_sample]
-
-            if loop_audio.size == 0:
-                raise ValueError("Extracted loop is empty")
-
-            # 2. Calculate stretch factor
-            from core.time_stretcher import calculate_stretch_factor
-
-            stretch_factor = calculate_stretch_factor(
-                self.task.original_bpm,
-                self.task.target_bpm
-            )
-
-            # 3. Time-stretch
-            from core.time_stretcher import time_stretch_audio, StretchQuality
-
-            logger.debug(
-                f"Processing: {self.task.stem_name}, Loop {self.task.loop_index}, "
-                f"{self.task.original_bpm} → {self.task.target_bpm} BPM "
-                f"(factor={stretch_factor:.2f})"
-            )
-
-            stretched_audio = time_stretch_audio(
-                loop_audio,
-                sr,
-                stretch_factor,
-                quality_preset=StretchQuality.EXPORT
-            )
-
-            # 4. Emit success
-            logger.debug(
-                f"Completed: {self.task.task_id}, "
-                f"input={len(loop_audio)/sr:.2f}s, output={len(stretched_audio)/sr:.2f}s"
-            )
-
-            self.task_completed.emit(self.task.task_id, stretched_audio)
-
-        except Exception as e:
-            # Emit failure
-            error_msg = f"Failed to stretch {self.task.task_id}: {e}"
-            logger.error(error_msg, exc_info=True)
-            self.task_failed.emit(self.task.task_id, str(e))
-
-
 # ============================================================================
 # Background Stretch Manager
 # ============================================================================
@@ -196,238 +80,259 @@ class BackgroundStretchManager(QObject):
 
     Features:
     - Priority-based processing (Drums first)
-    - Thread pool for parallel processing
+    - Worker processes via StretchScheduler (shared memory, all cores)
     - Progress tracking
     - Thread-safe result storage
+    - Optional progressive mode (PREVIEW first, EXPORT upgrade in background)
+    - Viewport-aware reprioritisation (set_playback_hints)
 
     Signals:
-        progress_updated(completed, total): Progress update
-        all_completed(): All tasks finished
-        task_completed(stem_name, loop_index, target_bpm): Single task finished
+        progress_updated(completed, total): Progress update (playable loops)
+        all_completed(): All tasks finished (playable, possibly preview quality)
+        task_completed(stem_name, loop_index, target_bpm): Single task playable
+        task_upgraded(stem_name, loop_index, target_bpm): Loop at EXPORT quality
+        upgrades_completed(): Batch done, every successful loop at EXPORT quality
+
+    All signals are emitted from the thread that owns the manager (the UI
+    thread); scheduler callbacks are forwarded through queued connections.
     """
 
     # Signals
     progress_updated = Signal(int, int)  # (completed_tasks, total_tasks)
     all_completed = Signal()
     task_completed = Signal(str, int, float)  # (stem_name, loop_index, target_bpm)
+    task_upgraded = Signal(str, int, float)  # (stem_name, loop_index, target_bpm)
+    upgrades_completed = Signal()
 
-    def __init__(self, max_workers: int = 4):
+    # Scheduler thread → manager thread
+    _scheduler_result = Signal(object, object, object)  # (task, audio, error)
+    _scheduler_finished = Signal(int)  # batch_id
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache: Optional[StretchCache] = None,
+        progressive: bool = False
+    ):
         """
         Initialize background stretch manager.
 
         Args:
-            max_workers: Maximum number of parallel worker threads
-                        Default: 4 (good balance for most systems)
-                        Recommended: CPU cores - 2 (leave cores for UI/system)
+            max_workers: Maximum number of jobs processed in parallel
+                        Default: get_optimal_worker_count()
+                        (CPU cores - 2, leaving cores for UI/system)
+            cache: Optional (disk-backed) StretchCache; cached loops are
+                   served without stretching, new results are stored in it
+            progressive: Stretch every loop at PREVIEW quality first, then
+                         upgrade to EXPORT quality in the background
         """
         super().__init__()
 
-        self.max_workers = max_workers
-        self.task_queue = PriorityQueue()
-        self.active_workers: List[StretchWorker] = []
+        self.max_workers = max_workers or get_optimal_worker_count()
+        self.progressive = progressive
         self.completed_tasks: Dict[str, np.ndarray] = {}  # task_id → audio
+        self.task_quality: Dict[str, str] = {}  # task_id → quality of stored audio
         self.failed_tasks: Dict[str, str] = {}  # task_id → error
 
         self.total_tasks = 0
         self.completed_count = 0
 
+        # Sample-accurate loop boundaries of the current batch
+        self.loop_grid: Optional[LoopGrid] = None
+
         self.is_running = False
         self.mutex = QMutex()
-
-        logger.info(f"BackgroundStretchManager initialized with {max_workers} workers")
+        self._batch_id = 0
+
+        # WHY: Queued connection - scheduler callbacks run on pool threads,
+        #      state changes and public signals stay on the manager's thread
+        self._scheduler_result.connect(self._on_scheduler_result, Qt.QueuedConnection)
+        self._scheduler_finished.connect(self._on_scheduler_finished, Qt.QueuedConnection)
+        self.scheduler = StretchScheduler(
+            max_workers=self.max_workers,
+            quality_preset=StretchQuality.EXPORT,
+            cache=cache,
+            preview_quality=StretchQuality.PREVIEW if progressive else None,
+            on_task_completed=lambda task, audio: self._scheduler_result.emit(task, audio, None),
+            on_task_failed=lambda task, error: self._scheduler_result.emit(task, None, error),
+            on_batch_finished=lambda: self._scheduler_finished.emit(self.scheduler.batch_id),
+        )
+
+        logger.info(f"BackgroundStretchManager initialized with {self.max_workers} workers")
 
     def start_batch(
         self,
         stem_files: Dict[str, Path],
-        loop_segments: List[Tuple[float, float]],
+        loop_segments: Union[List[Tuple[float, float]], LoopGrid],
         original_bpm: float,
         target_bpm: float,
-        sample_rate: int
+        sample_rate: int,
+        focus_loop: Optional[int] = None
     ):
         """
         Start background processing of all loops.
 
         Automatically creates tasks for all stems × loops and starts processing
-        in priority order (Drums first).
+        in priority order (focused loop and its neighbours, Drums first).
 
         Args:
             stem_files: Dict of stem_name → stem_path
-            loop_segments: List of (start_time, end_time) for each loop
+            loop_segments: LoopGrid, or list of (start_time, end_time) for each loop
+                           (converted to a LoopGrid at sample_rate)
             original_bpm: Original BPM from detection
             target_bpm: Target BPM from user input
-            sample_rate: Sample rate
+            sample_rate: Reference sample rate (ignored if loop_segments is a LoopGrid)
+            focus_loop: Loop index the user is about to play (stretched first)
         """
 
         with QMutexLocker(self.mutex):
             # Clear previous state
-            self._cancel_all_workers()
-            self.task_queue = PriorityQueue()
             self.completed_tasks.clear()
+            self.task_quality.clear()
             self.failed_tasks.clear()
             self.completed_count = 0
 
-            # Define stem priority
-            # WHY: Drums are most important for preview (rhythm-focused)
-            stem_priority = {
-                'drums': 0,    # Highest priority
-                'vocals': 1,
-                'bass': 2,
-                'other': 3
-            }
-
-            # Create tasks for all loops × stems
-            for stem_name, stem_path in stem_files.items():
-                # Normalize stem name to lowercase for consistency
-                # WHY: Task IDs must match between creation and retrieval.
-                #      PlayerWidget uses lowercase when retrieving loops.
-                stem_name_normalized = stem_name.lower()
-                
-                # Get priority (case-insensitive)
-                priority = stem_priority.get(stem_name_normalized, 3)
-
-                for loop_idx, (loop_start, loop_end) in enumerate(loop_segments):
-                    # Use normalized stem name for task ID generation
-                    task_id = self._generate_task_id(stem_name_normalized, loop_idx, target_bpm)
-
-                    task = StretchTask(
-                        priority=priority,
-                        stem_name=stem_name_normalized,  # Store normalized name
-                        loop_index=loop_idx,
-                        loop_start=loop_start,
-                        loop_end=loop_end,
-                        stem_path=stem_path,
-                        original_bpm=original_bpm,
-                        target_bpm=target_bpm,
-                        sample_rate=sample_rate,
-                        task_id=task_id
-                    )
-
-                    self.task_queue.put(task)
-
-            self.total_tasks = len(stem_files) * len(loop_segments)
-            self.is_running = True
+            # Compute every loop boundary once, in samples
+            if isinstance(loop_segments, LoopGrid):
+                loop_grid = loop_segments
+            else:
+                loop_grid = LoopGrid.from_seconds(loop_segments, sample_rate)
+            self.loop_grid = loop_grid
+
+            # Create tasks for all loops × stems (replaces the previous batch)
+            tasks = build_stretch_tasks(
+                stem_files, loop_grid, original_bpm, target_bpm, focus_loop=focus_loop
+            )
+            self.total_tasks = len(tasks)
+            self.is_running = self.total_tasks > 0
+            self._batch_id = self.scheduler.submit_batch(tasks)
 
             logger.info(
                 f"Started batch processing: {self.total_tasks} tasks "
-                f"({len(stem_files)} stems × {len(loop_segments)} loops), "
+                f"({len(stem_files)} stems × {len(loop_grid)} loops), "
                 f"{original_bpm} → {target_bpm} BPM"
             )
 
-            # Start processing
-            self._start_next_workers()
-
-            # Handle empty batch (0 tasks) - emit completion immediately
-            if self.total_tasks == 0:
-                self.is_running = False
-                logger.info("Batch processing completed immediately (0 tasks)")
-                self.all_completed.emit()
+        # Handle empty batch (0 tasks) - emit completion immediately
+        if self.total_tasks == 0:
+            logger.info("Batch processing completed immediately (0 tasks)")
+            self.all_completed.emit()
 
-    def _start_next_workers(self):
+    def _on_scheduler_result(
+        self,
+        task: StretchTask,
+        stretched_audio: Optional[np.ndarray],
+        error_message: Optional[str]
+    ):
         """
-        Start next batch of workers from queue.
+        Handle a finished task (manager thread).
 
-        ⚠️ IMPORTANT: This method MUST be called from within a mutex lock!
-        It assumes the caller already holds self.mutex.
-
-        Called by:
-        - start_batch() (already locked at line 261)
-        - _on_worker_finished() (already locked at line 379)
+        The first result of a loop makes it playable and counts for progress.
+        In progressive mode the EXPORT result arrives later and replaces the
+        preview (one dict assignment, so readers never see a missing loop).
         """
-        # NO mutex lock here - caller already has it!
-        # This prevents deadlock when called from start_batch() or _on_worker_finished()
-
-        while (
-            len(self.active_workers) < self.max_workers
-            and not self.task_queue.empty()
-        ):
-            # Get next task from priority queue
-            task = self.task_queue.get()
-
-            # Create and start worker
-            worker = StretchWorker(task)
-            worker.task_completed.connect(self._on_task_completed)
-            worker.task_failed.connect(self._on_task_failed)
-            worker.finished.connect(lambda w=worker: self._on_worker_finished(w))
 
-            self.active_workers.append(worker)
-            worker.start()
-
-            logger.debug(
-                f"Started worker: {task.task_id} "
-                f"(priority={task.priority}, active={len(self.active_workers)})"
-            )
-
-    def _on_task_completed(self, task_id: str, stretched_audio: np.ndarray):
-        """Handle completed task"""
+        task_id = task.task_id
+        upgraded = stretched_audio is not None and task.quality_preset == StretchQuality.EXPORT
 
         with QMutexLocker(self.mutex):
-            self.completed_tasks[task_id] = stretched_audio
-            self.completed_count += 1
-
-            # Parse task_id to extract info
-            stem_name, loop_index, target_bpm = self._parse_task_id(task_id)
-
+            # Results of a replaced or cancelled batch
+            if task.batch_id != self._batch_id or not self.is_running:
+                return
+
+            first = task_id not in self.task_quality and task_id not in self.failed_tasks
+            if stretched_audio is not None:
+                if not upgraded and self.task_quality.get(task_id) == StretchQuality.EXPORT:
+                    # Never replace an upgrade with a late preview
+                    return
+                self.completed_tasks[task_id] = stretched_audio
+                self.task_quality[task_id] = task.quality_preset
+                self.failed_tasks.pop(task_id, None)
+            elif first:
+                self.failed_tasks[task_id] = error_message
+
+            finished = False
+            if first:
+                self.completed_count += 1
+                finished = self.completed_count >= self.total_tasks
+                if finished and not self.progressive:
+                    self.is_running = False
+
+        if upgraded:
+            self.task_upgraded.emit(task.stem_name, task.loop_index, task.target_bpm)
+
+        if not first:
+            if stretched_audio is None:
+                logger.warning(f"Upgrade failed, keeping preview: {task_id} - {error_message}")
+            return
+
+        if stretched_audio is not None:
             logger.debug(
-                f"Task completed: {task_id} ({self.completed_count}/{self.total_tasks})"
+                f"Task completed: {task.task_id} ({self.completed_count}/{self.total_tasks})"
             )
-
-            # Emit signals
-            self.progress_updated.emit(self.completed_count, self.total_tasks)
-            self.task_completed.emit(stem_name, loop_index, target_bpm)
-
-    def _on_task_failed(self, task_id: str, error_message: str):
-        """Handle failed task"""
-
-        with QMutexLocker(self.mutex):
-            self.failed_tasks[task_id] = error_message
-            self.completed_count += 1
-
+        else:
             logger.warning(
-                f"Task failed: {task_id} ({self.completed_count}/{self.total_tasks}) - {error_message}"
+                f"Task failed: {task.task_id} ({self.completed_count}/{self.total_tasks}) - {error_message}"
             )
 
-            # Still emit progress (failed tasks count as completed)
-            self.progress_updated.emit(self.completed_count, self.total_tasks)
-
-    def _on_worker_finished(self, worker: StretchWorker):
-        """Handle worker thread finished"""
+        # Emit signals (failed tasks count as completed for progress)
+        self.progress_updated.emit(self.completed_count, self.total_tasks)
+        if stretched_audio is not None:
+            self.task_completed.emit(task.stem_name, task.loop_index, task.target_bpm)
 
-        with QMutexLocker(self.mutex):
-            if worker in self.active_workers:
-                self.active_workers.remove(worker)
-
-            # Start next worker
-            self._start_next_workers()
+        if finished:
+            logger.info(
+                f"Batch processing completed: {len(self.completed_tasks)} successful, "
+                f"{len(self.failed_tasks)} failed"
+            )
+            self.all_completed.emit()
 
-            # Check if all tasks completed
-            if self.completed_count >= self.total_tasks:
-                self.is_running = False
+    def _on_scheduler_finished(self, batch_id: int):
+        """Every pass of the batch is done (manager thread)"""
 
-                success_count = len(self.completed_tasks)
-                failed_count = len(self.failed_tasks)
+        with QMutexLocker(self.mutex):
+            if batch_id != self._batch_id:
+                return
+            self.is_running = False
+            upgraded = sum(
+                1 for quality in self.task_quality.values() if quality == StretchQuality.EXPORT
+            )
 
-                logger.info(
-                    f"Batch processing completed: {success_count} successful, "
-                    f"{failed_count} failed"
-                )
+        if self.progressive:
+            logger.info(f"Export-quality upgrades completed: {upgraded}/{self.total_tasks} loops")
+        self.upgrades_completed.emit()
 
-                self.all_completed.emit()
+    def set_playback_hints(
+        self,
+        selected_loop: Optional[int] = None,
+        visible_loops: Tuple[int, ...] = (),
+        playing_loop: Optional[int] = None
+    ):
+        """
+        Stretch what the user is about to hear first.
 
-    def _cancel_all_workers(self):
-        """Cancel all active workers"""
+        Queued tasks are reordered: playing loop, selected loop, visible
+        loops, then the rest (closest to the playing/selected loop first).
+        Hints persist across batches.
 
-        for worker in self.active_workers:
-            worker.terminate()
-            worker.wait()
+        Args:
+            selected_loop: Selected loop index (batch loop indices)
+            visible_loops: Loop indices visible in the waveform viewport
+            playing_loop: Loop currently playing or requested for playback
+        """
 
-        self.active_workers.clear()
-        logger.debug("All workers cancelled")
+        self.scheduler.set_hints(PlaybackHints(
+            selected=selected_loop,
+            visible=tuple(sorted(set(visible_loops))),
+            playing=playing_loop
+        ))
 
     def get_stretched_loop(
         self,
         stem_name: str,
         loop_index: int,
-        target_bpm: float
+        target_bpm: float,
+        quality: Optional[str] = None
     ) -> Optional[np.ndarray]:
         """
         Get stretched loop from completed tasks.
@@ -436,19 +341,24 @@ class BackgroundStretchManager(QObject):
             stem_name: Stem name
             loop_index: Loop index
             target_bpm: Target BPM
+            quality: Required quality (e.g. StretchQuality.EXPORT for export);
+                     None = best available
 
         Returns:
             Stretched audio array or None if not yet completed
         """
 
         task_id = self._generate_task_id(stem_name, loop_index, target_bpm)
+        if quality is not None and self.task_quality.get(task_id) != quality:
+            return None
         return self.completed_tasks.get(task_id)
 
     def is_loop_ready(
         self,
         stem_name: str,
         loop_index: int,
-        target_bpm: float
+        target_bpm: float,
+        quality: Optional[str] = None
     ) -> bool:
         """
         Check if specific loop is ready.
@@ -457,14 +367,38 @@ class BackgroundStretchManager(QObject):
             stem_name: Stem name
             loop_index: Loop index
             target_bpm: Target BPM
+            quality: Required quality (None = any quality)
 
         Returns:
             True if loop is stretched and cached
         """
 
         task_id = self._generate_task_id(stem_name, loop_index, target_bpm)
+        if quality is not None:
+            return self.task_quality.get(task_id) == quality
         return task_id in self.completed_tasks
 
+    def get_loop_quality(
+        self,
+        stem_name: str,
+        loop_index: int,
+        target_bpm: float
+    ) -> Optional[str]:
+        """
+        Get the quality of a stretched loop.
+
+        Args:
+            stem_name: Stem name
+            loop_index: Loop index
+            target_bpm: Target BPM
+
+        Returns:
+            StretchQuality.PREVIEW / StretchQuality.EXPORT, or None if not ready
+        """
+
+        task_id = self._generate_task_id(stem_name, loop_index, target_bpm)
+        return self.task_quality.get(task_id)
+
     def get_progress(self) -> Tuple[int, int]:
         """
         Get current progress.
@@ -490,14 +424,26 @@ class BackgroundStretchManager(QObject):
         """Cancel all background processing"""
 
         with QMutexLocker(self.mutex):
-            self._cancel_all_workers()
+            self.scheduler.cancel()
             self.is_running = False
             logger.info("Background processing cancelled")
 
+    def shutdown(self):
+        """
+        Cancel processing and stop the scheduler's dispatcher thread.
+
+        WHY: The dispatcher holds this manager (and its StretchCache) through
+             the scheduler callbacks; without shutdown() a dropped manager is
+             never freed. Call before discarding the manager.
+        """
+        self.cancel()
+        self.scheduler.shutdown()
+        logger.info("Background stretch manager shut down")
+
     @staticmethod
     def _generate_task_id(stem_name: str, loop_index: int, target_bpm: float) -> str:
         """Generate unique task ID"""
-        return f"{stem_name}_{loop_index}_{int(target_bpm)}"
+        return make_task_id(stem_name, loop_index, target_bpm)
 
     @staticmethod
     def _parse_task_id(task_id: str) -> Tuple[str, int, float]:
@@ -521,34 +467,3 @@ class BackgroundStretchManager(QObject):
 
         return (stem_name, loop_index, target_bpm)
 
-
-# ============================================================================
-# Utility Functions
-# ============================================================================
-
-def get_optimal_worker_count() -> int:
-    """
-    Calculate optimal worker count based on CPU cores.
-
-    Returns:
-        Recommended worker count
-
-    Algorithm:
-        - Leave 1-2 cores for UI/system
-        - Cap at 8 workers (diminishing returns beyond that)
-
-    Example:
-        >>> # 8-core system
-        >>> get_optimal_worker_count()
-        6  # 8 cores - 2 for UI/system
-    """
-
-    import multiprocessing
-
-    cpu_count = multiprocessing.cpu_count()
-
-    # Leave 1-2 cores for UI/system
-    optimal = max(2, cpu_count - 2)
-
-    # Cap at 8 workers (diminishing returns, thread overhead)
-    return min(optimal, 8)
@@ -0,0 +1,498 @@
+"""
+Export Writer - Allocation-free gain, dither and encode for loop exports
+
+PURPOSE: Write many short audio chunks (sampler loops) to disk without
+         allocating fresh full-size arrays per chunk.
+
+CONTEXT: LoopExportWriter is used by sampler_export.export_sampler_loops() in its
+         per-chunk hot loop. Replaces the normalize → slice → dither → sf.write()
+         sequence, where every step returned a new float64 array and sf.write()
+         converted it again.
+         LoopMixWriter is used by the stretched-loop export (mixed mode), which
+         previously stacked, cast and summed every stem into a fresh array per loop.
+         write_wav_loop_markers() adds cue/smpl chunks for single-container exports
+         (all loops of a stem in one WAV).
+
+ALGORITHM:
+    - One float32 scratch buffer, grown on demand and reused as a view for every
+      chunk (chunks share the same length except the last one)
+    - Gain and channel conversion are applied while copying into the scratch buffer
+      (np.multiply(..., out=scratch))
+    - TPDF dither is generated in place from a seeded numpy Generator into a second
+      reusable buffer, so exports are bit-identical for a given seed
+    - The scratch buffer is handed to SoundFile.buffer_write(); libsndfile performs
+      the PCM conversion directly from the float32 memory
+
+USAGE:
+    >>> writer = LoopExportWriter(sample_rate=44100, bit_depth=16, channels=2, seed=1234)
+    >>> gain = peak_normalization_gain(audio, target_dbfs=-1.0)
+    >>> for start, end, path in chunks:
+    ...     writer.write(path, audio[start:end], gain=gain)
+"""
+
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import struct
+import numpy as np
+import soundfile as sf
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# soundfile subtype per bit depth (shared by all loop exporters)
+SUBTYPE_MAP = {16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}
+
+# LSB amplitude per bit depth (32-bit uses the 24-bit equivalent, see apply_tpdf_dither)
+_DITHER_LSB = {16: 1.0 / 32768.0, 24: 1.0 / 8388608.0, 32: 1.0 / 8388608.0}
+
+
+def get_subtype(bit_depth: int, default: str = "PCM_24") -> str:
+    """
+    Get soundfile subtype for a bit depth.
+
+    Args:
+        bit_depth: Bit depth (16, 24, or 32)
+        default: Subtype returned for unsupported bit depths
+
+    Returns:
+        soundfile subtype string (e.g., 'PCM_24')
+    """
+    return SUBTYPE_MAP.get(bit_depth, default)
+
+
+# ============================================================================
+# WAV loop markers (cue / smpl chunks)
+# ============================================================================
+
+# MIDI unity note written to the smpl chunk (C4, sampler default)
+_SMPL_UNITY_NOTE = 60
+
+
+def write_wav_loop_markers(
+    wav_path: Path, loops: Sequence[Tuple[int, int]], sample_rate: int
+):
+    """
+    Append `cue ` and `smpl` chunks marking loop boundaries to a finished WAV file.
+
+    WHY: Single-container exports store all loops of a stem in one file. Samplers
+         and DAWs read loop regions from the smpl chunk and slice markers from the
+         cue chunk, so the loops stay addressable without one file per loop.
+
+    Args:
+        wav_path: Path to a closed RIFF/WAVE file (e.g., written by soundfile)
+        loops: List of (start_sample, end_sample) frame offsets, end exclusive
+        sample_rate: Sample rate of the file in Hz
+
+    Raises:
+        ValueError: If the file is not a RIFF/WAVE file
+    """
+    num_loops = len(loops)
+
+    # cue chunk: one cue point per loop start (IDs are 1-based)
+    cue = [struct.pack("<I", num_loops)]
+    for cue_id, (start, _end) in enumerate(loops, start=1):
+        cue.append(struct.pack("<II4sIII", cue_id, start, b"data", 0, 0, start))
+    cue_data = b"".join(cue)
+
+    # smpl chunk: one forward loop per cue point (dwEnd is inclusive)
+    sample_period_ns = int(round(1e9 / sample_rate))
+    smpl = [
+        struct.pack(
+            "<9I", 0, 0, sample_period_ns, _SMPL_UNITY_NOTE, 0, 0, 0, num_loops, 0
+        )
+    ]
+    for cue_id, (start, end) in enumerate(loops, start=1):
+        smpl.append(struct.pack("<6I", cue_id, 0, start, max(start, end - 1), 0, 0))
+    smpl_data = b"".join(smpl)
+
+    with open(wav_path, "r+b") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {wav_path}")
+
+        f.seek(0, 2)
+        if f.tell() % 2:
+            f.write(b"\x00")  # RIFF chunks are word-aligned
+
+        f.write(b"cue " + struct.pack("<I", len(cue_data)) + cue_data)
+        f.write(b"smpl" + struct.pack("<I", len(smpl_data)) + smpl_data)
+
+        # Update RIFF size (file length minus 'RIFF' + size field)
+        riff_size = f.tell() - 8
+        f.seek(4)
+        f.write(struct.pack("<I", riff_size))
+
+
+def read_wav_loop_markers(wav_path: Path) -> List[Tuple[int, int]]:
+    """
+    Read loop regions from the `smpl` chunk of a WAV file.
+
+    Args:
+        wav_path: Path to WAV file
+
+    Returns:
+        List of (start_sample, end_sample) with end exclusive (empty if no smpl chunk)
+    """
+    with open(wav_path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {wav_path}")
+
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return []
+
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id != b"smpl":
+                f.seek(chunk_size + (chunk_size % 2), 1)
+                continue
+
+            data = f.read(chunk_size)
+            num_loops = struct.unpack_from("<I", data, 28)[0]
+            loops = []
+            for loop_idx in range(num_loops):
+                _cue_id, _type, start, end, _frac, _count = struct.unpack_from(
+                    "<6I", data, 36 + 24 * loop_idx
+                )
+                loops.append((start, end + 1))
+            return loops
+
+
+class LoopExportWriter:
+    """
+    Reusable writer for exporting audio chunks with gain and TPDF dither.
+
+    Features:
+    - Float32 scratch buffer reused across chunks (no per-chunk allocations)
+    - In-place gain, channel conversion, dither and clipping
+    - Seeded vectorised RNG for reproducible dither
+    - Direct float32 hand-off to libsndfile via SoundFile.buffer_write()
+
+    A writer is not thread-safe; use one writer per export thread.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        bit_depth: int = 24,
+        channels: int = 2,
+        file_format: str = "WAV",
+        dither: Optional[bool] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize export writer.
+
+        Args:
+            sample_rate: Output sample rate in Hz
+            bit_depth: Output bit depth (16, 24, or 32)
+            channels: Output channels (1=mono, 2=stereo)
+            file_format: Output format ('WAV', 'AIFF', or 'FLAC')
+            dither: Apply TPDF dither before quantization.
+                    Default (None): dither only for 16-bit, like apply_tpdf_dither usage
+            seed: Seed for the dither RNG. Same seed + same input = identical files.
+                  None draws fresh entropy (non-reproducible)
+        """
+        if channels not in (1, 2):
+            raise ValueError(f"Unsupported channel count: {channels}")
+
+        self.sample_rate = sample_rate
+        self.bit_depth = bit_depth
+        self.channels = channels
+        self.file_format = file_format
+        self.subtype = get_subtype(bit_depth)
+        self.dither = (bit_depth == 16) if dither is None else dither
+        self.seed = seed
+
+        self._rng = np.random.default_rng(seed)
+        self._lsb = _DITHER_LSB.get(bit_depth, _DITHER_LSB[24])
+
+        # Grow-only buffers, sliced to the current chunk length
+        self._scratch: Optional[np.ndarray] = None
+        self._noise: Optional[np.ndarray] = None
+
+        # Statistics (buffer growth = the only allocations in the hot loop)
+        self.buffer_allocations = 0
+        self.chunks_written = 0
+
+    def _frame_shape(self, frames: int) -> tuple:
+        """Shape of one buffer holding `frames` output frames"""
+        return (frames,) if self.channels == 1 else (frames, self.channels)
+
+    def _ensure_capacity(self, frames: int):
+        """Grow scratch buffers if `frames` exceeds current capacity"""
+        if self._scratch is not None and len(self._scratch) >= frames:
+            return
+
+        self._scratch = np.empty(self._frame_shape(frames), dtype=np.float32)
+        if self.dither:
+            self._noise = np.empty(self._frame_shape(frames), dtype=np.float32)
+        self.buffer_allocations += 1
+
+        logger.debug(
+            f"LoopExportWriter: allocated scratch buffer for {frames} frames "
+            f"({self._scratch.nbytes / 1024:.0f} KB)"
+        )
+
+    def prepare(self, audio: np.ndarray, gain: float = 1.0) -> np.ndarray:
+        """
+        Copy audio into the scratch buffer with gain, channel conversion and dither.
+
+        Args:
+            audio: Source chunk, (samples,) mono or (samples, channels)
+            gain: Linear gain applied while copying (e.g., from peak_normalization_gain)
+
+        Returns:
+            View into the internal float32 scratch buffer, valid until the next call.
+            Shape is (samples,) for mono output or (samples, channels) for stereo.
+        """
+        frames = len(audio)
+        self._ensure_capacity(frames)
+        out = self._scratch[:frames]
+
+        # Gain + channel conversion in a single pass into the scratch buffer
+        if self.channels == 1 and audio.ndim > 1:
+            # Mono from multi-channel: mean(channels) * gain
+            np.sum(audio, axis=1, out=out)
+            np.multiply(out, gain / audio.shape[1], out=out)
+        elif self.channels == 2 and audio.ndim == 1:
+            # Stereo from mono: broadcast into both channels
+            np.multiply(audio[:, np.newaxis], gain, out=out)
+        elif self.channels == 2 and audio.shape[1] != 2:
+            np.multiply(audio[:, :2], gain, out=out)
+        else:
+            np.multiply(audio, gain, out=out)
+
+        if self.dither:
+            self._apply_dither(out)
+
+        # Clip to valid range (dither may push a sample out of bounds)
+        np.clip(out, -1.0, 1.0, out=out)
+
+        return out
+
+    def _apply_dither(self, out: np.ndarray):
+        """
+        Add TPDF dither in place.
+
+        TPDF dither of ±1 LSB per uniform component (same distribution as
+        apply_tpdf_dither): U(-lsb, lsb) + U(-lsb, lsb) == 2 * lsb * (a - b)
+        with a, b ~ U(0, 1).
+        """
+        noise = self._noise[: len(out)]
+        scale = np.float32(2.0 * self._lsb)
+
+        # out += 2 * lsb * a
+        self._rng.random(out=noise, dtype=np.float32)
+        np.multiply(noise, scale, out=noise)
+        np.add(out, noise, out=out)
+
+        # out -= 2 * lsb * b
+        self._rng.random(out=noise, dtype=np.float32)
+        np.multiply(noise, scale, out=noise)
+        np.subtract(out, noise, out=out)
+
+    def append(self, sound_file: sf.SoundFile, audio: np.ndarray, gain: float = 1.0) -> int:
+        """
+        Process one chunk and append it to an already open file.
+
+        Used for single-container exports, where all loops of a stem are written
+        sequentially into one file.
+
+        Args:
+            sound_file: Open SoundFile in write mode (same channels as the writer)
+            audio: Source chunk, (samples,) mono or (samples, channels)
+            gain: Linear gain applied before dither/quantization
+
+        Returns:
+            Number of frames written
+        """
+        buffer = self.prepare(audio, gain)
+        sound_file.buffer_write(buffer, dtype="float32")
+        self.chunks_written += 1
+        return len(buffer)
+
+    def write(self, output_path: Path, audio: np.ndarray, gain: float = 1.0) -> int:
+        """
+        Process and write one chunk to a new file.
+
+        Args:
+            output_path: Destination file path
+            audio: Source chunk, (samples,) mono or (samples, channels)
+            gain: Linear gain applied before dither/quantization
+
+        Returns:
+            Number of frames written
+        """
+        buffer = self.prepare(audio, gain)
+
+        with sf.SoundFile(
+            str(output_path),
+            mode="w",
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            subtype=self.subtype,
+            format=self.file_format,
+        ) as f:
+            f.buffer_write(buffer, dtype="float32")
+
+        self.chunks_written += 1
+        return len(buffer)
+
+
+class LoopMixWriter:
+    """
+    Reusable accumulator for exporting mixed (all stems combined) loops.
+
+    Features:
+    - One float32 mix buffer, grown on demand and reused for every loop
+    - Stems are summed in place (np.add(..., out=mix)) in the output channel layout,
+      so mono stems never get stacked to stereo and stereo stems are never copied
+    - Peak protection applied in place (scale to 0.95 when the mix exceeds full scale)
+    - Each output file is opened once and written with SoundFile.buffer_write()
+
+    A writer is not thread-safe; use one writer per export thread.
+
+    USAGE:
+        >>> mixer = LoopMixWriter(sample_rate=44100, bit_depth=24, channels=2)
+        >>> for loop_idx, path in outputs:
+        ...     stems = [cache.get(name, loop_idx) for name in stem_names]
+        ...     mixer.begin(max(len(s) for s in stems))
+        ...     for stem_audio in stems:
+        ...         mixer.add(stem_audio)
+        ...     mixer.write(path)
+    """
+
+    # Peak target used when the mix exceeds full scale
+    HEADROOM_PEAK = 0.95
+
+    def __init__(
+        self,
+        sample_rate: int,
+        bit_depth: int = 24,
+        channels: int = 2,
+        file_format: str = "WAV",
+    ):
+        """
+        Initialize mix writer.
+
+        Args:
+            sample_rate: Output sample rate in Hz
+            bit_depth: Output bit depth (16, 24, or 32)
+            channels: Output channels (1=mono, 2=stereo)
+            file_format: Output format ('WAV', 'AIFF', or 'FLAC')
+        """
+        if channels not in (1, 2):
+            raise ValueError(f"Unsupported channel count: {channels}")
+
+        self.sample_rate = sample_rate
+        self.bit_depth = bit_depth
+        self.channels = channels
+        self.file_format = file_format
+        self.subtype = get_subtype(bit_depth)
+
+        # Grow-only buffers, sliced to the current loop length
+        self._mix: Optional[np.ndarray] = None
+        self._downmix: Optional[np.ndarray] = None  # Mono output: (L + R) / 2 per stem
+        self._frames = 0
+
+        # Statistics (buffer growth = the only allocations in the hot loop)
+        self.buffer_allocations = 0
+        self.loops_written = 0
+
+    def _ensure_capacity(self, frames: int):
+        """Grow mix buffers if `frames` exceeds current capacity"""
+        if self._mix is not None and len(self._mix) >= frames:
+            return
+
+        shape = (frames,) if self.channels == 1 else (frames, self.channels)
+        self._mix = np.empty(shape, dtype=np.float32)
+        if self.channels == 1:
+            self._downmix = np.empty(frames, dtype=np.float32)
+        self.buffer_allocations += 1
+
+        logger.debug(
+            f"LoopMixWriter: allocated mix buffer for {frames} frames "
+            f"({self._mix.nbytes / 1024:.0f} KB)"
+        )
+
+    def begin(self, frames: int) -> np.ndarray:
+        """
+        Start a new loop: clear the mix buffer for `frames` output frames.
+
+        Args:
+            frames: Loop length in samples (longest stem of this loop)
+
+        Returns:
+            View into the internal mix buffer, valid until the next begin()
+        """
+        self._ensure_capacity(frames)
+        self._frames = frames
+        mix = self._mix[:frames]
+        mix.fill(0.0)
+        return mix
+
+    def add(self, audio: np.ndarray):
+        """
+        Accumulate one stem into the current mix (in place).
+
+        Stems shorter than the loop are treated as zero-padded; longer stems are
+        truncated (stretched stems may differ by a sample due to rounding).
+
+        Args:
+            audio: Stem audio, (samples,) mono or (samples, channels)
+        """
+        frames = min(len(audio), self._frames)
+        if frames == 0:
+            return
+
+        mix = self._mix[:frames]
+        audio = audio[:frames]
+
+        if self.channels == 2:
+            if audio.ndim == 1:
+                # Mono stem: broadcast into both channels
+                np.add(mix, audio[:, np.newaxis], out=mix)
+            else:
+                np.add(mix, audio[:, :2], out=mix)
+        elif audio.ndim == 1:
+            np.add(mix, audio, out=mix)
+        else:
+            # Mono output from multi-channel stem: mean(channels)
+            downmix = self._downmix[:frames]
+            np.sum(audio, axis=1, out=downmix)
+            np.multiply(downmix, 1.0 / audio.shape[1], out=downmix)
+            np.add(mix, downmix, out=mix)
+
+    def write(self, output_path: Path) -> int:
+        """
+        Apply peak protection to the current mix and write it to a new file.
+
+        Args:
+            output_path: Destination file path
+
+        Returns:
+            Number of frames written
+        """
+        mix = self._mix[: self._frames]
+
+        if len(mix) > 0:
+            peak = max(float(mix.max()), -float(mix.min()))
+            if peak > 1.0:
+                np.multiply(mix, self.HEADROOM_PEAK / peak, out=mix)
+
+        with sf.SoundFile(
+            str(output_path),
+            mode="w",
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            subtype=self.subtype,
+            format=self.file_format,
+        ) as f:
+            f.buffer_write(mix, dtype="float32")
+
+        self.loops_written += 1
+        return len(mix)
@@ -0,0 +1,252 @@
+"""
+Null Output - Sound-card-free output stream for the streaming mixer
+
+PURPOSE: Drive StreamingMixer (and so AudioPlayer) without audio hardware,
+         at real-time pace or as fast as possible, optionally writing the
+         rendered blocks to a sound file.
+
+CONTEXT: The only output backend was sounddevice.OutputStream, so player
+         performance could not be measured in CI, and tests faked the stream
+         ad hoc. NullOutputStream implements the same small surface the mixer
+         uses (start/stop/close/active/time + callback) and is plugged in
+         through the mixer's stream factory.
+
+ARCHITECTURE:
+    pump thread (stands in for the audio device)
+    ────────────────────────────────────────────
+    loop:
+        t0 = now
+        callback(buffer, blocksize, time_info, status)   ◄── mixer renders
+        record render time; write buffer to file (optional)
+        realtime: sleep until the block's deadline (k + 1) · period
+        fast:     no sleep; the stream clock is frames / sample_rate
+
+    A block is late (an xrun) when the callback finishes after its deadline
+    (realtime) or takes longer than one block period (fast). Like PortAudio,
+    the next callback then receives a non-empty status, so the mixer's own
+    xrun counter sees it too.
+
+USAGE:
+    >>> streams = []
+    >>> factory = null_stream_factory(realtime=False, streams=streams)
+    >>> player = AudioPlayer(stream_factory=factory)
+    >>> player.load_stems(files); player.play()
+    >>> streams[0].wait_blocks(10)
+    >>> streams[0].render_seconds               # per-callback render times
+
+    STEMSEPARATOR_AUDIO_BACKEND=null selects this backend (real-time, no file)
+    for AudioPlayer instances created without a stream factory.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+import threading
+import time
+
+import numpy as np
+import soundfile as sf
+
+from core.stream_mixer import StreamFactory
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Status handed to the callback after a late block
+# WHY: Mirrors sounddevice's CallbackFlags, which is truthy after an underflow
+OUTPUT_UNDERFLOW = "output underflow"
+
+
+class NullOutputStream:
+    """
+    Output stream that consumes blocks without a sound card.
+
+    Features:
+    - Real-time pacing (one block per block period) or faster than real time
+    - Stream clock and outputBufferDacTime like sounddevice
+    - Per-callback render times and deadline misses (xruns)
+    - Optional file sink (any soundfile format, float32)
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int,
+        blocksize: int,
+        callback: Callable,
+        realtime: bool = True,
+        output_path: Optional[Path] = None
+    ):
+        """
+        Initialize stream (stopped).
+
+        Args:
+            sample_rate: Sample rate in Hz
+            channels: Output channels
+            blocksize: Frames per callback
+            callback: sounddevice-style callback(outdata, frames, time, status)
+            realtime: Pace callbacks at the sample rate (False = as fast as
+                      possible); may be switched while the stream is stopped
+            output_path: Write every rendered block to this file (None = discard)
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.callback = callback
+        self.realtime = realtime
+        self.output_path = Path(output_path) if output_path is not None else None
+        self.period = blocksize / sample_rate
+
+        self.active = False
+        self.closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._progress = threading.Condition()
+        self._file: Optional[sf.SoundFile] = None
+        self._origin = time.perf_counter()
+
+        # Statistics (since the stream was created or reset_stats())
+        self.frames = 0  # Frames handed to the callback
+        self.blocks = 0
+        self.xruns = 0  # Blocks that missed their deadline
+        self.render_seconds: List[float] = []  # Callback duration per block
+
+    @property
+    def time(self) -> float:
+        """Stream clock in seconds (virtual in fast mode)"""
+        if self.realtime:
+            return time.perf_counter() - self._origin
+        return self.frames / self.sample_rate
+
+    def reset_stats(self):
+        """Clear block counters and render times (not the stream clock)"""
+        with self._progress:
+            self.blocks = 0
+            self.xruns = 0
+            self.render_seconds = []
+
+    def start(self):
+        """Start calling the callback from the pump thread"""
+        if self.closed:
+            raise RuntimeError("Stream is closed")
+        if self.active:
+            return
+        if self.output_path is not None and self._file is None:
+            self._file = sf.SoundFile(
+                str(self.output_path), mode="w", samplerate=self.sample_rate,
+                channels=self.channels, subtype="FLOAT"
+            )
+        self._stop.clear()
+        self.active = True
+        self._thread = threading.Thread(target=self._pump, name="null-output", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop after the block being rendered (like sounddevice.stop())"""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        # WHY: The player may stop the stream from its state callback, which
+        #      can run on this thread; joining ourselves would deadlock
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.active = False
+        with self._progress:
+            self._progress.notify_all()
+
+    def close(self):
+        """Stop and close the file sink"""
+        self.stop()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.closed = True
+
+    def wait_blocks(self, count: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until count more callbacks have completed.
+
+        Args:
+            count: Callbacks to wait for
+            timeout: Maximum wait in seconds (None = no limit)
+
+        Returns:
+            True if they completed, False on timeout or when the stream stopped
+        """
+        with self._progress:
+            target = self.blocks + count
+            return self._progress.wait_for(
+                lambda: self.blocks >= target or not self.active, timeout
+            ) and self.blocks >= target
+
+    def _pump(self):
+        """Pump thread body: one callback per block period (or back to back)"""
+        buffer = np.zeros((self.blocksize, self.channels), dtype=np.float32)
+        status = None
+        deadline = time.perf_counter() + self.period
+
+        while not self._stop.is_set():
+            # The block is heard at its deadline (realtime) or right after the
+            # frames already output (fast, virtual clock)
+            if self.realtime:
+                dac_time = deadline - self._origin
+            else:
+                dac_time = self.frames / self.sample_rate
+            time_info = SimpleNamespace(currentTime=self.time, outputBufferDacTime=dac_time)
+
+            started = time.perf_counter()
+            try:
+                self.callback(buffer, self.blocksize, time_info, status)
+            except Exception as e:
+                logger.error(f"Null output callback failed: {e}", exc_info=True)
+                self.active = False
+                break
+            finished = time.perf_counter()
+
+            if self._file is not None:
+                self._file.write(buffer)
+
+            late = finished > deadline if self.realtime else finished - started > self.period
+            status = OUTPUT_UNDERFLOW if late else None
+            with self._progress:
+                self.frames += self.blocksize
+                self.blocks += 1
+                self.xruns += late
+                self.render_seconds.append(finished - started)
+                self._progress.notify_all()
+
+            if self.realtime:
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                    deadline += self.period
+                else:
+                    # Fell behind: restart the schedule instead of bursting
+                    deadline = time.perf_counter() + self.period
+
+
+def null_stream_factory(
+    realtime: bool = True,
+    output_path: Optional[Path] = None,
+    streams: Optional[List[NullOutputStream]] = None
+) -> StreamFactory:
+    """
+    Create a StreamingMixer/AudioPlayer stream factory for NullOutputStream.
+
+    Args:
+        realtime: Pace callbacks at the sample rate (False = as fast as possible)
+        output_path: Write the rendered output to this file
+        streams: List that every created stream is appended to (for stats)
+
+    Returns:
+        StreamFactory
+    """
+    def factory(sample_rate: int, channels: int, blocksize: int, callback: Callable):
+        stream = NullOutputStream(
+            sample_rate, channels, blocksize, callback,
+            realtime=realtime, output_path=output_path
+        )
+        if streams is not None:
+            streams.append(stream)
+        return stream
+
+    return factory
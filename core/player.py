@@ -2,25 +2,47 @@
 Audio Player - Real-time playback and mixing of separated stems
 
 PURPOSE: Provides audio playback with per-stem volume/mute/solo controls
-CONTEXT: Uses sounddevice for simple, reliable audio playback of pre-loaded audio
-MIGRATION: Migrated from rtmixer to sounddevice.play() for simpler implementation
+CONTEXT: Uses a sounddevice OutputStream callback that mixes pre-loaded stems
+         block by block (see core.stream_mixer)
+MIGRATION: Migrated from rtmixer to sounddevice.play(), then to a streaming
+           callback so seek and gain changes no longer re-mix the track
 """
 
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Dict, Callable
+from typing import Optional, Dict, Callable, Iterator
 from dataclasses import dataclass
 from enum import Enum
+import math
+import os
 import threading
-import time
 import numpy as np
 import soundfile as sf
-from concurrent.futures import ThreadPoolExecutor
-
-from config import RECORDING_SAMPLE_RATE
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import (
+    PLAYER_MEMORY_MAPPED_STEMS,
+    PLAYER_OUTPUT_BACKEND,
+    PLAYER_READ_AHEAD_SECONDS,
+    RECORDING_SAMPLE_RATE,
+    STEM_CACHE_DIR,
+    STEM_CACHE_SIZE_MB,
+)
 from utils.logger import get_logger
-from utils.audio_processing import export_audio_chunks
+from utils.audio_processing import EXPORT_BLOCK_FRAMES, export_audio_chunks_streamed
+from utils.loop_grid import seconds_to_samples
+from core.stem_store import StemStore
+from core.limiter import LookaheadLimiter
+from core.null_output import null_stream_factory
+from core.stream_mixer import (
+    StreamFactory,
+    StreamingMixer,
+    compute_stem_gains,
+    iter_mix_blocks,
+    mix_stems,
+    sounddevice_stream_factory,
+)
 
 logger = get_logger()
 
@@ -64,14 +86,31 @@ class AudioPlayer:
     - Callbacks for position updates
 
     IMPLEMENTATION:
-    - Uses sounddevice.play() for straightforward playback of pre-loaded audio
-    - All stems are mixed in memory before playback
-    - Non-blocking playback with position tracking thread
+    - StreamingMixer mixes each output block from the pre-loaded stems
+    - Seek, volume, mute and solo take effect within one block (no re-mix)
+    - Non-blocking playback; position read from the output audio clock
     """
 
-    def __init__(self, sample_rate: int = RECORDING_SAMPLE_RATE):
+    def __init__(
+        self,
+        sample_rate: int = RECORDING_SAMPLE_RATE,
+        stream_factory: Optional[StreamFactory] = None,
+        stem_store: Optional[StemStore] = None,
+    ):
+        """
+        Initialize player.
+
+        Args:
+            sample_rate: Initial sample rate (replaced by the stems' rate on load)
+            stream_factory: Output stream factory for the streaming mixer
+                            (default: sounddevice.OutputStream, or the null
+                            backend if config.PLAYER_OUTPUT_BACKEND is "null";
+                            tests inject a fake stream)
+            stem_store: Memory-mapped stem cache (None = decode stems into RAM)
+        """
         self.logger = logger
         self.sample_rate = sample_rate
+        self._stem_store = stem_store
 
         # Playback state
         self.state = PlaybackState.STOPPED
@@ -79,9 +118,9 @@ class AudioPlayer:
         self.duration_samples = 0
 
         # Audio data
-        self.stems: Dict[str, np.ndarray] = (
-            {}
-        )  # stem_name -> audio_data (channels, samples)
+        # stem_name -> audio_data (channels, samples); memory-mapped when a
+        # stem store is used; stems may be shorter than duration_samples
+        self.stems: Dict[str, np.ndarray] = {}
         self.stem_settings: Dict[str, StemSettings] = {}
         self.master_volume: float = 1.0
 
@@ -89,15 +128,11 @@ class AudioPlayer:
         self.loop_mode_enabled: bool = False
         self.loop_start_samples: int = 0
         self.loop_end_samples: int = 0
-        self._loop_cached_audio: Optional[np.ndarray] = (
-            None  # Cached loop audio buffer (multi-rep)
-        )
-        self._loop_single_length: int = 0  # Length of single loop iteration in samples
+        self.loop_crossfade_samples: int = 0  # Crossfade where a repeat loop wraps
 
-        # Threading for position updates
-        self._position_lock = threading.Lock()
-        self._update_thread: Optional[threading.Thread] = None
-        self._stop_update = threading.Event()
+        # Threading
+        self._stems_lock = threading.Lock()  # Serialises stem/gain publishing
+        self._load_lock = threading.Lock()  # One load_stems() at a time
 
         # Thread pool for async operations (reduces thread creation overhead)
         self._thread_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="player")
@@ -113,6 +148,28 @@ class AudioPlayer:
         self._active_actions = []  # Track active playback for cancellation
         self._import_rtmixer()
 
+        # Streaming mixer (None when no output backend is available)
+        self._mixer: Optional[StreamingMixer] = None
+        if stream_factory is None and PLAYER_OUTPUT_BACKEND == "null":
+            # WHY: No sound card (CI, benchmarks) - blocks are rendered in
+            #      real time and discarded
+            stream_factory = null_stream_factory()
+        if stream_factory is None and self._sounddevice_module is not None:
+            stream_factory = sounddevice_stream_factory(self._sounddevice_module)
+        if stream_factory is not None:
+            self._mixer = StreamingMixer(
+                self.sample_rate,
+                channels=2,
+                stream_factory=stream_factory,
+                limiter=LookaheadLimiter(self.sample_rate, channels=2),
+                # WHY: Mute/solo toggles mix from RAM copies of every stem, so
+                #      they are heard within one block even on slow disks
+                read_ahead_seconds=PLAYER_READ_AHEAD_SECONDS,
+                # WHY: The mixer reports the end of the track itself, so
+                #      playback stops even when nobody polls get_position()
+                finished_callback=self._on_playback_finished,
+            )
+
         self.logger.info("AudioPlayer initialized with sounddevice")
 
     def _import_rtmixer(self) -> bool:
@@ -164,106 +221,105 @@ class AudioPlayer:
             self._sounddevice_module = None
             return False
 
-    def load_stems(self, stem_files: Dict[str, Path]) -> bool:
+    def load_stems(
+        self,
+        stem_files: Dict[str, Path],
+        on_stem_ready: Optional[Callable[[str, int, int], None]] = None,
+        max_workers: Optional[int] = None,
+    ) -> bool:
         """
-        Load stem audio files into memory
+        Load stem audio files (decoded in parallel)
+
+        Stems join self.stems and the live mix as soon as each one is decoded,
+        so playback may start after the first stem is ready (e.g. from the UI
+        thread while this call is still running in a worker thread). Duration
+        and stem settings are known up front from the file headers.
 
         Args:
             stem_files: Dict mapping stem_name -> file_path
+            on_stem_ready: Called as (stem_name, ready_count, total) after each
+                           stem is loaded (from a loader thread)
+            max_workers: Decoder threads (default: one per stem, capped at CPU count)
 
         Returns:
-            True if successful, False otherwise
+            True if all stems loaded, False otherwise
         """
         if not stem_files:
             self.logger.warning("No stems to load")
             return False
 
+        # WHY: A second load (e.g. user picks new files while the first is
+        #      still decoding) would reset self.stems under the first one
+        with self._load_lock:
+            return self._load_stems_locked(stem_files, on_stem_ready, max_workers)
+
+    def _load_stems_locked(
+        self,
+        stem_files: Dict[str, Path],
+        on_stem_ready: Optional[Callable[[str, int, int], None]],
+        max_workers: Optional[int],
+    ) -> bool:
+        """load_stems() body (caller holds self._load_lock)"""
         self.logger.info(f"Loading {len(stem_files)} stems...")
 
         try:
-            self.stems.clear()
+            self.stems = {}
             self.stem_settings.clear()
-            max_length = 0
-            detected_sample_rate = None
 
-            # Load all stems
-            for stem_name, file_path in stem_files.items():
-                self.logger.debug(f"Loading stem: {stem_name} from {file_path}")
-
-                # Load audio (ensure float32 for consistent processing)
-                audio_data, file_sr = sf.read(
-                    str(file_path), always_2d=True, dtype="float32"
-                )
+            # Use first file's sample rate as reference
+            first_path = next(iter(stem_files.values()))
+            self.sample_rate = sf.info(str(first_path)).samplerate
+            self.logger.info(f"Using sample rate from stems: {self.sample_rate} Hz")
 
-                self.logger.info(
-                    f"Loaded {stem_name}: sample_rate={file_sr} Hz, "
-                    f"shape={audio_data.shape}, duration={audio_data.shape[0]/file_sr:.2f}s"
+            # Duration from headers (resampled length as librosa produces it)
+            max_length = 0
+            for stem_name, file_path in stem_files.items():
+                info = sf.info(str(file_path))
+                max_length = max(
+                    max_length,
+                    math.ceil(info.frames * self.sample_rate / info.samplerate),
                 )
-
-                # Use first file's sample rate as reference
-                if detected_sample_rate is None:
-                    detected_sample_rate = file_sr
-                    self.sample_rate = file_sr
-                    self.logger.info(
-                        f"Using sample rate from stems: {self.sample_rate} Hz"
-                    )
-
-                # Transpose to (channels, samples)
-                audio_data = audio_data.T.astype(np.float32)
-
-                # Resample if needed
-                if file_sr != detected_sample_rate:
-                    self.logger.warning(
-                        f"Stem {stem_name} has different sample rate ({file_sr} vs {detected_sample_rate}). "
-                        f"Resampling from {file_sr} to {detected_sample_rate} Hz..."
-                    )
-                    # Resample using librosa
-                    import librosa
-
-                    audio_data = librosa.resample(
-                        audio_data,
-                        orig_sr=file_sr,
-                        target_sr=detected_sample_rate,
-                        res_type="kaiser_best",
-                    ).astype(np.float32)
-                    self.logger.info(
-                        f"Resampled {stem_name} to {detected_sample_rate} Hz"
-                    )
-
-                # Ensure stereo
-                if audio_data.shape[0] == 1:
-                    # Mono to stereo
-                    audio_data = np.repeat(audio_data, 2, axis=0)
-                elif audio_data.shape[0] > 2:
-                    # Take first 2 channels
-                    audio_data = audio_data[:2, :]
-
-                self.stems[stem_name] = audio_data
                 self.stem_settings[stem_name] = StemSettings()
 
-                # Track max length
-                max_length = max(max_length, audio_data.shape[1])
-
-                self.logger.debug(
-                    f"Loaded {stem_name}: {audio_data.shape[1]} samples, "
-                    f"{audio_data.shape[1] / self.sample_rate:.2f}s"
-                )
-
-            # Pad all stems to same length
-            for stem_name, audio_data in self.stems.items():
-                if audio_data.shape[1] < max_length:
-                    padding = max_length - audio_data.shape[1]
-                    self.stems[stem_name] = np.pad(
-                        audio_data,
-                        ((0, 0), (0, padding)),
-                        mode="constant",
-                        constant_values=0,
-                    )
-                    self.logger.debug(f"Padded {stem_name} with {padding} samples")
-
+            # WHY: No padding copies - stems keep their own length and every
+            #      reader treats samples past a stem's end as silence
             self.duration_samples = max_length
             self.position_samples = 0
 
+            if self._mixer is not None:
+                self._mixer.set_stems([], self.sample_rate)
+
+            # WHY: libsndfile and the resampler release the GIL, so threads
+            #      decode stems truly in parallel - total load time approaches
+            #      that of the slowest stem
+            workers = max_workers or min(len(stem_files), os.cpu_count() or 1)
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="stem-load"
+            ) as pool:
+                futures = {
+                    pool.submit(self._load_stem, stem_name, file_path): stem_name
+                    for stem_name, file_path in stem_files.items()
+                }
+                for future in as_completed(futures):
+                    stem_name = futures[future]
+                    audio_data = future.result()
+
+                    self._add_loaded_stem(stem_name, audio_data)
+                    self.logger.debug(
+                        f"Loaded {stem_name}: {audio_data.shape[1]} samples, "
+                        f"{audio_data.shape[1] / self.sample_rate:.2f}s"
+                    )
+                    if on_stem_ready:
+                        on_stem_ready(stem_name, len(self.stems), len(stem_files))
+
+            # Restore the caller's stem order (completion order is arbitrary)
+            with self._stems_lock:
+                self.stems = {name: self.stems[name] for name in stem_files}
+                self.duration_samples = max(
+                    audio.shape[1] for audio in self.stems.values()
+                )
+            self._update_mixer_gains()
+
             self.logger.info(
                 f"Successfully loaded {len(self.stems)} stems. "
                 f"Duration: {self.get_duration():.2f}s"
@@ -273,10 +329,84 @@ class AudioPlayer:
 
         except Exception as e:
             self.logger.error(f"Failed to load stems: {e}", exc_info=True)
-            self.stems.clear()
+            self.stems = {}
             self.stem_settings.clear()
+            if self._mixer is not None:
+                self._mixer.set_stems([])
             return False
 
+    def _load_stem(self, stem_name: str, file_path: Path) -> np.ndarray:
+        """Load one stem at self.sample_rate (runs on a loader thread)"""
+        self.logger.debug(f"Loading stem: {stem_name} from {file_path}")
+
+        if self._stem_store is not None:
+            # Decoded once into a cache file, then memory-mapped (read-only)
+            return self._stem_store.load(file_path, self.sample_rate)
+        return self._decode_stem(stem_name, file_path, self.sample_rate)
+
+    def _add_loaded_stem(self, stem_name: str, audio_data: np.ndarray):
+        """
+        Add a decoded stem to the player and the live mix
+
+        WHY: self.stems is replaced, not mutated, so readers iterating a
+             snapshot (mix, export, UI) never see it change size mid-loop
+        """
+        with self._stems_lock:
+            self.stems = {**self.stems, stem_name: audio_data}
+        self._update_mixer_gains()
+
+    def _decode_stem(
+        self, stem_name: str, file_path: Path, target_sample_rate: int
+    ) -> np.ndarray:
+        """
+        Decode a stem fully into memory
+
+        Args:
+            stem_name: Stem name (for logging)
+            file_path: Audio file
+            target_sample_rate: Sample rate to resample to if the file differs
+
+        Returns:
+            Stereo float32 audio (2, samples)
+        """
+        # Load audio (ensure float32 for consistent processing)
+        audio_data, file_sr = sf.read(str(file_path), always_2d=True, dtype="float32")
+
+        self.logger.info(
+            f"Loaded {stem_name}: sample_rate={file_sr} Hz, "
+            f"shape={audio_data.shape}, duration={audio_data.shape[0]/file_sr:.2f}s"
+        )
+
+        # Transpose to (channels, samples)
+        audio_data = audio_data.T.astype(np.float32)
+
+        # Resample if needed
+        if file_sr != target_sample_rate:
+            self.logger.warning(
+                f"Stem {stem_name} has different sample rate ({file_sr} vs {target_sample_rate}). "
+                f"Resampling from {file_sr} to {target_sample_rate} Hz..."
+            )
+            # Resample using librosa
+            import librosa
+
+            audio_data = librosa.resample(
+                audio_data,
+                orig_sr=file_sr,
+                target_sr=target_sample_rate,
+                res_type="kaiser_best",
+            ).astype(np.float32)
+            self.logger.info(f"Resampled {stem_name} to {target_sample_rate} Hz")
+
+        # Ensure stereo
+        if audio_data.shape[0] == 1:
+            # Mono to stereo
+            audio_data = np.repeat(audio_data, 2, axis=0)
+        elif audio_data.shape[0] > 2:
+            # Take first 2 channels
+            audio_data = audio_data[:2, :]
+
+        return audio_data
+
     def get_duration(self) -> float:
         """Get total duration in seconds"""
         if self.duration_samples == 0:
@@ -284,9 +414,9 @@ class AudioPlayer:
         return self.duration_samples / self.sample_rate
 
     def get_position(self) -> float:
-        """Get current position in seconds"""
-        with self._position_lock:
-            return self.position_samples / self.sample_rate
+        """Get current position in seconds (audio clock while playing)"""
+        self._sync_position()
+        return self.position_samples / self.sample_rate
 
     def set_position(self, position_seconds: float):
         """
@@ -295,97 +425,92 @@ class AudioPlayer:
         Args:
             position_seconds: Target position in seconds
 
-        WHY: Seeking must not block the GUI thread, especially when sounddevice.stop()
-             is called, which can block on some systems. Also allows seeking when stopped
+        WHY: Seeking must not block the GUI thread. While playing, the streaming
+             mixer picks up the new position at its next block - the stream keeps
+             running and nothing is re-mixed. Also allows seeking when stopped
              to enable restarting playback from a different position.
         """
         position_samples = int(position_seconds * self.sample_rate)
         position_samples = max(0, min(position_samples, self.duration_samples))
 
-        # Update position atomically
-        with self._position_lock:
-            old_position = self.position_samples
-            self.position_samples = position_samples
-            is_playing = self.state == PlaybackState.PLAYING
+        old_position = self.position_samples
+        self.position_samples = position_samples
+        is_playing = self.state == PlaybackState.PLAYING
 
         self.logger.info(
             f"Seeked to {position_seconds:.2f}s ({position_samples} samples)"
         )
 
-        # If playing, restart playback from new position (outside lock to prevent deadlock)
-        if is_playing and self._sounddevice_module is not None:
+        # If playing, hand the new position to the mixer (outside lock)
+        if is_playing and self._mixer is not None:
             self.logger.debug(
                 f"Seeking from {old_position} to {position_samples} samples"
             )
-            # Run restart in thread pool to prevent blocking (short-lived task)
-            self._thread_pool.submit(self._async_seek_restart)
+            self._mixer.seek(position_samples)
         # Note: If stopped, position is updated but playback doesn't restart
         # User can click Play to start from the new position
 
-    def _async_seek_restart(self):
-        """
-        Restart playback after seek (runs in separate thread)
-
-        WHY: sounddevice.stop() can block, so we run this in a separate thread
-             to prevent freezing the GUI
-        """
-        try:
-            # Cancel all current playback
-            self._cancel_all_actions()
-            # Minimal delay to ensure stop completed (reduced from 50ms to 10ms)
-            time.sleep(0.01)
-            # Start playback from new position
-            self._start_playback_from_position()
-        except Exception as e:
-            self.logger.error(f"Error during async seek restart: {e}", exc_info=True)
-
     def set_stem_volume(self, stem_name: str, volume: float):
         """Set stem volume (0.0 to 1.0) and apply immediately during playback"""
         if stem_name in self.stem_settings:
             self.stem_settings[stem_name].volume = max(0.0, min(1.0, volume))
-            # Restart playback with new mix if currently playing
-            self._restart_playback_if_playing()
+            self._update_mixer_gains()
 
     def set_stem_mute(self, stem_name: str, is_muted: bool):
         """Set stem mute state and apply immediately during playback"""
         if stem_name in self.stem_settings:
             self.stem_settings[stem_name].is_muted = is_muted
-            # Restart playback with new mix if currently playing
-            self._restart_playback_if_playing()
+            self._update_mixer_gains()
 
     def set_stem_solo(self, stem_name: str, is_solo: bool):
         """Set stem solo state and apply immediately during playback"""
         if stem_name in self.stem_settings:
             self.stem_settings[stem_name].is_solo = is_solo
-            # Restart playback with new mix if currently playing
-            self._restart_playback_if_playing()
+            self._update_mixer_gains()
 
     def set_master_volume(self, volume: float):
         """Set master volume (0.0 to 1.0) and apply immediately during playback"""
         self.master_volume = max(0.0, min(1.0, volume))
-        # Restart playback with new mix if currently playing
-        self._restart_playback_if_playing()
+        self._update_mixer_gains()
 
-    def _restart_playback_if_playing(self):
-        """Restart playback from current position with new mix (if currently playing)"""
-        if self.state == PlaybackState.PLAYING:
-            # Stop position update thread temporarily
-            self._stop_update.set()
-            if self._update_thread and self._update_thread.is_alive():
-                self._update_thread.join(timeout=0.5)
-
-            # Stop current playback
-            self._cancel_all_actions()
+    def _effective_gains(
+        self, stems: Optional[Dict[str, np.ndarray]] = None
+    ) -> list[float]:
+        """
+        Per-stem gains (mute/solo/volume/master applied)
 
-            # Restart from current position with new mix
-            self._start_playback_from_position()
+        Args:
+            stems: Stems snapshot to align with (default: self.stems)
 
-            # Restart position update thread
-            self._stop_update.clear()
-            self._update_thread = threading.Thread(
-                target=self._position_update_loop, daemon=True
+        Returns:
+            Gains in the order of stems; solo is resolved over all stems,
+            including ones still loading
+        """
+        stems = self.stems if stems is None else stems
+        names = list(self.stem_settings)
+        gains = dict(
+            zip(
+                names,
+                compute_stem_gains(
+                    [self.stem_settings[name] for name in names], self.master_volume
+                ),
             )
-            self._update_thread.start()
+        )
+        return [gains.get(name, 0.0) for name in stems]
+
+    def _update_mixer_gains(self):
+        """
+        Publish current gains to the streaming mixer
+
+        WHY: The mixer reads gains once per block, so a change is audible within
+             one buffer whether or not playback is running - no restart, no re-mix
+        """
+        if self._mixer is not None:
+            with self._stems_lock:
+                stems = self.stems
+                self._mixer.set_stems(
+                    list(stems.values()), gains=self._effective_gains(stems)
+                )
 
     def is_playback_available(self) -> tuple[bool, str]:
         """
@@ -396,7 +521,7 @@ class AudioPlayer:
             - (True, "") if playback is available
             - (False, "error message") if playback is not available
         """
-        if not self._sounddevice_module:
+        if self._mixer is None:
             return (
                 False,
                 "sounddevice library is not available. "
@@ -427,7 +552,7 @@ class AudioPlayer:
             self.logger.warning("Already playing")
             return False
 
-        if not self._sounddevice_module:
+        if self._mixer is None:
             self.logger.error("sounddevice not available")
             return False
 
@@ -454,13 +579,6 @@ class AudioPlayer:
             if self.state_callback:
                 self.state_callback(self.state)
 
-            # Start position update thread
-            self._stop_update.clear()
-            self._update_thread = threading.Thread(
-                target=self._position_update_loop, daemon=True
-            )
-            self._update_thread.start()
-
             self.logger.info("Started playback with sounddevice")
             return True
 
@@ -473,25 +591,29 @@ class AudioPlayer:
 
     def _cancel_all_actions(self):
         """Cancel all active playback"""
-        if self._sounddevice_module:
+        if self._mixer is not None:
             try:
-                self._sounddevice_module.stop()
-                self.logger.debug("Stopped sounddevice playback")
+                self._mixer.stop()
             except Exception as e:
-                self.logger.debug(f"Error stopping sounddevice: {e}")
+                self.logger.debug(f"Error stopping output stream: {e}")
 
         self._active_actions.clear()
 
     def _start_playback_from_position(self):
-        """Start playback from current position (internal helper) using sounddevice"""
-        if self._sounddevice_module is None:
+        """
+        Start playback from current position (internal helper)
+
+        WHY: The streaming mixer renders blocks on demand, so starting (or
+             restarting at a loop boundary) only sets the play range - there
+             is no pre-mix of the remaining track.
+        """
+        if self._mixer is None:
             return
 
         # Clear previous actions
         self._active_actions.clear()
 
-        with self._position_lock:
-            start_sample = self.position_samples
+        start_sample = int(self.position_samples)
 
         # Determine end point based on loop mode
         if self.loop_mode_enabled:
@@ -499,177 +621,86 @@ class AudioPlayer:
         else:
             end_sample = self.duration_samples
 
-        # Mix stems from current position to end (or loop end)
-        mixed_audio = self._mix_stems(start_sample, end_sample)
-
-        if mixed_audio.shape[1] == 0:
-            self.logger.warning("No audio to play (empty buffer)")
+        if end_sample <= start_sample:
+            self.logger.warning("No audio to play (empty range)")
             return
 
-        # Transpose to (samples, channels) for sounddevice
-        chunk_for_playback = mixed_audio.T.astype(np.float32)
-
-        self.logger.info(
-            f"Prepared mixed audio: {chunk_for_playback.shape[0]} samples "
-            f"({chunk_for_playback.shape[0] / self.sample_rate:.2f}s), "
-            f"peak level: {np.max(np.abs(chunk_for_playback)):.3f}"
-        )
-
-        # Use sounddevice.play() for simple playback (non-blocking)
         try:
-            sd = self._sounddevice_module
+            if self.loop_mode_enabled:
+                # WHY: The mixer wraps at loop end inside the callback, so the
+                #      loop repeats gaplessly without being restarted from here
+                self._mixer.play(
+                    start_sample,
+                    end_sample,
+                    loop=True,
+                    loop_start=self.loop_start_samples,
+                    crossfade=self.loop_crossfade_samples,
+                )
+            else:
+                self._mixer.play(start_sample, end_sample)
+            self.logger.info(
+                f"Started streaming playback: {start_sample}-{end_sample} samples "
+                f"({(end_sample - start_sample) / self.sample_rate:.2f}s)"
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to start output stream: {e}", exc_info=True)
 
-            # Get default output device
-            default_device = sd.default.device[1]
+    def _sync_position(self):
+        """
+        Read the playback position from the mixer's audio clock
 
-            # Play audio using sounddevice (simpler than rtmixer for pre-loaded audio)
-            sd.play(
-                chunk_for_playback,
-                samplerate=self.sample_rate,
-                device=default_device,
-                blocking=False,  # Non-blocking to allow UI updates
-            )
+        WHY: Position comes from frames the output callback actually
+             consumed, not from a wall-clock estimate, so it cannot drift
+             from the audio. The UI drives this from its own timer through
+             get_position(); there is no position thread and no lock. The
+             end of the track is reported by the mixer (_on_playback_finished).
+        """
+        mixer = self._mixer
+        if self.state != PlaybackState.PLAYING or mixer is None:
+            return
 
-            self.logger.info(
-                f"Started playback with sounddevice.play() on device #{default_device}"
-            )
+        self.position_samples = int(mixer.playback_position())
 
-        except Exception as e:
-            self.logger.error(f"Failed to play via sounddevice: {e}", exc_info=True)
+        if self.position_callback:
+            self.position_callback(
+                self.position_samples / self.sample_rate, self.get_duration()
+            )
 
-    def _position_update_loop(self):
-        """Thread loop for updating position (runs separately from audio)"""
-        try:
-            # Use perf_counter for higher precision timing
-            # WHY: Reduces timing drift compared to time.time()
-            start_time = time.perf_counter()
-            start_position = self.position_samples
-
-            while not self._stop_update.is_set():
-                # Calculate elapsed time with higher precision
-                elapsed = time.perf_counter() - start_time
-                # Use float calculation, round only at end for better accuracy
-                # WHY: Integer truncation accumulates errors over time
-                elapsed_samples_float = elapsed * self.sample_rate
-                expected_position = int(start_position + elapsed_samples_float)
-
-                with self._position_lock:
-                    # Check if position was changed externally (e.g., via seek)
-                    # Allow small tolerance for rounding errors
-                    position_changed_externally = (
-                        abs(self.position_samples - expected_position)
-                        > self.sample_rate * 0.1
-                    )
+    def _on_playback_finished(self):
+        """
+        Handle the end of the track (called from the mixer's watcher thread)
 
-                    # Handle loop mode with extended buffer separately
-                    if (
-                        self.loop_mode_enabled
-                        and self._loop_cached_audio is not None
-                        and self._loop_single_length > 0
-                    ):
-                        # Extended buffer mode: don't use normal position tracking
-                        # Calculate position within extended buffer
-                        extended_buffer_samples = len(self._loop_cached_audio)
-                        elapsed_in_extended = expected_position - start_position
-
-                        # Check if extended buffer is exhausted
-                        if elapsed_in_extended >= extended_buffer_samples:
-                            # Restart the extended buffer
-                            self.logger.debug(
-                                f"Extended loop buffer exhausted after {elapsed_in_extended} samples, restarting"
-                            )
-
-                            # Reset timing
-                            start_position = self.loop_start_samples
-                            start_time = time.perf_counter()
-                            self.position_samples = self.loop_start_samples
-
-                            # Restart playback
-                            self._play_cached_loop()
-                        else:
-                            # Wrap position to show correct UI position within single loop
-                            pos_in_single = (
-                                int(elapsed_in_extended) % self._loop_single_length
-                            )
-                            self.position_samples = (
-                                self.loop_start_samples + pos_in_single
-                            )
-                    elif position_changed_externally:
-                        # Position was changed by seek - reset our timing
-                        start_position = self.position_samples
-                        start_time = time.perf_counter()
-                        self.logger.debug(
-                            f"Position update loop detected seek to {self.position_samples} samples, resetting timing"
-                        )
-                    else:
-                        # Update position normally
-                        if self.loop_mode_enabled:
-                            # In loop mode (no cached audio), clamp to loop boundaries
-                            self.position_samples = min(
-                                expected_position, self.loop_end_samples
-                            )
-
-                            # Check if reached loop end
-                            if self.position_samples >= self.loop_end_samples:
-                                self.logger.debug(f"Loop end reached, restarting")
-
-                                self.position_samples = self.loop_start_samples
-                                start_position = self.loop_start_samples
-                                start_time = time.perf_counter()
-
-                                self._start_playback_from_position()
-                        else:
-                            # Normal mode, clamp to track duration
-                            self.position_samples = min(
-                                expected_position, self.duration_samples
-                            )
-
-                    current_pos = self.position_samples
-
-                    # Check if reached track end (non-loop mode only)
-                    if (
-                        not self.loop_mode_enabled
-                        and current_pos >= self.duration_samples
-                    ):
-                        self.logger.info("Reached end of audio")
-                        self.state = PlaybackState.STOPPED
-                        self.position_samples = 0
-                        # Call state_callback to notify UI
-                        if self.state_callback:
-                            try:
-                                self.state_callback(self.state)
-                            except Exception as e:
-                                self.logger.error(
-                                    f"Error in state_callback: {e}", exc_info=True
-                                )
-                        break
-
-                # Call position callback
-                if self.position_callback:
-                    self.position_callback(self.get_position(), self.get_duration())
-
-                # Update every 10ms for faster loop detection (was 50ms)
-                time.sleep(0.01)
+        WHY: Driven by the mixer, not by get_position(), so scripts, the CLI
+             and tests that never poll still see PLAYING → STOPPED and the
+             output stream is stopped instead of rendering silence.
+        """
+        if self.state != PlaybackState.PLAYING or self.loop_mode_enabled:
+            return
+        if self._mixer is None or not self._mixer.is_finished:
+            return  # Restarted or seeked since the mixer signalled
 
-        except Exception as e:
-            self.logger.error(f"Error in position update loop: {e}", exc_info=True)
+        self.logger.info("Reached end of audio")
+        self.state = PlaybackState.STOPPED
+        self.position_samples = 0
+        self._cancel_all_actions()
+        if self.state_callback:
+            try:
+                self.state_callback(self.state)
+            except Exception as e:
+                self.logger.error(f"Error in state_callback: {e}", exc_info=True)
 
     def pause(self):
         """Pause playback"""
         if self.state == PlaybackState.PLAYING:
-            # Stop position updates first
-            self._stop_update.set()
+            # Keep the position the audio clock reached (resume starts there)
+            if self._mixer is not None:
+                self.position_samples = int(self._mixer.playback_position())
 
             # Cancel playback (sounddevice doesn't have pause, so we stop)
             self._cancel_all_actions()
 
-            # Now wait for thread to finish
-            if self._update_thread:
-                self._update_thread.join(timeout=1.0)
-
             self.state = PlaybackState.PAUSED
 
-            # Call state callback after thread has finished to avoid deadlock
             if self.state_callback:
                 self.state_callback(self.state)
 
@@ -678,25 +709,14 @@ class AudioPlayer:
     def stop(self):
         """Stop playback"""
         if self.state in [PlaybackState.PLAYING, PlaybackState.PAUSED]:
-            # Stop position updates first
-            self._stop_update.set()
-
-            # Cancel playback before waiting for thread
             self._cancel_all_actions()
 
-            # Now wait for thread to finish (it won't call callbacks anymore)
-            if self._update_thread:
-                self._update_thread.join(timeout=1.0)
-
             self.state = PlaybackState.STOPPED
             self.position_samples = 0
 
-            # Clear loop mode and cache to free memory
+            # Clear loop mode
             self.loop_mode_enabled = False
-            self._loop_cached_audio = None
-            self._loop_single_length = 0
 
-            # Call state callback after thread has finished to avoid deadlock
             if self.state_callback:
                 self.state_callback(self.state)
 
@@ -713,6 +733,26 @@ class AudioPlayer:
             end_sec: End time in seconds
             repeat: If True, loop repeats continuously when reaching end
 
+        Returns:
+            True if playback started successfully, False otherwise
+        """
+        return self.play_loop_samples(
+            seconds_to_samples(start_sec, self.sample_rate),
+            seconds_to_samples(end_sec, self.sample_rate),
+            repeat=repeat,
+        )
+
+    def play_loop_samples(
+        self, start_sample: int, end_sample: int, repeat: bool = False
+    ) -> bool:
+        """
+        Play a loop segment given in samples (e.g., from a LoopGrid)
+
+        Args:
+            start_sample: Start sample index at self.sample_rate
+            end_sample: End sample index (exclusive) at self.sample_rate
+            repeat: If True, loop repeats continuously when reaching end
+
         Returns:
             True if playback started successfully, False otherwise
         """
@@ -720,17 +760,16 @@ class AudioPlayer:
             self.logger.warning("No stems loaded, cannot play loop")
             return False
 
-        if not self._sounddevice_module:
+        if self._mixer is None:
             self.logger.error("sounddevice not available")
             return False
 
-        # Convert to samples
-        start_sample = int(start_sec * self.sample_rate)
-        end_sample = int(end_sec * self.sample_rate)
-
         # Clamp to valid range
-        start_sample = max(0, min(start_sample, self.duration_samples))
-        end_sample = max(start_sample, min(end_sample, self.duration_samples))
+        start_sample = max(0, min(int(start_sample), self.duration_samples))
+        end_sample = max(start_sample, min(int(end_sample), self.duration_samples))
+
+        start_sec = start_sample / self.sample_rate
+        end_sec = end_sample / self.sample_rate
 
         if start_sample >= end_sample:
             self.logger.warning(f"Invalid loop segment: {start_sec}s - {end_sec}s")
@@ -751,74 +790,34 @@ class AudioPlayer:
             f"({'repeat' if repeat else 'once'})"
         )
 
-        # Pre-mix and cache loop audio for fast repeat (avoids re-mixing on each loop)
-        # Create extended buffer with multiple repetitions for gapless-ish playback
-        if repeat:
-            self.logger.info("Pre-mixing loop audio for repeat mode...")
-            mixed_audio = self._mix_stems(start_sample, end_sample)
-            single_loop = mixed_audio.T.astype(np.float32)
-
-            # Create buffer with multiple repetitions (reduces restart frequency)
-            # Each restart of sounddevice.play() has ~10-50ms latency
-            num_repetitions = 10  # Play 10 loops before needing to restart
-            self._loop_cached_audio = np.tile(single_loop, (num_repetitions, 1))
-            self._loop_single_length = len(single_loop)  # Track single loop length
-
-            loop_duration = len(single_loop) / self.sample_rate
-            self.logger.info(
-                f"Cached loop audio: {len(single_loop)} samples ({loop_duration:.2f}s) "
-                f"x {num_repetitions} = {len(self._loop_cached_audio)} total samples"
-            )
-        else:
-            self._loop_cached_audio = None
-            self._loop_single_length = 0
-
         # Start playback from loop start
+        # WHY: In repeat mode the mixer wraps at loop end inside the audio
+        #      callback - no pre-mixed or tiled buffer, no restart gaps
         try:
-            # Use cached loop audio if available (for repeat mode)
-            if self._loop_cached_audio is not None:
-                self._play_cached_loop()
-            else:
-                self._start_playback_from_position()
+            self._start_playback_from_position()
 
             # Update state
             self.state = PlaybackState.PLAYING
             if self.state_callback:
                 self.state_callback(self.state)
 
-            # Start position update thread
-            self._stop_update.clear()
-            self._update_thread = threading.Thread(
-                target=self._position_update_loop, daemon=True
-            )
-            self._update_thread.start()
-
             return True
 
         except Exception as e:
             self.logger.error(f"Failed to start loop playback: {e}", exc_info=True)
             return False
 
-    def _play_cached_loop(self):
-        """Play cached loop audio without re-mixing (for fast loop repeat)"""
-        if self._loop_cached_audio is None or self._sounddevice_module is None:
-            return
-
-        try:
-            sd = self._sounddevice_module
-            default_device = sd.default.device[1]
-
-            sd.play(
-                self._loop_cached_audio,
-                samplerate=self.sample_rate,
-                device=default_device,
-                blocking=False,
-            )
-
-            self.logger.debug("Restarted cached loop playback")
+    def set_loop_crossfade(self, crossfade_ms: float):
+        """
+        Set the micro-crossfade applied where a repeating loop wraps
 
-        except Exception as e:
-            self.logger.error(f"Failed to play cached loop: {e}", exc_info=True)
+        Args:
+            crossfade_ms: Crossfade length in milliseconds (0 = sample-accurate
+                          hard wrap). Applies from the next loop playback.
+        """
+        self.loop_crossfade_samples = max(
+            0, int(round(crossfade_ms * self.sample_rate / 1000.0))
+        )
 
     def set_loop_mode(
         self, enabled: bool, start_sec: float = 0.0, end_sec: Optional[float] = None
@@ -834,11 +833,11 @@ class AudioPlayer:
         self.loop_mode_enabled = enabled
 
         if enabled:
-            self.loop_start_samples = int(start_sec * self.sample_rate)
+            self.loop_start_samples = seconds_to_samples(start_sec, self.sample_rate)
             if end_sec is None:
                 self.loop_end_samples = self.duration_samples
             else:
-                self.loop_end_samples = int(end_sec * self.sample_rate)
+                self.loop_end_samples = seconds_to_samples(end_sec, self.sample_rate)
 
             # Clamp to valid range
             self.loop_start_samples = max(
@@ -863,10 +862,9 @@ class AudioPlayer:
         Returns:
             Tuple of (position_sec, loop_start_sec, loop_end_sec)
         """
-        with self._position_lock:
-            position_sec = self.position_samples / self.sample_rate
-            loop_start_sec = self.loop_start_samples / self.sample_rate
-            loop_end_sec = self.loop_end_samples / self.sample_rate
+        position_sec = self.get_position()
+        loop_start_sec = self.loop_start_samples / self.sample_rate
+        loop_end_sec = self.loop_end_samples / self.sample_rate
 
         return position_sec, loop_start_sec, loop_end_sec
 
@@ -881,47 +879,48 @@ class AudioPlayer:
         Returns:
             Mixed audio (channels, samples)
         """
-        # Initialize output
-        num_samples = end_sample - start_sample
-        mixed = np.zeros((2, num_samples), dtype=np.float32)
-
-        # Check if any stem is solo
-        any_solo = any(settings.is_solo for settings in self.stem_settings.values())
-
-        # Mix stems
-        for stem_name, audio_data in self.stems.items():
-            settings = self.stem_settings[stem_name]
-
-            # Skip if muted
-            if settings.is_muted:
-                continue
-
-            # Skip if not solo and another stem is solo
-            if any_solo and not settings.is_solo:
-                continue
-
-            # Extract chunk
-            chunk = audio_data[:, start_sample:end_sample]
-
-            # Apply volume
-            chunk = chunk * settings.volume
-
-            # Add to mix
-            mixed += chunk
+        # WHY: Shared kernel - in-place accumulation, then the look-ahead
+        #      limiter only where the mix exceeds the ceiling
+        stems = self.stems
+        return mix_stems(
+            list(stems.values()),
+            self._effective_gains(stems),
+            start_sample,
+            end_sample,
+            self.sample_rate,
+        )
 
-        # Apply master volume
-        mixed = mixed * self.master_volume
+    def _mix_blocks(self) -> Iterator[np.ndarray]:
+        """
+        Full-track mix as limited blocks, for streamed export.
 
-        # Soft clipping to prevent harsh distortion
-        peak = np.max(np.abs(mixed))
-        if peak > 1.0:
-            # Normalize to prevent clipping, with some headroom
-            mixed = mixed * (0.95 / peak)
+        Takes a snapshot of the stems and gains; blocks are mixed on demand
+        and run through a look-ahead limiter (latency compensated), so memory
+        does not depend on the track length.
 
-        # Final safety clip (should rarely be needed now)
-        mixed = np.clip(mixed, -1.0, 1.0)
+        Yields:
+            Mixed audio blocks (channels, n) float32, in order
+        """
+        stems = self.stems
+        limiter = LookaheadLimiter(self.sample_rate, channels=2)
+        yield from limiter.process_stream(
+            iter_mix_blocks(
+                list(stems.values()),
+                self._effective_gains(stems),
+                0,
+                self.duration_samples,
+                block_frames=EXPORT_BLOCK_FRAMES,
+            )
+        )
 
-        return mixed
+    def _export_path(
+        self, output_file: Path, file_format: str, common_filename: Optional[str]
+    ) -> Path:
+        """Base path for chunked mix export (common_filename overrides the name)"""
+        if not common_filename:
+            return output_file
+        extension = output_file.suffix if output_file.suffix else f".{file_format.lower()}"
+        return output_file.parent / f"{common_filename}{extension}"
 
     def export_mix(
         self, output_file: Path, file_format: str = "WAV", bit_depth: int = 16
@@ -929,6 +928,9 @@ class AudioPlayer:
         """
         Export mixed audio to file
 
+        Mixes and encodes block by block into an open SoundFile, so memory use
+        does not grow with the track length.
+
         Args:
             output_file: Output file path
             file_format: Audio format ('WAV', 'FLAC')
@@ -944,24 +946,21 @@ class AudioPlayer:
         try:
             self.logger.info(f"Exporting mix to {output_file}")
 
-            # Mix entire audio
-            mixed_audio = self._mix_stems(0, self.duration_samples)
-
-            # Transpose to (samples, channels) for soundfile
-            audio_to_save = mixed_audio.T
-
             # Determine subtype
             subtype_map = {16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}
             subtype = subtype_map.get(bit_depth, "PCM_16")
 
-            # Save file
-            sf.write(
+            # Stream blocks into the file, (samples, channels) for soundfile
+            with sf.SoundFile(
                 str(output_file),
-                audio_to_save,
-                self.sample_rate,
+                "w",
+                samplerate=self.sample_rate,
+                channels=2,
                 subtype=subtype,
                 format=file_format,
-            )
+            ) as f:
+                for block in self._mix_blocks():
+                    f.write(block.T)
 
             self.logger.info(f"Successfully exported mix: {output_file}")
             return True
@@ -1001,27 +1000,12 @@ class AudioPlayer:
                 f"Exporting mixed audio in {chunk_length_seconds}s chunks to {output_file}"
             )
 
-            # Mix entire audio
-            mixed_audio = self._mix_stems(0, self.duration_samples)
-
-            # Use common_filename if provided, otherwise use output_file.stem
-            if common_filename:
-                # Construct output path with common filename
-                output_dir = output_file.parent
-                extension = (
-                    output_file.suffix
-                    if output_file.suffix
-                    else f".{file_format.lower()}"
-                )
-                base_output_path = output_dir / f"{common_filename}{extension}"
-            else:
-                base_output_path = output_file
-
-            # Export as chunks (mixed_audio is already in (channels, samples) format)
-            chunk_paths = export_audio_chunks(
-                mixed_audio,
+            # Mix is produced block by block while the chunks are written
+            chunk_paths = export_audio_chunks_streamed(
+                self._mix_blocks(),
+                2,
                 self.sample_rate,
-                base_output_path,
+                self._export_path(output_file, file_format, common_filename),
                 chunk_length_seconds,
                 file_format=file_format,
                 bit_depth=bit_depth,
@@ -1084,7 +1068,10 @@ class AudioPlayer:
 
             all_chunks = {}
 
-            for stem_name, stem_audio in self.stems.items():
+            stems = self.stems
+            total_samples = self.duration_samples
+
+            for stem_name, stem_audio in stems.items():
                 # Get stem settings (volume, mute, solo)
                 settings = self.stem_settings.get(stem_name)
 
@@ -1096,8 +1083,15 @@ class AudioPlayer:
                     self.logger.info(f"Skipping muted stem: {stem_name}")
                     continue
 
-                # Apply volume to stem
-                stem_audio_with_volume = stem_audio * settings.volume
+                # Apply volume per block (zero-filled to the track length)
+                stem_blocks = iter_mix_blocks(
+                    [stem_audio],
+                    [settings.volume],
+                    0,
+                    total_samples,
+                    channels=stem_audio.shape[0],
+                    block_frames=EXPORT_BLOCK_FRAMES,
+                )
 
                 # Generate output path for this stem using common filename
                 extension = f".{file_format.lower()}"
@@ -1111,8 +1105,9 @@ class AudioPlayer:
                     stem_output_path = output_dir / f"{stem_name}{extension}"
 
                 # Export stem as chunks (with volume applied)
-                chunk_paths = export_audio_chunks(
-                    stem_audio_with_volume,
+                chunk_paths = export_audio_chunks_streamed(
+                    stem_blocks,
+                    stem_audio.shape[0],
                     self.sample_rate,
                     stem_output_path,
                     chunk_length_seconds,
@@ -1150,6 +1145,10 @@ class AudioPlayer:
             self._thread_pool.shutdown(wait=True, cancel_futures=False)
             self.logger.debug("Thread pool shut down")
 
+        # Release the output stream
+        if self._mixer is not None:
+            self._mixer.close()
+
         # Stop any ongoing sounddevice playback
         if self._sounddevice_module:
             try:
@@ -1158,7 +1157,7 @@ class AudioPlayer:
                 # Ignore errors during cleanup - sounddevice may not be playing
                 logger.debug(f"Error stopping sounddevice during cleanup: {e}")
 
-        self.stems.clear()
+        self.stems = {}
         self.stem_settings.clear()
 
 
@@ -1170,5 +1169,8 @@ def get_player() -> AudioPlayer:
     """Get global player instance"""
     global _player
     if _player is None:
-        _player = AudioPlayer()
+        stem_store = None
+        if PLAYER_MEMORY_MAPPED_STEMS:
+            stem_store = StemStore(STEM_CACHE_DIR, max_size_mb=STEM_CACHE_SIZE_MB)
+        _player = AudioPlayer(stem_store=stem_store)
     return _player
@@ -36,6 +36,7 @@ FUTURE EXTENSION POINT: alignToTempoGrid()
 
 from pathlib import Path
 from typing import Optional, List, Callable, Tuple
+import json
 from dataclasses import dataclass
 import numpy as np
 import soundfile as sf
@@ -50,12 +51,13 @@ from utils.loop_math import (
 )
 from utils.audio_processing import (
     detect_bpm,
-    normalize_peak_to_dbfs,
+    peak_normalization_gain,
     resample_audio,
-    apply_tpdf_dither,
     stereo_to_mono,
     find_nearest_zero_crossing,
 )
+from utils.loop_grid import seconds_to_samples
+from core.export_writer import LoopExportWriter, write_wav_loop_markers
 from config import get_default_output_dir, DEFAULT_LOOPS_DIR
 
 logger = get_logger()
@@ -75,6 +77,7 @@ class ExportResult:
         samples_per_chunk: Target samples per chunk (may vary slightly due to zero-crossing)
         zero_crossing_shifts: List of zero-crossing adjustments per chunk (in samples)
         effective_durations_sec: Actual duration of each exported chunk (in seconds)
+        index_file: JSON sidecar with loop offsets (single-container export only)
     """
 
     success: bool
@@ -85,6 +88,7 @@ class ExportResult:
     samples_per_chunk: int = 0
     zero_crossing_shifts: List[int] = None
     effective_durations_sec: List[float] = None
+    index_file: Optional[Path] = None
 
     def __post_init__(self):
         """Initialize mutable default values"""
@@ -111,6 +115,8 @@ def export_sampler_loops(
     progress_callback: Optional[Callable[[str, int], None]] = None,
     common_filename: Optional[str] = None,
     stem_name: Optional[str] = None,
+    dither_seed: Optional[int] = None,
+    single_container: bool = False,
 ) -> ExportResult:
     """
     Export audio as musically-timed sampler loops.
@@ -120,11 +126,11 @@ def export_sampler_loops(
     2. Detect or validate BPM
     3. Resample to target sample rate (if needed)
     4. Convert to mono/stereo as requested
-    5. Normalize to -1.0 dBFS peak
+    5. Compute gain for -1.0 dBFS peak normalization
     6. Calculate exact chunk length based on BPM and bars
     7. Split into chunks with zero-crossing optimization
-    8. Apply dither (for 16-bit)
-    9. Export chunks with descriptive filenames
+    8. Apply gain and dither (for 16-bit) per chunk in a reusable float32 buffer
+    9. Export chunks with descriptive filenames (or into one WAV per stem)
 
     Args:
         input_path: Path to input audio file
@@ -139,6 +145,11 @@ def export_sampler_loops(
         progress_callback: Optional callback(message: str, percent: int) for progress updates
         common_filename: Common filename extracted from first loaded stem (e.g., "MySong")
         stem_name: Stem name for individual stem exports (e.g., "vocals"), None for mixed
+        dither_seed: Optional seed for the 16-bit TPDF dither RNG. With a seed, repeated
+                     exports of the same input are bit-identical.
+        single_container: Write all chunks sequentially into one WAV file with
+                          cue/smpl chunks marking every loop, plus a JSON sidecar
+                          index (<name>_<BPM>BPM_<bars>T.json). WAV only.
 
     Returns:
         ExportResult with success status, files, warnings, and metadata
@@ -148,6 +159,7 @@ def export_sampler_loops(
         Mixed multiple: "<common_filename>_<BPM>BPM_<bars>T_<NN>.<ext>"
         Individual single: "<common_filename>_<stem_name>_<BPM>BPM_<bars>T.<ext>"
         Individual multiple: "<common_filename>_<stem_name>_<BPM>BPM_<bars>T_<NN>.<ext>"
+        Single container: single-chunk name for every chunk count, plus ".json" index
 
         Examples:
             "MySong_120BPM_4T.wav"
@@ -191,6 +203,13 @@ def export_sampler_loops(
             success=False, error_message=f"Input file not found: {input_path}"
         )
 
+    # cue/smpl markers are RIFF chunks
+    if single_container and file_format.upper() != "WAV":
+        return ExportResult(
+            success=False,
+            error_message=f"Single-container export requires WAV format, got {file_format}",
+        )
+
     # Round BPM to integer (as specified in requirements)
     bpm = round(bpm)
 
@@ -205,8 +224,10 @@ def export_sampler_loops(
     report_progress("Loading audio file", 5)
 
     try:
-        # Load audio
-        audio_data, original_sr = sf.read(str(input_path), always_2d=False)
+        # Load audio (float32 halves memory vs. float64 and matches the export buffer)
+        audio_data, original_sr = sf.read(
+            str(input_path), always_2d=False, dtype="float32"
+        )
         logger.info(
             f"Loaded: {input_path.name}, {original_sr} Hz, "
             f"{audio_data.shape}, dtype={audio_data.dtype}"
@@ -224,15 +245,15 @@ def export_sampler_loops(
             audio_data = resample_audio(audio_data, original_sr, sample_rate)
 
         # Step 2: Channel conversion
+        # WHY: Mono-to-stereo duplication is done per chunk by LoopExportWriter,
+        #      so the full track is never materialized twice.
         if channels == 1 and audio_data.ndim > 1:
             # Convert stereo to mono
             audio_data = stereo_to_mono(audio_data)
-        elif channels == 2 and audio_data.ndim == 1:
-            # Convert mono to stereo (duplicate channel)
-            audio_data = np.stack([audio_data, audio_data], axis=1)
 
-        # Step 3: Normalize
-        audio_data = normalize_peak_to_dbfs(audio_data, target_dbfs=-1.0)
+        # Step 3: Normalization gain (applied per chunk by the writer)
+        normalize_gain = peak_normalization_gain(audio_data, target_dbfs=-1.0)
+        logger.debug(f"Normalization gain to -1.0 dBFS: {normalize_gain:.4f}")
 
     except Exception as e:
         return ExportResult(
@@ -294,9 +315,34 @@ def export_sampler_loops(
 
     extension = f".{file_format.lower()}"
 
-    # Determine soundfile subtype
-    subtype_map = {16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}
-    subtype = subtype_map.get(bit_depth, "PCM_24")
+    # Reusable writer: gain + dither + encode without per-chunk allocations
+    writer = LoopExportWriter(
+        sample_rate=sample_rate,
+        bit_depth=bit_depth,
+        channels=channels,
+        file_format=file_format,
+        seed=dither_seed,
+    )
+
+    # Single container: one open file for all chunks (sequential write, no per-loop creates)
+    container = None
+    container_path = None
+    container_loops = []
+    if single_container:
+        container_path = output_dir / f"{base_name}_{bpm}BPM_{bars}T{extension}"
+        try:
+            container = sf.SoundFile(
+                str(container_path),
+                mode="w",
+                samplerate=sample_rate,
+                channels=channels,
+                subtype=writer.subtype,
+                format=file_format,
+            )
+        except Exception as e:
+            return ExportResult(
+                success=False, error_message=f"Failed to create container file: {e}"
+            )
 
     report_progress(f"Exporting {num_chunks} chunk(s)", 35)
 
@@ -359,10 +405,6 @@ def export_sampler_loops(
                 "exporting remaining audio."
             )
 
-        # Apply dither (if 16-bit)
-        if bit_depth == 16:
-            chunk_data = apply_tpdf_dither(chunk_data, bit_depth)
-
         # Generate filename with unified naming convention
         # WHY: Consistent format with BPM suffix, 4T format for bars, and two-digit numbering
         bpm_str = f"{bpm}BPM"
@@ -381,13 +423,14 @@ def export_sampler_loops(
 
         # Export chunk
         try:
-            sf.write(
-                str(output_path),
-                chunk_data,
-                sample_rate,
-                subtype=subtype,
-                format=file_format,
-            )
+            # Gain, dither (16-bit) and PCM encoding happen inside the writer
+            if container is not None:
+                writer.append(container, chunk_data, gain=normalize_gain)
+                container_loops.append((current_pos, actual_end))
+                filename = f"{container_path.name} @ {current_pos}"
+            else:
+                writer.write(output_path, chunk_data, gain=normalize_gain)
+                output_files.append(output_path)
 
             logger.info(
                 f"Exported chunk {chunk_idx + 1}/{num_chunks}: {filename} "
@@ -395,11 +438,12 @@ def export_sampler_loops(
                 f"ZC shift: {zc_shift:+d} samples)"
             )
 
-            output_files.append(output_path)
             zero_crossing_shifts.append(zc_shift)
             effective_durations.append(chunk_duration_sec)
 
         except Exception as e:
+            if container is not None:
+                container.close()
             return ExportResult(
                 success=False,
                 error_message=f"Failed to export chunk {chunk_idx + 1}: {e}",
@@ -410,6 +454,30 @@ def export_sampler_loops(
         # Move to next chunk (no gaps, no overlaps)
         current_pos = actual_end
 
+    index_file = None
+    if container is not None:
+        report_progress("Writing loop index", 97)
+        try:
+            container.close()
+            write_wav_loop_markers(container_path, container_loops, sample_rate)
+            index_file = _write_container_index(
+                container_path,
+                container_loops,
+                zero_crossing_shifts,
+                bpm=bpm,
+                bars=bars,
+                sample_rate=sample_rate,
+                bit_depth=bit_depth,
+                channels=channels,
+            )
+            output_files.append(container_path)
+        except Exception as e:
+            return ExportResult(
+                success=False,
+                error_message=f"Failed to write loop index: {e}",
+                warning_messages=warnings,
+            )
+
     report_progress("Export complete", 100)
 
     logger.info(
@@ -420,13 +488,72 @@ def export_sampler_loops(
         success=True,
         warning_messages=warnings,
         output_files=output_files,
-        chunk_count=len(output_files),
+        chunk_count=len(effective_durations),
         samples_per_chunk=samples_per_chunk,
         zero_crossing_shifts=zero_crossing_shifts,
         effective_durations_sec=effective_durations,
+        index_file=index_file,
     )
 
 
+def _write_container_index(
+    container_path: Path,
+    loops: List[Tuple[int, int]],
+    zero_crossing_shifts: List[int],
+    bpm: int,
+    bars: int,
+    sample_rate: int,
+    bit_depth: int,
+    channels: int,
+) -> Path:
+    """
+    Write JSON sidecar index for a single-container export.
+
+    WHY: Consumers that don't parse cue/smpl chunks can still random-access each
+         loop by frame offset (e.g., sf.read(path, start=start, stop=end)).
+
+    Args:
+        container_path: Path to the container WAV file
+        loops: List of (start_sample, end_sample) frame offsets, end exclusive
+        zero_crossing_shifts: Zero-crossing adjustment per loop (in samples)
+        bpm: Export BPM
+        bars: Bars per loop
+        sample_rate: Sample rate of the container
+        bit_depth: Bit depth of the container
+        channels: Channel count of the container
+
+    Returns:
+        Path to the JSON index file (container path with .json suffix)
+    """
+    index = {
+        "file": container_path.name,
+        "sample_rate": sample_rate,
+        "bit_depth": bit_depth,
+        "channels": channels,
+        "bpm": bpm,
+        "bars": bars,
+        "loops": [
+            {
+                "index": loop_idx + 1,
+                "start_sample": start,
+                "end_sample": end,
+                "frames": end - start,
+                "duration_sec": (end - start) / sample_rate,
+                "zero_crossing_shift": shift,
+            }
+            for loop_idx, ((start, end), shift) in enumerate(
+                zip(loops, zero_crossing_shifts)
+            )
+        ],
+    }
+
+    index_path = container_path.with_suffix(".json")
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+
+    return index_path
+
+
 def detect_audio_bpm(audio_path: Path) -> Tuple[float, str, Optional[float]]:
     """
     Detect BPM of an audio file (convenience wrapper).
@@ -545,7 +672,7 @@ def export_padded_intro(
         audio_data = normalize_peak_to_dbfs(audio_data, target_dbfs=-1.0)
 
         # Calculate sample positions
-        intro_end_sample = int(intro_end * sample_rate)
+        intro_end_sample = seconds_to_samples(intro_end, sample_rate)
 
         # Extract actual intro audio (from sample 0 to intro_end)
         if audio_data.ndim == 1:
@@ -556,7 +683,7 @@ def export_padded_intro(
         # Check if padding is needed (negative start time)
         if intro_start < 0:
             padding_duration = abs(intro_start)
-            padding_samples = int(padding_duration * sample_rate)
+            padding_samples = seconds_to_samples(padding_duration, sample_rate)
 
             # Create silence padding
             if channels == 1:
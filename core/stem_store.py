@@ -0,0 +1,236 @@
+"""
+Stem Store - Decode-once, memory-mapped stem storage for playback
+
+PURPOSE: Keep loaded stems out of process memory. Each stem is decoded once
+         into a float32 cache file and memory-mapped, so the OS page cache
+         decides what is resident and RSS stays small even for long sets.
+
+CONTEXT: AudioPlayer.load_stems used to decode every stem fully into float32
+         arrays and pad them to equal length with np.pad copies - a one hour
+         set with 6 stereo stems is ~5.7 GB before playback starts. Playback,
+         export and waveform rendering only ever read ranges of the stems.
+
+ARCHITECTURE:
+    stem file ──sf.blocks──► (frames, channels) float32 .npy ──np.load(mmap)──►
+                                 ▲ written once, atomically       (channels, frames) view
+                                 │
+    key = hash(path, size, mtime, sample rate)
+
+    - Decoding is streamed block by block (constant memory); only stems that
+      need resampling are decoded fully, since resampling needs the whole signal
+    - Cache files are frame-major, so a (channels, frames) range read touches
+      one contiguous span of the file
+    - Stems keep their own length; consumers treat reads past a stem's end as
+      silence (stream_mixer.mix_stems_into), so there is no padding copy
+    - Oldest files are evicted when the directory exceeds its size budget;
+      temp files orphaned by a crashed decode are swept at the same time
+
+USAGE:
+    >>> store = StemStore(STEM_CACHE_DIR)
+    >>> audio = store.load(Path("song_vocals.wav"), sample_rate=44100)
+    >>> audio.shape                     # (2, frames), read-only memmap view
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import soundfile as sf
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Default size of the stem cache directory (see config.STEM_CACHE_SIZE_MB)
+DEFAULT_STEM_CACHE_SIZE_MB = 8192
+
+# Frames decoded per block while writing a cache file
+DECODE_BLOCK_FRAMES = 1 << 18
+
+# Age after which a temp file is treated as left behind by a crashed decode
+# WHY: Far longer than any decode, so a concurrent writer (another process
+#      sharing the directory) never loses its file
+STALE_TEMP_SECONDS = 3600
+
+
+def _to_stereo(block: np.ndarray) -> np.ndarray:
+    """(frames, channels) block → (frames, 2)"""
+    if block.shape[1] == 1:
+        return np.repeat(block, 2, axis=1)
+    return block[:, :2]
+
+
+# ============================================================================
+# Stem Store
+# ============================================================================
+
+class StemStore:
+    """
+    Memory-mapped stem cache.
+
+    Features:
+    - Decode once per (file, size, mtime, sample rate); later loads only map
+    - Atomic writes (temp file + os.replace), safe for concurrent processes
+    - Oldest-first eviction above max_size_mb
+    - Always returns stereo (mono duplicated, extra channels dropped)
+    - Thread-safe; different stems decode concurrently
+    """
+
+    SUFFIX = ".npy"
+    TEMP_SUFFIX = ".tmp"
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_size_mb: int = DEFAULT_STEM_CACHE_SIZE_MB
+    ):
+        """
+        Initialize store (directory is created on first load).
+
+        Args:
+            directory: Cache directory
+            max_size_mb: Maximum total size of cache files in megabytes
+        """
+        self.directory = Path(directory)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._in_flight: set = set()  # Cache files being written or mapped
+
+        # Statistics
+        self.decodes = 0
+        self.hits = 0
+
+    def _filename(self, path: Path, sample_rate: Optional[int]) -> str:
+        stat = path.stat()
+        key = f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{sample_rate}"
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest() + self.SUFFIX
+
+    def load(self, path: Union[str, Path], sample_rate: Optional[int] = None) -> np.ndarray:
+        """
+        Get a stem as a read-only memory-mapped (channels, frames) float32 view.
+
+        Args:
+            path: Audio file
+            sample_rate: Target sample rate (None = keep the file's rate)
+
+        Returns:
+            Stereo (2, frames) float32 memmap view
+        """
+        path = Path(path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        cache_path = self.directory / self._filename(path, sample_rate)
+
+        with self._lock:
+            self._in_flight.add(cache_path)
+        try:
+            if cache_path.exists():
+                with self._lock:
+                    self.hits += 1
+                os.utime(cache_path)  # Refresh for eviction order
+            else:
+                # WHY: Decode outside the lock so stems load in parallel; a
+                #      concurrent decode of the same file just replaces it atomically
+                self._decode(path, cache_path, sample_rate)
+                with self._lock:
+                    self.decodes += 1
+                    self._evict_locked()
+
+            # WHY: Frame-major on disk; the transpose is a free view
+            return np.load(cache_path, mmap_mode='r').T
+        finally:
+            with self._lock:
+                self._in_flight.discard(cache_path)
+
+    def _decode(self, path: Path, cache_path: Path, sample_rate: Optional[int]):
+        """Decode path into cache_path (frames, 2) float32 via a temp file"""
+        info = sf.info(str(path))
+        needs_resample = sample_rate is not None and info.samplerate != sample_rate
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=self.TEMP_SUFFIX)
+        os.close(fd)
+        try:
+            if needs_resample:
+                import librosa
+
+                logger.warning(
+                    f"Resampling {path.name} from {info.samplerate} to {sample_rate} Hz"
+                )
+                audio, _ = sf.read(str(path), always_2d=True, dtype="float32")
+                audio = librosa.resample(
+                    audio.T, orig_sr=info.samplerate, target_sr=sample_rate,
+                    res_type="kaiser_best"
+                ).T
+                data = np.lib.format.open_memmap(
+                    tmp_name, mode='w+', dtype=np.float32, shape=(len(audio), 2)
+                )
+                data[:] = _to_stereo(audio)
+            else:
+                data = np.lib.format.open_memmap(
+                    tmp_name, mode='w+', dtype=np.float32, shape=(info.frames, 2)
+                )
+                offset = 0
+                for block in sf.blocks(
+                    str(path), blocksize=DECODE_BLOCK_FRAMES, always_2d=True, dtype="float32"
+                ):
+                    data[offset:offset + len(block)] = _to_stereo(block)
+                    offset += len(block)
+
+            data.flush()
+            del data
+            os.replace(tmp_name, cache_path)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        logger.info(f"Decoded {path.name} into stem cache ({cache_path.name})")
+
+    def _evict_locked(self):
+        """Remove oldest cache files until the directory fits its budget"""
+        self._sweep_temp_files()
+
+        files = []
+        for entry in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime_ns, entry, stat.st_size))
+
+        total = sum(size for _, _, size in files)
+        for _, entry, size in sorted(files):
+            if total <= self.max_size_bytes:
+                break
+            if entry in self._in_flight:
+                continue
+            try:
+                entry.unlink()
+                total -= size
+            except OSError as e:
+                # Still mapped on platforms that forbid unlinking open files
+                logger.debug(f"Could not evict stem cache file {entry.name}: {e}")
+
+    def _sweep_temp_files(self):
+        """Delete temp files older than STALE_TEMP_SECONDS (crashed decodes)"""
+        cutoff = time.time() - STALE_TEMP_SECONDS
+        for entry in self.directory.glob(f"*{self.TEMP_SUFFIX}"):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    entry.unlink()
+                    logger.debug(f"Removed stale stem cache temp file {entry.name}")
+            except OSError:
+                continue
+
+    def clear(self):
+        """Delete all cache files (open maps stay valid where the OS allows)"""
+        with self._lock:
+            for entry in self.directory.glob(f"*{self.SUFFIX}"):
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,865 @@
+"""
+Stream Mixer - Callback-driven real-time mixing of preloaded stems
+
+PURPOSE: Mix only the block the audio device asks for, straight from the
+         preloaded stems, so seeking and gain changes never re-mix the track.
+
+CONTEXT: AudioPlayer used to mix the whole remaining track into a new buffer
+         and hand it to sounddevice.play(). Every seek, volume, mute or solo
+         change stopped playback and repeated that O(track) mix. With an
+         OutputStream callback the work per change is one attribute store.
+
+ARCHITECTURE:
+    UI thread                         Audio thread (stream callback)
+    ─────────                         ──────────────────────────────
+    set_gains(gains)  ──► _layers     reads (stems, gains) once per block
+    seek(sample)      ──► _seek       applies pending seek at block start
+    play(start, end)  ──► _seek       ↓
+                                      out[:n] = Σ gain_i · stem_i[pos:pos+n]
+                                      ↓  (loop: wrap pos at end → loop_start)
+                                      ↓  look-ahead limiter (optional)
+                                      ↓  clip to [-1, 1]
+                                      publishes _clock (position, DAC time)
+
+    Parameters are immutable objects swapped by reference (atomic under the
+    GIL), so the callback never takes a lock and never waits on the UI.
+    Changes take effect at the next block (blocksize / sample_rate seconds).
+
+    The playback position comes from the audio clock: each callback publishes
+    which stem sample its first frame carries and when that frame reaches
+    the DAC (outputBufferDacTime). playback_position() extrapolates from the
+    last block with the stream clock, so the position is exactly what was
+    consumed by the device - it cannot drift from the audio.
+
+    Loops wrap the read pointer inside the callback, so a loop repeats
+    sample-accurately with no gap, no restart and no tiled buffer. An optional
+    micro-crossfade blends the last N samples of the loop with the N samples
+    that precede loop_start (the audio that naturally leads into it):
+
+        ... ─ pre-roll ─┐ loop_start ──────────── end-N ──┐ end
+                        └──── fade in ◄── blended ──► fade out
+
+    The period stays exactly end - loop_start; pre-roll before sample 0 is
+    silence, which turns the crossfade into a short declicking fade-out.
+
+    Read-ahead (optional): a background thread keeps copies of the next few
+    seconds of every stem in RAM (_ReadAhead, one block per stem - each stem
+    is its own submix group). The callback mixes from those copies with the
+    live gains, so any mute/solo/volume combination is heard within one
+    block and the audio thread never page-faults on memory-mapped stems.
+    Blocks outside the window (right after a seek) are read from the stems
+    directly, so the read-ahead is purely a cache.
+
+    Completion: once a play-once range has been rendered and the limiter has
+    drained, the callback sets an event; a watcher thread then calls
+    finished_callback (outside the audio thread, so it may stop the stream).
+    The owner learns about the end of the track without polling.
+
+    The stream is created on first play() by a stream factory. The default
+    factory opens a sounddevice.OutputStream; tests pass a fake stream that
+    invokes the callback directly.
+
+USAGE:
+    >>> mixer = StreamingMixer(44100)
+    >>> mixer.set_stems([drums, bass])          # (channels, samples) float32
+    >>> mixer.set_gains([0.75, 0.0])            # bass muted
+    >>> mixer.play(0, drums.shape[1])
+    >>> mixer.seek(44100 * 30)                  # audible within one block
+    >>> mixer.play(a, b, loop=True, crossfade=64)  # gapless repeat of [a, b)
+    >>> mixer.stop()
+"""
+
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import itertools
+import threading
+
+import numpy as np
+
+from core.limiter import LookaheadLimiter
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Frames per callback
+# WHY: ~12 ms at 44.1 kHz - seek/gain latency stays below perception while
+#      the per-block Python overhead is still negligible
+DEFAULT_BLOCKSIZE = 512
+
+# Frames per kernel pass in offline mixing
+# WHY: One chunk of every stem plus the accumulator stays cache-resident, and
+#      the scratch buffer is bounded regardless of track length
+MIX_CHUNK_FRAMES = 1 << 16
+
+# Factory signature: (sample_rate, channels, blocksize, callback) -> stream
+StreamFactory = Callable[[int, int, int, Callable], Any]
+
+
+class _Region(NamedTuple):
+    """Play request handed to the callback (immutable, swapped by reference)"""
+
+    serial: int
+    position: int
+    end: int
+    loop_start: Optional[int]  # None = play once
+    fade_in: Optional[np.ndarray]  # Crossfade curves (loop only)
+    fade_out: Optional[np.ndarray]
+
+
+class _ReadAhead(NamedTuple):
+    """RAM copies of [start, end) of every stem (immutable, swapped by reference)"""
+
+    source: Tuple[np.ndarray, ...]  # Stems the copies were taken from
+    start: int
+    end: int
+    blocks: Tuple[np.ndarray, ...]  # (channels, <= end - start) per stem
+
+
+class _Clock(NamedTuple):
+    """Audio clock published by the callback once per block"""
+
+    position: int  # Stem sample carried by the block's first output frame
+    dac_time: Optional[float]  # When that frame is heard (stream clock), if known
+    frames: int  # Frames output since the stream was created
+
+
+def crossfade_curves(length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Equal-power crossfade curves.
+
+    Args:
+        length: Crossfade length in samples
+
+    Returns:
+        (fade_in, fade_out) float32 arrays of shape (length, 1)
+    """
+    phase = (np.arange(length, dtype=np.float64) + 0.5) / length * (np.pi / 2)
+    fade_in = np.sin(phase).astype(np.float32)[:, None]
+    fade_out = np.cos(phase).astype(np.float32)[:, None]
+    return fade_in, fade_out
+
+
+def sounddevice_stream_factory(sd_module) -> StreamFactory:
+    """
+    Create a factory for sounddevice.OutputStream.
+
+    Args:
+        sd_module: Imported sounddevice module
+
+    Returns:
+        StreamFactory opening float32 low-latency output streams
+    """
+    def factory(sample_rate: int, channels: int, blocksize: int, callback: Callable):
+        return sd_module.OutputStream(
+            samplerate=sample_rate,
+            channels=channels,
+            blocksize=blocksize,
+            dtype="float32",
+            latency="low",
+            callback=callback,
+        )
+
+    return factory
+
+
+# ============================================================================
+# Streaming Mixer
+# ============================================================================
+
+class StreamingMixer:
+    """
+    Real-time stem mixer driven by an output stream callback.
+
+    Features:
+    - Mixes one block at a time from preloaded stems (no full-track buffers)
+    - Lock-free gains and seek (reference swaps read by the callback)
+    - One stream reused across play/stop/seek
+    - Gapless sample-accurate looping with optional micro-crossfade
+    - Optional look-ahead limiter; output hard-clipped to [-1, 1]
+    - Optional read-ahead of every stem, so toggles never wait on disk
+    - Signals the end of a play-once range (finished_callback)
+
+    Note:
+        The callback runs on the audio thread: it only slices, multiplies and
+        adds into preallocated buffers, and never logs or blocks.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 2,
+        blocksize: int = DEFAULT_BLOCKSIZE,
+        stream_factory: Optional[StreamFactory] = None,
+        limiter: Optional[LookaheadLimiter] = None,
+        read_ahead_seconds: float = 0.0,
+        finished_callback: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize mixer.
+
+        Args:
+            sample_rate: Output sample rate
+            channels: Output channels (stems must have this many channels)
+            blocksize: Frames per callback
+            stream_factory: Creates the output stream (default: sounddevice,
+                            imported on first use)
+            limiter: Applied to every block before clipping (adds its
+                     latency to the output)
+            read_ahead_seconds: Seconds of every stem kept in RAM ahead of
+                                the play position (0 = read stems directly)
+            finished_callback: Called (from a watcher thread) once a play-once
+                               range has been rendered and the output drained
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self._stream_factory = stream_factory
+        self._stream = None
+        self.limiter = limiter
+        self.read_ahead_seconds = read_ahead_seconds
+        self.finished_callback = finished_callback
+
+        # Shared with the callback (replaced, never mutated in place)
+        # WHY: Stems and gains live in one tuple so a stem joining the mix
+        #      (progressive loading) can never be paired with a stale gain
+        self._layers: Tuple[Tuple[np.ndarray, ...], np.ndarray] = (
+            (), np.zeros(0, dtype=np.float32)
+        )
+        self._seek: Optional[_Region] = None
+        self._seek_serial = itertools.count(1)
+
+        # Owned by the callback
+        self._region = _Region(0, 0, 0, None, None, None)
+        self._position = 0
+        self._clock = _Clock(0, None, 0)
+
+        # Read-ahead (filled by a background thread, read by the callback)
+        self._ahead: Optional[_ReadAhead] = None
+        self._ahead_thread: Optional[threading.Thread] = None
+        self._ahead_wake = threading.Event()
+        self._ahead_stop = threading.Event()
+
+        # Completion (set by the callback, acted on by a watcher thread)
+        self._tail_frames = 0  # Frames output past the end of the range
+        self._finished_serial = 0  # Region whose completion was signalled
+        self._finished = threading.Event()
+        self._finished_thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._scratch = np.zeros((blocksize, channels), dtype=np.float32)
+        self._fade_buffer = np.zeros((blocksize, channels), dtype=np.float32)
+
+        # Diagnostics
+        self.xruns = 0
+        self.blocks_mixed = 0
+        self.loop_count = 0
+        self.read_ahead_hits = 0  # Segments mixed from the read-ahead
+        self.read_ahead_misses = 0  # Segments read from the stems directly
+
+    # ------------------------------------------------------------------------
+    # Control (any thread)
+    # ------------------------------------------------------------------------
+
+    @property
+    def position(self) -> int:
+        """Next sample the callback will read (updated once per block)"""
+        return self._position
+
+    def playback_position(self, now: Optional[float] = None) -> int:
+        """
+        Stem sample being heard now, from the audio clock.
+
+        A pending seek is reported immediately. Otherwise the position of the
+        last rendered block is advanced by the stream time elapsed since its
+        DAC time (at most one block), then wrapped like the callback wraps.
+
+        Args:
+            now: Current stream time (default: the stream's clock, if any)
+
+        Returns:
+            Position in samples
+        """
+        seek = self._seek
+        if seek is not None:
+            return seek.position
+
+        clock = self._clock
+        region = self._region
+        position = clock.position
+
+        if clock.dac_time:
+            if now is None:
+                now = getattr(self._stream, "time", None)
+            if now:
+                elapsed = round((now - clock.dac_time) * self.sample_rate)
+                position += max(-self.blocksize, min(elapsed, self.blocksize))
+
+        loop_start, end = region.loop_start, region.end
+        if loop_start is not None and end > loop_start and position >= end:
+            position = loop_start + (position - loop_start) % (end - loop_start)
+        return max(0, min(position, end))
+
+    @property
+    def frames_output(self) -> int:
+        """Frames handed to the device since the stream was created"""
+        return self._clock.frames
+
+    @property
+    def is_active(self) -> bool:
+        """True while the output stream is running"""
+        return self._stream is not None and bool(self._stream.active)
+
+    @property
+    def is_finished(self) -> bool:
+        """True once the play range has been fully rendered (never for loops)"""
+        region = self._region
+        return (
+            self._seek is None
+            and region.loop_start is None
+            and self._position >= region.end
+        )
+
+    def set_stems(
+        self,
+        stems: Sequence[np.ndarray],
+        sample_rate: Optional[int] = None,
+        gains: Optional[Sequence[float]] = None
+    ):
+        """
+        Set the preloaded stems (safe while playing).
+
+        Args:
+            stems: Arrays of shape (channels, samples), float32 (may be
+                   memory-mapped; shorter stems read as silence past their end)
+            sample_rate: New sample rate (reopens the stream if it changed)
+            gains: Gain per stem (default: unity)
+        """
+        if sample_rate is not None and sample_rate != self.sample_rate:
+            self.close()
+            self.sample_rate = sample_rate
+            if self.limiter is not None:
+                self.limiter = self.limiter.for_sample_rate(sample_rate)
+
+        stems = tuple(stems)
+        if gains is None:
+            gains = np.ones(len(stems), dtype=np.float32)
+        self._layers = (stems, np.array(gains, dtype=np.float32))
+        self._ahead_wake.set()
+
+    def set_gains(self, gains: Sequence[float]):
+        """
+        Set the per-stem gains (mute/solo/volume/master already applied).
+
+        Args:
+            gains: One linear gain per stem, in set_stems() order
+        """
+        # WHY: A new tuple per change - the callback may be reading the old one
+        self._layers = (self._layers[0], np.array(gains, dtype=np.float32))
+
+    def play(
+        self,
+        start_sample: int,
+        end_sample: int,
+        loop: bool = False,
+        loop_start: Optional[int] = None,
+        crossfade: int = 0
+    ):
+        """
+        Play [start_sample, end_sample) of the stems.
+
+        Starts the stream if needed; while running this is a seek that also
+        moves the end point.
+
+        Args:
+            start_sample: First sample to play
+            end_sample: Sample after the last one to play
+            loop: Wrap to loop_start at end_sample, forever
+            loop_start: Loop start (default: start_sample)
+            crossfade: Loop crossfade length in samples (0 = hard wrap)
+        """
+        start_sample, end_sample = int(start_sample), int(end_sample)
+        fade_in = fade_out = None
+
+        if loop:
+            loop_start = start_sample if loop_start is None else int(loop_start)
+            crossfade = max(0, min(int(crossfade), end_sample - loop_start))
+            if crossfade:
+                fade_in, fade_out = crossfade_curves(crossfade)
+        else:
+            loop_start = None
+
+        self._seek = _Region(
+            next(self._seek_serial), start_sample, end_sample,
+            loop_start, fade_in, fade_out
+        )
+
+        if self._stream is None:
+            factory = self._stream_factory or self._default_stream_factory()
+            self._stream = factory(self.sample_rate, self.channels, self.blocksize, self._callback)
+
+        if not self._stream.active:
+            # Callback is idle: drop audio left in the limiter's delay line
+            if self.limiter is not None:
+                self.limiter.reset()
+            self._stream.start()
+
+        self._start_read_ahead()
+        self._start_finished_watcher()
+
+    def seek(self, sample: int):
+        """
+        Move the read position (takes effect at the next block).
+
+        Args:
+            sample: New position in samples
+        """
+        region = self._seek or self._region
+        self._seek = region._replace(
+            serial=next(self._seek_serial), position=int(sample)
+        )
+        self._ahead_wake.set()
+
+    def stop(self):
+        """Stop the stream (kept open for the next play)"""
+        if self._stream is not None and self._stream.active:
+            self._stream.stop()
+
+    def close(self):
+        """Stop and release the stream (and the read-ahead/watcher threads)"""
+        thread, self._ahead_thread = self._ahead_thread, None
+        if thread is not None:
+            self._ahead_stop.set()
+            self._ahead_wake.set()
+            thread.join(timeout=1.0)
+        self._ahead = None
+
+        thread, self._finished_thread = self._finished_thread, None
+        if thread is not None:
+            self._closing = True
+            self._finished.set()
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing output stream: {e}")
+
+    @staticmethod
+    def _default_stream_factory() -> StreamFactory:
+        import sounddevice as sd
+
+        return sounddevice_stream_factory(sd)
+
+    # ------------------------------------------------------------------------
+    # Completion (watcher thread)
+    # ------------------------------------------------------------------------
+
+    def _start_finished_watcher(self):
+        """Start the completion watcher once (no-op without finished_callback)"""
+        if self.finished_callback is None or self._finished_thread is not None:
+            return
+        self._closing = False
+        self._finished_thread = threading.Thread(
+            target=self._finished_loop, name="mixer-finished", daemon=True
+        )
+        self._finished_thread.start()
+
+    def _finished_loop(self):
+        """Call finished_callback each time the callback signals completion"""
+        while True:
+            self._finished.wait()
+            self._finished.clear()
+            if self._closing:
+                break
+            # WHY: A seek or play() after the signal (but before this thread
+            #      ran) restarted playback; the old completion no longer holds
+            if not self.is_finished:
+                continue
+            try:
+                self.finished_callback()
+            except Exception as e:
+                logger.error(f"Error in mixer finished_callback: {e}", exc_info=True)
+
+    # ------------------------------------------------------------------------
+    # Read-ahead (background thread)
+    # ------------------------------------------------------------------------
+
+    def _start_read_ahead(self):
+        """Start the read-ahead thread once (no-op when disabled)"""
+        if self.read_ahead_seconds <= 0 or self._ahead_thread is not None:
+            return
+        self._ahead_stop.clear()
+        self._ahead_thread = threading.Thread(
+            target=self._read_ahead_loop, name="mixer-read-ahead", daemon=True
+        )
+        self._ahead_thread.start()
+
+    def _read_ahead_loop(self):
+        """Keep the window filled; wakes on seek/play/stems or every quarter window"""
+        interval = self.read_ahead_seconds / 4
+        while not self._ahead_stop.is_set():
+            self._ahead_wake.wait(interval)
+            self._ahead_wake.clear()
+            if self._ahead_stop.is_set():
+                break
+            try:
+                self.refill_read_ahead()
+            except Exception as e:
+                # WHY: The callback falls back to direct reads; never let a
+                #      read error kill the thread
+                logger.debug(f"Read-ahead refill failed: {e}")
+
+    def refill_read_ahead(self) -> bool:
+        """
+        Copy the next read_ahead_seconds of every stem if the window runs low.
+
+        The window is renewed once less than half of it lies ahead of the
+        play position. A loop that fits in the window is copied whole, so it
+        wraps inside the window.
+
+        Returns:
+            True if a new window was published
+        """
+        stems = self._layers[0]
+        region = self._seek or self._region
+        position = region.position if self._seek is not None else self._position
+        window = int(self.read_ahead_seconds * self.sample_rate)
+        if window <= 0 or not stems:
+            return False
+
+        loop_start = region.loop_start
+        if (
+            loop_start is not None
+            and loop_start <= position
+            and 0 < region.end - loop_start <= window
+        ):
+            # Include the crossfade pre-roll that precedes loop_start
+            preroll = len(region.fade_in) if region.fade_in is not None else 0
+            start, end = max(0, loop_start - preroll), region.end
+            needed = end
+        else:
+            start, end = position, min(position + window, region.end)
+            needed = min(position + window // 2, region.end)
+
+        ahead = self._ahead
+        if (
+            ahead is not None and ahead.source is stems
+            and ahead.start <= position and needed <= ahead.end
+        ):
+            return False
+        if end <= start:
+            return False
+
+        # np.array copies: pages are faulted in here, not in the callback
+        blocks = tuple(np.array(stem[:, start:end]) for stem in stems)
+        self._ahead = _ReadAhead(stems, start, end, blocks)
+        return True
+
+    # ------------------------------------------------------------------------
+    # Audio thread
+    # ------------------------------------------------------------------------
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info, status):
+        """Render one block (sounddevice callback signature)"""
+        if status:
+            self.xruns += 1
+
+        seek = self._seek
+        if seek is not None and seek.serial != self._region.serial:
+            self._region = seek
+            self._position = seek.position
+            self._tail_frames = 0
+            if self._seek is seek:
+                self._seek = None
+
+        position = self._position
+        rendered = self.render(outdata, frames)
+
+        # WHY: One tuple store - readers never see a position from one block
+        #      paired with the timestamp of another
+        dac_time = getattr(time_info, "outputBufferDacTime", None)
+        if self.limiter is not None:
+            # The limiter delays the output; the frame heard first is older
+            position = self._unwrap(position - self.limiter.latency)
+        self._clock = _Clock(position, dac_time, self._clock.frames + frames)
+
+        region = self._region
+        if (
+            region.loop_start is None
+            and self._position >= region.end
+            and self._finished_serial != region.serial
+        ):
+            # Done once the limiter's delay line has been flushed with silence
+            self._tail_frames += frames - rendered
+            latency = self.limiter.latency if self.limiter is not None else 0
+            if self._tail_frames >= latency:
+                self._finished_serial = region.serial
+                self._finished.set()
+
+    def render(self, outdata: np.ndarray, frames: int) -> int:
+        """
+        Mix the next block into outdata and advance the position.
+
+        Args:
+            outdata: Output block (frames, channels), overwritten
+            frames: Frames to render
+
+        Returns:
+            Frames taken from the play range (the rest is silence)
+        """
+        region = self._region
+        end, loop_start = region.end, region.loop_start
+        fade_len = len(region.fade_in) if region.fade_in is not None else 0
+        fade_from = end - fade_len
+        position = self._position
+
+        if len(self._scratch) < frames:
+            self._scratch = np.zeros((frames, self.channels), dtype=np.float32)
+            self._fade_buffer = np.zeros((frames, self.channels), dtype=np.float32)
+
+        outdata.fill(0)
+        offset = 0
+        while offset < frames:
+            if position >= end:
+                if loop_start is None or loop_start >= end:
+                    break
+                # WHY: Wrapping here (not by restarting the stream) is what
+                #      makes the loop gapless and sample-accurate
+                position = loop_start
+                self.loop_count += 1
+
+            count = min(frames - offset, end - position)
+            out = outdata[offset:offset + count]
+
+            if fade_len and position >= fade_from:
+                self._mix_crossfade(out, position, count, region, position - fade_from)
+            else:
+                if fade_len:
+                    count = min(count, fade_from - position)
+                    out = outdata[offset:offset + count]
+                self._mix_add(out, position, count)
+
+            position += count
+            offset += count
+
+        if self.limiter is not None:
+            # WHY: Whole block, including silence past the end, so the delay
+            #      line drains instead of holding the last few milliseconds
+            outdata[:frames] = self.limiter.process(outdata[:frames].T).T
+
+        if offset:
+            np.clip(outdata[:offset], -1.0, 1.0, out=outdata[:offset])
+            self.blocks_mixed += 1
+
+        self._position = position
+        return offset
+
+    def _unwrap(self, position: int) -> int:
+        """Map a position before loop_start back into the loop tail"""
+        region = self._region
+        loop_start, end = region.loop_start, region.end
+        if (
+            loop_start is not None and self.loop_count
+            and end > loop_start and position < loop_start
+        ):
+            return end - (loop_start - position) % (end - loop_start)
+        return max(0, position)
+
+    def _mix_add(self, out: np.ndarray, position: int, count: int):
+        """Add the gain-weighted stems [position, position + count) into out"""
+        stems, gains = self._layers
+        ahead = self._ahead
+        if ahead is not None:
+            # Same stems and fully inside the window: mix the RAM copies
+            if (
+                ahead.source is stems
+                and ahead.start <= position
+                and position + count <= ahead.end
+            ):
+                stems = ahead.blocks
+                position -= ahead.start
+                self.read_ahead_hits += 1
+            else:
+                self.read_ahead_misses += 1
+        # (frames, channels) buffers viewed as (channels, frames) for the kernel
+        mix_stems_into(out.T, stems, gains, position, self._scratch[:count].T)
+
+    def _mix_crossfade(
+        self,
+        out: np.ndarray,
+        position: int,
+        count: int,
+        region: _Region,
+        fade_offset: int
+    ):
+        """Blend the loop tail (fading out) with the pre-roll (fading in)"""
+        fade = slice(fade_offset, fade_offset + count)
+        buffer = self._fade_buffer[:count]
+
+        buffer.fill(0)
+        self._mix_add(buffer, position, count)
+        buffer *= region.fade_out[fade]
+        out += buffer
+
+        # Pre-roll before sample 0 is silence
+        preroll = region.loop_start - len(region.fade_in) + fade_offset
+        skip = min(count, max(0, -preroll))
+        if skip < count:
+            buffer.fill(0)
+            self._mix_add(buffer[skip:], preroll + skip, count - skip)
+            buffer *= region.fade_in[fade]
+            out += buffer
+
+
+# ============================================================================
+# Mixing Kernel
+# ============================================================================
+
+def mix_stems_into(
+    out: np.ndarray,
+    stems: Sequence[np.ndarray],
+    gains: Sequence[float],
+    start: int,
+    scratch: np.ndarray,
+    track_peak: bool = False
+) -> float:
+    """
+    Accumulate gain-weighted stems into out, in place.
+
+    Shared by the real-time callback and offline mixing (export). Each stem
+    slice is scaled into scratch with np.multiply(out=) and added in place, so
+    there is no temporary per stem; work is done in scratch-sized chunks.
+
+    Args:
+        out: Accumulator (channels, frames), added to (not cleared)
+        stems: (channels, samples) arrays or views; samples past a stem's end
+               count as silence
+        gains: Linear gain per stem (0.0 stems are skipped)
+        start: Stem sample aligned with out[:, 0]
+        scratch: Work buffer (channels, chunk_frames), any chunk size >= 1
+        track_peak: Also return max |out| (taken per chunk while it is hot)
+
+    Returns:
+        Peak absolute value of out if track_peak, else 0.0
+    """
+    frames = out.shape[1]
+    step = scratch.shape[1]
+    peak = 0.0
+
+    for offset in range(0, frames, step):
+        count = min(step, frames - offset)
+        dest = out[:, offset:offset + count]
+        position = start + offset
+
+        for stem, gain in zip(stems, gains):
+            # Stems may be shorter than the track (virtual zero padding)
+            available = min(count, stem.shape[1] - position)
+            if gain == 0.0 or available <= 0:
+                continue
+            buffer = scratch[:, :available]
+            np.multiply(stem[:, position:position + available], gain, out=buffer)
+            dest[:, :available] += buffer
+
+        if track_peak:
+            # Peak without an abs() temporary: max(|x|) == max(max(x), -min(x))
+            peak = max(peak, float(dest.max()), -float(dest.min()))
+
+    return peak
+
+
+def iter_mix_blocks(
+    stems: Sequence[np.ndarray],
+    gains: Sequence[float],
+    start: int,
+    end: int,
+    channels: int = 2,
+    block_frames: int = MIX_CHUNK_FRAMES
+) -> Iterator[np.ndarray]:
+    """
+    Mix [start, end) block by block, for streaming consumers (export).
+
+    Args:
+        stems: (channels, samples) arrays or views
+        gains: Linear gain per stem
+        start: First sample
+        end: Sample after the last one
+        channels: Output channels
+        block_frames: Frames per yielded block
+
+    Yields:
+        New mixed blocks (channels, <= block_frames) float32, unlimited
+    """
+    scratch = np.empty((channels, max(1, min(end - start, block_frames))), dtype=np.float32)
+    for position in range(start, end, block_frames):
+        block = np.zeros((channels, min(block_frames, end - position)), dtype=np.float32)
+        mix_stems_into(block, stems, gains, position, scratch)
+        yield block
+
+
+def mix_stems(
+    stems: Sequence[np.ndarray],
+    gains: Sequence[float],
+    start: int,
+    end: int,
+    sample_rate: int,
+    channels: int = 2
+) -> np.ndarray:
+    """
+    Offline mix of [start, end), peak limited.
+
+    The mix is accumulated in place, then run through a LookaheadLimiter
+    chunk by chunk, writing back into the same buffer (latency compensated),
+    so gain reduction is local to the peaks that need it.
+
+    Args:
+        stems: (channels, samples) arrays or views
+        gains: Linear gain per stem
+        start: First sample
+        end: Sample after the last one
+        sample_rate: Sample rate (sets the limiter time constants)
+        channels: Output channels
+
+    Returns:
+        Mixed audio (channels, end - start) float32
+    """
+    frames = max(0, end - start)
+    mixed = np.zeros((channels, frames), dtype=np.float32)
+    scratch = np.empty((channels, max(1, min(frames, MIX_CHUNK_FRAMES))), dtype=np.float32)
+
+    peak = mix_stems_into(mixed, stems, gains, start, scratch, track_peak=True)
+    limiter = LookaheadLimiter(sample_rate, channels)
+    if peak <= limiter.ceiling:
+        return mixed
+
+    # WHY: Output lags input by the limiter latency, so each limited block
+    #      lands on frames that have already been read into the delay line
+    chunks = (mixed[:, i:i + MIX_CHUNK_FRAMES] for i in range(0, frames, MIX_CHUNK_FRAMES))
+    offset = 0
+    for block in limiter.process_stream(chunks):
+        mixed[:, offset:offset + block.shape[1]] = block
+        offset += block.shape[1]
+
+    return mixed
+
+
+def compute_stem_gains(
+    settings: Sequence[Any],
+    master_volume: float = 1.0
+) -> List[float]:
+    """
+    Effective linear gain per stem from mute/solo/volume settings.
+
+    Args:
+        settings: Objects with volume, is_muted and is_solo (StemSettings)
+        master_volume: Master gain applied to every stem
+
+    Returns:
+        Gains in the order of settings (0.0 for muted / not soloed stems)
+    """
+    any_solo = any(s.is_solo for s in settings)
+    return [
+        0.0 if s.is_muted or (any_solo and not s.is_solo) else s.volume * master_volume
+        for s in settings
+    ]
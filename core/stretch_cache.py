@@ -8,13 +8,25 @@ CONTEXT: Used by BackgroundStretchManager to store results.
          Prevents re-processing when user previews loops or exports.
 
 ALGORITHM: LRU (Least Recently Used) eviction
-           - Tracks access order
-           - Evicts oldest items when cache is full
-           - Efficient O(1) access with dict + list
+           - OrderedDict keeps entries in access order (oldest first)
+           - get/put: move_to_end() marks an entry as most recently used
+           - Eviction: popitem(last=False) drops the oldest entry
+           - All operations O(1), guarded by one lock (manager + UI threads)
+
+TWO TIERS:
+    RAM (StretchCache LRU)  →  miss  →  Disk (DiskStretchStore)  →  miss  →  stretch
+    - put() writes through to disk, so loops survive restarts and RAM eviction
+    - Disk entries are raw float32 .npy files, loaded memory-mapped on a hit
+    - Disk tier is size-bounded too (oldest files evicted first)
+    - Persistent keys (make_loop_cache_key) include the stem content hash,
+      loop bounds in samples, BPMs, quality preset and engine version, so a
+      changed stem or engine can never return a stale loop
 
 SIZE CALCULATION:
     Typical loop: 10 seconds, 44100 Hz, stereo, float32
     Size = 10s × 44100 Hz × 2 channels × 4 bytes = 3.5 MB
+    (entries are always stored as float32, float64 input is converted;
+     storage='int16' / 'int24' packs them to 1.8 MB / 2.6 MB)
 
     4 stems × 8 loops × 3.5 MB = ~112 MB per song
 
@@ -38,15 +50,356 @@ USAGE:
     >>> # Get statistics
     >>> stats = cache.get_stats()
     >>> print(f"Cache: {stats['size_mb']:.1f} MB, {stats['hit_rate']:.1%} hit rate")
+    >>>
+    >>> # Persistent two-tier cache
+    >>> cache = StretchCache(max_size_mb=500, disk_dir=STRETCH_CACHE_DIR)
+    >>> key = make_loop_cache_key(compute_content_hash(stem_path), 0, 88200, 44100,
+    ...                           104, 120, 'export', 'phase-vocoder:2')
 """
 
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import hashlib
+import os
+import tempfile
+import threading
 import numpy as np
 
 from utils.logger import get_logger
 
 logger = get_logger()
 
+# Default size of the disk tier (see config.STRETCH_DISK_CACHE_SIZE_MB)
+DEFAULT_DISK_CACHE_SIZE_MB = 2048
+
+
+# RAM tier storage formats
+STORAGE_FLOAT32 = 'float32'
+STORAGE_INT16 = 'int16'  # Half the memory, ~-96 dB quantisation (preview)
+STORAGE_INT24 = 'int24'  # 3/4 of the memory, ~-144 dB quantisation
+
+# Largest integer code per packed format
+_PACKED_FULL_SCALE = {
+    STORAGE_INT16: 32767,
+    STORAGE_INT24: 8388607,
+}
+
+
+# ============================================================================
+# Packed Storage
+# ============================================================================
+
+class PackedAudio:
+    """
+    Integer-packed audio with a per-entry scale factor.
+
+    The loop peak maps to full scale, so quiet loops keep their resolution.
+    int24 is stored as 3 little-endian bytes per sample. Decoding to float32
+    happens on access (decode()), never on insertion.
+    """
+
+    __slots__ = ('storage', 'shape', 'scale', 'data')
+
+    def __init__(self, audio: np.ndarray, storage: str):
+        """
+        Pack float audio.
+
+        Args:
+            audio: float32 audio array
+            storage: STORAGE_INT16 or STORAGE_INT24
+        """
+        full_scale = _PACKED_FULL_SCALE[storage]
+        peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+
+        self.storage = storage
+        self.shape = audio.shape
+        self.scale = (peak if peak > 0 else 1.0) / full_scale  # Value of one LSB
+
+        codes = np.rint(audio * np.float32(1.0 / self.scale))
+        np.clip(codes, -full_scale, full_scale, out=codes)
+
+        if storage == STORAGE_INT16:
+            self.data = codes.astype(np.int16)
+        else:
+            # Low three bytes of little-endian int32 (two's complement)
+            words = codes.astype('<i4').reshape(-1)
+            self.data = words.view(np.uint8).reshape(-1, 4)[:, :3].copy()
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def decode(self) -> np.ndarray:
+        """
+        Decode to a new float32 array.
+
+        Returns:
+            float32 audio with the original shape
+        """
+        if self.storage == STORAGE_INT16:
+            audio = self.data.astype(np.float32)
+        else:
+            words = np.empty((len(self.data), 4), dtype=np.uint8)
+            words[:, :3] = self.data
+            # Sign-extend bit 23 into the top byte
+            words[:, 3] = np.where(self.data[:, 2] & 0x80, 0xFF, 0)
+            audio = words.view('<i4').reshape(self.shape).astype(np.float32)
+
+        audio *= np.float32(self.scale)
+        return audio
+
+
+# ============================================================================
+# Cache Keys
+# ============================================================================
+
+_content_hash_lock = threading.Lock()
+_content_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def compute_content_hash(path: Union[str, Path]) -> str:
+    """
+    Hash the content of an audio file (memoized per path, size and mtime).
+
+    WHY: Keys must change when a stem is re-separated under the same file
+         name. Hashing a 50 MB stem takes ~0.1 s, so it is done once per
+         file version and process.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        32-character hex digest (BLAKE2b-128)
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+
+    with _content_hash_lock:
+        cached = _content_hashes.get(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    content_hash = digest.hexdigest()
+
+    with _content_hash_lock:
+        _content_hashes[memo_key] = content_hash
+    return content_hash
+
+
+def make_loop_cache_key(
+    content_hash: str,
+    start_sample: int,
+    end_sample: int,
+    sample_rate: int,
+    source_bpm: float,
+    target_bpm: float,
+    quality_preset: str,
+    engine_version: str
+) -> str:
+    """
+    Build a persistent cache key for one stretched loop.
+
+    Args:
+        content_hash: Stem content hash (compute_content_hash)
+        start_sample: Loop start in samples (at sample_rate)
+        end_sample: Loop end in samples (at sample_rate)
+        sample_rate: Sample rate of the stem
+        source_bpm: Original BPM
+        target_bpm: Target BPM
+        quality_preset: Stretch quality preset
+        engine_version: Engine name and version (e.g., 'phase-vocoder:2')
+
+    Returns:
+        Key string
+
+    Example:
+        >>> make_loop_cache_key('ab12', 0, 88200, 44100, 104, 120, 'export', 'phase-vocoder:2')
+        'ab12:0-88200@44100:104->120:export:phase-vocoder:2'
+    """
+    return (
+        f"{content_hash}:{int(start_sample)}-{int(end_sample)}@{int(sample_rate)}:"
+        f"{float(source_bpm):g}->{float(target_bpm):g}:{quality_preset}:{engine_version}"
+    )
+
+
+# ============================================================================
+# Disk Tier
+# ============================================================================
+
+class DiskStretchStore:
+    """
+    Size-bounded on-disk store of float32 loops (one .npy file per key).
+
+    Features:
+    - Raw float32 .npy files, returned memory-mapped (read-only) on get()
+    - Atomic writes (temp file + os.replace), safe for concurrent processes
+    - LRU eviction by last use (file mtime, refreshed on every hit)
+    - File names are hashes of the key (any key string is safe)
+    """
+
+    SUFFIX = ".npy"
+
+    def __init__(self, directory: Union[str, Path], max_size_mb: int = DEFAULT_DISK_CACHE_SIZE_MB):
+        """
+        Initialize disk store (indexes existing files).
+
+        Args:
+            directory: Cache directory (created if missing)
+            max_size_mb: Maximum total size of cached files in megabytes
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+
+        self._lock = threading.Lock()
+        # File name → size in bytes, oldest first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.current_size_bytes = 0
+
+        # Statistics
+        self.evictions = 0
+
+        files = []
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime_ns, path.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self.current_size_bytes += size
+
+        logger.info(
+            f"Disk stretch cache: {self.directory} "
+            f"({len(self._entries)} loops, {self.current_size_bytes / (1024**2):.1f} MB)"
+        )
+
+    def _filename(self, key: str) -> str:
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest() + self.SUFFIX
+
+    def put(self, key: str, audio: np.ndarray) -> bool:
+        """
+        Store audio as float32 (replaces an existing entry).
+
+        Args:
+            key: Cache key
+            audio: Audio array
+
+        Returns:
+            True if stored (False if empty, larger than the store, or I/O failed)
+        """
+        data = np.ascontiguousarray(audio, dtype=np.float32)
+        if data.size == 0 or data.nbytes > self.max_size_bytes:
+            return False
+
+        name = self._filename(key)
+        path = self.directory / name
+
+        # Write outside the lock; only the rename is visible to readers
+        tmp_name = None
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, data, allow_pickle=False)
+            os.replace(tmp_name, path)
+            size = path.stat().st_size
+        except OSError as e:
+            logger.warning(f"Could not write stretch cache file {name}: {e}")
+            if tmp_name is not None and os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            return False
+
+        with self._lock:
+            self.current_size_bytes -= self._entries.pop(name, 0)
+            self._entries[name] = size
+            self.current_size_bytes += size
+            self._evict_locked()
+        return True
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Load audio memory-mapped (read-only).
+
+        Args:
+            key: Cache key
+
+        Returns:
+            float32 array backed by the file, or None if not stored
+        """
+        name = self._filename(key)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+
+        path = self.directory / name
+        try:
+            audio = np.load(path, mmap_mode='r', allow_pickle=False)
+            # Refresh last-use time for LRU order across restarts
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable stretch cache file {name}: {e}")
+            self._discard(name)
+            return None
+
+        return audio
+
+    def has(self, key: str) -> bool:
+        """Check if key is stored"""
+        with self._lock:
+            return self._filename(key) in self._entries
+
+    def remove(self, key: str) -> bool:
+        """Remove stored audio (True if it existed)"""
+        return self._discard(self._filename(key))
+
+    def clear(self):
+        """Delete all cached files"""
+        with self._lock:
+            names = list(self._entries)
+        for name in names:
+            self._discard(name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, name: str) -> bool:
+        with self._lock:
+            if name not in self._entries:
+                return False
+            self.current_size_bytes -= self._entries.pop(name)
+        try:
+            (self.directory / name).unlink()
+        except OSError:
+            pass
+        return True
+
+    def _evict_locked(self):
+        """Delete oldest files until within budget. Caller holds self._lock."""
+        while self.current_size_bytes > self.max_size_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self.current_size_bytes -= size
+            self.evictions += 1
+            try:
+                (self.directory / name).unlink()
+            except OSError:
+                # Still mapped elsewhere (Windows): retried on next start
+                pass
+            logger.debug(f"Evicted disk cache file: {name} ({size / (1024**2):.2f} MB)")
+
+
+# ============================================================================
+# Two-Tier Cache
+# ============================================================================
+
 
 class StretchCache:
     """
@@ -54,12 +407,25 @@ class StretchCache:
 
     Features:
     - Size-based eviction (MB limit)
-    - LRU (Least Recently Used) algorithm
+    - LRU (Least Recently Used) algorithm, O(1) per access
     - Memory estimation for numpy arrays
     - Statistics tracking (hits, misses, hit rate)
+    - Optional persistent disk tier (write-through, promoted to RAM on hit)
+    - Entries normalised to float32 C-contiguous, optionally packed to
+      int16/int24 with a per-entry scale (decoded on get)
+
+    Thread-safety:
+        All public methods take the same lock, so stretch results can be
+        stored from the manager while the UI reads loops for playback.
     """
 
-    def __init__(self, max_size_mb: int = 500):
+    def __init__(
+        self,
+        max_size_mb: int = 500,
+        disk_dir: Optional[Union[str, Path]] = None,
+        disk_max_size_mb: int = DEFAULT_DISK_CACHE_SIZE_MB,
+        storage: str = STORAGE_FLOAT32
+    ):
         """
         Initialize stretch cache.
 
@@ -67,30 +433,46 @@ class StretchCache:
             max_size_mb: Maximum cache size in megabytes
                         Default: 500 MB (~4-5 songs)
                         Minimum: 200 MB (~2 songs)
+            disk_dir: Directory of the persistent disk tier (None = RAM only)
+            disk_max_size_mb: Maximum size of the disk tier in megabytes
+            storage: RAM representation: STORAGE_FLOAT32 (default, lossless),
+                     STORAGE_INT24 or STORAGE_INT16 (preview quality,
+                     1.3× / 2× more loops per MB). The disk tier is float32.
 
         Example:
             >>> cache = StretchCache(max_size_mb=500)
             >>> # Can store ~140 loops (4 stems × 8 loops × ~4 songs)
         """
 
+        if storage not in (STORAGE_FLOAT32, STORAGE_INT16, STORAGE_INT24):
+            raise ValueError(f"Unsupported cache storage: {storage}")
+
         self.max_size_bytes = max_size_mb * 1024 * 1024
-        self.cache: Dict[str, np.ndarray] = {}
-        self.access_order: List[str] = []  # LRU tracking
+        self.storage = storage
+        # Insertion order = LRU order (first = least recently used)
+        self.cache: "OrderedDict[str, Union[np.ndarray, PackedAudio]]" = OrderedDict()
         self.current_size_bytes = 0
+        self._lock = threading.RLock()
+
+        # Second tier (survives restarts and RAM eviction)
+        self.disk: Optional[DiskStretchStore] = (
+            DiskStretchStore(disk_dir, disk_max_size_mb) if disk_dir is not None else None
+        )
 
         # Statistics
         self.hits = 0
+        self.disk_hits = 0
         self.misses = 0
         self.evictions = 0
 
         logger.info(f"StretchCache initialized: max size = {max_size_mb} MB")
 
-    def _estimate_size(self, audio: np.ndarray) -> int:
+    def _estimate_size(self, audio: Union[np.ndarray, PackedAudio]) -> int:
         """
-        Estimate memory size of audio array in bytes.
+        Estimate memory size of a cache entry in bytes.
 
         Args:
-            audio: Audio numpy array
+            audio: Audio numpy array or PackedAudio
 
         Returns:
             Size in bytes
@@ -103,42 +485,57 @@ class StretchCache:
 
         return audio.nbytes
 
-    def put(self, key: str, audio: np.ndarray):
+    def put(self, key: str, audio: np.ndarray, persist: bool = True):
         """
         Add audio to cache.
 
         If cache is full, evicts least recently used items until
-        there is enough space.
+        there is enough space. With a disk tier, the loop is also
+        written to disk (evicted RAM entries stay available there).
 
         Args:
-            key: Cache key (e.g., 'drums_0_120')
+            key: Cache key (e.g., 'drums_0_120' or make_loop_cache_key(...))
             audio: Audio array to cache
+            persist: Also write to the disk tier (if configured)
 
         Example:
             >>> cache.put('drums_0_120', stretched_audio)
         """
 
+        self._put_ram(key, audio)
+
+        if persist and self.disk is not None:
+            self.disk.put(key, audio)
+
+    def _pack(self, audio: np.ndarray) -> Union[np.ndarray, PackedAudio]:
+        """
+        Convert audio to the RAM storage format.
+
+        WHY: Engines and sf.read may return float64 or strided arrays;
+             float32 C-contiguous halves float64 memory and is what the
+             player and writers consume without another conversion.
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        if self.storage == STORAGE_FLOAT32:
+            return audio
+        return PackedAudio(audio, self.storage)
+
+    def _put_ram(self, key: str, audio: np.ndarray):
+        """Insert into the RAM tier (evicting LRU entries)"""
+
+        audio = self._pack(audio)
         audio_size = self._estimate_size(audio)
 
-        # Check if key already exists
-        if key in self.cache:
-            # Update existing entry
-            old_size = self._estimate_size(self.cache[key])
-            self.current_size_bytes -= old_size
-
-            # Update access order
-            if key in self.access_order:
-                self.access_order.remove(key)
-
-        # Evict if necessary
-        while (
-            self.current_size_bytes + audio_size > self.max_size_bytes
-            and self.access_order
-        ):
-            # Evict LRU item
-            lru_key = self.access_order.pop(0)
-            if lru_key in self.cache:
-                evicted_audio = self.cache.pop(lru_key)
+        with self._lock:
+            # Replace existing entry
+            old_audio = self.cache.pop(key, None)
+            if old_audio is not None:
+                self.current_size_bytes -= self._estimate_size(old_audio)
+
+            # Evict if necessary
+            while self.current_size_bytes + audio_size > self.max_size_bytes and self.cache:
+                # Evict LRU item
+                lru_key, evicted_audio = self.cache.popitem(last=False)
                 evicted_size = self._estimate_size(evicted_audio)
                 self.current_size_bytes -= evicted_size
                 self.evictions += 1
@@ -147,27 +544,29 @@ class StretchCache:
                     f"Evicted LRU item: {lru_key} ({evicted_size / (1024**2):.2f} MB)"
                 )
 
-        # Add to cache
-        self.cache[key] = audio
-        self.access_order.append(key)
-        self.current_size_bytes += audio_size
+            # Add to cache (most recently used)
+            self.cache[key] = audio
+            self.current_size_bytes += audio_size
 
-        logger.debug(
-            f"Cached: {key} ({audio_size / (1024**2):.2f} MB), "
-            f"total: {self.current_size_bytes / (1024**2):.1f} MB"
-        )
+            logger.debug(
+                f"Cached: {key} ({audio_size / (1024**2):.2f} MB), "
+                f"total: {self.current_size_bytes / (1024**2):.1f} MB"
+            )
 
     def get(self, key: str) -> Optional[np.ndarray]:
         """
         Get audio from cache.
 
-        Updates LRU order (marks as recently used).
+        Updates LRU order (marks as recently used). A RAM miss falls back
+        to the disk tier; disk hits are promoted to RAM (memory-mapped,
+        read-only).
 
         Args:
             key: Cache key
 
         Returns:
-            Audio array or None if not in cache
+            float32 audio array (decoded copy for packed storage),
+            or None if not in cache
 
         Example:
             >>> audio = cache.get('drums_0_120')
@@ -175,17 +574,28 @@ class StretchCache:
             ...     play(audio)
         """
 
-        if key in self.cache:
-            # Update LRU order
-            if key in self.access_order:
-                self.access_order.remove(key)
-            self.access_order.append(key)
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                # Update LRU order
+                self.cache.move_to_end(key)
+                self.hits += 1
+
+        if entry is not None:
+            # Packed entries are decoded lazily, outside the lock
+            return entry.decode() if isinstance(entry, PackedAudio) else entry
 
+        audio = self.disk.get(key) if self.disk is not None else None
+
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
             self.hits += 1
-            return self.cache[key]
-        else:
-            self.misses += 1
-            return None
+            self.disk_hits += 1
+
+        self._put_ram(key, audio)
+        return audio
 
     def has(self, key: str) -> bool:
         """
@@ -197,30 +607,39 @@ class StretchCache:
             key: Cache key
 
         Returns:
-            True if key is in cache
+            True if key is in RAM or on disk
 
         Example:
             >>> if cache.has('drums_0_120'):
             ...     audio = cache.get('drums_0_120')
         """
 
-        return key in self.cache
+        with self._lock:
+            if key in self.cache:
+                return True
+        return self.disk is not None and self.disk.has(key)
 
-    def clear(self):
+    def clear(self, include_disk: bool = False):
         """
-        Clear entire cache.
+        Clear entire cache (RAM tier; disk tier only if include_disk).
 
         Resets all statistics.
 
+        Args:
+            include_disk: Also delete the persistent disk tier
+
         Example:
             >>> cache.clear()
             >>> cache.get_stats()['item_count']
             0
         """
 
-        self.cache.clear()
-        self.access_order.clear()
-        self.current_size_bytes = 0
+        with self._lock:
+            self.cache.clear()
+            self.current_size_bytes = 0
+
+        if include_disk and self.disk is not None:
+            self.disk.clear()
 
         logger.info("Cache cleared")
 
@@ -239,18 +658,45 @@ class StretchCache:
             True
         """
 
-        if key in self.cache:
-            audio = self.cache.pop(key)
-            if key in self.access_order:
-                self.access_order.remove(key)
+        removed_disk = self.disk is not None and self.disk.remove(key)
+
+        with self._lock:
+            audio = self.cache.pop(key, None)
+            if audio is None:
+                return removed_disk
 
             removed_size = self._estimate_size(audio)
             self.current_size_bytes -= removed_size
 
-            logger.debug(f"Removed: {key} ({removed_size / (1024**2):.2f} MB)")
-            return True
+        logger.debug(f"Removed: {key} ({removed_size / (1024**2):.2f} MB)")
+        return True
 
-        return False
+    def replace(self, old_key: str, new_key: str, audio: np.ndarray, persist: bool = True):
+        """
+        Atomically replace one entry by another.
+
+        Used to swap a preview-quality loop for its export-quality upgrade:
+        a concurrent get() sees the old entry until the new one is in place.
+
+        Args:
+            old_key: Entry to drop (missing is fine)
+            new_key: Key of the replacement
+            audio: Replacement audio
+            persist: Also write the replacement to the disk tier (if configured)
+        """
+
+        if persist and self.disk is not None:
+            self.disk.put(new_key, audio)
+
+        with self._lock:
+            self._put_ram(new_key, audio)
+            if old_key != new_key:
+                old_audio = self.cache.pop(old_key, None)
+                if old_audio is not None:
+                    self.current_size_bytes -= self._estimate_size(old_audio)
+
+        if self.disk is not None and old_key != new_key:
+            self.disk.remove(old_key)
 
     def get_stats(self) -> dict:
         """
@@ -266,6 +712,10 @@ class StretchCache:
             - misses: Number of cache misses
             - hit_rate: Hit rate (0.0 to 1.0)
             - evictions: Number of items evicted
+            - storage: RAM storage format ('float32', 'int24' or 'int16')
+            - disk_hits: Hits served by the disk tier (included in hits)
+            - disk_size_mb: Size of the disk tier in MB (0 without disk tier)
+            - disk_item_count: Number of loops on disk
 
         Example:
             >>> stats = cache.get_stats()
@@ -275,10 +725,16 @@ class StretchCache:
             Hit rate: 85.3%
         """
 
-        total_accesses = self.hits + self.misses
-        hit_rate = self.hits / total_accesses if total_accesses > 0 else 0.0
+        with self._lock:
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+            disk_hits = self.disk_hits
+            current_size_bytes = self.current_size_bytes
+            item_count = len(self.cache)
+
+        total_accesses = hits + misses
+        hit_rate = hits / total_accesses if total_accesses > 0 else 0.0
 
-        size_mb = self.current_size_bytes / (1024 * 1024)
+        size_mb = current_size_bytes / (1024 * 1024)
         max_size_mb = self.max_size_bytes / (1024 * 1024)
         usage_percent = (size_mb / max_size_mb * 100) if max_size_mb > 0 else 0.0
 
@@ -286,16 +742,20 @@ class StretchCache:
             'size_mb': size_mb,
             'max_size_mb': max_size_mb,
             'usage_percent': usage_percent,
-            'item_count': len(self.cache),
-            'hits': self.hits,
-            'misses': self.misses,
+            'item_count': item_count,
+            'hits': hits,
+            'misses': misses,
             'hit_rate': hit_rate,
-            'evictions': self.evictions
+            'evictions': evictions,
+            'storage': self.storage,
+            'disk_hits': disk_hits,
+            'disk_size_mb': self.disk.current_size_bytes / (1024 * 1024) if self.disk else 0.0,
+            'disk_item_count': len(self.disk) if self.disk else 0
         }
 
     def get_keys(self) -> List[str]:
         """
-        Get list of all cached keys.
+        Get list of all keys cached in RAM.
 
         Returns:
             List of cache keys
@@ -305,7 +765,8 @@ class StretchCache:
             ['drums_0_120', 'drums_1_120', 'vocals_0_120', ...]
         """
 
-        return list(self.cache.keys())
+        with self._lock:
+            return list(self.cache.keys())
 
     def get_lru_order(self) -> List[str]:
         """
@@ -320,7 +781,8 @@ class StretchCache:
             # 'vocals_2_120' will be evicted first if cache is full
         """
 
-        return self.access_order.copy()
+        with self._lock:
+            return list(self.cache.keys())
 
 
 # ============================================================================
@@ -333,12 +795,18 @@ CACHE_SIZE_STANDARD = 300  # MB - for typical use
 CACHE_SIZE_SMALL = 200  # MB - for systems with limited RAM
 
 
-def create_cache(size_preset: str = 'standard') -> StretchCache:
+def create_cache(
+    size_preset: str = 'standard',
+    disk_dir: Optional[Union[str, Path]] = None,
+    storage: str = STORAGE_FLOAT32
+) -> StretchCache:
     """
     Create cache with preset size.
 
     Args:
         size_preset: 'small', 'standard', or 'large'
+        disk_dir: Directory of the persistent disk tier (None = RAM only)
+        storage: RAM storage format (STORAGE_FLOAT32, STORAGE_INT24, STORAGE_INT16)
 
     Returns:
         StretchCache instance
@@ -357,4 +825,4 @@ def create_cache(size_preset: str = 'standard') -> StretchCache:
 
     size_mb = size_map.get(size_preset, CACHE_SIZE_STANDARD)
 
-    return StretchCache(max_size_mb=size_mb)
+    return StretchCache(max_size_mb=size_mb, disk_dir=disk_dir, storage=storage)
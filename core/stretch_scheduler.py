@@ -0,0 +1,1024 @@
+"""
+Stretch Scheduler - Qt-independent process-pool time-stretching
+
+PURPOSE: Time-stretch loops of many stems on all CPU cores, without Qt, so the
+         same scheduler serves the GUI (BackgroundStretchManager) and the CLI.
+
+CONTEXT: Stretching used to run in one QThread per loop. Those threads mostly
+         waited on a Rubberband subprocess, an in-process engine (phase vocoder)
+         was serialised by the GIL, and every result was pickled through a Qt
+         signal. Worker processes scale with the core count, and audio travels
+         through shared memory instead of pipes.
+
+ARCHITECTURE:
+    submit_batch(tasks)
+         ↓
+    Pending heap (pass, priority, submission order)
+         ↑  set_hints(): selected / visible / playing loop re-key queued tasks
+         ↓  dispatcher thread: keeps at most max_workers jobs in flight
+         ↓  (the pool never holds queued work, so priorities stay effective)
+    Stem decoded once per batch → SharedMemory (float32)
+    Output SharedMemory preallocated per job (exact stretched lengths)
+         ↓
+    ProcessPoolExecutor (spawn, shared by all schedulers of the process)
+         ↓  worker attaches by name, stretches, writes in place, returns None
+    Done callback copies loops out, unlinks output memory (results are
+    also stored in the optional StretchCache; cached loops skip the pool)
+         ↓
+    on_task_completed(task, audio) / on_task_failed(task, error)
+    on_batch_finished()
+
+    Progressive mode (preview_quality set): every loop is queued twice. The
+    preview pass (fast engine) runs first for all loops, then the upgrade pass
+    re-stretches them at quality_preset; task.quality_preset tells callbacks
+    which pass a result belongs to. In the cache, an upgrade atomically
+    replaces its preview entry (StretchCache.replace).
+
+    Engines that support concatenation (Rubberband CLI) get up to
+    MAX_LOOPS_PER_JOB loops of one stem per job (see time_stretch_batch);
+    in-process engines get one loop per job for maximum parallelism.
+
+USAGE:
+    >>> scheduler = StretchScheduler(on_task_completed=lambda task, audio: ...)
+    >>> tasks = build_stretch_tasks(stem_files, loop_grid, 104, 120, focus_loop=3)
+    >>> scheduler.submit_batch(tasks)
+    >>> scheduler.set_hints(PlaybackHints(selected=5, visible=(4, 5, 6)))
+    >>> scheduler.wait()
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import atexit
+import heapq
+import itertools
+import multiprocessing
+import signal
+import threading
+
+import numpy as np
+import soundfile as sf
+
+from core.stretch_cache import StretchCache, compute_content_hash, make_loop_cache_key
+from core.time_stretcher import (
+    StretchQuality,
+    calculate_stretch_factor,
+    get_stretch_engine,
+    time_stretch_batch,
+)
+from utils.logger import get_logger
+from utils.loop_grid import LoopGrid, rescale_samples, seconds_to_samples
+
+logger = get_logger()
+
+# Loops of one stem stretched in one job by concatenating engines
+# WHY: Amortises engine start-up without serialising a whole stem on one core
+MAX_LOOPS_PER_JOB = 16
+
+# Stem processing order (lower = earlier)
+# WHY: Drums are most important for preview (rhythm-focused)
+STEM_PRIORITY = {
+    'drums': 0,    # Highest priority
+    'vocals': 1,
+    'bass': 2,
+    'other': 3
+}
+
+# Priority step per loop of distance from the focused loop
+# WHY: All stems of the focused loop come first (it is what the user plays),
+#      then its neighbours; Drums-first order is kept within each loop
+FOCUS_PRIORITY_STEP = max(STEM_PRIORITY.values()) + 1
+
+# Hint tiers (lower = earlier): playing loop, selected loop, visible loops, rest
+_TIER_PLAYING, _TIER_SELECTED, _TIER_VISIBLE, _TIER_OTHER = range(4)
+# Priority span of one tier (loop distances within a tier stay below it)
+_TIER_SPAN = FOCUS_PRIORITY_STEP << 20
+
+
+# ============================================================================
+# Task Definition
+# ============================================================================
+
+@dataclass(order=True)
+class StretchTask:
+    """
+    Task for background time-stretching.
+
+    Priority-based processing order:
+    - Priority 0: Drums (highest - most interesting for users)
+    - Priority 1: Vocals
+    - Priority 2: Bass
+    - Priority 3: Other
+    With a focused loop, each loop of distance from it adds FOCUS_PRIORITY_STEP.
+
+    Attributes:
+        priority: Task priority (0 = highest)
+        stem_name: Stem name (e.g., 'drums', 'vocals')
+        loop_index: Loop index (0-based)
+        loop_start: Loop start time in seconds
+        loop_end: Loop end time in seconds
+        stem_path: Path to stem audio file
+        original_bpm: Original BPM
+        target_bpm: Target BPM
+        sample_rate: Reference sample rate of start_sample/end_sample
+        task_id: Unique task identifier
+        start_sample: Loop start in samples at sample_rate (from LoopGrid)
+        end_sample: Loop end in samples at sample_rate (from LoopGrid)
+        batch_id: Batch the task belongs to (set by StretchScheduler.submit_batch)
+        quality_preset: Quality of this pass (set by StretchScheduler.submit_batch;
+                        the preview pass of progressive mode uses preview_quality)
+    """
+
+    priority: int
+    stem_name: str = field(compare=False)
+    loop_index: int = field(compare=False)
+    loop_start: float = field(compare=False)
+    loop_end: float = field(compare=False)
+    stem_path: Path = field(compare=False)
+    original_bpm: float = field(compare=False)
+    target_bpm: float = field(compare=False)
+    sample_rate: int = field(compare=False)
+    task_id: str = field(compare=False)
+    start_sample: Optional[int] = field(default=None, compare=False)
+    end_sample: Optional[int] = field(default=None, compare=False)
+    batch_id: int = field(default=0, compare=False)
+    quality_preset: Optional[str] = field(default=None, compare=False)
+
+
+@dataclass(frozen=True)
+class PlaybackHints:
+    """
+    What the user is about to hear, used to reorder queued tasks.
+
+    Loop indices refer to task.loop_index (the loop grid of the batch).
+
+    Attributes:
+        selected: Selected loop
+        visible: Loops visible in the waveform viewport
+        playing: Loop currently playing (or requested for playback)
+    """
+
+    selected: Optional[int] = None
+    visible: Tuple[int, ...] = ()
+    playing: Optional[int] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return self.selected is None and self.playing is None and not self.visible
+
+
+def hint_priority(stem_name: str, loop_index: int, hints: PlaybackHints) -> int:
+    """
+    Priority of a loop under playback hints.
+
+    Order: playing loop, selected loop, visible loops, all other loops.
+    Within a tier, loops closer to the playing (else selected) loop come
+    first; within a loop, STEM_PRIORITY applies (Drums first).
+
+    Args:
+        stem_name: Lowercase stem name
+        loop_index: Loop index of the task
+        hints: Current playback hints
+
+    Returns:
+        Task priority (lower = earlier)
+    """
+    stem_priority = STEM_PRIORITY.get(stem_name, 3)
+    if hints.is_empty:
+        return stem_priority
+
+    if loop_index == hints.playing:
+        tier = _TIER_PLAYING
+    elif loop_index == hints.selected:
+        tier = _TIER_SELECTED
+    elif loop_index in hints.visible:
+        tier = _TIER_VISIBLE
+    else:
+        tier = _TIER_OTHER
+
+    anchor = hints.playing if hints.playing is not None else hints.selected
+    distance = abs(loop_index - anchor) if anchor is not None else loop_index
+
+    return tier * _TIER_SPAN + distance * FOCUS_PRIORITY_STEP + stem_priority
+
+
+def make_task_id(stem_name: str, loop_index: int, target_bpm: float) -> str:
+    """Generate unique task ID ("stem_loopidx_bpm")"""
+    return f"{stem_name}_{loop_index}_{int(target_bpm)}"
+
+
+def build_stretch_tasks(
+    stem_files: Dict[str, Path],
+    loop_grid: LoopGrid,
+    original_bpm: float,
+    target_bpm: float,
+    focus_loop: Optional[int] = None
+) -> List[StretchTask]:
+    """
+    Create one task per stem × loop.
+
+    Args:
+        stem_files: Dict of stem_name → stem_path
+        loop_grid: Sample-accurate loop boundaries
+        original_bpm: Original BPM from detection
+        target_bpm: Target BPM
+        focus_loop: Loop the user is about to play (stretched first, then
+                    its neighbours); None = stem priority only
+
+    Returns:
+        List of StretchTask (stem names normalised to lowercase)
+    """
+    hints = PlaybackHints(selected=focus_loop)
+    tasks = []
+    for stem_name, stem_path in stem_files.items():
+        # Normalize stem name to lowercase for consistency
+        # WHY: Task IDs must match between creation and retrieval.
+        #      PlayerWidget uses lowercase when retrieving loops.
+        stem_name_normalized = stem_name.lower()
+        for loop_idx, (start_sample, end_sample) in enumerate(loop_grid):
+            tasks.append(StretchTask(
+                priority=hint_priority(stem_name_normalized, loop_idx, hints),
+                stem_name=stem_name_normalized,
+                loop_index=loop_idx,
+                loop_start=start_sample / loop_grid.sample_rate,
+                loop_end=end_sample / loop_grid.sample_rate,
+                stem_path=Path(stem_path),
+                original_bpm=original_bpm,
+                target_bpm=target_bpm,
+                sample_rate=loop_grid.sample_rate,
+                task_id=make_task_id(stem_name_normalized, loop_idx, target_bpm),
+                start_sample=start_sample,
+                end_sample=end_sample
+            ))
+
+    return tasks
+
+
+# ============================================================================
+# Worker Process Side
+# ============================================================================
+
+@dataclass
+class _StretchJob:
+    """Picklable description of one worker job (no audio inside)"""
+
+    input_name: str
+    input_shape: Tuple[int, ...]
+    output_name: str
+    output_frames: int
+    bounds: List[Tuple[int, int]]    # [start, end) at the stem sample rate
+    offsets: List[int]               # Output frame offset per loop
+    sample_rate: int
+    stretch_factor: float
+    quality_preset: str
+    engine: str
+
+
+def _init_worker():
+    """Worker initializer: Ctrl+C is handled by the parent only"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _run_stretch_job(job: _StretchJob) -> None:
+    """
+    Stretch the loops of one job in a worker process.
+
+    Reads the stem from shared memory and writes every stretched loop directly
+    into the preallocated output block. Nothing but the exception (if any)
+    travels back through the pool's pipe.
+    """
+    input_shm = shared_memory.SharedMemory(name=job.input_name)
+    output_shm = shared_memory.SharedMemory(name=job.output_name)
+    try:
+        audio = np.ndarray(job.input_shape, dtype=np.float32, buffer=input_shm.buf)
+        output = np.ndarray(
+            (job.output_frames,) + tuple(job.input_shape[1:]),
+            dtype=np.float32,
+            buffer=output_shm.buf
+        )
+
+        segments = [audio[start:end] for start, end in job.bounds]
+        stretched = time_stretch_batch(
+            segments,
+            job.sample_rate,
+            job.stretch_factor,
+            quality_preset=job.quality_preset,
+            engine=job.engine
+        )
+
+        # time_stretch_batch guarantees round(len / factor) frames per loop
+        for offset, loop_audio in zip(job.offsets, stretched):
+            output[offset:offset + len(loop_audio)] = loop_audio
+
+        # Views must be released before the mappings can be closed
+        del audio, output, segments, stretched
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+
+# ============================================================================
+# Shared Process Pool
+# ============================================================================
+
+_executor_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Get the process pool shared by all schedulers (created on first use).
+
+    WHY: "spawn" on every platform - forking a process that runs Qt and audio
+         threads can deadlock the child. One pool per process keeps the worker
+         start-up cost to the first batch and bounds the process count when the
+         GUI recreates its manager.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            workers = get_optimal_worker_count()
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            logger.info(f"Stretch process pool started with {workers} workers")
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """Drop a broken pool so the next job starts a fresh one"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_stretch_pool():
+    """Shut down the shared worker processes (pending jobs are cancelled)"""
+    global _executor
+
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+class _SharedStem:
+    """Decoded stem in a named shared-memory block"""
+
+    def __init__(self, stem_path: Path):
+        with sf.SoundFile(str(stem_path)) as f:
+            frames, channels = f.frames, f.channels
+            self.sample_rate = f.samplerate
+            shape = (frames,) if channels == 1 else (frames, channels)
+
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=max(1, frames * channels * 4)
+            )
+            # Decode straight into shared memory (no intermediate array)
+            view = np.ndarray(shape, dtype=np.float32, buffer=self.shm.buf)
+            frames_read = len(f.read(out=view))
+            del view
+
+        self.shape = (frames_read,) + shape[1:]
+
+    @property
+    def frames(self) -> int:
+        return self.shape[0]
+
+    def release(self):
+        _release_shared_memory(self.shm)
+
+
+def _release_shared_memory(shm: shared_memory.SharedMemory):
+    """Close and unlink a block we created (already-unlinked is fine)"""
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class StretchScheduler:
+    """
+    Priority scheduler that stretches loops on a shared process pool.
+
+    Features:
+    - Priority order (Drums first) with at most max_workers jobs in flight
+    - Each stem decoded once per batch into shared memory
+    - Results written by workers into preallocated shared memory
+    - New batch / cancel() discards everything of the previous batch
+    - Optional progressive mode: fast preview pass, then background upgrade
+    - Queued tasks re-keyed from playback hints (set_hints)
+    - No Qt dependency (callbacks run on a scheduler thread)
+
+    Callbacks:
+        on_task_completed(task, audio): Loop stretched (audio is an owned copy)
+        on_task_failed(task, error_message): Loop failed
+        on_batch_finished(): Every task of the current batch was reported
+                             (in progressive mode: after the upgrade pass)
+
+    Note:
+        Jobs already running in a worker cannot be interrupted; their results
+        are dropped when they arrive after a cancel.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        quality_preset: str = StretchQuality.EXPORT,
+        engine: Optional[str] = None,
+        cache: Optional[StretchCache] = None,
+        preview_quality: Optional[str] = None,
+        on_task_completed: Optional[Callable[[StretchTask, np.ndarray], None]] = None,
+        on_task_failed: Optional[Callable[[StretchTask, str], None]] = None,
+        on_batch_finished: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_workers: Jobs in flight at once (default: get_optimal_worker_count())
+            quality_preset: Final quality preset passed to the stretch engine
+            engine: Stretch engine name (default: first available for quality_preset)
+            cache: Cache consulted before stretching and filled with results
+                   (keys from make_loop_cache_key, so a disk tier persists them)
+            preview_quality: Enables progressive mode - every loop is first
+                             stretched at this preset (e.g. StretchQuality.PREVIEW),
+                             then upgraded to quality_preset
+            on_task_completed: Callback(task, audio) per stretched loop
+            on_task_failed: Callback(task, error_message) per failed loop
+            on_batch_finished: Callback() when the batch is done
+        """
+        self.max_workers = max_workers or get_optimal_worker_count()
+        self.quality_preset = quality_preset
+        self.engine = engine
+        self.cache = cache
+        # A preview pass at the final quality would only duplicate work
+        self.preview_quality = preview_quality if preview_quality != quality_preset else None
+
+        self.on_task_completed = on_task_completed
+        self.on_task_failed = on_task_failed
+        self.on_batch_finished = on_batch_finished
+
+        self._cond = threading.Condition()
+        # Heap of [pass, priority, seq, task]; a re-keyed task leaves its old
+        # entry behind with task=None (lazy deletion - heapq has no decrease-key)
+        self._pending: List[list] = []
+        self._entries: Dict[Tuple[str, str], list] = {}  # (task_id, quality) → live entry
+        self._hints = PlaybackHints()
+        self._sequence = itertools.count()
+        self._batch_id = 0
+        self._remaining = 0
+        self._in_flight = 0
+        self._stems: Dict[str, _SharedStem] = {}
+        self._stem_info: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+        self._dispatcher: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        """True while tasks of the current batch are outstanding"""
+        return not self._idle.is_set()
+
+    @property
+    def batch_id(self) -> int:
+        """ID of the current batch"""
+        return self._batch_id
+
+    @property
+    def hints(self) -> PlaybackHints:
+        """Current playback hints"""
+        return self._hints
+
+    @property
+    def progressive(self) -> bool:
+        """True if loops get a preview pass before the final-quality pass"""
+        return self.preview_quality is not None
+
+    def submit_batch(self, tasks: List[StretchTask]) -> int:
+        """
+        Replace the current batch with new tasks.
+
+        In progressive mode every task is queued a second time for the
+        preview pass, which runs ahead of all final-quality tasks.
+
+        Args:
+            tasks: Tasks to stretch (processed in priority order)
+
+        Returns:
+            Batch ID (also stored in every task's batch_id)
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StretchScheduler has been shut down")
+
+            self._reset_batch()
+            batch_id = self._batch_id
+
+            for task in tasks:
+                task.batch_id = batch_id
+                task.quality_preset = self.quality_preset
+                if not self._hints.is_empty:
+                    task.priority = hint_priority(task.stem_name, task.loop_index, self._hints)
+                if self.progressive:
+                    preview = replace(task, quality_preset=self.preview_quality)
+                    self._push(preview, 0)
+                self._push(task, 1)
+
+            self._remaining = len(self._pending)
+            if tasks:
+                self._idle.clear()
+                self._ensure_dispatcher()
+            self._cond.notify_all()
+
+        logger.info(f"Stretch batch {batch_id} submitted: {len(tasks)} tasks")
+
+        if not tasks and self.on_batch_finished:
+            self.on_batch_finished()
+
+        return batch_id
+
+    def set_hints(self, hints: PlaybackHints):
+        """
+        Reorder queued tasks for new playback hints.
+
+        Tasks whose priority changes are re-keyed (decrease-key by lazy
+        deletion); jobs already in flight are unaffected. The hints also
+        apply to later batches.
+
+        Args:
+            hints: Selected / visible / playing loops
+        """
+        with self._cond:
+            if hints == self._hints:
+                return
+            self._hints = hints
+
+            rekeyed = 0
+            # Submission order keeps ties in their original order
+            for entry in sorted(self._entries.values(), key=lambda e: e[2]):
+                task = entry[-1]
+                priority = hint_priority(task.stem_name, task.loop_index, hints)
+                if priority != task.priority:
+                    entry[-1] = None
+                    task.priority = priority
+                    self._push(task, entry[0])
+                    rekeyed += 1
+
+            if rekeyed:
+                self._cond.notify_all()
+
+        if rekeyed:
+            logger.debug(f"Playback hints {hints}: re-keyed {rekeyed} queued tasks")
+
+    def cancel(self):
+        """Discard all pending tasks and ignore results of running jobs"""
+        with self._cond:
+            self._reset_batch()
+            self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the current batch is finished or cancelled.
+
+        Args:
+            timeout: Maximum wait in seconds (None = forever)
+
+        Returns:
+            True if the scheduler is idle
+        """
+        return self._idle.wait(timeout)
+
+    def shutdown(self):
+        """Cancel work and stop the dispatcher (the shared pool stays alive)"""
+        with self._cond:
+            self._reset_batch()
+            self._closed = True
+            self._cond.notify_all()
+
+        if self._dispatcher is not None and self._dispatcher is not threading.current_thread():
+            self._dispatcher.join()
+
+    # ------------------------------------------------------------------------
+    # Dispatcher
+    # ------------------------------------------------------------------------
+
+    def _push(self, task: StretchTask, quality_pass: int):
+        """Queue a task (preview pass before final pass). Caller holds self._cond."""
+        entry = [quality_pass, task.priority, next(self._sequence), task]
+        self._entries[(task.task_id, task.quality_preset)] = entry
+        heapq.heappush(self._pending, entry)
+
+    def _pop_task(self) -> StretchTask:
+        """Pop the most urgent live task. Caller holds self._cond and self._entries is not empty."""
+        while True:
+            task = heapq.heappop(self._pending)[-1]
+            if task is not None:
+                self._entries.pop((task.task_id, task.quality_preset), None)
+                return task
+
+    def _reset_batch(self):
+        """Start a new (empty) batch. Caller holds self._cond."""
+        self._batch_id += 1
+        self._pending.clear()
+        self._entries.clear()
+        self._remaining = 0
+        self._release_stems()
+        self._stem_info = {}
+        self._idle.set()
+
+    def _release_stems(self):
+        """Unlink decoded stems. Caller holds self._cond."""
+        # WHY: Workers that are still attached keep their mapping; only the
+        #      name disappears, so this is safe while jobs are running.
+        for stem in self._stems.values():
+            stem.release()
+        self._stems.clear()
+
+    def _ensure_dispatcher(self):
+        """Start the dispatcher thread on first use. Caller holds self._cond."""
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="stretch-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch_loop(self):
+        """Feed the pool from the priority heap, max_workers jobs at a time"""
+        while True:
+            with self._cond:
+                while not self._closed and (
+                    not self._entries or self._in_flight >= self.max_workers
+                ):
+                    self._cond.wait()
+                if self._closed:
+                    return
+
+                batch_id = self._batch_id
+                tasks = self._take_job_tasks()
+                self._in_flight += 1
+
+            try:
+                self._submit_job(tasks, batch_id)
+            except Exception as e:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+                logger.error(f"Failed to start stretch job: {e}", exc_info=True)
+                self._report(batch_id, [(task, None, str(e)) for task in tasks])
+
+    def _take_job_tasks(self) -> List[StretchTask]:
+        """
+        Pop the next job's tasks from the heap. Caller holds self._cond.
+
+        Concatenating engines get further loops of the same stem (same BPMs
+        and quality pass).
+        """
+        first = self._pop_task()
+        tasks = [first]
+
+        if not self._engine_batches(first.quality_preset):
+            return tasks
+
+        def same_stem(task: StretchTask) -> bool:
+            return (
+                task.stem_path == first.stem_path
+                and task.original_bpm == first.original_bpm
+                and task.target_bpm == first.target_bpm
+                and task.quality_preset == first.quality_preset
+            )
+
+        # Heap entries of equal priority come out in submission (loop) order
+        keep = []
+        for entry in sorted(self._pending):
+            task = entry[-1]
+            if task is None:
+                continue  # Drop stale entries while rebuilding anyway
+            if len(tasks) < MAX_LOOPS_PER_JOB and same_stem(task):
+                tasks.append(task)
+                self._entries.pop((task.task_id, task.quality_preset), None)
+            else:
+                keep.append(entry)
+        if len(tasks) > 1:
+            self._pending[:] = keep
+            heapq.heapify(self._pending)
+
+        return tasks
+
+    def _engine_batches(self, quality_preset: str) -> bool:
+        """Whether the engine of a quality pass prefers many loops per call"""
+        try:
+            return get_stretch_engine(self.engine, quality_preset).batch_concatenate
+        except Exception:
+            return False
+
+    def _get_stem(self, stem_path: Path, batch_id: int) -> Optional[_SharedStem]:
+        """Decoded stem for this batch (None if the batch was replaced meanwhile)"""
+        key = str(stem_path)
+        with self._cond:
+            stem = self._stems.get(key)
+        if stem is not None:
+            return stem
+
+        # Only the dispatcher decodes, so no duplicate decodes can race here
+        stem = _SharedStem(stem_path)
+        logger.debug(
+            f"Decoded stem once for batch {batch_id}: {Path(key).name} "
+            f"({stem.shm.size / 1024 / 1024:.1f} MB shared)"
+        )
+
+        with self._cond:
+            if batch_id != self._batch_id:
+                stem.release()
+                return None
+            self._stems[key] = stem
+        return stem
+
+    def _get_stem_info(self, stem_path: Path) -> Tuple[int, int, Optional[str]]:
+        """(sample_rate, frames, content_hash) of a stem, read once per batch"""
+        key = str(stem_path)
+        info = self._stem_info.get(key)
+        if info is None:
+            file_info = sf.info(key)
+            content_hash = compute_content_hash(stem_path) if self.cache is not None else None
+            info = (file_info.samplerate, file_info.frames, content_hash)
+            self._stem_info[key] = info
+        return info
+
+    def _submit_job(self, tasks: List[StretchTask], batch_id: int):
+        """Serve cached loops, prepare shared memory for the rest and submit"""
+        sample_rate, frames, content_hash = self._get_stem_info(tasks[0].stem_path)
+        stretch_factor = calculate_stretch_factor(tasks[0].original_bpm, tasks[0].target_bpm)
+        quality = tasks[0].quality_preset or self.quality_preset
+        engine = get_stretch_engine(self.engine, quality)
+        is_preview = quality != self.quality_preset
+
+        job_tasks, bounds, offsets, lengths, job_keys, immediate = [], [], [], [], [], []
+        output_frames = 0
+        for task in tasks:
+            start, end = self._task_bounds(task, sample_rate)
+            if start < 0 or end > frames or end <= start:
+                immediate.append((
+                    task, None,
+                    f"Invalid loop bounds: [{start}, {end}] for audio length {frames}"
+                ))
+                continue
+
+            keys = None
+            if self.cache is not None:
+                final_key = self._cache_key(content_hash, start, end, sample_rate, task)
+                preview_key = None
+                if self.progressive:
+                    preview_key = self._cache_key(
+                        content_hash, start, end, sample_rate, task, self.preview_quality
+                    )
+
+                if is_preview:
+                    # Upgraded in an earlier batch/session: no preview needed
+                    cached = self.cache.get(final_key)
+                    if cached is not None:
+                        final_task = replace(task, quality_preset=self.quality_preset)
+                        immediate.append((final_task, cached, None))
+                        continue
+                    keys = (preview_key, None)
+                else:
+                    keys = (final_key, preview_key)
+
+                cached = self.cache.get(keys[0])
+                if cached is not None:
+                    immediate.append((task, cached, None))
+                    continue
+
+            length = int(round((end - start) / stretch_factor))
+            job_tasks.append(task)
+            bounds.append((start, end))
+            offsets.append(output_frames)
+            lengths.append(length)
+            job_keys.append(keys)
+            output_frames += length
+
+        if immediate:
+            self._report(batch_id, immediate)
+
+        stem = self._get_stem(tasks[0].stem_path, batch_id) if job_tasks else None
+        if stem is None:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+            return
+
+        channels = stem.shape[1] if len(stem.shape) > 1 else 1
+        output_shm = shared_memory.SharedMemory(
+            create=True, size=max(1, output_frames * channels * 4)
+        )
+        job = _StretchJob(
+            input_name=stem.shm.name,
+            input_shape=stem.shape,
+            output_name=output_shm.name,
+            output_frames=output_frames,
+            bounds=bounds,
+            offsets=offsets,
+            sample_rate=stem.sample_rate,
+            stretch_factor=stretch_factor,
+            quality_preset=quality,
+            engine=engine.name
+        )
+
+        try:
+            executor = _get_executor()
+            try:
+                future = executor.submit(_run_stretch_job, job)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed by the OS): retry once on a fresh pool
+                _discard_executor(executor)
+                executor = _get_executor()
+                future = executor.submit(_run_stretch_job, job)
+        except Exception:
+            _release_shared_memory(output_shm)
+            raise
+
+        logger.debug(
+            f"Submitted stretch job: {tasks[0].stem_name} loops "
+            f"{[task.loop_index for task in job_tasks]} (batch {batch_id})"
+        )
+        future.add_done_callback(
+            lambda f: self._on_job_done(
+                f, executor, job, job_tasks, lengths, job_keys, output_shm, batch_id
+            )
+        )
+
+    def _cache_key(
+        self,
+        content_hash: str,
+        start: int,
+        end: int,
+        sample_rate: int,
+        task: StretchTask,
+        quality: Optional[str] = None
+    ) -> str:
+        """Cache key of a loop at a quality (default: the final quality)"""
+        quality = quality or self.quality_preset
+        engine = get_stretch_engine(self.engine, quality)
+        return make_loop_cache_key(
+            content_hash, start, end, sample_rate, task.original_bpm,
+            task.target_bpm, quality, f"{engine.name}:{engine.version()}"
+        )
+
+    def _store(self, task: StretchTask, keys: Tuple[str, Optional[str]], audio: np.ndarray):
+        """
+        Put a result into the cache.
+
+        Previews stay in RAM only. A final-quality result replaces the preview
+        entry of its loop in one atomic step, so cache readers see either the
+        preview or the upgrade, never neither.
+        """
+        key, preview_key = keys
+        if task.quality_preset != self.quality_preset:
+            self.cache.put(key, audio, persist=False)
+        elif preview_key is not None:
+            self.cache.replace(preview_key, key, audio)
+        else:
+            self.cache.put(key, audio)
+
+    @staticmethod
+    def _task_bounds(task: StretchTask, sample_rate: int) -> Tuple[int, int]:
+        """Loop bounds at the stem sample rate (shared grid when available)"""
+        if task.start_sample is not None and task.end_sample is not None:
+            return (
+                rescale_samples(task.start_sample, task.sample_rate, sample_rate),
+                rescale_samples(task.end_sample, task.sample_rate, sample_rate)
+            )
+        return (
+            seconds_to_samples(task.loop_start, sample_rate),
+            seconds_to_samples(task.loop_end, sample_rate)
+        )
+
+    def _on_job_done(
+        self,
+        future: Future,
+        executor: ProcessPoolExecutor,
+        job: _StretchJob,
+        tasks: List[StretchTask],
+        lengths: List[int],
+        keys: List[Optional[Tuple[str, Optional[str]]]],
+        output_shm: shared_memory.SharedMemory,
+        batch_id: int
+    ):
+        """Collect a finished job (runs on the pool's management thread)"""
+        results = []
+        try:
+            error = None
+            if future.cancelled():
+                error = "Cancelled"
+            elif future.exception() is not None:
+                exc = future.exception()
+                error = str(exc) or type(exc).__name__
+                if isinstance(exc, BrokenProcessPool):
+                    _discard_executor(executor)
+
+            # Results of a replaced batch are still cached (e.g., BPM toggled back)
+            if error is None and (batch_id == self._batch_id or self.cache is not None):
+                output = np.ndarray(
+                    (job.output_frames,) + tuple(job.input_shape[1:]),
+                    dtype=np.float32,
+                    buffer=output_shm.buf
+                )
+                for task, offset, length, task_keys in zip(tasks, job.offsets, lengths, keys):
+                    audio = output[offset:offset + length].copy()
+                    if task_keys is not None:
+                        self._store(task, task_keys, audio)
+                    results.append((task, audio, None))
+                del output
+            else:
+                results = [(task, None, error) for task in tasks]
+        except Exception as e:
+            logger.error(f"Failed to collect stretch job: {e}", exc_info=True)
+            results = [(task, None, str(e)) for task in tasks]
+        finally:
+            _release_shared_memory(output_shm)
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+        self._report(batch_id, results)
+
+    def _report(self, batch_id: int, results: List[Tuple[StretchTask, Optional[np.ndarray], Optional[str]]]):
+        """Invoke callbacks for tasks of the current batch"""
+        with self._cond:
+            if batch_id != self._batch_id:
+                return
+            self._remaining -= len(results)
+            finished = self._remaining <= 0
+
+        for task, audio, error in results:
+            if audio is not None:
+                if self.on_task_completed:
+                    self.on_task_completed(task, audio)
+            else:
+                logger.warning(f"Stretch task failed: {task.task_id} - {error}")
+                if self.on_task_failed:
+                    self.on_task_failed(task, error)
+
+        if not finished:
+            return
+
+        with self._cond:
+            if batch_id != self._batch_id:
+                return
+            # Decoded stems are no longer needed once the batch is done
+            self._release_stems()
+            self._idle.set()
+
+        logger.info(f"Stretch batch {batch_id} finished")
+        if self.on_batch_finished:
+            self.on_batch_finished()
+
+
+# ============================================================================
+# Utility Functions
+# ============================================================================
+
+def get_optimal_worker_count() -> int:
+    """
+    Calculate optimal worker count based on CPU cores.
+
+    Returns:
+        Recommended worker count
+
+    Algorithm:
+        - Leave 1-2 cores for UI/system
+        - Cap at 8 workers (diminishing returns beyond that)
+
+    Example:
+        >>> # 8-core system
+        >>> get_optimal_worker_count()
+        6  # 8 cores - 2 for UI/system
+    """
+
+    cpu_count = multiprocessing.cpu_count()
+
+    # Leave 1-2 cores for UI/system
+    optimal = max(2, cpu_count - 2)
+
+    # Cap at 8 workers (diminishing returns, thread overhead)
+    return min(optimal, 8)
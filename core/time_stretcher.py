@@ -1,5 +1,5 @@
 """
-Time Stretcher - Pitch-preserving time-stretching using Rubberband CLI
+Time Stretcher - Pitch-preserving time-stretching with pluggable engines
 
 PURPOSE: Provide high-quality time-stretching for separated audio stems.
          Supports BPM-based stretching for DJ mixing, practice, and remixing.
@@ -7,16 +7,24 @@ PURPOSE: Provide high-quality time-stretching for separated audio stems.
 CONTEXT: Integrated into the Loop Export workflow for processing loops
          from original BPM to target BPM while preserving pitch.
 
-ALGORITHM: Uses Rubberband CLI directly (via subprocess)
+ALGORITHM: Pluggable StretchEngine backends (see get_stretch_engine):
+
+           'rubberband-cli': Rubberband CLI via subprocess
            - Rubberband R3 phase vocoder engine
            - Pitch-preserving (independent time/pitch modification)
            - Transient detection and preservation
            - Adaptive stretch ratio
            - Phase lamination for reduced artifacts
            - Optimized for musical content
+           - Note: Uses CLI instead of pyrubberband library to avoid
+                   stereo audio bug in pyrubberband v0.4.0
+           - Binary discovery and flag probe run once per process
+             (see get_engine_diagnostics)
 
-           Note: Uses CLI instead of pyrubberband library to avoid
-                 stereo audio bug in pyrubberband v0.4.0
+           'phase-vocoder': In-process NumPy phase vocoder
+           - Operates directly on arrays (no process spawn, no temp files)
+           - Vectorised STFT and overlap-add, identity phase locking
+           - Used for PREVIEW quality and as fallback when rubberband is missing
 
 USAGE:
     >>> from core.time_stretcher import time_stretch_audio, calculate_stretch_factor
@@ -31,13 +39,20 @@ USAGE:
     ...     sample_rate=44100,
     ...     stretch_factor=factor
     ... )
+    >>>
+    >>> # Force the in-process engine
+    >>> stretched = time_stretch_audio(audio_array, 44100, factor, engine='phase-vocoder')
 """
 
-from typing import Optional, Tuple
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
 import numpy as np
 from pathlib import Path
 import subprocess
 import tempfile
+import threading
+import time
 import os
 
 from utils.logger import get_logger
@@ -191,11 +206,114 @@ def estimate_processing_time(
 # Rubberband CLI Integration
 # ============================================================================
 
+def _find_rubberband_binary() -> str:
+    """
+    Find rubberband binary (check bundled location first, then system PATH).
+
+    WHY: Support both bundled app (sys._MEIPASS/bin/rubberband) and development (system PATH)
+
+    Returns:
+        Path to bundled binary, or "rubberband" (resolved via PATH)
+    """
+    import sys
+
+    # Check bundled location first (when running from PyInstaller app)
+    if getattr(sys, "frozen", False):
+        bundle_dir = Path(sys._MEIPASS)
+        bundled_rubberband = bundle_dir / "bin" / "rubberband"
+        if bundled_rubberband.exists() and os.access(bundled_rubberband, os.X_OK):
+            return str(bundled_rubberband)
+
+    # Fallback to system PATH
+    return "rubberband"
+
+
+@dataclass(frozen=True)
+class RubberbandCapabilities:
+    """
+    Result of probing the rubberband binary (cached by RubberbandCLIEngine).
+
+    Attributes:
+        path: Resolved binary path
+        available: True if the binary runs
+        version: Version string reported by --version (empty if unknown)
+        supports_fine: '--fine' flag (R3 engine) is supported
+        supports_window_long: '--window-long' flag is supported
+        supports_crisp: '-c' crispness flag is supported
+        error: Probe error message if not available
+    """
+
+    path: str
+    available: bool
+    version: str = ""
+    supports_fine: bool = False
+    supports_window_long: bool = False
+    supports_crisp: bool = False
+    error: Optional[str] = None
+
+    @property
+    def r3_available(self) -> bool:
+        """R3 ("finer") engine is available"""
+        return self.supports_fine
+
+
+def _probe_rubberband(rubberband_path: str) -> RubberbandCapabilities:
+    """
+    Run the rubberband binary once to check it works and which flags it supports.
+
+    Args:
+        rubberband_path: Binary path (or name resolved via PATH)
+
+    Returns:
+        RubberbandCapabilities (available=False with error on failure)
+    """
+    try:
+        version_result = subprocess.run(
+            [rubberband_path, '--version'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if version_result.returncode != 0:
+            return RubberbandCapabilities(
+                path=rubberband_path,
+                available=False,
+                error="rubberband binary not found or not working",
+            )
+
+        # Rubberband prints usage (incl. all flags) for --help; older versions
+        # write it to stderr and exit non-zero, so inspect both streams.
+        help_result = subprocess.run(
+            [rubberband_path, '--help'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        help_text = help_result.stdout + help_result.stderr
+
+    except (FileNotFoundError, PermissionError, subprocess.TimeoutExpired) as e:
+        return RubberbandCapabilities(
+            path=rubberband_path,
+            available=False,
+            error=f"Rubberband CLI not found ({type(e).__name__})",
+        )
+
+    version = (version_result.stdout or version_result.stderr).strip().splitlines()
+    return RubberbandCapabilities(
+        path=rubberband_path,
+        available=True,
+        version=version[0] if version else "",
+        supports_fine='--fine' in help_text,
+        supports_window_long='--window-long' in help_text,
+        supports_crisp='--crisp' in help_text or '-c<N>' in help_text or '-c ' in help_text,
+    )
+
 def _time_stretch_with_rubberband_cli(
     audio: np.ndarray,
     sample_rate: int,
     stretch_factor: float,
-    quality_preset: str = StretchQuality.EXPORT
+    quality_preset: str = StretchQuality.EXPORT,
+    capabilities: Optional[RubberbandCapabilities] = None
 ) -> np.ndarray:
     """
     Time-stretch audio using Rubberband CLI (bypasses pyrubberband bug).
@@ -208,6 +326,8 @@ def _time_stretch_with_rubberband_cli(
         sample_rate: Sample rate in Hz
         stretch_factor: Time-stretch factor
         quality_preset: Quality preset (PREVIEW or EXPORT)
+        capabilities: Cached probe result. Default (None): probe via the
+                      registered 'rubberband-cli' engine (cached process-wide)
 
     Returns:
         Time-stretched audio array
@@ -217,37 +337,17 @@ def _time_stretch_with_rubberband_cli(
         ProcessingError: If processing fails
     """
 
-    # Find rubberband binary (check bundled location first, then system PATH)
-    # WHY: Support both bundled app (sys._MEIPASS/bin/rubberband) and development (system PATH)
-    import sys
-    rubberband_path = None
-    
-    # Check bundled location first (when running from PyInstaller app)
-    if getattr(sys, "frozen", False):
-        bundle_dir = Path(sys._MEIPASS)
-        bundled_rubberband = bundle_dir / "bin" / "rubberband"
-        if bundled_rubberband.exists() and os.access(bundled_rubberband, os.X_OK):
-            rubberband_path = str(bundled_rubberband)
-    
-    # Fallback to system PATH
-    if not rubberband_path:
-        rubberband_path = "rubberband"  # Will be found via PATH
-    
-    # Check if rubberband binary exists and works
-    try:
-        result = subprocess.run(
-            [rubberband_path, '--version'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode != 0:
-            raise LibraryNotFoundError("rubberband binary not found or not working")
-    except (FileNotFoundError, subprocess.TimeoutExpired):
+    if capabilities is None:
+        capabilities = _ENGINES["rubberband-cli"].probe()
+
+    if not capabilities.available:
         raise LibraryNotFoundError(
-            "Rubberband CLI not found. Please install it with: brew install rubberband"
+            f"Rubberband CLI not found ({capabilities.error}). "
+            "Please install it with: brew install rubberband"
         )
 
+    rubberband_path = capabilities.path
+
     # Create temporary files
     temp_dir = tempfile.mkdtemp()
     input_path = os.path.join(temp_dir, 'input.wav')
@@ -262,18 +362,17 @@ def _time_stretch_with_rubberband_cli(
         # Build rubberband command (use found path)
         cmd = [rubberband_path]
 
-        # Add quality options
+        # Add quality options (only flags the probed binary supports)
         if quality_preset == StretchQuality.EXPORT:
             # Highest quality settings (use R3 engine)
-            cmd.extend([
-                '--fine',            # Use R3 (finer) engine
-                '--window-long',     # Longer window for maximum quality
-            ])
+            if capabilities.supports_fine:
+                cmd.append('--fine')         # Use R3 (finer) engine
+            if capabilities.supports_window_long:
+                cmd.append('--window-long')  # Longer window for maximum quality
         else:  # PREVIEW
             # Balanced quality/speed (use R2 engine - default)
-            cmd.extend([
-                '-c5',               # Good transient preservation
-            ])
+            if capabilities.supports_crisp:
+                cmd.append('-c5')            # Good transient preservation
 
         # Add tempo stretch factor
         # Use --tempo instead of --time because:
@@ -301,7 +400,9 @@ def _time_stretch_with_rubberband_cli(
             )
 
         # Read output
-        stretched, _ = sf.read(output_path, always_2d=False)
+        # WHY: float32 like the in-process engines (sf.read defaults to float64,
+        #      which doubles the memory of every cached loop)
+        stretched, _ = sf.read(output_path, always_2d=False, dtype='float32')
 
         return stretched
 
@@ -324,6 +425,455 @@ def _time_stretch_with_rubberband_cli(
             logger.warning(f"Failed to clean up temp files: {e}")
 
 
+# ============================================================================
+# In-Process Phase Vocoder
+# ============================================================================
+
+# FFT size per quality preset (at 44.1/48 kHz)
+# WHY: Shorter windows smear drum transients less; longer windows resolve
+#      tonal content better. Preview favours speed.
+_PV_FFT_SIZE = {
+    StretchQuality.PREVIEW: 1024,
+    StretchQuality.EXPORT: 2048,
+}
+
+# Synthesis hop = n_fft / overlap (75% overlap, constant Hann² overlap-add gain)
+_PV_OVERLAP = 4
+
+# Bump when phase vocoder output changes (invalidates cached stretch results)
+_PV_VERSION = "2"
+
+
+def _nearest_peak_bins(magnitude: np.ndarray) -> np.ndarray:
+    """
+    Map every FFT bin to its nearest local magnitude peak (vectorised).
+
+    Args:
+        magnitude: Spectrogram magnitudes, (..., bins)
+
+    Returns:
+        int64 array of same shape: peak bin index for every bin
+        (bins without any peak in their frame map to themselves)
+    """
+    num_bins = magnitude.shape[-1]
+    bins = np.arange(num_bins)
+
+    # Local maxima (ties resolved to the left bin)
+    is_peak = np.zeros(magnitude.shape, dtype=bool)
+    is_peak[..., 1:-1] = (
+        (magnitude[..., 1:-1] >= magnitude[..., :-2])
+        & (magnitude[..., 1:-1] > magnitude[..., 2:])
+    )
+
+    # Previous peak at or left of each bin / next peak at or right of each bin
+    previous_peak = np.maximum.accumulate(np.where(is_peak, bins, -1), axis=-1)
+    next_peak = np.flip(
+        np.minimum.accumulate(np.flip(np.where(is_peak, bins, num_bins), axis=-1), axis=-1),
+        axis=-1,
+    )
+
+    use_previous = (previous_peak >= 0) & (
+        (next_peak >= num_bins) | (bins - previous_peak <= next_peak - bins)
+    )
+    nearest = np.where(use_previous, previous_peak, next_peak)
+
+    # Frames without peaks (e.g., digital silence): keep bins independent
+    return np.where(nearest >= num_bins, bins, nearest).astype(np.int64)
+
+
+def _phase_vocoder_stretch(
+    audio: np.ndarray,
+    stretch_factor: float,
+    n_fft: int = 2048,
+) -> np.ndarray:
+    """
+    Time-stretch audio with a vectorised phase vocoder.
+
+    Analysis frames are taken every (hop * stretch_factor) samples and
+    resynthesized every hop samples. Phases are propagated with the
+    instantaneous frequency of each spectral peak; the other bins are locked
+    to the phase of their peak (identity phase locking, Laroche & Dolson), so
+    pitch is preserved and partials stay coherent after silence or onsets.
+
+    Framing (sliding_window_view), rfft/irfft, peak picking and overlap-add
+    (`_PV_OVERLAP` interleaved groups of non-overlapping frames) run on all
+    frames at once; only the phase recurrence steps through frames, vectorised
+    over channels and bins.
+
+    Args:
+        audio: Audio array, (samples,) or (samples, channels)
+        stretch_factor: Tempo factor (>1.0 = faster/shorter)
+        n_fft: FFT size (power of two)
+
+    Returns:
+        Stretched audio with round(len(audio) / stretch_factor) samples,
+        same dtype and channel layout as input
+    """
+    mono = audio.ndim == 1
+    x = audio[:, np.newaxis] if mono else audio
+    num_samples, num_channels = x.shape
+    target_length = int(round(num_samples / stretch_factor))
+
+    hop_out = n_fft // _PV_OVERLAP
+    hop_in = hop_out * stretch_factor
+    half = n_fft // 2
+
+    # Analysis frame positions (integer, in padded input)
+    num_frames = int(np.ceil((target_length + n_fft) / hop_out)) + 1
+    positions = np.rint(np.arange(num_frames) * hop_in).astype(np.int64)
+
+    # Pad: centre the first frame at sample 0, and cover the last analysis frame
+    pad_end = max(0, int(positions[-1]) + n_fft - (num_samples + half))
+    padded = np.zeros((num_samples + half + pad_end, num_channels), dtype=np.float64)
+    padded[half:half + num_samples] = x
+
+    window = np.hanning(n_fft + 1)[:-1]  # Periodic Hann
+
+    # (frames, channels, n_fft) views → one batched FFT
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=0)[positions]
+    spectrum = np.fft.rfft(frames * window, axis=-1)
+
+    magnitude = np.abs(spectrum)
+    phase = np.angle(spectrum)
+
+    # Instantaneous frequency from phase difference over the actual analysis hop
+    bin_freq = 2.0 * np.pi * np.arange(n_fft // 2 + 1) / n_fft  # rad/sample
+    actual_hops = np.diff(positions).astype(np.float64)[:, np.newaxis, np.newaxis]
+    delta = np.diff(phase, axis=0) - bin_freq * actual_hops
+    delta -= 2.0 * np.pi * np.round(delta / (2.0 * np.pi))  # Wrap to [-pi, pi]
+    inst_freq = bin_freq + delta / np.maximum(actual_hops, 1.0)
+
+    # Region of influence: every bin follows its nearest spectral peak
+    peak_bins = _nearest_peak_bins(magnitude)
+
+    # Synthesis phase: peaks advance by inst_freq * hop_out, other bins keep
+    # their analysis phase offset to the peak
+    synth_phase = np.empty_like(phase)
+    synth_phase[0] = phase[0]
+    phase_advance = inst_freq * hop_out
+    for frame in range(1, num_frames):
+        peaks = peak_bins[frame]
+        advanced = synth_phase[frame - 1] + phase_advance[frame - 1]
+        analysis = phase[frame]
+        synth_phase[frame] = (
+            np.take_along_axis(advanced, peaks, axis=-1)
+            + analysis
+            - np.take_along_axis(analysis, peaks, axis=-1)
+        )
+
+    output_frames = np.fft.irfft(magnitude * np.exp(1j * synth_phase), n=n_fft, axis=-1)
+    output_frames *= window
+
+    # Overlap-add: frames r, r+4, r+8, ... tile without overlap → contiguous add
+    output_length = (num_frames - 1) * hop_out + n_fft
+    output = np.zeros((output_length + n_fft, num_channels), dtype=np.float64)
+    for offset in range(_PV_OVERLAP):
+        group = output_frames[offset::_PV_OVERLAP]  # (k, channels, n_fft)
+        tiled = group.transpose(0, 2, 1).reshape(-1, num_channels)
+        start = offset * hop_out
+        output[start:start + len(tiled)] += tiled
+
+    # Hann² overlap-add gain is constant for 75% overlap
+    output /= np.sum(window ** 2) / hop_out
+
+    result = output[half:half + target_length].astype(audio.dtype, copy=False)
+    return result[:, 0] if mono else result
+
+
+# ============================================================================
+# Stretch Engines
+# ============================================================================
+
+# Seconds a "rubberband not found" probe result is trusted
+# WHY: Successful probes are cached for the process; a negative result must
+#      expire so a binary installed while the app runs is found
+RUBBERBAND_NEGATIVE_PROBE_TTL_SECONDS = 30.0
+
+
+class StretchEngine(ABC):
+    """
+    Base class for time-stretch backends.
+
+    Subclasses implement stretch() on NumPy arrays and report availability.
+    Register instances with register_stretch_engine() to make them selectable
+    by name in time_stretch_audio(engine=...). Engines are process-wide
+    singletons, so expensive discovery should be cached on the instance.
+
+    Attributes:
+        name: Engine identifier (e.g., 'rubberband-cli')
+        in_process: True if the engine runs without spawning processes
+        batch_concatenate: True if time_stretch_batch() should stretch all
+                           segments in one call (high per-call start-up cost)
+    """
+
+    name = "base"
+    in_process = False
+    batch_concatenate = False
+
+    def is_available(self) -> bool:
+        """Check if the engine can be used on this system"""
+        return True
+
+    def diagnostics(self) -> Dict[str, object]:
+        """
+        Describe the engine for logs and support output.
+
+        Returns:
+            Dict with at least 'name', 'available' and 'in_process'
+        """
+        return {
+            'name': self.name,
+            'available': self.is_available(),
+            'in_process': self.in_process,
+            'version': self.version(),
+        }
+
+    def version(self) -> str:
+        """
+        Version of the algorithm/binary producing the output.
+
+        WHY: Part of persistent cache keys, so results of an upgraded engine
+             are never mixed with stale ones.
+
+        Returns:
+            Version string (empty if unknown)
+        """
+        return ""
+
+    def invalidate(self) -> None:
+        """Drop cached discovery results (re-probe on next use)"""
+
+    @abstractmethod
+    def stretch(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        stretch_factor: float,
+        quality_preset: str = StretchQuality.EXPORT
+    ) -> np.ndarray:
+        """
+        Time-stretch audio (inputs are validated by time_stretch_audio).
+
+        Args:
+            audio: Audio array, (samples,) or (samples, channels)
+            sample_rate: Sample rate in Hz
+            stretch_factor: Tempo factor (>1.0 = faster)
+            quality_preset: StretchQuality.PREVIEW or StretchQuality.EXPORT
+
+        Returns:
+            Time-stretched audio array (same channel layout as input)
+        """
+
+
+class RubberbandCLIEngine(StretchEngine):
+    """
+    Rubberband CLI subprocess backend (highest quality, R3 engine).
+
+    The binary is resolved and probed (--version, --help) once per process.
+    The cached RubberbandCLIEngine.probe() result drives flag selection, so
+    the stretch hot path spawns exactly one process per loop. A failed run
+    invalidates the cache, so a binary that disappeared or broke is re-probed
+    on the next call. A missing binary is re-probed after
+    RUBBERBAND_NEGATIVE_PROBE_TTL_SECONDS, so installing rubberband (or
+    fixing PATH) while the app runs is picked up.
+    """
+
+    name = "rubberband-cli"
+    in_process = False
+    # WHY: Splitting the concatenated output assumes rubberband maps time
+    #      linearly across the guard gaps; off until
+    #      test_batch_rubberband_matches_per_loop has passed against the real
+    #      binary (time_stretch_batch(concatenate=True) still opts in)
+    batch_concatenate = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._capabilities: Optional[RubberbandCapabilities] = None
+        self._probed_at = 0.0  # time.monotonic() of the cached probe
+        self.probe_count = 0
+
+    def _is_cached(self, capabilities: Optional[RubberbandCapabilities]) -> bool:
+        """True if capabilities may be reused (success, or a fresh failure)"""
+        if capabilities is None:
+            return False
+        if capabilities.available:
+            return True
+        return time.monotonic() - self._probed_at < RUBBERBAND_NEGATIVE_PROBE_TTL_SECONDS
+
+    def probe(self) -> RubberbandCapabilities:
+        """
+        Get cached capabilities (probes the binary on first call, and again
+        once a negative result is older than the TTL).
+
+        Returns:
+            RubberbandCapabilities
+        """
+        capabilities = self._capabilities
+        if self._is_cached(capabilities):
+            return capabilities
+
+        with self._lock:
+            if not self._is_cached(self._capabilities):
+                self._capabilities = _probe_rubberband(_find_rubberband_binary())
+                self._probed_at = time.monotonic()
+                self.probe_count += 1
+
+                if self._capabilities.available:
+                    logger.info(
+                        f"Rubberband CLI: {self._capabilities.path} "
+                        f"({self._capabilities.version or 'unknown version'}), "
+                        f"R3={'yes' if self._capabilities.r3_available else 'no'}"
+                    )
+                else:
+                    logger.info(f"Rubberband CLI unavailable: {self._capabilities.error}")
+
+            return self._capabilities
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._capabilities = None
+
+    def is_available(self) -> bool:
+        return self.probe().available
+
+    def version(self) -> str:
+        return self.probe().version
+
+    def diagnostics(self) -> Dict[str, object]:
+        capabilities = self.probe()
+        info = super().diagnostics()
+        info.update({
+            'path': capabilities.path,
+            'r3_available': capabilities.r3_available,
+            'supports_fine': capabilities.supports_fine,
+            'supports_window_long': capabilities.supports_window_long,
+            'supports_crisp': capabilities.supports_crisp,
+            'error': capabilities.error,
+        })
+        return info
+
+    def stretch(self, audio, sample_rate, stretch_factor, quality_preset=StretchQuality.EXPORT):
+        try:
+            return _time_stretch_with_rubberband_cli(
+                audio, sample_rate, stretch_factor, quality_preset,
+                capabilities=self.probe()
+            )
+        except TimeStretchError:
+            # Binary may have been removed/replaced: re-probe on next call
+            self.invalidate()
+            raise
+
+
+class PhaseVocoderEngine(StretchEngine):
+    """In-process NumPy phase vocoder backend (no subprocess, no temp files)"""
+
+    name = "phase-vocoder"
+    in_process = True
+
+    def version(self) -> str:
+        return _PV_VERSION
+
+    def stretch(self, audio, sample_rate, stretch_factor, quality_preset=StretchQuality.EXPORT):
+        n_fft = _PV_FFT_SIZE.get(quality_preset, _PV_FFT_SIZE[StretchQuality.EXPORT])
+
+        # Keep window duration roughly constant at high sample rates (88.2/96 kHz)
+        if sample_rate >= 88200:
+            n_fft *= 2
+
+        return _phase_vocoder_stretch(audio, stretch_factor, n_fft=n_fft)
+
+
+_ENGINES: Dict[str, StretchEngine] = {}
+
+# Engine preference per quality preset (first available engine wins)
+# WHY: Preview stretching runs for every loop in the background and must be
+#      CPU-bound (in-process). Export keeps Rubberband R3 quality when installed.
+ENGINE_PREFERENCE = {
+    StretchQuality.PREVIEW: ["phase-vocoder"],
+    StretchQuality.EXPORT: ["rubberband-cli", "phase-vocoder"],
+}
+
+
+def register_stretch_engine(engine: StretchEngine) -> None:
+    """
+    Register a stretch engine (replaces an engine with the same name).
+
+    Args:
+        engine: StretchEngine instance
+    """
+    _ENGINES[engine.name] = engine
+    logger.debug(f"Registered stretch engine: {engine.name}")
+
+
+def available_stretch_engines() -> List[str]:
+    """
+    List names of registered engines that are available on this system.
+
+    Returns:
+        Engine names (e.g., ['rubberband-cli', 'phase-vocoder'])
+    """
+    return [name for name, engine in _ENGINES.items() if engine.is_available()]
+
+
+def get_engine_diagnostics() -> List[Dict[str, object]]:
+    """
+    Describe all registered engines (probes each engine once, then cached).
+
+    Returns:
+        List of per-engine dicts (see StretchEngine.diagnostics)
+
+    Example:
+        >>> for info in get_engine_diagnostics():
+        ...     print(info['name'], info['available'], info.get('version', ''))
+    """
+    return [engine.diagnostics() for engine in _ENGINES.values()]
+
+
+def get_stretch_engine(
+    name: Optional[str] = None,
+    quality_preset: str = StretchQuality.EXPORT
+) -> StretchEngine:
+    """
+    Resolve a stretch engine by name or by quality preference.
+
+    Args:
+        name: Engine name, or None to pick the first available engine from
+              ENGINE_PREFERENCE[quality_preset]
+        quality_preset: Quality preset used for automatic selection
+
+    Returns:
+        StretchEngine instance
+
+    Raises:
+        LibraryNotFoundError: If the named engine is unknown or unavailable,
+                              or no preferred engine is available
+    """
+    if name is not None:
+        engine = _ENGINES.get(name)
+        if engine is None:
+            raise LibraryNotFoundError(
+                f"Unknown stretch engine '{name}'. Registered: {sorted(_ENGINES)}"
+            )
+        if not engine.is_available():
+            raise LibraryNotFoundError(f"Stretch engine '{name}' is not available")
+        return engine
+
+    preference = ENGINE_PREFERENCE.get(quality_preset, ENGINE_PREFERENCE[StretchQuality.EXPORT])
+    for engine_name in preference:
+        engine = _ENGINES.get(engine_name)
+        if engine is not None and engine.is_available():
+            return engine
+
+    raise LibraryNotFoundError(
+        f"No stretch engine available for quality '{quality_preset}' "
+        f"(tried: {', '.join(preference)})"
+    )
+
+
+register_stretch_engine(RubberbandCLIEngine())
+register_stretch_engine(PhaseVocoderEngine())
+
+
 # ============================================================================
 # Core Time-Stretching Function
 # ============================================================================
@@ -332,10 +882,11 @@ def time_stretch_audio(
     audio: np.ndarray,
     sample_rate: int,
     stretch_factor: float,
-    quality_preset: str = StretchQuality.EXPORT
+    quality_preset: str = StretchQuality.EXPORT,
+    engine: Optional[str] = None
 ) -> np.ndarray:
     """
-    Time-stretch audio while preserving pitch using Rubberband CLI.
+    Time-stretch audio while preserving pitch.
 
     Args:
         audio: Audio array
@@ -349,13 +900,16 @@ def time_stretch_audio(
         quality_preset: Quality preset (default: StretchQuality.EXPORT)
                        - StretchQuality.PREVIEW: Balanced quality/speed (R2 engine, crisp 5)
                        - StretchQuality.EXPORT: Maximum quality (R3 engine, long window)
+        engine: Stretch engine name ('rubberband-cli', 'phase-vocoder', ...).
+                Default (None): first available engine for quality_preset
+                (see ENGINE_PREFERENCE)
 
     Returns:
         Time-stretched audio array (same format as input)
 
     Raises:
         InvalidStretchFactorError: If stretch_factor outside safe range [0.5, 2.0]
-        LibraryNotFoundError: If rubberband binary not found
+        LibraryNotFoundError: If the requested engine is not available
         ProcessingError: If time-stretching fails
 
     Example:
@@ -392,6 +946,13 @@ def time_stretch_audio(
     if sample_rate <= 0:
         raise ValueError(f"Invalid sample rate: {sample_rate}")
 
+    if audio.ndim > 2:
+        raise ProcessingError(
+            f"Unsupported audio shape {audio.shape}: expected (samples,) or (samples, channels)"
+        )
+
+    stretch_engine = get_stretch_engine(engine, quality_preset)
+
     # Log processing info
     duration_sec = len(audio) / sample_rate
     estimated_time = estimate_processing_time(duration_sec, stretch_factor, quality_preset)
@@ -399,12 +960,11 @@ def time_stretch_audio(
     logger.debug(
         f"Time-stretching: {duration_sec:.2f}s audio, "
         f"factor={stretch_factor:.2f}, quality={quality_preset}, "
-        f"estimated time={estimated_time:.1f}s"
+        f"engine={stretch_engine.name}, estimated time={estimated_time:.1f}s"
     )
 
     try:
-        # Use Rubberband CLI (bypasses pyrubberband stereo bug)
-        stretched = _time_stretch_with_rubberband_cli(
+        stretched = stretch_engine.stretch(
             audio, sample_rate, stretch_factor, quality_preset
         )
 
@@ -435,6 +995,115 @@ def time_stretch_audio(
 # Batch Processing Utilities
 # ============================================================================
 
+# Silence between concatenated segments in time_stretch_batch()
+# WHY: Longer than Rubberband's longest analysis window (R3 --window-long), so
+#      no segment's spectral smearing reaches its neighbour.
+BATCH_GUARD_SECONDS = 0.5
+
+
+def time_stretch_batch(
+    segments: List[np.ndarray],
+    sample_rate: int,
+    stretch_factor: float,
+    quality_preset: str = StretchQuality.EXPORT,
+    engine: Optional[str] = None,
+    concatenate: Optional[bool] = None,
+    guard_seconds: float = BATCH_GUARD_SECONDS
+) -> List[np.ndarray]:
+    """
+    Time-stretch many segments (e.g., all loops of one stem) at the same factor.
+
+    With concatenation, segments are joined with silent guard gaps, stretched in
+    a single engine call and split at the mapped boundaries
+    (output position = round(input position / stretch_factor)). Process spawn
+    and analysis start-up are paid once per batch instead of once per segment.
+
+    Args:
+        segments: Audio segments with identical channel layout
+        sample_rate: Sample rate in Hz
+        stretch_factor: Time-stretch factor (same for all segments)
+        quality_preset: Quality preset
+        engine: Stretch engine name (default: first available for quality_preset)
+        concatenate: Stretch in one call. Default (None): engine.batch_concatenate
+        guard_seconds: Silence between segments when concatenating
+
+    Returns:
+        List of stretched segments, each round(len(segment) / stretch_factor) long
+
+    Raises:
+        InvalidStretchFactorError: If stretch_factor outside safe range
+        ProcessingError: If segments are empty/inconsistent or stretching fails
+
+    Example:
+        >>> loops = [audio[start:end] for start, end in loop_grid]
+        >>> stretched_loops = time_stretch_batch(loops, 44100, 120 / 104)
+    """
+    validate_stretch_factor(stretch_factor)
+
+    if not segments:
+        return []
+
+    stretch_engine = get_stretch_engine(engine, quality_preset)
+    if concatenate is None:
+        concatenate = stretch_engine.batch_concatenate
+
+    if not concatenate or len(segments) == 1:
+        return [
+            time_stretch_audio(
+                segment, sample_rate, stretch_factor, quality_preset,
+                engine=stretch_engine.name
+            )
+            for segment in segments
+        ]
+
+    first = segments[0]
+    channel_shape = first.shape[1:]
+    if any(segment.shape[1:] != channel_shape for segment in segments):
+        raise ProcessingError("All segments in a batch must have the same channel layout")
+    if any(len(segment) == 0 for segment in segments):
+        raise ProcessingError("Batch contains an empty segment")
+
+    # Layout: [guard][seg 0][guard][seg 1] ... [seg N-1][guard]
+    guard = int(round(guard_seconds * sample_rate))
+    starts = []
+    position = guard
+    for segment in segments:
+        starts.append(position)
+        position += len(segment) + guard
+
+    combined = np.zeros((position,) + channel_shape, dtype=first.dtype)
+    for start, segment in zip(starts, segments):
+        combined[start:start + len(segment)] = segment
+
+    logger.debug(
+        f"Batch time-stretching {len(segments)} segments in one call "
+        f"({position / sample_rate:.2f}s incl. guards, engine={stretch_engine.name})"
+    )
+
+    stretched = time_stretch_audio(
+        combined, sample_rate, stretch_factor, quality_preset,
+        engine=stretch_engine.name
+    )
+
+    # Split at mapped boundaries (copies, so the combined buffer can be freed)
+    results = []
+    for start, segment in zip(starts, segments):
+        out_start = int(round(start / stretch_factor))
+        out_length = int(round(len(segment) / stretch_factor))
+        piece = stretched[out_start:out_start + out_length]
+
+        if len(piece) < out_length:
+            # Engine output slightly shorter than the nominal ratio: pad silence
+            padding = np.zeros((out_length - len(piece),) + piece.shape[1:], dtype=piece.dtype)
+            piece = np.concatenate([piece, padding])
+        else:
+            piece = piece.copy()
+
+        results.append(piece)
+
+    return results
+
+
 def time_stretch_file(
     input_path: Path,
     output_path: Path,
@@ -10,6 +10,7 @@ import os
 import fcntl
 import atexit
 import json
+import multiprocessing
 from pathlib import Path
 from typing import Optional, Callable
 
@@ -365,4 +366,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # WHY: Stretch workers are spawned processes; in a frozen bundle they
+    #      re-launch this executable and must not start the GUI.
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Player Benchmark - AudioPlayer performance without a sound card
+
+PURPOSE: Measure what limits playback on slow machines - load time, seek
+         latency, mix cost per block, allocations on the audio thread and the
+         missed-deadline (xrun) rate - for N stems x duration.
+
+CONTEXT: Runs AudioPlayer on the null output backend (core.null_output), so it
+         works on CI runners without audio hardware. Not collected by pytest;
+         tests/test_null_output.py runs a tiny configuration as a smoke test.
+
+ARCHITECTURE:
+    per (stems, duration):
+        write N synthetic stereo stems (16-bit WAV, temp dir)
+        load        AudioPlayer.load_stems() wall time
+        render      fast null stream over the track: callback time per block
+        allocations fast null stream + tracemalloc: transient heap per block
+        realtime    paced null stream: seeks (time until the new position is
+                    rendered) and deadline misses while playing
+
+USAGE:
+    python -m tests.benchmark_player
+    python -m tests.benchmark_player --stems 4 8 16 --duration 60 --json bench.json
+    python -m tests.benchmark_player --memory-mapped --max-xrun-rate 0.01
+"""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+from core.null_output import NullOutputStream, null_stream_factory
+from core.player import AudioPlayer, PlaybackState
+from core.stem_store import StemStore
+
+# Blocks rendered by the tracemalloc pass
+# WHY: Tracing slows mixing ~10x; steady state is reached within a few blocks
+ALLOCATION_BLOCKS = 200
+
+# Seconds to wait for a block before giving up (stalled stream)
+BLOCK_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one stems x duration configuration"""
+
+    stems: int
+    duration_seconds: float
+    sample_rate: int
+    blocksize: int
+    load_seconds: float
+    render_mean_us: float  # Callback time per block (fast, unpaced)
+    render_p99_us: float
+    render_max_us: float
+    dsp_load: float  # Mean render time / block period
+    realtime_factor: float  # Track seconds rendered per wall second
+    alloc_peak_kib_per_block: float  # Mean transient heap high-water per block
+    alloc_net_blocks: int  # Allocated blocks retained after rendering
+    seek_mean_ms: float  # set_position() until the new position is rendered
+    seek_max_ms: float
+    realtime_blocks: int
+    xruns: int  # Deadline misses while paced at real time
+    xrun_rate: float
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def write_stems(directory: Path, stems: int, duration: float, sample_rate: int) -> dict:
+    """
+    Write synthetic stereo stems (filtered noise bursts, ~-12 dBFS).
+
+    Args:
+        directory: Output directory
+        stems: Number of stems
+        duration: Length in seconds
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Dict stem_name -> file path, as AudioPlayer.load_stems() expects
+    """
+    rng = np.random.default_rng(0)
+    frames = int(duration * sample_rate)
+    files = {}
+    for index in range(stems):
+        noise = rng.standard_normal((frames, 2)).astype(np.float32)
+        # Cheap low-pass so stems differ in spectrum, not just seed
+        noise = np.cumsum(noise, axis=0) * (0.02 / (index + 1))
+        noise -= np.mean(noise, axis=0)
+        audio = np.clip(noise / (np.abs(noise).max() + 1e-9) * 0.25, -1.0, 1.0)
+        path = directory / f"stem_{index:02d}.wav"
+        sf.write(str(path), audio, sample_rate, subtype="PCM_16")
+        files[f"stem_{index:02d}"] = path
+    return files
+
+
+def _wait_until_finished(player: AudioPlayer, stream: NullOutputStream):
+    """Wait for the mixer to render the end of the play range"""
+    mixer = player._mixer
+    while not mixer.is_finished:
+        # The player stops the stream itself at the end of the track
+        if not stream.wait_blocks(1, BLOCK_TIMEOUT_SECONDS) and not mixer.is_finished:
+            raise RuntimeError("Null output stream stalled")
+
+
+def _measure_allocations(player: AudioPlayer, stream: NullOutputStream) -> tuple:
+    """Transient heap per callback and net retained blocks (tracemalloc)"""
+    peaks: List[int] = []
+    callback = stream.callback
+
+    def traced(outdata, frames, time_info, status):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        callback(outdata, frames, time_info, status)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+
+    stream.callback = traced
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        player.play()
+        stream.wait_blocks(ALLOCATION_BLOCKS, BLOCK_TIMEOUT_SECONDS * 10)
+        player.stop()
+    finally:
+        tracemalloc.stop()
+        stream.callback = callback
+    net_blocks = sys.getallocatedblocks() - blocks_before
+    # Skip warm-up blocks (first-use buffers, read-ahead window)
+    steady = peaks[len(peaks) // 4:] or peaks
+    return float(np.mean(steady)) / 1024 if steady else 0.0, net_blocks
+
+
+def _measure_realtime(
+    player: AudioPlayer,
+    stream: NullOutputStream,
+    seconds: float,
+    seeks: int
+) -> tuple:
+    """Seek latencies (s) while playing at real time, then (blocks, xruns)"""
+    mixer = player._mixer
+    rng = np.random.default_rng(1)
+    duration = player.get_duration()
+    latencies = []
+
+    stream.realtime = True
+    stream.reset_stats()
+    player.play()
+    started = time.perf_counter()
+    interval = seconds / (seeks + 1)
+
+    for _ in range(seeks):
+        time.sleep(interval)
+        if player.state != PlaybackState.PLAYING:
+            player.play()  # Reached the end of the track since the last seek
+        target = float(rng.uniform(0.0, duration * 0.9))
+        issued = time.perf_counter()
+        player.set_position(target)
+        serial = mixer._seek.serial if mixer._seek is not None else None
+        # The seek is done once a block rendered from the new region completes
+        while serial is not None:
+            if not stream.wait_blocks(1, BLOCK_TIMEOUT_SECONDS):
+                raise RuntimeError("Null output stream stalled")
+            if mixer._region.serial == serial:
+                break
+        latencies.append(time.perf_counter() - issued)
+
+    remaining = seconds - (time.perf_counter() - started)
+    if remaining > 0:
+        time.sleep(remaining)
+    player.stop()
+    return latencies, stream.blocks, stream.xruns
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def run_benchmark(
+    stems: int,
+    duration: float,
+    sample_rate: int = 44100,
+    realtime_seconds: float = 3.0,
+    seeks: int = 10,
+    memory_mapped: bool = False
+) -> BenchmarkResult:
+    """
+    Benchmark AudioPlayer for one configuration.
+
+    Args:
+        stems: Number of stems
+        duration: Track length in seconds
+        sample_rate: Sample rate in Hz
+        realtime_seconds: Wall time of the paced (xrun/seek) phase
+        seeks: Seeks issued during the paced phase
+        memory_mapped: Load through a StemStore (cold cache) instead of RAM
+
+    Returns:
+        BenchmarkResult
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="player_bench_"))
+    streams: List[NullOutputStream] = []
+    player = None
+    try:
+        files = write_stems(workdir, stems, duration, sample_rate)
+        store = StemStore(workdir / "store") if memory_mapped else None
+        player = AudioPlayer(
+            sample_rate,
+            stream_factory=null_stream_factory(realtime=False, streams=streams),
+            stem_store=store,
+        )
+
+        started = time.perf_counter()
+        if not player.load_stems(files):
+            raise RuntimeError("Loading stems failed")
+        load_seconds = time.perf_counter() - started
+
+        # Render: whole track, unpaced (the stream is created by play())
+        started = time.perf_counter()
+        player.play()
+        stream = streams[0]
+        _wait_until_finished(player, stream)
+        wall = time.perf_counter() - started
+        player.stop()
+        render = np.array(stream.render_seconds)
+        period = stream.period
+
+        alloc_kib, alloc_blocks = _measure_allocations(player, stream)
+        latencies, blocks, xruns = _measure_realtime(
+            player, stream, realtime_seconds, seeks
+        )
+
+        return BenchmarkResult(
+            stems=stems,
+            duration_seconds=duration,
+            sample_rate=sample_rate,
+            blocksize=stream.blocksize,
+            load_seconds=load_seconds,
+            render_mean_us=float(render.mean()) * 1e6,
+            render_p99_us=float(np.percentile(render, 99)) * 1e6,
+            render_max_us=float(render.max()) * 1e6,
+            dsp_load=float(render.mean()) / period,
+            realtime_factor=len(render) * period / wall if wall > 0 else 0.0,
+            alloc_peak_kib_per_block=alloc_kib,
+            alloc_net_blocks=alloc_blocks,
+            seek_mean_ms=float(np.mean(latencies)) * 1e3 if latencies else 0.0,
+            seek_max_ms=float(np.max(latencies)) * 1e3 if latencies else 0.0,
+            realtime_blocks=blocks,
+            xruns=xruns,
+            xrun_rate=xruns / blocks if blocks else 0.0,
+        )
+    finally:
+        if player is not None:
+            player.cleanup()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    """Render results as a fixed-width table"""
+    header = (
+        f"{'stems':>5} {'dur s':>6} {'load s':>7} {'mix us':>8} {'p99 us':>8} "
+        f"{'load %':>7} {'x rt':>7} {'KiB/blk':>8} {'seek ms':>8} {'xruns':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.stems:>5} {r.duration_seconds:>6.0f} {r.load_seconds:>7.2f} "
+            f"{r.render_mean_us:>8.0f} {r.render_p99_us:>8.0f} {r.dsp_load * 100:>7.1f} "
+            f"{r.realtime_factor:>7.0f} {r.alloc_peak_kib_per_block:>8.1f} "
+            f"{r.seek_mean_ms:>8.1f} {r.xruns:>4}/{r.realtime_blocks:<4}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point; returns the exit code"""
+    parser = argparse.ArgumentParser(description="AudioPlayer benchmark (null audio backend)")
+    parser.add_argument("--stems", type=int, nargs="+", default=[2, 6], help="Stem counts")
+    parser.add_argument("--duration", type=float, nargs="+", default=[30.0], help="Track lengths (s)")
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument("--realtime-seconds", type=float, default=3.0,
+                        help="Wall time of the paced phase per configuration")
+    parser.add_argument("--seeks", type=int, default=10)
+    parser.add_argument("--memory-mapped", action="store_true",
+                        help="Load stems through a StemStore (memory-mapped)")
+    parser.add_argument("--json", type=Path, help="Also write results as JSON")
+    parser.add_argument("--max-xrun-rate", type=float,
+                        help="Exit with 1 if any configuration exceeds this xrun rate")
+    args = parser.parse_args(argv)
+
+    results = []
+    for duration in args.duration:
+        for stems in args.stems:
+            results.append(run_benchmark(
+                stems, duration, args.sample_rate,
+                args.realtime_seconds, args.seeks, args.memory_mapped
+            ))
+
+    print(format_results(results))
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2))
+
+    if args.max_xrun_rate is not None:
+        worst = max(r.xrun_rate for r in results)
+        if worst > args.max_xrun_rate:
+            print(f"xrun rate {worst:.3%} exceeds {args.max_xrun_rate:.3%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
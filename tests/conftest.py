@@ -0,0 +1,30 @@
+"""
+Pytest fixtures shared by all tests
+
+PURPOSE: Keep test runs from writing into the working tree.
+CONTEXT: In a source checkout USER_DIR is the project root, so the stem and
+         stretch caches (config.STEM_CACHE_DIR / STRETCH_CACHE_DIR) would be
+         created under ./cache by any test that reaches get_player() or the
+         PlayerWidget stretch manager.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_dirs(tmp_path_factory):
+    """
+    Point the on-disk caches at a temporary directory for the whole session
+
+    WHY: Session scope - get_player() is a process-wide singleton, so its
+         StemStore must stay valid after the test that created it
+    """
+    import config
+    import core.player
+
+    cache_root = tmp_path_factory.mktemp("cache")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(config, "STEM_CACHE_DIR", cache_root / "stems")
+        patch.setattr(config, "STRETCH_CACHE_DIR", cache_root / "stretch")
+        patch.setattr(core.player, "STEM_CACHE_DIR", cache_root / "stems")
+        yield cache_root
@@ -3,7 +3,7 @@ Unit tests for core.background_stretch_manager module
 
 Tests cover:
 - Task creation and priority
-- Worker execution
+- Failure reporting
 - Background manager orchestration
 - Thread-safe result storage
 - Progress tracking
@@ -20,10 +20,10 @@ from PySide6.QtCore import QObject, QEventLoop, QTimer
 
 from core.background_stretch_manager import (
     StretchTask,
-    StretchWorker,
     BackgroundStretchManager,
     get_optimal_worker_count
 )
+from core.time_stretcher import StretchQuality
 
 
 # ============================================================================
@@ -113,87 +113,6 @@ def test_stretch_task_priority_ordering():
     assert first.stem_name == 'drums'
 
 
-# ============================================================================
-# Test: Worker Execution
-# ============================================================================
-
-def test_worker_successful_execution(qtbot, sample_audio_file):
-    """Test successful worker execution"""
-    task = StretchTask(
-        priority=0,
-        stem_name='drums',
-        loop_index=0,
-        loop_start=0.0,
-        loop_end=0.5,  # 0.5 second loop
-        stem_path=sample_audio_file,
-        original_bpm=104.0,
-        target_bpm=120.0,
-        sample_rate=44100,
-        task_id='drums_0_120'
-    )
-
-    worker = StretchWorker(task)
-
-    # Track completion
-    completed = []
-
-    def on_completed(task_id, audio):
-        completed.append((task_id, audio))
-
-    worker.task_completed.connect(on_completed)
-
-    # Start worker
-    worker.start()
-
-    # Wait for completion (with timeout)
-    qtbot.waitUntil(lambda: len(completed) > 0, timeout=10000)
-
-    # Verify result
-    assert len(completed) == 1
-    task_id, audio = completed[0]
-    assert task_id == 'drums_0_120'
-    assert audio.size > 0
-
-
-def test_worker_failure_handling(qtbot):
-    """Test worker error handling"""
-    # Create task with invalid file
-    task = StretchTask(
-        priority=0,
-        stem_name='drums',
-        loop_index=0,
-        loop_start=0.0,
-        loop_end=0.5,
-        stem_path=Path('/nonexistent/file.wav'),  # Invalid path
-        original_bpm=104.0,
-        target_bpm=120.0,
-        sample_rate=44100,
-        task_id='drums_0_120'
-    )
-
-    worker = StretchWorker(task)
-
-    # Track failures
-    failures = []
-
-    def on_failed(task_id, error):
-        failures.append((task_id, error))
-
-    worker.task_failed.connect(on_failed)
-
-    # Start worker
-    worker.start()
-
-    # Wait for failure
-    qtbot.waitUntil(lambda: len(failures) > 0, timeout=5000)
-
-    # Verify error was caught
-    assert len(failures) == 1
-    task_id, error = failures[0]
-    assert task_id == 'drums_0_120'
-    assert error != ''
-
-
 # ============================================================================
 # Test: Background Manager
 # ============================================================================
@@ -367,6 +286,99 @@ def test_background_manager_cancel(qtbot, stem_files, loop_segments):
     assert manager.is_running is False
 
 
+def test_background_manager_shutdown_stops_dispatcher(qtbot, stem_files, loop_segments):
+    """shutdown() ends the scheduler's dispatcher thread"""
+    manager = BackgroundStretchManager(max_workers=2)
+    manager.start_batch(
+        stem_files=stem_files,
+        loop_segments=loop_segments,
+        original_bpm=104,
+        target_bpm=120,
+        sample_rate=44100
+    )
+    dispatcher = manager.scheduler._dispatcher
+    assert dispatcher is not None and dispatcher.is_alive()
+
+    manager.shutdown()
+
+    dispatcher.join(timeout=5.0)
+    assert not dispatcher.is_alive()
+    assert manager.is_running is False
+
+
+def test_background_manager_progressive(qtbot, stem_files, loop_segments):
+    """Loops become playable as previews and are upgraded to export quality"""
+    manager = BackgroundStretchManager(max_workers=2, progressive=True)
+
+    all_completed = []
+    upgrades_completed = []
+    upgraded = []
+    manager.all_completed.connect(lambda: all_completed.append(manager.is_running))
+    manager.upgrades_completed.connect(lambda: upgrades_completed.append(True))
+    manager.task_upgraded.connect(lambda stem, idx, bpm: upgraded.append((stem, idx)))
+
+    manager.start_batch(
+        stem_files=stem_files,
+        loop_segments=loop_segments,
+        original_bpm=104,
+        target_bpm=120,
+        sample_rate=44100,
+        focus_loop=1
+    )
+
+    qtbot.waitUntil(lambda: len(upgrades_completed) > 0, timeout=30000)
+
+    # Playable before the upgrade pass finished
+    assert all_completed == [True]
+    assert manager.is_running is False
+    assert manager.completed_count == 4
+    assert sorted(upgraded) == [('drums', 0), ('drums', 1), ('vocals', 0), ('vocals', 1)]
+    assert manager.get_loop_quality('drums', 1, 120) == StretchQuality.EXPORT
+    assert manager.is_loop_ready('vocals', 0, 120, quality=StretchQuality.EXPORT)
+    assert manager.get_stretched_loop('drums', 0, 120, quality=StretchQuality.EXPORT) is not None
+
+
+def test_background_manager_playback_hints(qtbot, stem_files, loop_segments):
+    """Playback hints reach the scheduler and order the batch"""
+    manager = BackgroundStretchManager(max_workers=1)
+
+    completed = []
+    manager.task_completed.connect(lambda stem, idx, bpm: completed.append((stem, idx)))
+    manager.set_playback_hints(selected_loop=1, visible_loops=[1, 0, 1])
+
+    assert manager.scheduler.hints.visible == (0, 1)
+
+    manager.start_batch(
+        stem_files=stem_files,
+        loop_segments=loop_segments,
+        original_bpm=104,
+        target_bpm=120,
+        sample_rate=44100
+    )
+    qtbot.waitUntil(lambda: len(completed) == 4, timeout=30000)
+
+    assert completed[:2] == [('drums', 1), ('vocals', 1)]
+
+
+def test_background_manager_quality_filter(qtbot):
+    """Preview loops are not returned when export quality is required"""
+    manager = BackgroundStretchManager(max_workers=2, progressive=True)
+    audio = np.zeros((100, 2), dtype=np.float32)
+    task = StretchTask(
+        priority=0, stem_name='drums', loop_index=0, loop_start=0.0, loop_end=1.0,
+        stem_path=Path('drums.wav'), original_bpm=104, target_bpm=120,
+        sample_rate=44100, task_id='drums_0_120', quality_preset=StretchQuality.PREVIEW
+    )
+    manager.is_running = True
+    manager.total_tasks = 2
+
+    manager._on_scheduler_result(task, audio, None)
+
+    assert manager.is_loop_ready('drums', 0, 120)
+    assert not manager.is_loop_ready('drums', 0, 120, quality=StretchQuality.EXPORT)
+    assert manager.get_stretched_loop('drums', 0, 120, quality=StretchQuality.EXPORT) is None
+
+
 # ============================================================================
 # Test: Utility Functions
 # ============================================================================
@@ -470,3 +482,31 @@ def test_background_manager_get_all_completed(qtbot, stem_files, loop_segments):
     assert len(all_loops) == 4  # All 4 tasks (2 stems × 2 loops)
     assert 'drums_0_120' in all_loops
     assert 'vocals_1_120' in all_loops  # Loop indices: 0, 1
+
+
+# ============================================================================
+# Test: Failure Handling
+# ============================================================================
+
+def test_background_manager_failure_handling(qtbot):
+    """Unreadable stems are reported as failed and still complete the batch"""
+    manager = BackgroundStretchManager(max_workers=2)
+
+    all_completed = []
+    manager.all_completed.connect(lambda: all_completed.append(True))
+
+    manager.start_batch(
+        stem_files={'drums': Path('/nonexistent/file.wav')},
+        loop_segments=[(0.0, 0.25)],
+        original_bpm=104,
+        target_bpm=120,
+        sample_rate=44100
+    )
+
+    qtbot.waitUntil(lambda: len(all_completed) > 0, timeout=10000)
+
+    assert manager.is_running is False
+    assert manager.completed_count == 1
+    assert 'drums_0_120' in manager.failed_tasks
+    assert manager.failed_tasks['drums_0_120'] != ''
+    assert manager.get_stretched_loop('drums', 0, 120) is None
@@ -0,0 +1,143 @@
+"""
+Tests for cli.pipeline - Parallel per-stem loop export
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cli.pipeline import StemLooperPipeline
+from core.sampler_export import ExportResult
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Pipeline with four fake stem files and a fixed BPM"""
+    input_file = tmp_path / "song.wav"
+    input_file.touch()
+
+    pipe = StemLooperPipeline(
+        input_file=input_file,
+        output_dir=tmp_path / "out",
+        num_stems=4,
+        bpm_override=120,
+        jobs=4,
+    )
+    pipe._detected_bpm = 120.0
+    pipe._stem_files = {
+        name: tmp_path / f"{name}.wav" for name in StemLooperPipeline.STEM_NAMES[4]
+    }
+    return pipe
+
+
+class TestParallelExport:
+    """Tests for StemLooperPipeline.export_loops"""
+
+    def test_stems_run_concurrently(self, pipeline):
+        """Stems are exported on multiple threads at the same time"""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_export(**kwargs):
+            with lock:
+                active.append(kwargs["stem_name"])
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(kwargs["stem_name"])
+            return ExportResult(success=True, chunk_count=2)
+
+        with patch("cli.pipeline.export_sampler_loops", side_effect=fake_export):
+            results = pipeline.export_loops()
+
+        assert list(results) == StemLooperPipeline.STEM_NAMES[4]
+        assert all(r.success for r in results.values())
+        assert max(peak) > 1
+
+    def test_failure_isolated(self, pipeline):
+        """An exception in one stem does not cancel the others"""
+
+        def fake_export(**kwargs):
+            if kwargs["stem_name"] == "drums":
+                raise RuntimeError("decoder crashed")
+            return ExportResult(success=True, chunk_count=1)
+
+        with patch("cli.pipeline.export_sampler_loops", side_effect=fake_export):
+            results = pipeline.export_loops()
+
+        assert not results["drums"].success
+        assert "decoder crashed" in results["drums"].error_message
+        assert all(results[name].success for name in ("vocals", "bass", "other"))
+
+    def test_progress_aggregated(self, pipeline):
+        """Progress callbacks are serialized, bounded and end at 100"""
+        calls = []
+        in_callback = threading.Event()
+
+        def progress(message, percent):
+            assert not in_callback.is_set(), "callback entered concurrently"
+            in_callback.set()
+            calls.append(percent)
+            time.sleep(0.001)
+            in_callback.clear()
+
+        def fake_export(**kwargs):
+            for pct in (10, 50, 100):
+                kwargs["progress_callback"]("step", pct)
+            return ExportResult(success=True)
+
+        with patch("cli.pipeline.export_sampler_loops", side_effect=fake_export):
+            pipeline.export_loops(progress_callback=progress)
+
+        assert calls[-1] == 100
+        assert all(0 <= pct <= 100 for pct in calls)
+
+    def test_job_count(self, pipeline):
+        """Job count is clamped to the number of stems"""
+        pipeline.jobs = 16
+        assert pipeline._get_job_count(4) == 4
+        pipeline.jobs = 1
+        assert pipeline._get_job_count(4) == 1
+
+
+class TestStretchLoops:
+    """Tests for StemLooperPipeline.stretch_loops (headless process-pool stretching)"""
+
+    def test_writes_stretched_loops(self, tmp_path):
+        """Every full loop of every stem is stretched to the target tempo"""
+        import numpy as np
+        import soundfile as sf
+
+        sr = 44100
+        stem = (0.5 * np.sin(2 * np.pi * 220 * np.arange(5 * sr) / sr)).astype(np.float32)
+        stems_dir = tmp_path / "out" / "stems"
+        stems_dir.mkdir(parents=True)
+        for name in ("drums", "bass"):
+            sf.write(str(stems_dir / f"song_{name}.wav"), stem, sr)
+
+        pipe = StemLooperPipeline(
+            input_file=tmp_path / "song.wav",
+            output_dir=tmp_path / "out",
+            num_stems=4,
+            bars_per_loop=2,
+            bpm_override=240,
+        )
+
+        written = pipe.stretch_loops(300)
+
+        # 2 bars at 240 BPM = 2 s → two full loops per 5 s stem
+        assert written == {"drums": 2, "bass": 2}
+        files = sorted((tmp_path / "out" / "loops" / "300BPM").glob("*.wav"))
+        assert len(files) == 4
+        assert files[0].name == "song_bass_300BPM_2T_001.wav"
+        assert sf.info(str(files[0])).frames == round(2 * sr / 1.25)
+
+    def test_rejects_unsafe_factor(self, pipeline):
+        """Target tempos outside the safe stretch range are refused up front"""
+        from core.time_stretcher import InvalidStretchFactorError
+
+        with pytest.raises(InvalidStretchFactorError):
+            pipeline.stretch_loops(500)
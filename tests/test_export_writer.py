@@ -0,0 +1,192 @@
+"""
+Tests for core.export_writer - Allocation-free loop export writer
+"""
+
+import pytest
+import numpy as np
+import soundfile as sf
+
+from core.export_writer import LoopExportWriter, LoopMixWriter, get_subtype
+from utils.audio_processing import normalize_peak_to_dbfs, peak_normalization_gain
+
+
+@pytest.fixture
+def stereo_audio():
+    """1 second stereo sine at 44.1 kHz (float32)"""
+    sr = 44100
+    t = np.arange(sr) / sr
+    left = 0.5 * np.sin(2 * np.pi * 440 * t)
+    right = 0.25 * np.sin(2 * np.pi * 220 * t)
+    return np.stack([left, right], axis=1).astype(np.float32)
+
+
+class TestPeakNormalizationGain:
+    """Tests for peak_normalization_gain helper"""
+
+    def test_matches_normalize_peak_to_dbfs(self, stereo_audio):
+        """Gain applied manually equals normalize_peak_to_dbfs output"""
+        gain = peak_normalization_gain(stereo_audio, target_dbfs=-1.0)
+        np.testing.assert_allclose(
+            stereo_audio * gain, normalize_peak_to_dbfs(stereo_audio, -1.0), rtol=1e-6
+        )
+
+    def test_silent_and_empty(self):
+        """Silent or empty audio yields unity gain"""
+        assert peak_normalization_gain(np.zeros(100)) == 1.0
+        assert peak_normalization_gain(np.zeros(0)) == 1.0
+
+
+class TestLoopExportWriter:
+    """Tests for LoopExportWriter"""
+
+    def test_subtype_mapping(self):
+        """Bit depth maps to soundfile subtype"""
+        assert get_subtype(16) == "PCM_16"
+        assert get_subtype(24) == "PCM_24"
+        assert get_subtype(12) == "PCM_24"
+
+    def test_prepare_applies_gain(self, stereo_audio):
+        """Gain is applied without dither for 24-bit"""
+        writer = LoopExportWriter(sample_rate=44100, bit_depth=24, channels=2)
+        out = writer.prepare(stereo_audio, gain=0.5)
+
+        assert out.dtype == np.float32
+        np.testing.assert_allclose(out, stereo_audio * 0.5, rtol=1e-6)
+
+    def test_prepare_mono_to_stereo(self, stereo_audio):
+        """Mono input is duplicated into both output channels"""
+        mono = stereo_audio[:, 0].copy()
+        writer = LoopExportWriter(sample_rate=44100, bit_depth=24, channels=2)
+        out = writer.prepare(mono)
+
+        assert out.shape == (len(mono), 2)
+        np.testing.assert_array_equal(out[:, 0], out[:, 1])
+
+    def test_prepare_stereo_to_mono(self, stereo_audio):
+        """Stereo input is averaged to mono"""
+        writer = LoopExportWriter(sample_rate=44100, bit_depth=24, channels=1)
+        out = writer.prepare(stereo_audio)
+
+        assert out.ndim == 1
+        np.testing.assert_allclose(out, stereo_audio.mean(axis=1), atol=1e-7)
+
+    def test_dither_amplitude_bounded(self, stereo_audio):
+        """16-bit TPDF dither stays within ±2 LSB"""
+        writer = LoopExportWriter(sample_rate=44100, bit_depth=16, channels=2, seed=1)
+        out = writer.prepare(stereo_audio)
+
+        diff = out - stereo_audio
+        assert np.abs(diff).max() <= 2.0 / 32768.0 + 1e-7
+        assert np.abs(diff).max() > 0
+
+    def test_scratch_buffer_reused(self, stereo_audio):
+        """Chunks of equal or smaller size reuse the same scratch buffer"""
+        writer = LoopExportWriter(sample_rate=44100, bit_depth=16, channels=2, seed=1)
+
+        first = writer.prepare(stereo_audio[:22050])
+        second = writer.prepare(stereo_audio[22050:])
+        third = writer.prepare(stereo_audio[:1000])
+
+        assert writer.buffer_allocations == 1
+        assert np.shares_memory(first, second)
+        assert np.shares_memory(first, third)
+
+    def test_same_seed_bit_identical(self, stereo_audio, tmp_path):
+        """Same seed produces byte-identical 16-bit files"""
+        paths = []
+        for run in range(2):
+            writer = LoopExportWriter(
+                sample_rate=44100, bit_depth=16, channels=2, seed=1234
+            )
+            for idx, start in enumerate(range(0, 44100, 11025)):
+                path = tmp_path / f"run{run}_{idx}.wav"
+                writer.write(path, stereo_audio[start : start + 11025], gain=1.5)
+                paths.append(path)
+
+        half = len(paths) // 2
+        for a, b in zip(paths[:half], paths[half:]):
+            assert a.read_bytes() == b.read_bytes()
+
+    def test_different_seed_differs(self, stereo_audio, tmp_path):
+        """Different seeds produce different dither"""
+        a = LoopExportWriter(44100, bit_depth=16, channels=2, seed=1)
+        b = LoopExportWriter(44100, bit_depth=16, channels=2, seed=2)
+        a.write(tmp_path / "a.wav", stereo_audio)
+        b.write(tmp_path / "b.wav", stereo_audio)
+
+        assert (tmp_path / "a.wav").read_bytes() != (tmp_path / "b.wav").read_bytes()
+
+    def test_write_roundtrip(self, stereo_audio, tmp_path):
+        """Written file has expected format and content"""
+        writer = LoopExportWriter(sample_rate=44100, bit_depth=24, channels=2)
+        path = tmp_path / "out.wav"
+        frames = writer.write(path, stereo_audio, gain=0.8)
+
+        assert frames == len(stereo_audio)
+        info = sf.info(str(path))
+        assert info.subtype == "PCM_24"
+        assert info.frames == len(stereo_audio)
+
+        data, _ = sf.read(str(path), dtype="float32")
+        np.testing.assert_allclose(data, stereo_audio * 0.8, atol=1e-6)
+
+    def test_clips_out_of_range(self, tmp_path):
+        """Values above full scale are clipped before encoding"""
+        loud = np.full((100, 2), 0.9, dtype=np.float32)
+        writer = LoopExportWriter(sample_rate=44100, bit_depth=24, channels=2)
+        out = writer.prepare(loud, gain=2.0)
+
+        assert out.max() <= 1.0
+
+
+class TestLoopMixWriter:
+    """Tests for LoopMixWriter"""
+
+    def test_mix_matches_reference(self, stereo_audio, tmp_path):
+        """Mixed output equals the sum of stems (mono stems duplicated)"""
+        mono = stereo_audio[:, 0].copy() * 0.5
+        writer = LoopMixWriter(sample_rate=44100, bit_depth=32, channels=2)
+
+        writer.begin(len(stereo_audio))
+        writer.add(stereo_audio * 0.5)
+        writer.add(mono)
+        path = tmp_path / "mix.wav"
+        assert writer.write(path) == len(stereo_audio)
+
+        expected = stereo_audio * 0.5 + np.stack([mono, mono], axis=1)
+        data, _ = sf.read(str(path), dtype="float32")
+        np.testing.assert_allclose(data, expected, atol=1e-6)
+
+    def test_mono_output(self, stereo_audio):
+        """Mono output averages stereo stems"""
+        writer = LoopMixWriter(sample_rate=44100, channels=1)
+        mix = writer.begin(len(stereo_audio))
+        writer.add(stereo_audio)
+
+        np.testing.assert_allclose(mix, stereo_audio.mean(axis=1), atol=1e-7)
+
+    def test_peak_protection(self, tmp_path):
+        """Mix exceeding full scale is scaled to 0.95 peak"""
+        loud = np.full((100, 2), 0.8, dtype=np.float32)
+        writer = LoopMixWriter(sample_rate=44100, bit_depth=32, channels=2)
+        writer.begin(100)
+        writer.add(loud)
+        writer.add(loud)
+        writer.write(tmp_path / "loud.wav")
+
+        data, _ = sf.read(str(tmp_path / "loud.wav"), dtype="float32")
+        assert abs(np.abs(data).max() - 0.95) < 1e-6
+
+    def test_uneven_lengths_and_reuse(self, stereo_audio):
+        """Shorter stems are zero-padded and the buffer is reused across loops"""
+        writer = LoopMixWriter(sample_rate=44100, channels=2)
+
+        first = writer.begin(1000)
+        writer.add(stereo_audio[:1000])
+        writer.add(stereo_audio[:500])
+        np.testing.assert_allclose(first[500:], stereo_audio[500:1000])
+
+        second = writer.begin(800)
+        assert not second.any()
+        assert np.shares_memory(first, second)
+        assert writer.buffer_allocations == 1
@@ -0,0 +1,67 @@
+"""
+Tests for core.limiter - Look-ahead peak limiter
+"""
+
+import numpy as np
+import pytest
+
+from core.limiter import LookaheadLimiter
+
+
+def _limit(audio, block_frames, **kwargs):
+    """Run process_stream over audio split into block_frames blocks"""
+    limiter = LookaheadLimiter(44100, channels=audio.shape[0], **kwargs)
+    blocks = (audio[:, i:i + block_frames] for i in range(0, audio.shape[1], block_frames))
+    return np.concatenate(list(limiter.process_stream(blocks)), axis=1)
+
+
+@pytest.fixture
+def loud():
+    """One second of stereo noise peaking well above full scale"""
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal((2, 44100)) * 0.6).astype(np.float32)
+
+
+class TestLookaheadLimiter:
+    """Tests for LookaheadLimiter"""
+
+    def test_ceiling_holds(self, loud):
+        """No output sample exceeds the ceiling"""
+        out = _limit(loud, 512)
+
+        assert out.shape == loud.shape
+        assert np.abs(out).max() <= 0.95 + 1e-6
+
+    def test_transparent_below_ceiling(self, loud):
+        """Quiet audio passes unchanged (latency compensated)"""
+        quiet = loud * 0.2
+        np.testing.assert_array_equal(_limit(quiet, 1000), quiet)
+
+    def test_block_size_independent(self, loud):
+        """Output does not depend on how the signal is split into blocks"""
+        np.testing.assert_allclose(_limit(loud, 64), _limit(loud, 4096), atol=1e-6)
+
+    def test_gain_change_is_local(self):
+        """A single transient only turns down its surroundings"""
+        audio = np.full((1, 44100), 0.5, dtype=np.float32)
+        audio[0, 10000] = 4.0
+        out = _limit(audio, 512)
+
+        lookahead = LookaheadLimiter(44100).lookahead
+        assert abs(out[0, 10000]) <= 0.95 + 1e-6
+        # Untouched before the look-ahead window (+ interpolator taps) and after release
+        np.testing.assert_array_equal(out[0, :10000 - lookahead - 2], 0.5)
+        assert out[0, -1000:] == pytest.approx(0.5)
+
+    def test_latency_and_reset(self, loud):
+        """process() delays by latency frames; reset() clears the delay line"""
+        limiter = LookaheadLimiter(44100)
+        out = limiter.process(loud[:, :1000] * 0.1)
+
+        assert not out[:, :limiter.latency].any()
+        np.testing.assert_array_equal(
+            out[:, limiter.latency:], loud[:, :1000 - limiter.latency] * 0.1
+        )
+
+        limiter.reset()
+        assert not limiter.process(np.zeros((2, 10), dtype=np.float32)).any()
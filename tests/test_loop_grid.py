@@ -0,0 +1,132 @@
+"""
+Tests for utils.loop_grid - Sample-accurate loop boundaries
+"""
+
+import pytest
+import numpy as np
+
+from utils.loop_grid import LoopGrid, rescale_samples, seconds_to_samples
+from utils.beat_detection import calculate_loop_grid_from_downbeats
+
+
+class TestConversions:
+    """Tests for seconds_to_samples and rescale_samples"""
+
+    def test_seconds_to_samples_rounds_to_nearest(self):
+        """Float error below half a sample does not truncate to the previous sample"""
+        # 0.29999999999 * 44100 = 13229.99999...; int() would truncate to 13229
+        assert seconds_to_samples(0.1 * 3, 44100) == 13230
+        assert seconds_to_samples(0.29999999999, 44100) == 13230
+
+    def test_seconds_to_samples_array(self):
+        """Array input returns int64 array"""
+        result = seconds_to_samples(np.array([0.0, 0.5, 1.0]), 48000)
+        assert result.dtype == np.int64
+        np.testing.assert_array_equal(result, [0, 24000, 48000])
+
+    def test_rescale_exact(self):
+        """Integer rescaling is exact for whole seconds"""
+        assert rescale_samples(44100, 44100, 48000) == 48000
+        assert rescale_samples(96000, 48000, 44100) == 88200
+        assert rescale_samples(12345, 44100, 44100) == 12345
+
+    def test_rescale_negative(self):
+        """Negative indices (padded intro loops) rescale symmetrically"""
+        assert rescale_samples(-44100, 44100, 48000) == -48000
+
+
+class TestLoopGrid:
+    """Tests for LoopGrid"""
+
+    @pytest.fixture
+    def grid(self):
+        return LoopGrid.from_seconds([(-2.0, 0.0), (0.0, 2.0), (2.0, 4.0)], 44100)
+
+    def test_from_seconds(self, grid):
+        """Segments are converted to integer sample bounds"""
+        assert len(grid) == 3
+        assert grid[1] == (0, 88200)
+        assert list(grid)[2] == (88200, 176400)
+        np.testing.assert_array_equal(grid.lengths, [88200, 88200, 88200])
+
+    def test_bounds_read_only(self, grid):
+        """Bounds cannot be mutated through the public views"""
+        with pytest.raises(ValueError):
+            grid.starts[0] = 5
+
+    def test_adjacent_loops_share_boundary(self):
+        """End of loop N equals start of loop N+1 after rounding"""
+        bpm = 127.3
+        bar = 4 * 60.0 / bpm
+        segments = [(i * bar, (i + 1) * bar) for i in range(20)]
+        grid = LoopGrid.from_seconds(segments, 44100)
+        np.testing.assert_array_equal(grid.ends[:-1], grid.starts[1:])
+
+    def test_to_rate_roundtrip(self, grid):
+        """Conversion to another rate and back restores the original bounds"""
+        converted = grid.to_rate(48000)
+        assert converted[2] == (96000, 192000)
+        assert converted.to_rate(44100) == grid
+        assert grid.to_rate(44100) is grid
+
+    def test_valid_indices_and_select(self, grid):
+        """Loops with negative starts are filtered, original indices kept"""
+        valid = grid.valid_indices()
+        np.testing.assert_array_equal(valid, [1, 2])
+        subset = grid.select(valid)
+        assert len(subset) == 2
+        assert subset[0] == grid[1]
+
+    def test_clip(self, grid):
+        """Boundaries are clamped to the audio length"""
+        clipped = grid.clip(100000)
+        assert clipped[0] == (0, 0)
+        assert clipped[2] == (88200, 100000)
+
+    def test_slice_is_view(self, grid):
+        """Slicing returns a view with the exact loop length"""
+        audio = np.zeros((200000, 2), dtype=np.float32)
+        loop = grid.slice(audio, 1)
+        assert loop.shape == (88200, 2)
+        assert np.shares_memory(loop, audio)
+
+        channels_first = np.zeros((2, 200000), dtype=np.float32)
+        assert grid.slice(channels_first, 2, axis=1).shape == (2, 88200)
+
+    def test_slice_other_rate(self, grid):
+        """Slicing audio at a different rate uses rescaled bounds"""
+        audio = np.zeros(200000, dtype=np.float32)
+        assert len(grid.slice(audio, 1, sample_rate=48000)) == 96000
+
+    def test_to_seconds(self, grid):
+        """Grid converts back to float seconds"""
+        assert grid.to_seconds()[2] == (2.0, 4.0)
+
+    def test_concatenate(self, grid):
+        """Grids are joined in order at the requested rate"""
+        intro = grid.select([0])
+        main = grid.select([1, 2]).to_rate(48000)
+        joined = LoopGrid.concatenate([intro, main], 44100)
+        assert joined == grid
+        assert len(LoopGrid.concatenate([], 48000)) == 0
+
+    def test_mismatched_lengths(self):
+        """Mismatched starts/ends raise ValueError"""
+        with pytest.raises(ValueError):
+            LoopGrid([0, 10], [5], 44100)
+
+
+class TestLoopGridFromDownbeats:
+    """Tests for calculate_loop_grid_from_downbeats"""
+
+    def test_matches_float_segments(self):
+        """Grid bounds match the rounded float segments"""
+        downbeats = np.arange(0.0, 20.0, 2.0)
+        loop_grid, intro_grid = calculate_loop_grid_from_downbeats(
+            downbeats, bars_per_loop=2, audio_duration=20.0, sample_rate=44100
+        )
+
+        assert loop_grid.sample_rate == 44100
+        assert len(loop_grid) > 0
+        np.testing.assert_array_equal(loop_grid.ends[:-1], loop_grid.starts[1:])
+        assert loop_grid[0] == (0, 4 * 44100)
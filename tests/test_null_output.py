@@ -0,0 +1,158 @@
+"""
+Tests for core.null_output - Sound-card-free output backend
+"""
+
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from core.null_output import OUTPUT_UNDERFLOW, NullOutputStream, null_stream_factory
+from core.player import AudioPlayer, PlaybackState
+from core.stream_mixer import StreamingMixer
+
+
+@pytest.fixture
+def stem():
+    """Half a second of stereo noise (channels, samples)"""
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal((2, 22050)) * 0.2).astype(np.float32)
+
+
+def _mixer(stem, **factory_kwargs):
+    """Mixer on a null stream; returns (mixer, streams)"""
+    streams = []
+    mixer = StreamingMixer(
+        44100, blocksize=256, stream_factory=null_stream_factory(streams=streams, **factory_kwargs)
+    )
+    mixer.set_stems([stem])
+    return mixer, streams
+
+
+class TestNullOutputStream:
+    """Tests for NullOutputStream"""
+
+    def test_fast_mode_renders_track_to_file(self, stem, tmp_path):
+        """Unpaced stream renders the whole range; the file holds the mix"""
+        path = tmp_path / "out.wav"
+        mixer, streams = _mixer(stem, realtime=False, output_path=path)
+        mixer.play(0, stem.shape[1])
+        stream = streams[0]
+
+        while not mixer.is_finished:
+            assert stream.wait_blocks(1, timeout=5.0)
+        mixer.close()
+
+        assert stream.closed
+        assert len(stream.render_seconds) == stream.blocks
+        # Virtual clock follows the frames output
+        assert stream.time == pytest.approx(stream.frames / 44100)
+
+        written, rate = sf.read(str(path), dtype="float32")
+        assert rate == 44100
+        np.testing.assert_allclose(written[:stem.shape[1]], stem.T, atol=1e-6)
+        assert not written[stem.shape[1]:].any()
+
+    def test_realtime_pacing(self, stem):
+        """Paced stream consumes blocks no faster than the sample rate"""
+        mixer, streams = _mixer(stem)
+        mixer.play(0, stem.shape[1])
+        stream = streams[0]
+        started = stream.time
+
+        assert stream.wait_blocks(20, timeout=5.0)
+        elapsed = stream.time - started
+        mixer.stop()
+
+        assert not stream.active
+        assert elapsed >= 19 * stream.period
+
+    def test_late_block_counts_as_xrun(self):
+        """A callback slower than the block period is a deadline miss"""
+        statuses = []
+
+        def slow(outdata, frames, time_info, status):
+            statuses.append(status)
+            outdata.fill(0)
+            if len(statuses) == 2:
+                time.sleep(0.05)
+
+        stream = NullOutputStream(44100, 2, 64, slow, realtime=False)
+        stream.start()
+        assert stream.wait_blocks(4, timeout=5.0)
+        stream.close()
+
+        assert stream.xruns == 1
+        # Reported to the next callback, like a PortAudio underflow
+        assert statuses[2] == OUTPUT_UNDERFLOW
+        assert statuses[3] is None
+
+    def test_stop_is_idempotent_and_restartable(self, stem):
+        """stop() twice is harmless; start() resumes the pump"""
+        mixer, streams = _mixer(stem, realtime=False)
+        mixer.play(0, stem.shape[1])
+        stream = streams[0]
+        stream.stop()
+        stream.stop()
+        blocks = stream.blocks
+
+        stream.start()
+        assert stream.wait_blocks(1, timeout=5.0)
+        assert stream.blocks > blocks
+        stream.close()
+        with pytest.raises(RuntimeError):
+            stream.start()
+
+
+class TestNullBackendPlayer:
+    """AudioPlayer and the benchmark on the null backend"""
+
+    def test_player_plays_without_sound_card(self, stem, tmp_path):
+        """AudioPlayer plays through the null stream and tracks position"""
+        path = tmp_path / "drums.wav"
+        sf.write(str(path), stem.T, 44100)
+        streams = []
+        player = AudioPlayer(stream_factory=null_stream_factory(realtime=False, streams=streams))
+        try:
+            assert player.load_stems({"drums": path})
+            assert player.play() is True
+            # get_position() reads the audio clock and handles the end of track
+            for _ in range(1000):
+                if player.state != PlaybackState.PLAYING:
+                    break
+                streams[0].wait_blocks(1, timeout=5.0)
+                player.get_position()
+            assert player.state == PlaybackState.STOPPED
+            assert streams[0].frames >= stem.shape[1]
+        finally:
+            player.cleanup()
+
+    def test_backend_selected_by_config(self, monkeypatch):
+        """PLAYER_OUTPUT_BACKEND = "null" gives players a null stream"""
+        import core.player
+
+        monkeypatch.setattr(core.player, "PLAYER_OUTPUT_BACKEND", "null")
+        player = AudioPlayer()
+        try:
+            assert player._mixer is not None
+            factory = player._mixer._stream_factory
+            stream = factory(44100, 2, 256, lambda *args: None)
+            assert isinstance(stream, NullOutputStream)
+            stream.close()
+        finally:
+            player.cleanup()
+
+    @pytest.mark.slow
+    def test_benchmark_smoke(self):
+        """The benchmark runs end to end on a tiny configuration"""
+        from tests.benchmark_player import format_results, run_benchmark
+
+        result = run_benchmark(2, 2.0, realtime_seconds=0.5, seeks=2)
+
+        assert result.load_seconds > 0
+        assert result.render_mean_us > 0
+        assert result.realtime_blocks > 0
+        assert 0.0 <= result.xrun_rate <= 1.0
+        assert result.seek_max_ms < 1000
+        assert "stems" in format_results([result])
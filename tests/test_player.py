@@ -8,6 +8,7 @@ import soundfile as sf
 from pathlib import Path
 import tempfile
 import shutil
+import threading
 from unittest.mock import Mock, patch, MagicMock
 
 from core.player import (
@@ -133,6 +134,33 @@ class TestAudioPlayer:
         assert success is False
         assert len(player.stems) == 0
 
+    def test_load_stems_progressive(self, test_audio_files):
+        """Each stem joins the player as it is decoded; final order is the caller's"""
+        player = AudioPlayer()
+        ready = []
+
+        def on_stem_ready(name, count, total):
+            # Duration and settings are known before any stem is decoded
+            assert player.duration_samples == 88200
+            assert len(player.stem_settings) == total
+            assert name in player.stems
+            ready.append((count, total, len(player.stems)))
+
+        assert player.load_stems(test_audio_files, on_stem_ready=on_stem_ready)
+
+        assert sorted(ready) == [(1, 3, 1), (2, 3, 2), (3, 3, 3)]
+        assert list(player.stems) == list(test_audio_files)
+
+    def test_load_stems_failure_clears(self, test_audio_files, tmp_path):
+        """A stem that fails to decode fails the whole load"""
+        broken = tmp_path / "broken.wav"
+        broken.write_bytes(b"not audio")
+        player = AudioPlayer()
+
+        assert player.load_stems({**test_audio_files, "broken": broken}) is False
+        assert len(player.stems) == 0
+        assert len(player.stem_settings) == 0
+
     def test_load_stems_creates_settings(self, test_audio_files):
         """Test that loading stems creates settings"""
         player = AudioPlayer()
@@ -142,7 +170,7 @@ class TestAudioPlayer:
         assert all(isinstance(s, StemSettings) for s in player.stem_settings.values())
 
     def test_load_stems_padding(self, test_audio_files):
-        """Test that stems are padded to same length"""
+        """Test that shorter stems are zero-padded virtually (no copy)"""
         # Create a shorter stem
         temp_dir = test_audio_files["vocals"].parent
         short_file = temp_dir / "short.wav"
@@ -162,9 +190,15 @@ class TestAudioPlayer:
         player = AudioPlayer()
         player.load_stems(stems)
 
-        # All should have same length
-        lengths = [audio.shape[1] for audio in player.stems.values()]
-        assert len(set(lengths)) == 1
+        # Padding is virtual: the short stem keeps its length, reads past it are silent
+        assert player.stems["short"].shape[1] == samples
+        assert player.duration_samples == player.stems["vocals"].shape[1]
+
+        player.set_stem_solo("short", True)
+        mixed = player._mix_stems(samples - 100, samples + 100)
+        assert mixed.shape == (2, 200)
+        assert np.all(mixed[:, 100:] == 0)
+        assert np.any(mixed[:, :100] != 0)
 
     def test_get_position(self):
         """Test get position"""
@@ -311,7 +345,7 @@ class TestAudioPlayer:
 
         assert success is True
         assert player.state == PlaybackState.PLAYING
-        assert player._update_thread is not None
+        mock_mixer.play.assert_called_once()
 
         # Stop immediately
         player.stop()
@@ -415,6 +449,53 @@ class TestAudioPlayer:
         assert success is False
         assert not output_file.exists()
 
+    def test_export_mix_streamed_matches_mix(self, test_audio_files, tmp_path):
+        """Block-streamed export equals the in-memory mix (incl. peak protection)"""
+        player = AudioPlayer()
+        player.load_stems(test_audio_files)
+        output_file = tmp_path / "mix.wav"
+
+        with patch("core.player.EXPORT_BLOCK_FRAMES", 1000):
+            assert player.export_mix(output_file, bit_depth=32)
+
+        data, _ = sf.read(str(output_file), dtype="float32")
+        np.testing.assert_allclose(
+            data, player._mix_stems(0, player.duration_samples).T, atol=1e-6
+        )
+
+    def test_export_mix_chunked_streamed(self, test_audio_files, tmp_path):
+        """Chunks are contiguous, never longer than requested, and equal the mix"""
+        player = AudioPlayer()
+        player.load_stems(test_audio_files)
+
+        paths = player.export_mix_chunked(
+            tmp_path / "mix.wav", 0.5, bit_depth=32, common_filename="Song"
+        )
+
+        assert [p.name for p in paths][:2] == ["Song_01.wav", "Song_02.wav"]
+        chunks = [sf.read(str(p), dtype="float32")[0] for p in paths]
+        assert all(len(c) <= 22050 for c in chunks)
+        np.testing.assert_allclose(
+            np.concatenate(chunks),
+            player._mix_stems(0, player.duration_samples).T,
+            atol=1e-6,
+        )
+
+    def test_export_stems_chunked_applies_volume(self, test_audio_files, tmp_path):
+        """Stem chunks carry the stem volume; muted stems are skipped"""
+        player = AudioPlayer()
+        player.load_stems(test_audio_files)
+        player.set_stem_volume("bass", 0.5)
+        player.set_stem_mute("drums", True)
+
+        result = player.export_stems_chunked(tmp_path, 0.5, bit_depth=32)
+
+        assert set(result) == {"vocals", "bass"}
+        bass = np.concatenate(
+            [sf.read(str(p), dtype="float32")[0] for p in result["bass"]]
+        )
+        np.testing.assert_allclose(bass, player.stems["bass"].T * 0.5, atol=1e-6)
+
     def test_cleanup(self, test_audio_files):
         """Test cleanup"""
         player = AudioPlayer()
@@ -433,3 +514,152 @@ class TestAudioPlayer:
 
         assert player1 is player2
         assert isinstance(player1, AudioPlayer)
+
+
+@pytest.mark.unit
+class TestStreamingPlayback:
+    """AudioPlayer driven through a fake output stream"""
+
+    @pytest.fixture
+    def streaming_player(self, test_audio_files):
+        """Player with a fake stream factory; yields (player, streams)"""
+        from tests.test_stream_mixer import FakeOutputStream
+
+        streams = []
+
+        def factory(*args):
+            streams.append(FakeOutputStream(*args))
+            return streams[-1]
+
+        player = AudioPlayer(stream_factory=factory)
+        player.load_stems(test_audio_files)
+        yield player, streams
+        player.stop()
+
+    def test_play_streams_from_position(self, streaming_player):
+        """Playback renders the live mix from the current position"""
+        player, streams = streaming_player
+        player._mixer.limiter = None  # Compare the raw mix (see test_playback_limited)
+        player.position_samples = 1000
+        player.state = PlaybackState.PAUSED
+
+        assert player.play() is True
+        out = streams[0].pull()
+
+        gains = player._effective_gains()
+        expected = sum(
+            audio[:, 1000 : 1000 + len(out)] * g
+            for audio, g in zip(player.stems.values(), gains)
+        ).T
+        np.testing.assert_allclose(out, np.clip(expected, -1, 1), atol=1e-5)
+
+    def test_mute_applies_without_restart(self, streaming_player):
+        """Mute/solo update the running stream instead of restarting it"""
+        player, streams = streaming_player
+        player._mixer.limiter = None
+        player.play()
+        streams[0].pull()
+
+        player.set_stem_solo("bass", True)
+        out = streams[0].pull()
+
+        start = streams[0].blocksize
+        expected = player.stems["bass"][:, start : start + len(out)] * 0.75
+        np.testing.assert_allclose(out, expected.T, atol=1e-6)
+        assert len(streams) == 1
+        assert streams[0].starts == 1
+
+    def test_playback_limited(self, streaming_player):
+        """The live mix goes through the look-ahead limiter (delayed, under the ceiling)"""
+        player, streams = streaming_player
+        player.play()
+        out = streams[0].pull(blocks=8)
+
+        limiter = player._mixer.limiter
+        expected = sum(
+            audio[:, : len(out)] * g
+            for audio, g in zip(player.stems.values(), player._effective_gains())
+        )
+        assert np.abs(expected).max() > 1.0
+        assert np.abs(out).max() <= limiter.ceiling + 1e-6
+        assert not out[: limiter.latency].any()
+
+    def test_position_follows_audio_clock(self, streaming_player):
+        """Position comes from rendered frames"""
+        player, streams = streaming_player
+        player.play()
+        assert player.get_position() == 0.0  # Nothing rendered yet
+
+        streams[0].latency = 0.0
+        streams[0].pull(blocks=10)
+        latency = player._mixer.limiter.latency
+        assert player.get_position() == (10 * 512 - latency) / player.sample_rate
+
+    def test_track_end_stops_without_polling(self, streaming_player):
+        """The mixer reports the end; nobody has to call get_position()"""
+        player, streams = streaming_player
+        stopped = threading.Event()
+        player.state_callback = lambda state: (
+            stopped.set() if state == PlaybackState.STOPPED else None
+        )
+        player.play()
+        player.set_position(player.get_duration() - 0.001)
+        streams[0].pull(blocks=3)
+
+        assert stopped.wait(timeout=2.0)
+        assert player.state == PlaybackState.STOPPED
+        assert player.position_samples == 0
+        assert not streams[0].active
+
+    def test_seek_applies_within_one_block(self, streaming_player):
+        """Seeking while playing moves the stream read position"""
+        player, streams = streaming_player
+        player.play()
+        streams[0].pull()
+
+        player.set_position(1.0)
+        streams[0].pull()
+
+        assert player._mixer.position == 44100 + streams[0].blocksize
+        assert streams[0].starts == 1
+
+    def test_late_stem_joins_running_mix(self, streaming_player, test_audio_files):
+        """Stems loaded while playing are picked up at the next block"""
+        player, streams = streaming_player
+        player.play()
+
+        first = {"vocals": test_audio_files["vocals"]}
+        seen = []
+
+        def on_stem_ready(name, count, total):
+            seen.append(len(player._mixer._layers[0]))
+
+        # Reload with playback running: the mixer follows each stem
+        player.load_stems(test_audio_files, on_stem_ready=on_stem_ready)
+        assert seen == [1, 2, 3]
+        assert len(player._mixer._layers[1]) == 3
+
+        player.load_stems(first)
+        assert len(player._mixer._layers[0]) == 1
+
+    def test_pause_stops_stream(self, streaming_player):
+        """Pause stops the output stream"""
+        player, streams = streaming_player
+        player.play()
+        player.pause()
+
+        assert not streams[0].active
+
+    def test_repeat_loop_wraps_in_stream(self, streaming_player):
+        """Repeat loops wrap inside the stream - no restart, no tiled buffer"""
+        player, streams = streaming_player
+        player.set_loop_crossfade(1.0)
+
+        assert player.play_loop_samples(1000, 1300, repeat=True) is True
+        streams[0].pull(blocks=8)
+
+        mixer = player._mixer
+        assert mixer.loop_count >= 6
+        assert 1000 <= mixer.position < 1300
+        assert streams[0].starts == 1
+        assert player.loop_crossfade_samples == 44
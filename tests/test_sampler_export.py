@@ -2,10 +2,12 @@
 Tests for sampler_export module - Loop export functionality
 """
 
+import json
 import pytest
 import numpy as np
 import soundfile as sf
 from pathlib import Path
+from core.export_writer import read_wav_loop_markers
 from core.sampler_export import export_sampler_loops, detect_audio_bpm, ExportResult
 
 
@@ -403,3 +405,94 @@ class TestBPMDetection:
         # Should fallback to 120 BPM
         assert bpm == 120.0
         assert "error" in message.lower() or "default" in message.lower()
+
+
+class TestDitherSeed:
+    """Tests for reproducible 16-bit exports"""
+
+    def test_same_seed_bit_identical(self, temp_audio_file, tmp_path):
+        """Exports with the same dither seed are byte-identical"""
+        results = [
+            export_sampler_loops(
+                input_path=temp_audio_file,
+                output_dir=tmp_path / f"run{run}",
+                bpm=120,
+                bars=2,
+                sample_rate=44100,
+                bit_depth=16,
+                channels=2,
+                dither_seed=42,
+            )
+            for run in range(2)
+        ]
+
+        assert all(r.success for r in results)
+        for a, b in zip(results[0].output_files, results[1].output_files):
+            assert a.read_bytes() == b.read_bytes()
+
+
+class TestSingleContainerExport:
+    """Tests for single-container export (one WAV + cue/smpl + JSON index)"""
+
+    def test_container_matches_per_file_export(self, temp_audio_file, tmp_path):
+        """Container loops are sample-identical to the per-file export"""
+        per_file = export_sampler_loops(
+            input_path=temp_audio_file,
+            output_dir=tmp_path / "files",
+            bpm=120,
+            bars=2,
+        )
+        container = export_sampler_loops(
+            input_path=temp_audio_file,
+            output_dir=tmp_path / "container",
+            bpm=120,
+            bars=2,
+            single_container=True,
+        )
+
+        assert per_file.success and container.success
+        assert container.chunk_count == per_file.chunk_count
+        assert len(container.output_files) == 1
+        assert container.index_file.exists()
+
+        index = json.loads(container.index_file.read_text())
+        container_path = container.output_files[0]
+        assert index["file"] == container_path.name
+        assert len(index["loops"]) == per_file.chunk_count
+
+        for loop, chunk_path in zip(index["loops"], per_file.output_files):
+            loop_audio, _ = sf.read(
+                str(container_path), start=loop["start_sample"], stop=loop["end_sample"]
+            )
+            chunk_audio, _ = sf.read(str(chunk_path))
+            np.testing.assert_array_equal(loop_audio, chunk_audio)
+
+    def test_smpl_markers_match_index(self, temp_audio_file, tmp_path):
+        """smpl chunk loop regions match the JSON index"""
+        result = export_sampler_loops(
+            input_path=temp_audio_file,
+            output_dir=tmp_path,
+            bpm=120,
+            bars=2,
+            single_container=True,
+        )
+
+        index = json.loads(result.index_file.read_text())
+        markers = read_wav_loop_markers(result.output_files[0])
+        assert markers == [(l["start_sample"], l["end_sample"]) for l in index["loops"]]
+        # Container is still a valid audio file after appending chunks
+        assert sf.info(str(result.output_files[0])).frames == markers[-1][1]
+
+    def test_requires_wav(self, temp_audio_file, tmp_path):
+        """Non-WAV formats are rejected"""
+        result = export_sampler_loops(
+            input_path=temp_audio_file,
+            output_dir=tmp_path,
+            bpm=120,
+            bars=2,
+            file_format="FLAC",
+            single_container=True,
+        )
+
+        assert not result.success
+        assert "WAV" in result.error_message
@@ -0,0 +1,102 @@
+"""
+Tests for core.stem_store - Memory-mapped stem storage
+"""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+import os
+import time
+
+from core.stem_store import STALE_TEMP_SECONDS, StemStore
+from core.player import AudioPlayer
+
+
+@pytest.fixture
+def stem_file(tmp_path):
+    """0.5 second stereo stem at 44.1 kHz"""
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal((22050, 2)) * 0.2).astype(np.float32)
+    path = tmp_path / "vocals.wav"
+    sf.write(str(path), audio, 44100, subtype="FLOAT")
+    return path, audio
+
+
+class TestStemStore:
+    """Tests for StemStore"""
+
+    def test_load_is_memory_mapped(self, stem_file, tmp_path):
+        """Loaded stems are read-only (channels, frames) maps of the decoded audio"""
+        path, audio = stem_file
+        store = StemStore(tmp_path / "cache")
+        mapped = store.load(path)
+
+        assert mapped.shape == (2, 22050)
+        assert isinstance(mapped.base, np.memmap)
+        assert not mapped.flags.writeable
+        np.testing.assert_array_equal(mapped, audio.T)
+
+    def test_decoded_once(self, stem_file, tmp_path):
+        """A second load maps the existing cache file"""
+        path, _ = stem_file
+        store = StemStore(tmp_path / "cache")
+        store.load(path)
+        StemStore(tmp_path / "cache").load(path)
+        store.load(path)
+
+        assert store.decodes == 1
+        assert store.hits == 1
+        assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+    def test_mono_and_resample(self, tmp_path):
+        """Mono becomes stereo; a different target rate resamples"""
+        path = tmp_path / "mono.wav"
+        sf.write(str(path), np.zeros(4800, dtype=np.float32), 48000)
+        store = StemStore(tmp_path / "cache")
+
+        assert store.load(path).shape == (2, 4800)
+        assert store.load(path, sample_rate=44100).shape == (2, 4410)
+
+    def test_eviction(self, stem_file, tmp_path):
+        """Oldest files are removed above the size budget"""
+        path, audio = stem_file
+        other = tmp_path / "other.wav"
+        sf.write(str(other), audio, 44100, subtype="FLOAT")
+
+        store = StemStore(tmp_path / "cache", max_size_mb=0)
+        store.load(path)
+        latest = store.load(other)
+
+        assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+        np.testing.assert_array_equal(latest, audio.T)
+
+    def test_stale_temp_files_swept(self, stem_file, tmp_path):
+        """Temp files left by a crashed decode are removed; fresh ones are kept"""
+        path, _ = stem_file
+        cache = tmp_path / "cache"
+        cache.mkdir()
+        stale = cache / "tmpcrashed.tmp"
+        fresh = cache / "tmpwriting.tmp"
+        stale.write_bytes(b"x")
+        fresh.write_bytes(b"x")
+        old = time.time() - STALE_TEMP_SECONDS - 60
+        os.utime(stale, (old, old))
+
+        StemStore(cache).load(path)
+
+        assert not stale.exists()
+        assert fresh.exists()
+
+
+def test_player_with_stem_store(stem_file, tmp_path):
+    """AudioPlayer plays and exports from memory-mapped stems"""
+    path, audio = stem_file
+    player = AudioPlayer(stem_store=StemStore(tmp_path / "cache"))
+
+    assert player.load_stems({"vocals": path})
+    assert isinstance(player.stems["vocals"].base, np.memmap)
+
+    mixed = player._mix_stems(0, 1000)
+    np.testing.assert_allclose(mixed, audio[:1000].T * 0.75, atol=1e-6)
+    assert player.export_mix(tmp_path / "mix.wav")
@@ -0,0 +1,387 @@
+"""
+Tests for core.stream_mixer - Callback-driven real-time stem mixer
+"""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.limiter import LookaheadLimiter
+from core.stream_mixer import (
+    StreamingMixer,
+    compute_stem_gains,
+    mix_stems,
+    mix_stems_into,
+)
+from core.player import StemSettings
+
+
+class FakeOutputStream:
+    """Stand-in for sounddevice.OutputStream that is pulled by the test"""
+
+    def __init__(self, sample_rate, channels, blocksize, callback):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.callback = callback
+        self.active = False
+        self.closed = False
+        self.starts = 0
+        self.time = 1.0  # Stream clock (seconds)
+        self.latency = 0.01  # Output latency reported as DAC time
+
+    def start(self):
+        self.active = True
+        self.starts += 1
+
+    def stop(self):
+        self.active = False
+
+    def close(self):
+        self.closed = True
+
+    def pull(self, blocks=1, status=None):
+        """Run the callback like the audio device would; returns (frames, channels)"""
+        out = []
+        for _ in range(blocks):
+            buf = np.full((self.blocksize, self.channels), np.nan, dtype=np.float32)
+            time_info = SimpleNamespace(outputBufferDacTime=self.time + self.latency)
+            self.callback(buf, self.blocksize, time_info, status)
+            self.time += self.blocksize / self.sample_rate
+            out.append(buf)
+        return np.concatenate(out)
+
+
+@pytest.fixture
+def stems():
+    """Two 1-second stereo stems (channels, samples)"""
+    rng = np.random.default_rng(0)
+    a = (rng.standard_normal((2, 44100)) * 0.2).astype(np.float32)
+    b = (rng.standard_normal((2, 44100)) * 0.2).astype(np.float32)
+    return [a, b]
+
+
+@pytest.fixture
+def mixer(stems):
+    """Mixer with a fake stream; exposes the stream as mixer.fake"""
+    streams = []
+
+    def factory(*args):
+        streams.append(FakeOutputStream(*args))
+        return streams[-1]
+
+    m = StreamingMixer(44100, channels=2, blocksize=256, stream_factory=factory)
+    m.set_stems(stems)
+    m.set_gains([0.5, 0.25])
+    m.play(0, stems[0].shape[1])
+    m.fake = streams[0]
+    return m
+
+
+class TestStreamingMixer:
+    """Tests for StreamingMixer"""
+
+    def test_mix_matches_reference(self, mixer, stems):
+        """Blocks equal the gain-weighted sum of the stems"""
+        out = mixer.fake.pull(blocks=4)
+        expected = (stems[0][:, :1024] * 0.5 + stems[1][:, :1024] * 0.25).T
+
+        np.testing.assert_allclose(out, expected, atol=1e-6)
+        assert mixer.position == 1024
+
+    def test_gain_change_next_block(self, mixer, stems):
+        """A gain change applies to the very next block"""
+        mixer.fake.pull()
+        mixer.set_gains([0.0, 1.0])
+        out = mixer.fake.pull()
+
+        np.testing.assert_allclose(out, stems[1][:, 256:512].T, atol=1e-6)
+
+    def test_seek_next_block(self, mixer, stems):
+        """A seek applies to the very next block without restarting the stream"""
+        mixer.fake.pull()
+        mixer.seek(10000)
+        out = mixer.fake.pull()
+
+        expected = (stems[0][:, 10000:10256] * 0.5 + stems[1][:, 10000:10256] * 0.25).T
+        np.testing.assert_allclose(out, expected, atol=1e-6)
+        assert mixer.fake.starts == 1
+
+    def test_silence_after_end(self, mixer, stems):
+        """Frames past the end are silent and the mixer reports finished"""
+        mixer.play(44100 - 100, 44100)
+        out = mixer.fake.pull(blocks=2)
+
+        assert np.all(out[100:] == 0)
+        assert mixer.is_finished
+        assert mixer.position == 44100
+
+    def test_finished_callback_after_limiter_drains(self, stems):
+        """finished_callback runs once, after the delay line has been flushed"""
+        streams = []
+        finished = threading.Event()
+        calls = []
+
+        def on_finished():
+            calls.append(m.position)
+            finished.set()
+
+        def factory(*args):
+            streams.append(FakeOutputStream(*args))
+            return streams[-1]
+
+        m = StreamingMixer(
+            44100, blocksize=256, stream_factory=factory,
+            limiter=LookaheadLimiter(44100), finished_callback=on_finished
+        )
+        m.set_stems(stems)
+        m.play(44100 - 200, 44100)
+
+        # 200 frames of audio + 56 of silence: limiter (latency > 56) not drained
+        streams[0].pull()
+        assert not finished.wait(timeout=0.2)
+
+        streams[0].pull(blocks=3)
+        assert finished.wait(timeout=2.0)
+        m.close()
+        assert calls == [44100]
+
+    def test_finished_not_signalled_for_loops(self, stems):
+        """Loops never signal completion"""
+        streams = []
+        calls = []
+        m = StreamingMixer(
+            44100, blocksize=256,
+            stream_factory=lambda *args: streams.append(FakeOutputStream(*args)) or streams[-1],
+            finished_callback=lambda: calls.append(True)
+        )
+        m.set_stems(stems)
+        m.play(0, 1000, loop=True)
+        streams[0].pull(blocks=10)
+        m.close()
+
+        assert calls == []
+
+    def test_output_clipped(self, mixer):
+        """Summed output is hard-clipped to full scale"""
+        loud = np.full((2, 1000), 0.8, dtype=np.float32)
+        mixer.set_stems([loud, loud])
+        mixer.set_gains([1.0, 1.0])
+        mixer.play(0, 1000)
+
+        assert mixer.fake.pull().max() == 1.0
+
+    def test_no_allocation_per_block(self, mixer):
+        """The scratch buffer is reused across blocks"""
+        scratch = mixer._scratch
+        mixer.fake.pull(blocks=8)
+
+        assert mixer._scratch is scratch
+
+    def test_playback_position_from_audio_clock(self, mixer):
+        """Position is the last block's first frame advanced by stream time since its DAC time"""
+        mixer.fake.pull(blocks=4)
+        dac_time = mixer._clock.dac_time
+
+        assert mixer.frames_output == 1024
+        assert mixer.playback_position(now=dac_time - 1.0) == 768 - 256  # At most one block back
+        assert mixer.playback_position(now=dac_time) == 768
+        assert mixer.playback_position(now=dac_time + 100 / 44100) == 768 + 100
+        assert mixer.playback_position(now=dac_time + 1.0) == 768 + 256
+        # The stream's own clock is used by default (one block on, minus latency)
+        assert mixer.playback_position() == 768 + 256 - round(0.01 * 44100)
+
+        mixer.seek(5000)
+        assert mixer.playback_position() == 5000
+
+    def test_playback_position_wraps_in_loop(self, mixer):
+        """Extrapolation past loop end wraps to loop start"""
+        mixer.play(1000, 1300, loop=True)
+        mixer.fake.pull(blocks=2)  # Second block starts at 1256
+
+        dac_time = mixer._clock.dac_time
+        assert mixer.playback_position(now=dac_time) == 1256
+        assert mixer.playback_position(now=dac_time + 100 / 44100) == 1056
+
+    def test_stream_reused_and_xruns(self, mixer):
+        """stop/play reuses the open stream; callback status counts as xrun"""
+        mixer.stop()
+        mixer.play(0, 1000)
+        mixer.fake.pull(status="output underflow")
+
+        assert mixer.fake.starts == 2
+        assert mixer.xruns == 1
+
+        mixer.close()
+        assert mixer.fake.closed
+        assert not mixer.is_active
+
+
+class TestStreamingMixerLoop:
+    """Tests for gapless loop playback"""
+
+    def test_loop_wraps_sample_accurately(self, mixer, stems):
+        """Output is the loop region repeated with no gap"""
+        mixer.play(1000, 1300, loop=True)
+        out = mixer.fake.pull(blocks=4)
+
+        region = stems[0][:, 1000:1300] * 0.5 + stems[1][:, 1000:1300] * 0.25
+        expected = np.tile(region.T, (4, 1))[: len(out)]
+        np.testing.assert_allclose(out, expected, atol=1e-6)
+        assert mixer.loop_count == 3
+        assert not mixer.is_finished
+
+    def test_loop_from_inside_region(self, mixer):
+        """Playback can start mid-loop and wraps to loop_start"""
+        mixer.play(1200, 1300, loop=True, loop_start=1000)
+        mixer.fake.pull()
+
+        assert mixer.position == 1000 + (256 - 100)
+        assert mixer.fake.starts == 1
+
+    def test_crossfade_blends_preroll(self, mixer):
+        """The loop tail fades into the samples leading up to loop_start"""
+        ramp = np.tile(np.arange(2000, dtype=np.float32) / 2000, (2, 1))
+        mixer.set_stems([ramp])
+        mixer.set_gains([1.0])
+        mixer.play(1000, 1500, loop=True, crossfade=100)
+        out = mixer.fake.pull(blocks=4)[:, 0]
+
+        # Before the fade: untouched; at the wrap: continuous ramp resumes
+        np.testing.assert_allclose(out[:400], ramp[0, 1000:1400], atol=1e-6)
+        np.testing.assert_allclose(out[500:600], ramp[0, 1000:1100], atol=1e-6)
+        # Crossfade ends on the pre-roll value; no jump like a hard wrap (0.25)
+        assert abs(out[499] - ramp[0, 999]) < 0.01
+        assert np.abs(np.diff(out[380:520])).max() < 0.02
+
+    def test_crossfade_at_track_start(self, mixer, stems):
+        """A loop at sample 0 fades its tail against silence"""
+        mixer.play(0, 500, loop=True, crossfade=64)
+        out = mixer.fake.pull(blocks=2)
+
+        assert np.all(np.isfinite(out))
+        assert np.abs(out[499]).max() < np.abs(out[:436]).max()
+
+    def test_seek_keeps_loop(self, mixer):
+        """Seeking inside a loop keeps wrapping at loop end"""
+        mixer.play(1000, 1300, loop=True)
+        mixer.fake.pull()
+        mixer.seek(1250)
+        mixer.fake.pull()
+
+        assert 1000 <= mixer.position < 1300
+        assert mixer.loop_count >= 1
+
+
+class TestStreamingMixerReadAhead:
+    """Tests for the per-stem read-ahead window"""
+
+    @pytest.fixture
+    def six_stems(self):
+        """Six 3-second stereo stems at 48 kHz"""
+        rng = np.random.default_rng(1)
+        return [(rng.standard_normal((2, 144000)) * 0.1).astype(np.float32) for _ in range(6)]
+
+    @pytest.fixture
+    def ahead_mixer(self, six_stems):
+        streams = []
+
+        def factory(*args):
+            streams.append(FakeOutputStream(*args))
+            return streams[-1]
+
+        m = StreamingMixer(48000, blocksize=256, stream_factory=factory, read_ahead_seconds=2.0)
+        m.set_stems(six_stems)
+        # WHY: Refills are driven explicitly - stop the background thread
+        m._start_read_ahead = lambda: None
+        m.play(0, 144000)
+        m.fake = streams[0]
+        yield m
+        m.close()
+
+    def test_toggle_audible_next_block_from_ram(self, ahead_mixer, six_stems):
+        """A solo toggle is heard in the next block, mixed from the RAM window"""
+        assert ahead_mixer.refill_read_ahead()
+        ahead_mixer.fake.pull()
+
+        gains = [0.0, 0.0, 1.0, 0.0, 0.0, 0.0]
+        ahead_mixer.set_gains(gains)
+        out = ahead_mixer.fake.pull()
+
+        np.testing.assert_allclose(out, six_stems[2][:, 256:512].T, atol=1e-6)
+        assert ahead_mixer.read_ahead_hits == 2
+        assert ahead_mixer.read_ahead_misses == 0
+
+    def test_seek_outside_window_reads_stems(self, ahead_mixer, six_stems):
+        """Blocks outside the window fall back to the stems, then the window follows"""
+        ahead_mixer.refill_read_ahead()
+        ahead_mixer.seek(120000)
+        out = ahead_mixer.fake.pull()
+
+        expected = sum(stem[:, 120000:120256] for stem in six_stems).T
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+        assert ahead_mixer.read_ahead_misses == 1
+
+        assert ahead_mixer.refill_read_ahead()
+        assert ahead_mixer._ahead.start == 120256
+        assert ahead_mixer._ahead.end == 144000
+        assert not ahead_mixer.refill_read_ahead()  # Still covers the next second
+
+    def test_short_loop_copied_whole(self, ahead_mixer):
+        """A loop shorter than the window (plus its pre-roll) wraps inside it"""
+        ahead_mixer.play(1000, 5000, loop=True, crossfade=64)
+        ahead_mixer.refill_read_ahead()
+
+        assert (ahead_mixer._ahead.start, ahead_mixer._ahead.end) == (1000 - 64, 5000)
+        ahead_mixer.fake.pull(blocks=40)
+        assert ahead_mixer.loop_count >= 2
+        assert ahead_mixer.read_ahead_misses == 0
+        assert not ahead_mixer.refill_read_ahead()
+
+
+class TestMixingKernel:
+    """Tests for mix_stems_into / mix_stems"""
+
+    def test_matches_reference_any_chunk_size(self, stems):
+        """In-place chunked accumulation equals the naive weighted sum"""
+        expected = stems[0][:, 100:5100] * 0.5 + stems[1][:, 100:5100] * 0.25
+
+        for chunk in (1, 333, 4096, 5000):
+            out = np.zeros((2, 5000), dtype=np.float32)
+            scratch = np.empty((2, chunk), dtype=np.float32)
+            peak = mix_stems_into(out, stems, [0.5, 0.25], 100, scratch, track_peak=True)
+
+            np.testing.assert_allclose(out, expected, atol=1e-6)
+            assert peak == pytest.approx(np.abs(expected).max())
+
+    def test_uneven_lengths_and_skipped_gain(self, stems):
+        """Short stems read as silence past their end; zero-gain stems are skipped"""
+        short = stems[0][:, :1000]
+        mixed = mix_stems([short, stems[1]], [1.0, 0.0], 900, 1100, 44100)
+
+        np.testing.assert_allclose(mixed[:, :100], short[:, 900:], atol=1e-7)
+        assert not mixed[:, 100:].any()
+
+    def test_peak_limited(self):
+        """A mix above the ceiling is limited to it"""
+        loud = np.full((2, 2000), 0.8, dtype=np.float32)
+        mixed = mix_stems([loud, loud], [1.0, 1.0], 0, 2000, 44100)
+
+        assert mixed.dtype == np.float32
+        assert np.abs(mixed).max() == pytest.approx(0.95, abs=1e-5)
+
+
+class TestComputeStemGains:
+    """Tests for compute_stem_gains"""
+
+    def test_mute_solo_volume(self):
+        """Solo silences other stems, mute wins over solo, master scales"""
+        settings = [
+            StemSettings(volume=0.5),
+            StemSettings(volume=0.8, is_solo=True),
+            StemSettings(volume=1.0, is_solo=True, is_muted=True),
+        ]
+
+        assert compute_stem_gains(settings, master_volume=0.5) == [0.0, 0.4, 0.0]
@@ -6,13 +6,25 @@ Tests cover:
 - LRU eviction
 - Size management
 - Statistics tracking
+- Thread safety
+- Disk tier and persistent keys
 - Edge cases
 """
 
 import pytest
 import numpy as np
 
-from core.stretch_cache import StretchCache, create_cache, CACHE_SIZE_LARGE
+from core.stretch_cache import (
+    CACHE_SIZE_LARGE,
+    STORAGE_INT16,
+    STORAGE_INT24,
+    DiskStretchStore,
+    PackedAudio,
+    StretchCache,
+    compute_content_hash,
+    create_cache,
+    make_loop_cache_key,
+)
 
 
 # ============================================================================
@@ -302,6 +314,216 @@ def test_cache_get_lru_order(cache, small_audio):
     assert lru_order == ['a', 'b', 'c']
 
 
+def test_lru_order_after_replace(cache, small_audio):
+    """Re-putting a key moves it to the most recently used position"""
+    for key in ('a', 'b', 'c'):
+        cache.put(key, small_audio)
+
+    cache.put('a', small_audio)
+
+    assert cache.get_lru_order() == ['b', 'c', 'a']
+    assert cache.current_size_bytes == 3 * small_audio.nbytes
+
+
+# ============================================================================
+# Test: Thread Safety
+# ============================================================================
+
+def test_concurrent_put_get():
+    """Concurrent writers and readers keep size accounting consistent"""
+    import threading
+
+    cache = StretchCache(max_size_mb=1)
+    audio = np.zeros(10000, dtype=np.float32)  # 40 KB → ~26 items fit
+
+    def worker(offset):
+        for i in range(500):
+            cache.put(f'item{(offset + i) % 64}', audio)
+            cache.get(f'item{(offset + 2 * i) % 64}')
+
+    threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()
+    assert cache.current_size_bytes == stats['item_count'] * audio.nbytes
+    assert cache.current_size_bytes <= cache.max_size_bytes
+    assert len(cache.get_lru_order()) == stats['item_count']
+    assert stats['hits'] + stats['misses'] == 8 * 500
+
+
+# ============================================================================
+# Test: Disk Tier
+# ============================================================================
+
+def test_disk_tier_survives_restart(tmp_path, small_audio):
+    """A new cache on the same directory serves loops from disk (memory-mapped)"""
+    first = StretchCache(max_size_mb=10, disk_dir=tmp_path)
+    first.put('drums_0_120', small_audio)
+
+    second = StretchCache(max_size_mb=10, disk_dir=tmp_path)
+    assert second.has('drums_0_120')
+
+    audio = second.get('drums_0_120')
+    assert isinstance(audio, np.memmap)
+    assert audio.dtype == np.float32
+    np.testing.assert_array_equal(audio, small_audio)
+
+    stats = second.get_stats()
+    assert stats['disk_hits'] == 1
+    assert stats['hits'] == 1
+    assert stats['disk_item_count'] == 1
+
+    # Promoted to RAM: second access is a RAM hit
+    second.get('drums_0_120')
+    assert second.get_stats()['disk_hits'] == 1
+
+
+def test_disk_tier_after_ram_eviction(tmp_path, sample_audio):
+    """Loops evicted from RAM are still served by the disk tier"""
+    cache = StretchCache(max_size_mb=5, disk_dir=tmp_path)
+    cache.put('a', sample_audio)
+    cache.put('b', sample_audio)  # Evicts 'a' from RAM
+
+    assert 'a' not in cache.get_keys()
+    np.testing.assert_array_equal(cache.get('a'), sample_audio)
+
+
+def test_disk_tier_size_bound(tmp_path, small_audio):
+    """Disk tier evicts the least recently used files beyond its limit"""
+    store = DiskStretchStore(tmp_path, max_size_mb=1)  # ~2 loops of 350 KB
+
+    for key in ('a', 'b', 'c'):
+        store.put(key, small_audio)
+
+    assert store.current_size_bytes <= store.max_size_bytes
+    assert not store.has('a')
+    assert store.has('c')
+    assert len(list(tmp_path.glob('*.npy'))) == len(store)
+
+
+def test_disk_tier_converts_to_float32(tmp_path):
+    """Disk entries are stored as float32"""
+    store = DiskStretchStore(tmp_path)
+    store.put('k', np.ones((100, 2), dtype=np.float64))
+
+    assert store.get('k').dtype == np.float32
+
+
+# ============================================================================
+# Test: Packed Storage
+# ============================================================================
+
+@pytest.mark.parametrize('storage,bits', [(STORAGE_INT16, 16), (STORAGE_INT24, 24)])
+def test_packed_roundtrip(storage, bits):
+    """Packed audio decodes within half an LSB of the entry peak"""
+    audio = (0.1 * np.random.randn(44100, 2)).astype(np.float32)
+    packed = PackedAudio(audio, storage)
+
+    decoded = packed.decode()
+    peak = np.abs(audio).max()
+    assert decoded.dtype == np.float32
+    assert decoded.shape == audio.shape
+    lsb = peak / (2 ** (bits - 1) - 1)
+    # Half an LSB of quantisation plus float32 rounding
+    assert np.abs(decoded - audio).max() <= 0.5 * lsb + peak * np.finfo(np.float32).eps
+    assert packed.nbytes == audio.nbytes * bits // 32
+
+
+def test_packed_silence_and_mono():
+    """Silent and mono entries survive packing"""
+    silent = PackedAudio(np.zeros(100, dtype=np.float32), STORAGE_INT24)
+    assert not silent.decode().any()
+
+    mono = np.linspace(-1, 1, 101, dtype=np.float32)
+    np.testing.assert_allclose(PackedAudio(mono, STORAGE_INT24).decode(), mono, atol=1e-6)
+
+
+def test_packed_cache_holds_more_loops(sample_audio):
+    """int16 storage fits twice as many loops in the same budget"""
+    float_cache = StretchCache(max_size_mb=10)
+    packed_cache = StretchCache(max_size_mb=10, storage=STORAGE_INT16)
+
+    for i in range(5):
+        float_cache.put(f'loop{i}', sample_audio)
+        packed_cache.put(f'loop{i}', sample_audio)
+
+    assert float_cache.get_stats()['item_count'] == 2
+    assert packed_cache.get_stats()['item_count'] == 5
+    assert packed_cache.get_stats()['storage'] == STORAGE_INT16
+    np.testing.assert_allclose(
+        packed_cache.get('loop4'), sample_audio, atol=np.abs(sample_audio).max() / 32767
+    )
+
+
+def test_packed_cache_decodes_on_get(small_audio):
+    """Packed entries are stored packed and decoded into fresh arrays"""
+    cache = StretchCache(max_size_mb=10, storage=STORAGE_INT24)
+    cache.put('a', small_audio)
+
+    assert isinstance(cache.cache['a'], PackedAudio)
+    first = cache.get('a')
+    first[:] = 0
+    assert cache.get('a').any()
+
+
+def test_invalid_storage():
+    """Unknown storage formats are rejected"""
+    with pytest.raises(ValueError):
+        StretchCache(storage='int8')
+
+
+def test_replace_swaps_entries(tmp_path, small_audio):
+    """replace() drops the old entry from both tiers and stores the new one"""
+    cache = StretchCache(max_size_mb=10, disk_dir=tmp_path)
+    cache.put('preview', small_audio, persist=False)
+    cache.disk.put('preview', small_audio)
+
+    upgrade = small_audio * 0.5
+    cache.replace('preview', 'export', upgrade)
+
+    assert not cache.has('preview')
+    np.testing.assert_array_equal(cache.get('export'), upgrade)
+    assert cache.disk.has('export')
+    assert cache.get_stats()['size_mb'] * 1024 * 1024 == small_audio.nbytes
+
+
+def test_clear_and_remove_disk(tmp_path, small_audio):
+    """remove() deletes both tiers; clear() keeps disk unless requested"""
+    cache = StretchCache(max_size_mb=10, disk_dir=tmp_path)
+    cache.put('a', small_audio)
+    cache.put('b', small_audio)
+
+    assert cache.remove('a') is True
+    assert not cache.has('a')
+
+    cache.clear()
+    assert cache.has('b')
+    cache.clear(include_disk=True)
+    assert not cache.has('b')
+    assert list(tmp_path.glob('*.npy')) == []
+
+
+def test_loop_cache_key_and_content_hash(tmp_path):
+    """Keys change with content, bounds, BPM, quality and engine version"""
+    path = tmp_path / 'stem.wav'
+    path.write_bytes(b'audio-1')
+    hash_1 = compute_content_hash(path)
+    path.write_bytes(b'audio-2-longer')
+    hash_2 = compute_content_hash(path)
+    assert hash_1 != hash_2
+
+    base = (hash_2, 0, 88200, 44100, 104, 120, 'export', 'phase-vocoder:2')
+    key = make_loop_cache_key(*base)
+    assert key == make_loop_cache_key(*base)
+    for index, value in enumerate([hash_1, 1, 88201, 48000, 100, 121, 'preview', 'rubberband-cli:3']):
+        changed = list(base)
+        changed[index] = value
+        assert make_loop_cache_key(*changed) != key
+
+
 # ============================================================================
 # Test: Edge Cases
 # ============================================================================
@@ -337,8 +559,14 @@ def test_cache_different_dtypes(cache):
     cache.put('f32', audio_float32)
     cache.put('f64', audio_float64)
 
+    # Entries are normalised to float32 C-contiguous
     assert cache.get('f32').dtype == np.float32
-    assert cache.get('f64').dtype == np.float64
+    assert cache.get('f64').dtype == np.float32
+    assert cache.get_stats()['size_mb'] * 1024 * 1024 == 2 * 1000 * 4
+
+    strided = np.random.randn(2, 1000).astype(np.float32).T
+    cache.put('strided', strided)
+    assert cache.get('strided').flags['C_CONTIGUOUS']
 
 
 def test_cache_has_no_side_effects(cache, small_audio):
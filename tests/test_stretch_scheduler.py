@@ -0,0 +1,334 @@
+"""
+Tests for core.stretch_scheduler - Qt-independent process-pool stretching
+"""
+
+import threading
+
+import pytest
+import numpy as np
+import soundfile as sf
+
+from core.stretch_scheduler import (
+    PlaybackHints,
+    StretchScheduler,
+    build_stretch_tasks,
+    get_optimal_worker_count,
+    hint_priority,
+)
+from core.time_stretcher import StretchQuality
+from utils.loop_grid import LoopGrid
+
+
+@pytest.fixture
+def stem_file(tmp_path):
+    """1 second stereo tone at 44.1 kHz"""
+    sr = 44100
+    t = np.arange(sr) / sr
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    path = tmp_path / "drums.wav"
+    sf.write(str(path), np.stack([tone, tone], axis=1), sr, subtype="FLOAT")
+    return path
+
+
+class _Collector:
+    """Records scheduler callbacks"""
+
+    def __init__(self):
+        self.completed = {}
+        self.failed = {}
+        self.order = []
+        self.finished = threading.Event()
+        self.lock = threading.Lock()
+
+    def on_completed(self, task, audio):
+        with self.lock:
+            self.completed[task.task_id] = audio
+            self.order.append(task.task_id)
+
+    def on_failed(self, task, error):
+        with self.lock:
+            self.failed[task.task_id] = error
+            self.order.append(task.task_id)
+
+    def scheduler(self, **kwargs) -> StretchScheduler:
+        return StretchScheduler(
+            engine="phase-vocoder",
+            on_task_completed=self.on_completed,
+            on_task_failed=self.on_failed,
+            on_batch_finished=self.finished.set,
+            **kwargs
+        )
+
+
+class TestBuildStretchTasks:
+    """Tests for build_stretch_tasks"""
+
+    def test_tasks_per_stem_and_loop(self, stem_file):
+        """One task per stem × loop with lowercase names and grid bounds"""
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+        tasks = build_stretch_tasks({'Drums': stem_file, 'other': stem_file}, grid, 100, 120)
+
+        assert len(tasks) == 4
+        assert tasks[0].task_id == 'drums_0_120'
+        assert tasks[1].start_sample == 22050
+        assert [task.priority for task in tasks] == [0, 0, 3, 3]
+
+    def test_focus_loop_first(self, stem_file):
+        """The focused loop, then its neighbours, come first for every stem"""
+        grid = LoopGrid.from_seconds([(i * 0.2, (i + 1) * 0.2) for i in range(5)], 44100)
+        tasks = build_stretch_tasks({'other': stem_file, 'drums': stem_file}, grid, 100, 120, focus_loop=2)
+
+        order = [(task.loop_index, task.stem_name) for task in sorted(tasks)]
+        assert order[:4] == [(2, 'drums'), (2, 'other'), (1, 'drums'), (3, 'drums')]
+
+
+class TestHintPriority:
+    """Tests for hint_priority"""
+
+    def test_tier_order(self):
+        """Playing before selected before visible before the rest"""
+        hints = PlaybackHints(selected=5, visible=(8, 9), playing=2)
+        ranked = sorted(range(12), key=lambda idx: hint_priority('drums', idx, hints))
+
+        assert ranked[:4] == [2, 5, 8, 9]
+        assert ranked[4:7] == [1, 3, 0]
+
+    def test_stem_order_within_loop(self):
+        """Drums first within a loop, but after every stem of a closer loop"""
+        hints = PlaybackHints(selected=3)
+        assert hint_priority('drums', 3, hints) < hint_priority('other', 3, hints)
+        assert hint_priority('other', 3, hints) < hint_priority('drums', 4, hints)
+
+    def test_no_hints(self):
+        """Without hints only the stem priority applies"""
+        assert hint_priority('bass', 7, PlaybackHints()) == 2
+
+
+class TestStretchScheduler:
+    """Tests for StretchScheduler (phase-vocoder engine in worker processes)"""
+
+    def test_worker_count_default(self):
+        """Default parallelism comes from get_optimal_worker_count"""
+        scheduler = StretchScheduler()
+        assert scheduler.max_workers == get_optimal_worker_count()
+
+    def test_batch_results_exact_length(self, stem_file):
+        """Loops are stretched in workers and returned with exact lengths"""
+        collector = _Collector()
+        scheduler = collector.scheduler(max_workers=2)
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 125))
+        assert collector.finished.wait(60)
+        assert not scheduler.is_running
+
+        assert set(collector.completed) == {'drums_0_125', 'drums_1_125'}
+        for audio in collector.completed.values():
+            assert audio.shape == (int(round(22050 / 1.25)), 2)
+            assert audio.dtype == np.float32
+            assert 0.3 < np.abs(audio).max() < 0.7
+        scheduler.shutdown()
+
+    def test_priority_order(self, stem_file):
+        """With one job in flight, drums finish before other stems"""
+        collector = _Collector()
+        scheduler = collector.scheduler(max_workers=1)
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+
+        tasks = build_stretch_tasks({'other': stem_file, 'drums': stem_file}, grid, 100, 120)
+        scheduler.submit_batch(tasks)
+        assert collector.finished.wait(60)
+
+        assert collector.order[:2] == ['drums_0_120', 'drums_1_120']
+        scheduler.shutdown()
+
+    def test_set_hints_reorders_queue(self, stem_file):
+        """Queued tasks are re-keyed when the hints change"""
+        collector = _Collector()
+        scheduler = collector.scheduler(max_workers=1)
+        grid = LoopGrid.from_seconds([(i * 0.2, (i + 1) * 0.2) for i in range(5)], 44100)
+
+        # Hold the dispatcher until the hints are applied
+        with scheduler._cond:
+            scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 120))
+            scheduler.set_hints(PlaybackHints(selected=3, playing=4))
+        assert collector.finished.wait(60)
+        scheduler.shutdown()
+
+        assert collector.order == [f'drums_{idx}_120' for idx in (4, 3, 2, 1, 0)]
+        assert scheduler.hints.playing == 4
+
+    def test_hints_apply_to_new_batches(self, stem_file):
+        """Hints set before a batch order that batch"""
+        collector = _Collector()
+        scheduler = collector.scheduler(max_workers=1)
+        grid = LoopGrid.from_seconds([(i * 0.2, (i + 1) * 0.2) for i in range(4)], 44100)
+
+        scheduler.set_hints(PlaybackHints(visible=(2, 3)))
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 120))
+        assert collector.finished.wait(60)
+        scheduler.shutdown()
+
+        assert collector.order[:2] == ['drums_2_120', 'drums_3_120']
+
+    def test_failures_reported(self, stem_file, tmp_path):
+        """Missing files and out-of-range loops fail without blocking the batch"""
+        collector = _Collector()
+        scheduler = collector.scheduler(max_workers=2)
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.9, 1.5)], 44100)
+
+        stems = {'drums': stem_file, 'bass': tmp_path / "missing.wav"}
+        scheduler.submit_batch(build_stretch_tasks(stems, grid, 100, 120))
+        assert collector.finished.wait(60)
+
+        assert set(collector.completed) == {'drums_0_120'}
+        assert set(collector.failed) == {'drums_1_120', 'bass_0_120', 'bass_1_120'}
+        assert 'Invalid loop bounds' in collector.failed['drums_1_120']
+        scheduler.shutdown()
+
+    def test_new_batch_discards_previous(self, stem_file):
+        """Results of a replaced batch are never reported"""
+        collector = _Collector()
+        scheduler = collector.scheduler(max_workers=1)
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 120))
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 80))
+        assert collector.finished.wait(60)
+
+        assert set(collector.completed) == {'drums_0_80', 'drums_1_80'}
+        scheduler.shutdown()
+
+    def test_empty_batch_finishes_immediately(self):
+        """Submitting no tasks reports completion synchronously"""
+        collector = _Collector()
+        scheduler = collector.scheduler()
+
+        scheduler.submit_batch([])
+
+        assert collector.finished.is_set()
+        assert scheduler.wait(0)
+
+    def test_cancel(self, stem_file):
+        """Cancel makes the scheduler idle and suppresses callbacks"""
+        collector = _Collector()
+        scheduler = collector.scheduler(max_workers=1)
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 120))
+        scheduler.cancel()
+
+        assert not scheduler.is_running
+        assert not collector.finished.wait(2)
+        assert collector.order == []
+        scheduler.shutdown()
+
+    def test_shutdown_rejects_new_batches(self):
+        """A shut down scheduler cannot accept work"""
+        scheduler = StretchScheduler(quality_preset=StretchQuality.PREVIEW)
+        scheduler.shutdown()
+
+        with pytest.raises(RuntimeError):
+            scheduler.submit_batch([])
+
+
+class TestStretchSchedulerCache:
+    """Tests for StretchScheduler with a disk-backed StretchCache"""
+
+    def test_reopen_hits_disk(self, stem_file, tmp_path):
+        """A second session with the same cache directory stretches nothing"""
+        from core.stretch_cache import StretchCache
+
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+        cache_dir = tmp_path / "cache"
+
+        first = _Collector()
+        scheduler = first.scheduler(cache=StretchCache(disk_dir=cache_dir))
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 125))
+        assert first.finished.wait(60)
+        scheduler.shutdown()
+
+        cache = StretchCache(disk_dir=cache_dir)
+        second = _Collector()
+        scheduler = second.scheduler(cache=cache)
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 125))
+        assert second.finished.wait(60)
+        scheduler.shutdown()
+
+        assert cache.get_stats()['disk_hits'] == 2
+        for task_id, audio in first.completed.items():
+            np.testing.assert_array_equal(second.completed[task_id], audio)
+
+
+class TestStretchSchedulerProgressive:
+    """Tests for the preview pass + background upgrade"""
+
+    def test_previews_before_upgrades(self, stem_file):
+        """Every loop gets a preview before any loop is upgraded"""
+        collector = _Collector()
+        qualities = []
+        completed = collector.on_completed
+
+        def on_completed(task, audio):
+            qualities.append(task.quality_preset)
+            completed(task, audio)
+
+        collector.on_completed = on_completed
+        scheduler = collector.scheduler(max_workers=1, preview_quality=StretchQuality.PREVIEW)
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 125))
+        assert collector.finished.wait(60)
+        scheduler.shutdown()
+
+        assert scheduler.progressive
+        assert qualities == [StretchQuality.PREVIEW] * 2 + [StretchQuality.EXPORT] * 2
+        assert collector.order == ['drums_0_125', 'drums_1_125'] * 2
+
+    def test_upgrade_replaces_preview_in_cache(self, stem_file, tmp_path):
+        """Previews stay in RAM and are swapped out for upgrades"""
+        from core.stretch_cache import StretchCache
+
+        cache = StretchCache(disk_dir=tmp_path / "cache")
+        collector = _Collector()
+        scheduler = collector.scheduler(cache=cache, preview_quality=StretchQuality.PREVIEW)
+        grid = LoopGrid.from_seconds([(0.0, 0.5), (0.5, 1.0)], 44100)
+
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 125))
+        assert collector.finished.wait(60)
+        scheduler.shutdown()
+
+        keys = cache.get_keys()
+        assert len(keys) == 2
+        assert all(':export:' in key for key in keys)
+        assert len(cache.disk) == 2
+
+    def test_upgraded_loops_skip_preview(self, stem_file, tmp_path):
+        """Loops already upgraded in the cache are served at final quality"""
+        from core.stretch_cache import StretchCache
+
+        cache = StretchCache(disk_dir=tmp_path / "cache")
+        grid = LoopGrid.from_seconds([(0.0, 0.5)], 44100)
+
+        first = _Collector()
+        scheduler = first.scheduler(cache=cache)
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 125))
+        assert first.finished.wait(60)
+        scheduler.shutdown()
+
+        misses = cache.get_stats()['misses']
+        qualities = []
+        second = _Collector()
+        scheduler = StretchScheduler(
+            engine="phase-vocoder",
+            cache=cache,
+            preview_quality=StretchQuality.PREVIEW,
+            on_task_completed=lambda task, audio: qualities.append(task.quality_preset),
+            on_batch_finished=second.finished.set
+        )
+        scheduler.submit_batch(build_stretch_tasks({'drums': stem_file}, grid, 100, 125))
+        assert second.finished.wait(60)
+        scheduler.shutdown()
+
+        assert qualities == [StretchQuality.EXPORT, StretchQuality.EXPORT]
+        assert cache.get_stats()['misses'] == misses
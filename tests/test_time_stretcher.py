@@ -25,7 +25,14 @@ from core.time_stretcher import (
     InvalidStretchFactorError,
     ProcessingError,
     LibraryNotFoundError,
-    StretchQuality
+    StretchQuality,
+    StretchEngine,
+    get_stretch_engine,
+    register_stretch_engine,
+    available_stretch_engines,
+    get_engine_diagnostics,
+    RubberbandCLIEngine,
+    time_stretch_batch,
 )
 
 
@@ -385,6 +392,325 @@ def test_full_workflow_bpm_to_stretched_audio(sample_audio_stereo):
     assert abs(stretched_duration - expected_duration) < 0.01  # Within 10ms
 
 
+# ============================================================================
+# Test: Stretch Engines
+# ============================================================================
+
+def test_phase_vocoder_engine_available():
+    """In-process engine is always registered and available"""
+    assert "phase-vocoder" in available_stretch_engines()
+    assert get_stretch_engine("phase-vocoder").in_process
+
+
+def test_preview_prefers_in_process_engine():
+    """PREVIEW quality resolves to the in-process engine"""
+    engine = get_stretch_engine(quality_preset=StretchQuality.PREVIEW)
+    assert engine.in_process
+
+
+def test_phase_vocoder_preserves_pitch(sample_audio_stereo):
+    """Phase vocoder output has exact target length and unchanged pitch"""
+    audio, sr = sample_audio_stereo
+
+    stretched = time_stretch_audio(audio, sr, 1.25, engine="phase-vocoder")
+
+    assert stretched.shape == (round(len(audio) / 1.25), 2)
+    assert stretched.dtype == audio.dtype
+
+    segment = stretched[4096:4096 + 16384, 0]
+    spectrum = np.abs(np.fft.rfft(segment * np.hanning(len(segment))))
+    peak_hz = np.argmax(spectrum) * sr / len(segment)
+    assert abs(peak_hz - 440) < 5
+
+
+def test_phase_vocoder_preserves_level(sample_audio_mono):
+    """Phase vocoder keeps steady-state amplitude (no overlap-add gain error)"""
+    audio, sr = sample_audio_mono
+
+    stretched = time_stretch_audio(audio, sr, 0.8, engine="phase-vocoder")
+
+    steady = stretched[4096:-4096]
+    assert abs(np.abs(steady).max() - 1.0) < 0.05
+
+
+def test_unknown_engine():
+    """Unknown engine names raise LibraryNotFoundError"""
+    with pytest.raises(LibraryNotFoundError):
+        get_stretch_engine("does-not-exist")
+
+
+def test_custom_engine_registration(sample_audio_mono, monkeypatch):
+    """Registered engines are selectable by name"""
+    import core.time_stretcher as time_stretcher
+
+    audio, sr = sample_audio_mono
+    monkeypatch.setattr(time_stretcher, "_ENGINES", dict(time_stretcher._ENGINES))
+
+    class HalfLengthEngine(StretchEngine):
+        name = "test-half"
+        in_process = True
+
+        def stretch(self, audio, sample_rate, stretch_factor, quality_preset=StretchQuality.EXPORT):
+            return audio[: len(audio) // 2]
+
+    register_stretch_engine(HalfLengthEngine())
+    stretched = time_stretch_audio(audio, sr, 2.0, engine="test-half")
+
+    assert len(stretched) == len(audio) // 2
+
+
+def test_engine_must_implement_stretch():
+    """StretchEngine is abstract: engines without stretch() cannot be created"""
+    class NoStretchEngine(StretchEngine):
+        name = "test-incomplete"
+
+    with pytest.raises(TypeError):
+        StretchEngine()
+    with pytest.raises(TypeError):
+        NoStretchEngine()
+
+
+# ============================================================================
+# Test: Rubberband Probe Caching
+# ============================================================================
+
+class _FakeCompleted:
+    """Minimal subprocess.CompletedProcess stand-in"""
+
+    def __init__(self, returncode=0, stdout="", stderr=""):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+@pytest.fixture
+def fake_rubberband(monkeypatch):
+    """Fake rubberband binary: records calls, writes input to output on stretch"""
+    import core.time_stretcher as time_stretcher
+
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        if cmd[1] == '--version':
+            return _FakeCompleted(stdout="3.3.0\n")
+        if cmd[1] == '--help':
+            return _FakeCompleted(
+                stderr="  -c<N>, --crisp <N>\n  -3, --fine\n  --window-long\n"
+            )
+        data, sr = sf.read(cmd[-2])
+        sf.write(cmd[-1], data, sr, subtype='FLOAT')
+        return _FakeCompleted()
+
+    monkeypatch.setattr(time_stretcher.subprocess, "run", fake_run)
+    return calls
+
+
+def test_rubberband_probe_cached(fake_rubberband, sample_audio_mono):
+    """Binary is probed once; each stretch spawns only the stretch process"""
+    audio, sr = sample_audio_mono
+    engine = RubberbandCLIEngine()
+
+    for _ in range(3):
+        engine.stretch(audio, sr, 1.1, StretchQuality.EXPORT)
+
+    assert engine.probe_count == 1
+    probe_calls = [cmd for cmd in fake_rubberband if cmd[1] in ('--version', '--help')]
+    assert len(probe_calls) == 2
+    assert len(fake_rubberband) == 2 + 3
+
+    stretch_cmd = fake_rubberband[-1]
+    assert '--fine' in stretch_cmd
+    assert '--window-long' in stretch_cmd
+
+
+def test_rubberband_diagnostics(fake_rubberband):
+    """Capabilities are exposed for diagnostics"""
+    info = RubberbandCLIEngine().diagnostics()
+
+    assert info['available'] is True
+    assert info['version'] == "3.3.0"
+    assert info['r3_available'] is True
+    assert info['supports_crisp'] is True
+
+
+def test_rubberband_reprobe_after_failure(fake_rubberband, monkeypatch, sample_audio_mono):
+    """A failed stretch invalidates the cache so the next call re-probes"""
+    import core.time_stretcher as time_stretcher
+
+    audio, sr = sample_audio_mono
+    engine = RubberbandCLIEngine()
+    engine.probe()
+
+    def failing_run(cmd, **kwargs):
+        return _FakeCompleted(returncode=1, stderr="boom")
+
+    monkeypatch.setattr(time_stretcher.subprocess, "run", failing_run)
+    with pytest.raises(ProcessingError):
+        engine.stretch(audio, sr, 1.1)
+
+    assert engine.probe().available is False
+    assert engine.probe_count == 2
+
+
+def test_rubberband_missing_binary_reprobed_after_ttl(monkeypatch):
+    """A negative probe expires, so a binary installed later is found"""
+    import core.time_stretcher as time_stretcher
+
+    def missing(cmd, **kwargs):
+        raise FileNotFoundError(cmd[0])
+
+    now = [1000.0]
+    monkeypatch.setattr(time_stretcher.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(time_stretcher.subprocess, "run", missing)
+    engine = RubberbandCLIEngine()
+
+    assert engine.is_available() is False
+    assert engine.is_available() is False
+    assert engine.probe_count == 1
+
+    # "Install" rubberband; still cached until the TTL has passed
+    monkeypatch.setattr(
+        time_stretcher.subprocess, "run",
+        lambda cmd, **kwargs: _FakeCompleted(stdout="3.3.0\n")
+    )
+    assert engine.is_available() is False
+
+    now[0] += time_stretcher.RUBBERBAND_NEGATIVE_PROBE_TTL_SECONDS
+    assert engine.is_available() is True
+    assert engine.probe_count == 2
+
+    # Positive results stay cached
+    now[0] += 3600
+    assert engine.is_available() is True
+    assert engine.probe_count == 2
+
+
+def test_engine_diagnostics_lists_all():
+    """Diagnostics cover every registered engine"""
+    names = [info['name'] for info in get_engine_diagnostics()]
+    assert 'rubberband-cli' in names
+    assert 'phase-vocoder' in names
+
+
+# ============================================================================
+# Test: Batched Stretching
+# ============================================================================
+
+@pytest.fixture
+def tone_segments():
+    """Four 0.5 s stereo segments with distinct pitches"""
+    sr = 44100
+    t = np.arange(sr // 2) / sr
+    segments = []
+    for freq in (220, 330, 440, 550):
+        tone = 0.5 * np.sin(2 * np.pi * freq * t)
+        segments.append(np.stack([tone, tone], axis=1).astype(np.float32))
+    return segments, sr
+
+
+def _dominant_hz(audio, sr):
+    """Dominant frequency of the middle of a (mono or stereo) segment"""
+    mono = audio[:, 0] if audio.ndim == 2 else audio
+    middle = mono[len(mono) // 4: 3 * len(mono) // 4]
+    spectrum = np.abs(np.fft.rfft(middle * np.hanning(len(middle)), n=1 << 16))
+    return np.argmax(spectrum) * sr / (1 << 16)
+
+
+def test_batch_matches_per_loop(tone_segments):
+    """Concatenated batch output matches per-loop stretching at the boundaries"""
+    segments, sr = tone_segments
+    factor = 1.2
+
+    per_loop = time_stretch_batch(
+        segments, sr, factor, engine="phase-vocoder", concatenate=False
+    )
+    batched = time_stretch_batch(
+        segments, sr, factor, engine="phase-vocoder", concatenate=True
+    )
+
+    assert len(batched) == len(per_loop) == len(segments)
+    for single, batch, source in zip(per_loop, batched, segments):
+        # Identical lengths (boundary mapping)
+        assert batch.shape == single.shape == (round(len(source) / factor), 2)
+
+        # No bleed from neighbouring segments: same pitch as its source
+        assert abs(_dominant_hz(batch, sr) - _dominant_hz(source, sr)) < 3
+
+        # Content matches the per-loop result away from the edges
+        edge = 2048
+        np.testing.assert_allclose(
+            np.abs(batch[edge:-edge]).max(), np.abs(single[edge:-edge]).max(), atol=0.05
+        )
+
+
+def test_batch_uses_one_rubberband_run(fake_rubberband, monkeypatch, tone_segments):
+    """With the CLI engine all loops are stretched in a single process"""
+    import core.time_stretcher as time_stretcher
+
+    segments, sr = tone_segments
+    engine = RubberbandCLIEngine()
+    monkeypatch.setattr(time_stretcher, "_ENGINES", {engine.name: engine})
+
+    results = time_stretch_batch(segments, sr, 1.0, engine="rubberband-cli", concatenate=True)
+
+    stretch_calls = [cmd for cmd in fake_rubberband if cmd[1] not in ('--version', '--help')]
+    assert len(stretch_calls) == 1
+    # Fake binary copies input → splits must reproduce the inputs exactly
+    for result, segment in zip(results, segments):
+        np.testing.assert_allclose(result, segment, atol=1e-7)
+
+
+def _onset(audio):
+    """Sample index of the strongest transient (peak of a 64-sample envelope)"""
+    mono = np.abs(audio[:, 0] if audio.ndim == 2 else audio)
+    envelope = np.convolve(mono, np.ones(64) / 64, mode="same")
+    return int(np.argmax(envelope))
+
+
+@pytest.mark.parametrize("factor", [0.8, 1.25])
+def test_batch_rubberband_matches_per_loop(monkeypatch, factor):
+    """Real rubberband: batched splits land where per-loop stretching does"""
+    import core.time_stretcher as time_stretcher
+
+    engine = RubberbandCLIEngine()
+    if not engine.is_available():
+        pytest.skip("rubberband CLI not installed")
+    monkeypatch.setattr(time_stretcher, "_ENGINES", {engine.name: engine})
+
+    # Quiet noise with one decaying burst at a different offset per loop
+    sr = 44100
+    rng = np.random.default_rng(0)
+    segments = []
+    for offset in (0.2, 0.35, 0.5, 0.65):
+        segment = rng.standard_normal((sr, 2)).astype(np.float32) * 0.01
+        start = int(offset * sr)
+        burst = rng.standard_normal((882, 2)) * np.exp(-np.arange(882) / 150)[:, None]
+        segment[start:start + 882] += (0.8 * burst).astype(np.float32)
+        segments.append(segment)
+
+    per_loop = time_stretch_batch(segments, sr, factor, engine=engine.name, concatenate=False)
+    batched = time_stretch_batch(segments, sr, factor, engine=engine.name, concatenate=True)
+
+    for single, batch in zip(per_loop, batched):
+        assert batch.shape == single.shape
+        # Boundary drift across the guard gaps stays within ~6 ms
+        assert abs(_onset(batch) - _onset(single)) <= 256
+        # Nothing from the neighbours smears into the loop edges
+        edge = int(0.01 * sr)
+        assert np.abs(batch[:edge]).max() < 0.1
+        assert np.abs(batch[-edge:]).max() < 0.1
+
+
+def test_batch_rejects_mixed_channels(tone_segments):
+    """Segments with different channel layouts cannot be concatenated"""
+    segments, sr = tone_segments
+    mixed = [segments[0], segments[1][:, 0]]
+
+    with pytest.raises(ProcessingError):
+        time_stretch_batch(mixed, sr, 1.1, engine="phase-vocoder", concatenate=True)
+
+
 # ============================================================================
 # Skip Tests if PyRubberBand Not Installed
 # ============================================================================
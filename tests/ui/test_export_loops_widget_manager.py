@@ -123,7 +123,11 @@ class TestPlayerWidgetGetStretchManager:
         manager1 = widget.get_stretch_manager()
         
         assert manager1 is mock_manager
-        mock_manager_class.assert_called_once_with(max_workers=4)
+        mock_manager_class.assert_called_once()
+        kwargs = mock_manager_class.call_args.kwargs
+        assert kwargs['max_workers'] == 4
+        assert kwargs['progressive'] is True
+        assert kwargs['cache'] is not None
         
         # Second access should return same instance
         manager2 = widget.get_stretch_manager()
@@ -289,8 +289,8 @@ class TestTimeStretchBackgroundProcessing:
         call_args = mock_manager.start_batch.call_args
         assert call_args.kwargs['original_bpm'] == 120.0
         assert call_args.kwargs['target_bpm'] == 140.0
-        assert call_args.kwargs['sample_rate'] == 44100
-        assert len(call_args.kwargs['loop_segments']) == 2
+        assert call_args.kwargs['sample_rate'] == widget.player.sample_rate
+        assert call_args.kwargs['loop_segments'] == widget._get_all_loop_grid()
         assert call_args.kwargs['stem_files'] == widget.stem_files
 
     @patch("core.player.AudioPlayer._import_rtmixer")
@@ -459,7 +459,7 @@ class TestTimeStretchPlayback:
         mock_sd_play.assert_called_once()
 
     @patch("core.player.AudioPlayer._import_rtmixer")
-    @patch("core.player.AudioPlayer.play_loop_segment")
+    @patch("core.player.AudioPlayer.play_loop_samples")
     def test_play_loop_clicked_uses_normal_when_disabled(self, mock_play, mock_rtmixer, qtbot, player_widget_with_loops):
         """Test that _on_play_loop_clicked() uses normal playback when time-stretch disabled"""
         widget = player_widget_with_loops
@@ -468,8 +468,10 @@ class TestTimeStretchPlayback:
         
         widget._on_play_loop_clicked()
         
-        # Verify AudioPlayer.play_loop_segment was called (normal playback)
-        mock_play.assert_called_once()
+        # Verify AudioPlayer.play_loop_samples was called (normal playback)
+        mock_play.assert_called_once_with(
+            0, widget.player.sample_rate // 2, repeat=False
+        )
 
     @patch("core.player.AudioPlayer._import_rtmixer")
     @patch("sounddevice.play")
@@ -759,3 +761,71 @@ class TestTimeStretchEdgeCases:
         # Button should be enabled if loops exist
         if len(widget.detected_loop_segments) > 0:
             assert widget.btn_start_stretch_processing.isEnabled() is True
+
+
+# ============================================================================
+# Manager Lifetime
+# ============================================================================
+
+@pytest.mark.unit
+class TestStretchManagerRelease:
+    """Dropping the stretch manager stops its dispatcher thread"""
+
+    def test_release_shuts_down_dispatcher(self, qtbot, test_audio_files):
+        """_release_stretch_manager() joins the scheduler's dispatcher"""
+        from types import SimpleNamespace
+        from core.background_stretch_manager import BackgroundStretchManager
+
+        temp_dir, file_paths = test_audio_files
+        manager = BackgroundStretchManager(max_workers=1)
+        holder = SimpleNamespace(
+            stretch_manager=manager,
+            _on_stretch_progress_updated=Mock(),
+            _on_stretch_all_completed=Mock(),
+        )
+        manager.progress_updated.connect(holder._on_stretch_progress_updated)
+        manager.all_completed.connect(holder._on_stretch_all_completed)
+        manager.start_batch(
+            stem_files={"drums": file_paths[0], "vocals": file_paths[1]},
+            loop_segments=[(0.0, 0.5), (0.5, 1.0)],
+            original_bpm=120,
+            target_bpm=130,
+            sample_rate=44100,
+        )
+        dispatcher = manager.scheduler._dispatcher
+        assert dispatcher is not None
+
+        PlayerWidget._release_stretch_manager(holder)
+
+        assert holder.stretch_manager is None
+        dispatcher.join(timeout=5.0)
+        assert not dispatcher.is_alive()
+
+
+# ============================================================================
+# Loop Grid
+# ============================================================================
+
+@pytest.mark.unit
+class TestLoopGridAtPlayerRate:
+    """Detected loops are sample grids at the player's rate"""
+
+    def test_grid_built_at_player_rate(self):
+        """_calculate_loop_grid() rounds boundaries once at the player's rate"""
+        from types import SimpleNamespace
+
+        holder = SimpleNamespace(
+            player=SimpleNamespace(sample_rate=48000, get_duration=lambda: 8.0),
+            song_start_downbeat_index=None,
+            intro_handling="pad",
+        )
+        downbeats = np.array([0.0, 2.0, 4.0, 6.0])
+
+        loops, intro_loops = PlayerWidget._calculate_loop_grid(holder, downbeats, 1)
+
+        grid = holder.detected_loop_grid
+        assert grid.sample_rate == 48000
+        assert grid[1] == (96000, 192000)
+        np.testing.assert_array_equal(grid.ends[:-1], grid.starts[1:])
+        assert loops == grid.to_seconds()
+        assert intro_loops == []
@@ -117,7 +117,7 @@ class TestTimeStretchIntegration:
     @patch("core.player.AudioPlayer._import_rtmixer")
     @patch("core.background_stretch_manager.BackgroundStretchManager")
     @patch("sounddevice.play")
-    @patch("core.player.AudioPlayer.play_loop_segment")
+    @patch("core.player.AudioPlayer.play_loop_samples")
     def test_toggle_workflow_normal_to_stretched(self, mock_normal_play, mock_sd_play, mock_manager_class, mock_rtmixer, qtbot, integration_widget):
         """Test toggle workflow: Enable → Process → Play stretched → Disable → Play normal"""
         widget = integration_widget
@@ -35,6 +35,8 @@ from ui.app_context import AppContext
 from ui.theme import ThemeManager
 from utils.loop_math import get_minimum_bpm, is_valid_for_sampler
 from core.background_stretch_manager import BackgroundStretchManager, get_optimal_worker_count
+from core.export_writer import LoopMixWriter, get_subtype
+from core.time_stretcher import StretchQuality
 from config import get_default_output_dir, DEFAULT_LOOPS_DIR
 from utils.path_utils import resolve_output_path
 
@@ -128,6 +130,8 @@ class ExportLoopsWidget(QWidget):
                 manager.progress_updated.disconnect()
                 manager.all_completed.disconnect()
                 manager.task_completed.disconnect()
+                manager.task_upgraded.disconnect()
+                manager.upgrades_completed.disconnect()
             except TypeError:
                 # Signals not connected yet, ignore
                 pass
@@ -136,6 +140,10 @@ class ExportLoopsWidget(QWidget):
             manager.progress_updated.connect(self._on_stretch_progress_updated)
             manager.all_completed.connect(self._on_stretch_all_completed)
             manager.task_completed.connect(self._on_stretch_task_completed)
+            # WHY: Export needs EXPORT quality; progressive previews become
+            #      exportable only once upgraded
+            manager.task_upgraded.connect(self._on_stretch_task_completed)
+            manager.upgrades_completed.connect(self._on_stretch_all_completed)
 
     def _create_card(self, title: str) -> tuple[QFrame, QVBoxLayout]:
         """Create a styled card frame with header"""
@@ -931,7 +939,9 @@ class ExportLoopsWidget(QWidget):
             #      for consistency. Must use lowercase when checking readiness.
             stem_name_lower = stem_name.lower()
             for loop_idx in range(len(loop_segments)):
-                if not manager.is_loop_ready(stem_name_lower, loop_idx, target_bpm):
+                if not manager.is_loop_ready(
+                    stem_name_lower, loop_idx, target_bpm, quality=StretchQuality.EXPORT
+                ):
                     return False
 
         return True
@@ -963,8 +973,7 @@ class ExportLoopsWidget(QWidget):
             target_bpm = self._get_target_bpm_from_player_widget()
 
             # Determine subtype based on bit depth
-            subtype_map = {16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}
-            subtype = subtype_map.get(settings.bit_depth, "PCM_24")
+            subtype = get_subtype(settings.bit_depth)
 
             # Create progress dialog
             total_files = len(stem_files) * len(loop_segments)
@@ -987,20 +996,30 @@ class ExportLoopsWidget(QWidget):
 
             if settings.export_mode == "mixed":
                 # Export mixed loops (all stems combined)
+                # WHY: One reusable mix buffer for all loops instead of stacking,
+                #      casting and summing into a fresh array per loop
+                mix_writer = LoopMixWriter(
+                    sample_rate=settings.sample_rate,
+                    bit_depth=settings.bit_depth,
+                    channels=settings.channels,
+                    file_format=settings.file_format,
+                )
+
                 for loop_idx in range(len(loop_segments)):
                     progress.setLabelText(f"Exporting mixed loop {loop_idx + 1}/{len(loop_segments)}...")
                     progress.setValue(loop_idx)
                     QApplication.processEvents()
 
-                    # Mix all stems for this loop
-                    mixed_audio = None
+                    # Collect stretched loops of all stems (cache references, no copies)
+                    stem_loops = []
                     for stem_name in stem_files.keys():
                         # Get stretched loop from cache
                         # WHY: BackgroundStretchManager stores loops with lowercase stem names
                         #      for consistency. Must use lowercase when retrieving.
                         stem_name_lower = stem_name.lower()
                         loop_audio = manager.get_stretched_loop(
-                            stem_name_lower, loop_idx, target_bpm
+                            stem_name_lower, loop_idx, target_bpm,
+                            quality=StretchQuality.EXPORT
                         )
 
                         if loop_audio is None:
@@ -1009,42 +1028,23 @@ class ExportLoopsWidget(QWidget):
                             )
                             continue
 
-                        # Ensure stereo
-                        if loop_audio.ndim == 1:
-                            loop_audio = np.stack([loop_audio, loop_audio], axis=1)
-
-                        # Initialize or add to mix
-                        if mixed_audio is None:
-                            mixed_audio = loop_audio.astype(np.float32)
-                        else:
-                            mixed_audio += loop_audio.astype(np.float32)
+                        stem_loops.append(loop_audio)
 
-                    if mixed_audio is None:
+                    if not stem_loops:
                         self.ctx.logger().warning(f"No audio for loop {loop_idx}, skipping")
                         continue
 
-                    # Apply channels setting
-                    if settings.channels == 1 and mixed_audio.ndim == 2:
-                        # Convert to mono
-                        mixed_audio = np.mean(mixed_audio, axis=1)
-
-                    # Normalize to prevent clipping
-                    peak = np.max(np.abs(mixed_audio))
-                    if peak > 1.0:
-                        mixed_audio = mixed_audio * (0.95 / peak)
+                    # Mix all stems for this loop in place
+                    mix_writer.begin(max(len(loop_audio) for loop_audio in stem_loops))
+                    for loop_audio in stem_loops:
+                        mix_writer.add(loop_audio)
 
                     # Generate filename
                     filename = f"{common_filename}_{target_bpm}BPM_{settings.bars}T_{loop_idx + 1:03d}.{settings.file_format.lower()}"
                     file_path = output_path / filename
 
-                    # Export
-                    sf.write(
-                        str(file_path),
-                        mixed_audio,
-                        settings.sample_rate,
-                        subtype=subtype,
-                        format=settings.file_format
-                    )
+                    # Export (normalizes to prevent clipping)
+                    mix_writer.write(file_path)
 
                     exported_count += 1
                     self.ctx.logger().info(f"Exported mixed loop {loop_idx + 1}: {filename}")
@@ -1066,7 +1066,8 @@ class ExportLoopsWidget(QWidget):
                         #      for consistency. Must use lowercase when retrieving.
                         stem_name_lower = stem_name.lower()
                         loop_audio = manager.get_stretched_loop(
-                            stem_name_lower, loop_idx, target_bpm
+                            stem_name_lower, loop_idx, target_bpm,
+                            quality=StretchQuality.EXPORT
                         )
 
                         if loop_audio is None:
@@ -1145,25 +1146,22 @@ class ExportLoopsWidget(QWidget):
         """
         # PRIORITY 1: If time-stretching was performed, use the same valid_loops
         # that were used during stretching (filtered to exclude intro loops with negative start times)
-        if self.player_widget and hasattr(self.player_widget, '_get_all_loop_segments'):
-            all_loops = self.player_widget._get_all_loop_segments()
+        if self.player_widget and hasattr(self.player_widget, '_get_stretch_loop_grid'):
+            all_loops = self.player_widget._get_all_loop_grid()
             
-            if all_loops:
-                # Apply the same filtering logic as in _on_start_stretch_processing_clicked()
+            if len(all_loops) > 0:
+                # Use the same filtered grid as _on_start_stretch_processing_clicked()
                 # WHY: Time-stretching only processes loops with non-negative start times.
                 #      Export must use the same filtered loops to match cache indices.
-                valid_loops = []
-                for start, end in all_loops:
-                    if start >= 0.0 and end > start:
-                        valid_loops.append((start, end))
+                valid_loops, _ = self.player_widget._get_stretch_loop_grid()
                 
-                if valid_loops:
+                if len(valid_loops) > 0:
                     self.ctx.logger().debug(
                         f"Using {len(valid_loops)} valid loops (filtered from {len(all_loops)} total loops) "
                         f"to match time-stretching cache indices"
                     )
-                    return valid_loops
-                elif all_loops:
+                    return valid_loops.to_seconds()
+                else:
                     # All loops have negative start times (unlikely, but handle gracefully)
                     self.ctx.logger().warning(
                         f"All {len(all_loops)} loops have negative start times. "
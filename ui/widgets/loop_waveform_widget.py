@@ -1072,13 +1072,14 @@ class LoopWaveformWidget(QWidget):
     - Combined/Stacked view mode selection
     - Visual loop segments with beat markers
     - Clickable loop selection
-    - Signal emission for loop selection
+    - Signal emission for loop selection and visible loops (stretch priority)
     """
 
     # Signals
     loop_selected = Signal(int)  # loop_index
     mode_changed = Signal(str)  # "combined" or "stacked"
     bars_per_loop_changed = Signal(int)  # 2, 4, or 8 bars per loop
+    visible_loops_changed = Signal(list)  # loop indices in the viewport
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -1092,6 +1093,9 @@ class LoopWaveformWidget(QWidget):
         self._loops_count: int = 0
         self._bars_total: int = 0
 
+        # Last emitted visible loop indices
+        self._visible_loops: List[int] = []
+
     def _setup_ui(self):
         """Setup widget layout with scroll area"""
         layout = QVBoxLayout(self)
@@ -1282,6 +1286,11 @@ class LoopWaveformWidget(QWidget):
         # Install event filter on scroll area viewport to catch resize events
         self.scroll_area.viewport().installEventFilter(self)
 
+        # Scrolling changes which loops the user looks at
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(
+            lambda _value: self._update_visible_loops()
+        )
+
     def _on_mode_changed(self, mode: str):
         """Handle view mode change"""
         self.waveform_display.display_mode = mode
@@ -1357,6 +1366,36 @@ class LoopWaveformWidget(QWidget):
             # Invalidate cache since dimensions changed
             self.waveform_display._waveform_cache = None
 
+        self._update_visible_loops()
+
+    def get_visible_loop_indices(self) -> List[int]:
+        """
+        Get loops overlapping the scroll area viewport.
+
+        Returns:
+            Loop indices (ascending), empty if no loops are set
+        """
+        display = self.waveform_display
+        if not display.loop_segments or display.duration <= 0:
+            return []
+
+        left = self.scroll_area.horizontalScrollBar().value()
+        view_start = display._x_to_time(left)
+        view_end = display._x_to_time(left + self.scroll_area.viewport().width())
+
+        return [
+            index
+            for index, (start, end) in enumerate(display.loop_segments)
+            if end > view_start and start < view_end
+        ]
+
+    def _update_visible_loops(self):
+        """Emit visible_loops_changed when the set of visible loops changed"""
+        visible = self.get_visible_loop_indices()
+        if visible != self._visible_loops:
+            self._visible_loops = visible
+            self.visible_loops_changed.emit(visible)
+
     def _on_loop_selected(self, loop_index: int):
         """Handle loop selection from display"""
         self.loop_selected.emit(loop_index)
@@ -1432,6 +1471,7 @@ class LoopWaveformWidget(QWidget):
             self._bars_total = 0
 
         self._update_info_label()
+        self._update_visible_loops()
 
     def set_beat_times(self, beat_times: np.ndarray, downbeat_times: np.ndarray):
         """Set beat marker positions"""
@@ -39,10 +39,12 @@ from PySide6.QtCore import Qt, Signal, Slot, QTimer, QRunnable, QThreadPool, QOb
 from ui.app_context import AppContext
 from ui.widgets.common import DragDropListWidget
 from core.player import get_player, PlaybackState
+from core.stream_mixer import compute_stem_gains, mix_stems
 from ui.theme import ThemeManager
 from ui.dialogs import ExportSettingsDialog, LoopExportDialog
 from ui.widgets.loop_waveform_widget import LoopWaveformWidget
 from utils import beat_detection
+from utils.loop_grid import LoopGrid
 from config import get_default_output_dir, DEFAULT_LOOPS_DIR, DEFAULT_SEPARATED_DIR
 from utils.path_utils import resolve_output_path
 
@@ -119,13 +121,16 @@ class LoadStemsWorker(QRunnable):
     Background worker for loading stem audio files.
 
     PURPOSE: Load audio files and perform resampling without blocking GUI thread
-    CONTEXT: Audio loading with soundfile and librosa resampling can be slow for large files
+    CONTEXT: Audio loading with soundfile and librosa resampling can be slow for large files.
+             The player decodes stems in parallel; stem_ready fires as each one joins
+             the mix so playback can start before the slowest stem is done.
     """
 
     class Signals(QObject):
         finished = Signal(bool)  # success
         error = Signal(str)  # error_message
         progress = Signal(int, str)  # percent, message
+        stem_ready = Signal(str, int, int)  # stem_name, ready_count, total
 
     def __init__(self, player, stem_files: Dict[str, Path], logger):
         super().__init__()
@@ -149,9 +154,19 @@ class LoadStemsWorker(QRunnable):
 
             self.signals.progress.emit(0, f"Loading {total_files} stems...")
 
+            def on_stem_ready(stem_name: str, ready: int, total: int):
+                if self._cancelled:
+                    return
+                self.signals.progress.emit(
+                    int(ready * 100 / total), f"Loaded {stem_name} ({ready}/{total})"
+                )
+                self.signals.stem_ready.emit(stem_name, ready, total)
+
             # Load stems using player's load_stems method
             # This performs I/O and potentially resampling, which can be slow
-            success = self.player.load_stems(self.stem_files)
+            success = self.player.load_stems(
+                self.stem_files, on_stem_ready=on_stem_ready
+            )
 
             if self._cancelled:
                 return
@@ -338,9 +353,12 @@ class PlayerWidget(QWidget):
         # Loop preview state
         self.detected_beat_times: Optional[np.ndarray] = None
         self.detected_downbeat_times: Optional[np.ndarray] = None
-        self.detected_loop_segments: List[Tuple[float, float]] = []
-        self.detected_intro_loops: List[Tuple[float, float]] = (
-            []
+        # WHY: Loop boundaries live in samples at the player's rate so playback,
+        #      stretching and export cut at the same samples; the seconds lists
+        #      (detected_loop_segments / detected_intro_loops) are views of these
+        self.detected_loop_grid = LoopGrid.empty(self.player.sample_rate)
+        self.detected_intro_grid = LoopGrid.empty(
+            self.player.sample_rate
         )  # Leading loops if song start marker is set
         self.selected_loop_index: int = -1
         self._bars_per_loop: int = 4  # Default: 4 bars per loop
@@ -364,6 +382,7 @@ class PlayerWidget(QWidget):
         self._loop_index_mapping: Dict[int, int] = {}  # Maps original loop index to filtered index
         self._stretched_playback_active: bool = False  # Track if stretched loop is currently playing
         self._stretched_playback_loop_index: int = -1  # Track which loop is playing
+        self._visible_loop_indices: List[int] = []  # Loops in the waveform viewport
         self._stretched_playback_repeat: bool = False  # Track if playback is in repeat mode
 
         # Beat analysis countdown timer
@@ -988,6 +1007,9 @@ class PlayerWidget(QWidget):
             self._on_bars_per_loop_changed
         )
         self.loop_waveform_widget.loop_selected.connect(self._on_loop_waveform_selected)
+        self.loop_waveform_widget.visible_loops_changed.connect(
+            self._on_visible_loops_changed
+        )
         self.loop_waveform_widget.waveform_display.song_start_marker_requested.connect(
             self._on_song_start_marker_requested
         )
@@ -1112,8 +1134,8 @@ class PlayerWidget(QWidget):
         # Reset loop detection results
         self.detected_beat_times = None
         self.detected_downbeat_times = None
-        self.detected_loop_segments = []
-        self.detected_intro_loops = []
+        self.detected_loop_grid = LoopGrid.empty(self.player.sample_rate)
+        self.detected_intro_grid = LoopGrid.empty(self.player.sample_rate)
         self.selected_loop_index = -1
 
         # Reset song start marker
@@ -1325,18 +1347,7 @@ class PlayerWidget(QWidget):
             bars_per_loop = self._bars_per_loop
 
             # Calculate loop segments
-            duration = self.player.get_duration()
-            loops, intro_loops = beat_detection.calculate_loops_from_downbeats(
-                downbeat_times,
-                bars_per_loop,
-                duration,
-                song_start_downbeat_index=getattr(
-                    self, "song_start_downbeat_index", None
-                ),
-                intro_handling=getattr(self, "intro_handling", "pad"),
-            )
-            self.detected_loop_segments = loops
-            self.detected_intro_loops = intro_loops
+            self._calculate_loop_grid(downbeat_times, bars_per_loop)
 
             # Load waveforms into widget
             self._set_loop_status(
@@ -1366,7 +1377,7 @@ class PlayerWidget(QWidget):
             player_sample_rate = self.player.sample_rate
             stem_waveforms = {}
             for stem_name, stem_path in self.stem_files.items():
-                audio_data, file_sr = sf.read(stem_path, dtype="float32")
+                audio_data, file_sr = self._read_stem_for_waveform(stem_name, stem_path)
 
                 # Resample to player's sample rate if needed
                 # WHY: Ensures waveform uses same sample rate as playback
@@ -1394,7 +1405,7 @@ class PlayerWidget(QWidget):
             self.loop_waveform_widget.set_loop_segments(self.detected_loop_segments)
 
             # Success message (3 status lines)
-            num_loops = len(self.detected_loop_segments)
+            num_loops = len(self.detected_loop_grid)
             status_icon = "⚠" if is_fallback else "✓"
             self._set_loop_status(
                 f"{status_icon} Detection complete",
@@ -1437,7 +1448,7 @@ class PlayerWidget(QWidget):
             # Enable time-stretch start button if time-stretching is enabled
             if self.time_stretch_enabled:
                 self.btn_start_stretch_processing.setEnabled(
-                    len(self.detected_loop_segments) > 0 and len(self.stem_files) > 0
+                    len(self.detected_loop_grid) > 0 and len(self.stem_files) > 0
                 )
 
             # Initialize correction UIs after successful detection
@@ -1544,29 +1555,19 @@ class PlayerWidget(QWidget):
             and len(self.detected_downbeat_times) > 0
         ):
             # Re-calculate loops with new bar count
-            duration = self.player.get_duration()
-
-            loops, intro_loops = beat_detection.calculate_loops_from_downbeats(
-                self.detected_downbeat_times,
-                bars_per_loop,
-                duration,
-                song_start_downbeat_index=getattr(
-                    self, "song_start_downbeat_index", None
-                ),
-                intro_handling=getattr(self, "intro_handling", "pad"),
+            loops, intro_loops = self._calculate_loop_grid(
+                self.detected_downbeat_times, bars_per_loop
             )
-            self.detected_loop_segments = loops
-            self.detected_intro_loops = intro_loops
 
             # Update widget
             if intro_loops:
                 # Add leading loops to display if present
-                all_segments = intro_loops + self.detected_loop_segments
+                all_segments = intro_loops + loops
                 self.loop_waveform_widget.set_loop_segments(all_segments)
             else:
-                self.loop_waveform_widget.set_loop_segments(self.detected_loop_segments)
+                self.loop_waveform_widget.set_loop_segments(loops)
 
-            num_loops = len(self.detected_loop_segments)
+            num_loops = len(self.detected_loop_grid)
             self._set_loop_status(
                 f"✓ Recalculated", f"{num_loops} loops ({bars_per_loop} bars each)", ""
             )
@@ -1743,26 +1744,16 @@ class PlayerWidget(QWidget):
 
             # Recalculate loops
             bars_per_loop = self._bars_per_loop
-            loops, intro_loops = beat_detection.calculate_loops_from_downbeats(
-                new_downbeat_times,
-                bars_per_loop,
-                duration,
-                song_start_downbeat_index=getattr(
-                    self, "song_start_downbeat_index", None
-                ),
-                intro_handling=getattr(self, "intro_handling", "pad"),
-            )
-            self.detected_loop_segments = loops
-            self.detected_intro_loops = intro_loops
+            loops, intro_loops = self._calculate_loop_grid(new_downbeat_times, bars_per_loop)
 
             # Update waveform
             self.loop_waveform_widget.set_beat_times(new_beat_times, new_downbeat_times)
 
             if intro_loops:
-                all_segments = intro_loops + self.detected_loop_segments
+                all_segments = intro_loops + loops
                 self.loop_waveform_widget.set_loop_segments(all_segments)
             else:
-                self.loop_waveform_widget.set_loop_segments(self.detected_loop_segments)
+                self.loop_waveform_widget.set_loop_segments(loops)
 
             # Update display with appropriate label (one decimal place for accuracy)
             # WHY: Shows exact BPM used for beat calculation, ensuring consistency
@@ -1775,7 +1766,7 @@ class PlayerWidget(QWidget):
             self.loop_waveform_widget.set_summary_prefix(bpm_prefix)
 
             # Success status
-            num_loops = len(self.detected_loop_segments)
+            num_loops = len(self.detected_loop_grid)
 
             # Set appropriate success message based on what was applied
             if has_downbeat and has_bpm_change:
@@ -1863,7 +1854,7 @@ class PlayerWidget(QWidget):
 
         self.ctx.logger().info("Clearing song start marker")
         self.song_start_downbeat_index = None
-        self.detected_intro_loops = []
+        self.detected_intro_grid = LoopGrid.empty(self.player.sample_rate)
 
         # Re-calculate loops from beginning
         self._recalculate_loops_with_current_settings()
@@ -1900,29 +1891,22 @@ class PlayerWidget(QWidget):
         ):
             return
 
-        duration = self.player.get_duration()
-        loops, intro_loops = beat_detection.calculate_loops_from_downbeats(
-            self.detected_downbeat_times,
-            self._bars_per_loop,
-            duration,
-            song_start_downbeat_index=self.song_start_downbeat_index,
-            intro_handling=self.intro_handling,
+        loops, intro_loops = self._calculate_loop_grid(
+            self.detected_downbeat_times, self._bars_per_loop
         )
-        self.detected_loop_segments = loops
-        self.detected_intro_loops = intro_loops
 
         # Update widget
         if intro_loops:
             # Show leading loops + main loops
-            all_segments = intro_loops + self.detected_loop_segments
+            all_segments = intro_loops + loops
             self.loop_waveform_widget.set_loop_segments(all_segments)
         else:
-            self.loop_waveform_widget.set_loop_segments(self.detected_loop_segments)
+            self.loop_waveform_widget.set_loop_segments(loops)
 
         # Enable time-stretch start button if time-stretching is enabled
         if self.time_stretch_enabled:
             self.btn_start_stretch_processing.setEnabled(
-                len(self.detected_loop_segments) > 0 and len(self.stem_files) > 0
+                len(self.detected_loop_grid) > 0 and len(self.stem_files) > 0
             )
 
         # Update status
@@ -1952,7 +1936,7 @@ class PlayerWidget(QWidget):
             intro_info = ""
             status_msg = "✓ Loops calculated"
 
-        num_loops = len(self.detected_loop_segments)
+        num_loops = len(self.detected_loop_grid)
         self._set_loop_status(
             status_msg,
             f"{intro_info}{num_loops} loops ({self._bars_per_loop} bars each)",
@@ -1968,6 +1952,79 @@ class PlayerWidget(QWidget):
             # Set marker
             self.set_song_start_marker(downbeat_index)
 
+    def _calculate_loop_grid(
+        self, downbeat_times: np.ndarray, bars_per_loop: int
+    ) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """
+        Calculate loops from downbeats as sample grids at the player's rate.
+
+        WHY: Boundaries are rounded to samples exactly once here; playback,
+             time-stretching and export all use these grids.
+
+        Args:
+            downbeat_times: Downbeat positions in seconds
+            bars_per_loop: Number of bars per loop
+
+        Returns:
+            Tuple of (loops, intro_loops) in seconds (for display)
+        """
+        (
+            self.detected_loop_grid,
+            self.detected_intro_grid,
+        ) = beat_detection.calculate_loop_grid_from_downbeats(
+            downbeat_times,
+            bars_per_loop,
+            self.player.get_duration(),
+            sample_rate=self.player.sample_rate,
+            song_start_downbeat_index=getattr(self, "song_start_downbeat_index", None),
+            intro_handling=getattr(self, "intro_handling", "pad"),
+        )
+        return self.detected_loop_grid.to_seconds(), self.detected_intro_grid.to_seconds()
+
+    @property
+    def detected_loop_segments(self) -> List[Tuple[float, float]]:
+        """Main loops as (start_sec, end_sec) tuples (view of detected_loop_grid)"""
+        return self.detected_loop_grid.to_seconds()
+
+    @detected_loop_segments.setter
+    def detected_loop_segments(self, segments: List[Tuple[float, float]]):
+        self.detected_loop_grid = LoopGrid.from_seconds(segments, self.player.sample_rate)
+
+    @property
+    def detected_intro_loops(self) -> List[Tuple[float, float]]:
+        """Leading loops as (start_sec, end_sec) tuples (view of detected_intro_grid)"""
+        return self.detected_intro_grid.to_seconds()
+
+    @detected_intro_loops.setter
+    def detected_intro_loops(self, segments: List[Tuple[float, float]]):
+        self.detected_intro_grid = LoopGrid.from_seconds(segments, self.player.sample_rate)
+
+    def _get_all_loop_grid(self) -> LoopGrid:
+        """
+        Get combined sample grid of all loops (intro + main) at the player's rate.
+
+        Returns:
+            LoopGrid indexed like _get_all_loop_segments()
+        """
+        return LoopGrid.concatenate(
+            [self.detected_intro_grid, self.detected_loop_grid], self.player.sample_rate
+        )
+
+    def _get_stretch_loop_grid(self) -> Tuple[LoopGrid, np.ndarray]:
+        """
+        Get the loops that can be time-stretched (non-negative start).
+
+        WHY: Leading loops with negative start times contain silence padding that
+             cannot be time-stretched. Stretching and stretched export must use the
+             same filtered grid so their loop indices match.
+
+        Returns:
+            Tuple of (filtered LoopGrid, original indices of the filtered loops)
+        """
+        all_loops = self._get_all_loop_grid()
+        valid_indices = all_loops.valid_indices()
+        return all_loops.select(valid_indices), valid_indices
+
     def _get_all_loop_segments(self) -> List[Tuple[float, float]]:
         """
         Get combined list of all loop segments (intro + main).
@@ -1977,7 +2034,7 @@ class PlayerWidget(QWidget):
         Returns:
             Combined list: [intro_loop1, intro_loop2, ..., main_loop1, main_loop2, ...]
         """
-        return self.detected_intro_loops + self.detected_loop_segments
+        return self._get_all_loop_grid().to_seconds()
 
     def _on_loop_waveform_selected(self, loop_index: int):
         """Handle loop selection from waveform widget"""
@@ -1991,12 +2048,12 @@ class PlayerWidget(QWidget):
             duration = end_time - start_time
 
             # Determine if this is a leading loop or main loop
-            is_leading_loop = loop_index < len(self.detected_intro_loops)
+            is_leading_loop = loop_index < len(self.detected_intro_grid)
             loop_type = "Leading Loop" if is_leading_loop else "Main Loop"
             relative_index = (
                 loop_index + 1
                 if is_leading_loop
-                else (loop_index - len(self.detected_intro_loops) + 1)
+                else (loop_index - len(self.detected_intro_grid) + 1)
             )
 
             self.loop_playback_info_label.setText(
@@ -2012,23 +2069,58 @@ class PlayerWidget(QWidget):
                 f"{loop_type} {relative_index} selected: {start_time:.2f}s - {end_time:.2f}s"
             )
 
+        self._update_stretch_hints()
+
+    @Slot(list)
+    def _on_visible_loops_changed(self, loop_indices: list):
+        """Handle scrolling/zooming of the loop waveform"""
+        self._visible_loop_indices = list(loop_indices)
+        self._update_stretch_hints()
+
+    def _update_stretch_hints(self, playing_loop: Optional[int] = None):
+        """
+        Tell the stretch manager what the user is about to hear.
+
+        WHY: Queued loops are reordered so the playing, selected and visible
+             loops are stretched first instead of in index order.
+
+        Args:
+            playing_loop: Loop requested for playback (default: the loop of
+                          active stretched playback)
+        """
+        if not self.stretch_manager:
+            return
+
+        if playing_loop is None and self._stretched_playback_active:
+            playing_loop = self._stretched_playback_loop_index
+
+        # Waveform indices (intro + main) → indices of the stretch batch
+        mapping = self._loop_index_mapping
+
+        self.stretch_manager.set_playback_hints(
+            selected_loop=mapping.get(self.selected_loop_index),
+            visible_loops=[mapping[i] for i in self._visible_loop_indices if i in mapping],
+            playing_loop=mapping.get(playing_loop) if playing_loop is not None else None
+        )
+
     def _on_play_loop_clicked(self):
         """Handle 'Play Loop' button click (play once)"""
-        all_loops = self._get_all_loop_segments()
+        loop_grid = self._get_all_loop_grid()
 
-        if self.selected_loop_index < 0 or self.selected_loop_index >= len(all_loops):
+        if self.selected_loop_index < 0 or self.selected_loop_index >= len(loop_grid):
             QMessageBox.warning(self, "No Loop Selected", "Please select a loop first.")
             return
 
-        start_time, end_time = all_loops[self.selected_loop_index]
+        start_sample, end_sample = loop_grid[self.selected_loop_index]
+        start_time, end_time = loop_grid.to_seconds()[self.selected_loop_index]
 
         # Determine loop type for display
-        is_leading_loop = self.selected_loop_index < len(self.detected_intro_loops)
+        is_leading_loop = self.selected_loop_index < len(self.detected_intro_grid)
         loop_type = "Leading Loop" if is_leading_loop else "Main Loop"
         relative_index = (
             self.selected_loop_index + 1
             if is_leading_loop
-            else (self.selected_loop_index - len(self.detected_intro_loops) + 1)
+            else (self.selected_loop_index - len(self.detected_intro_grid) + 1)
         )
 
         # Stop position timer for Playback tab (loop playback shouldn't update it)
@@ -2041,7 +2133,7 @@ class PlayerWidget(QWidget):
             return
 
         # Play loop segment once (no repeat) - normal playback
-        success = self.player.play_loop_segment(start_time, end_time, repeat=False)
+        success = self.player.play_loop_samples(start_sample, end_sample, repeat=False)
 
         if success:
             self.btn_stop_loop.setEnabled(True)
@@ -2059,21 +2151,22 @@ class PlayerWidget(QWidget):
 
     def _on_play_loop_repeat_clicked(self):
         """Handle 'Play Loop (Repeat)' button click"""
-        all_loops = self._get_all_loop_segments()
+        loop_grid = self._get_all_loop_grid()
 
-        if self.selected_loop_index < 0 or self.selected_loop_index >= len(all_loops):
+        if self.selected_loop_index < 0 or self.selected_loop_index >= len(loop_grid):
             QMessageBox.warning(self, "No Loop Selected", "Please select a loop first.")
             return
 
-        start_time, end_time = all_loops[self.selected_loop_index]
+        start_sample, end_sample = loop_grid[self.selected_loop_index]
+        start_time, end_time = loop_grid.to_seconds()[self.selected_loop_index]
 
         # Determine loop type for display
-        is_leading_loop = self.selected_loop_index < len(self.detected_intro_loops)
+        is_leading_loop = self.selected_loop_index < len(self.detected_intro_grid)
         loop_type = "Leading Loop" if is_leading_loop else "Main Loop"
         relative_index = (
             self.selected_loop_index + 1
             if is_leading_loop
-            else (self.selected_loop_index - len(self.detected_intro_loops) + 1)
+            else (self.selected_loop_index - len(self.detected_intro_grid) + 1)
         )
 
         # Stop position timer for Playback tab (loop playback shouldn't update it)
@@ -2086,7 +2179,7 @@ class PlayerWidget(QWidget):
             return
 
         # Play loop segment with repeat - normal playback
-        success = self.player.play_loop_segment(start_time, end_time, repeat=True)
+        success = self.player.play_loop_samples(start_sample, end_sample, repeat=True)
 
         if success:
             self.btn_stop_loop.setEnabled(True)
@@ -2120,6 +2213,7 @@ class PlayerWidget(QWidget):
         self._stretched_playback_active = False
         self._stretched_playback_loop_index = -1
         self._stretched_playback_repeat = False
+        self._update_stretch_hints()
         
         self.btn_stop_loop.setEnabled(False)
 
@@ -2144,7 +2238,19 @@ class PlayerWidget(QWidget):
         """
         if not self.stretch_manager:
             from core.background_stretch_manager import BackgroundStretchManager, get_optimal_worker_count
-            self.stretch_manager = BackgroundStretchManager(max_workers=get_optimal_worker_count())
+            from core.stretch_cache import StretchCache
+            from config import STRETCH_CACHE_DIR, STRETCH_DISK_CACHE_SIZE_MB
+
+            # WHY: Disk tier keeps stretched loops across restarts, so
+            #      re-opening a project does not re-stretch every loop
+            cache = StretchCache(
+                disk_dir=STRETCH_CACHE_DIR, disk_max_size_mb=STRETCH_DISK_CACHE_SIZE_MB
+            )
+            # WHY: progressive - loops become playable at PREVIEW quality in a
+            #      fraction of the EXPORT time; upgrades follow in the background
+            self.stretch_manager = BackgroundStretchManager(
+                max_workers=get_optimal_worker_count(), cache=cache, progressive=True
+            )
             self.stretch_manager.progress_updated.connect(self._on_stretch_progress_updated)
             self.stretch_manager.all_completed.connect(self._on_stretch_all_completed)
         return self.stretch_manager
@@ -2155,16 +2261,28 @@ class PlayerWidget(QWidget):
         self.time_stretch_enabled = enabled
         self.target_bpm_spin.setEnabled(enabled)
         self.btn_start_stretch_processing.setEnabled(
-            enabled and len(self.detected_loop_segments) > 0 and len(self.stem_files) > 0
+            enabled and len(self.detected_loop_grid) > 0 and len(self.stem_files) > 0
         )
         
         if not enabled:
-            # Cancel processing and clear manager if disabled
-            if self.stretch_manager:
-                self.stretch_manager.cancel()
-            self.stretch_manager = None
+            # Stop processing and release the manager if disabled
+            self._release_stretch_manager()
             self.stretch_progress_bar.setVisible(False)
 
+    def _release_stretch_manager(self):
+        """
+        Shut down and drop the stretch manager (if any).
+
+        WHY: A manager that is only cancelled keeps its dispatcher thread and
+             in-memory StretchCache alive; shutdown() stops the thread so both
+             are freed.
+        """
+        manager, self.stretch_manager = self.stretch_manager, None
+        if manager is not None:
+            manager.progress_updated.disconnect(self._on_stretch_progress_updated)
+            manager.all_completed.disconnect(self._on_stretch_all_completed)
+            manager.shutdown()
+
     @Slot(int)
     def _on_target_bpm_changed(self, value: int):
         """Handle target BPM change."""
@@ -2172,7 +2290,7 @@ class PlayerWidget(QWidget):
         # Update button enabled state if needed
         if self.time_stretch_enabled:
             self.btn_start_stretch_processing.setEnabled(
-                len(self.detected_loop_segments) > 0 and len(self.stem_files) > 0
+                len(self.detected_loop_grid) > 0 and len(self.stem_files) > 0
             )
 
     @Slot()
@@ -2181,10 +2299,10 @@ class PlayerWidget(QWidget):
         # Get original BPM from detected BPM (fallback: 120.0)
         original_bpm = self.detected_bpm if self.detected_bpm else 120.0
         
-        # Get all loop segments (intro loops + main loops)
-        all_loops = self._get_all_loop_segments()
+        # Get all loops (intro loops + main loops)
+        all_loops = self._get_all_loop_grid()
         
-        if not all_loops:
+        if len(all_loops) == 0:
             QMessageBox.warning(self, "No Loops", "Please detect loops first.")
             return
         
@@ -2193,19 +2311,17 @@ class PlayerWidget(QWidget):
             return
         
         # Filter out loops with negative start times (leading loops with padding)
-        # WHY: Leading loops with negative start times contain silence padding that
-        #      cannot be time-stretched. Only process loops with valid (non-negative) start times.
-        valid_loops = []
-        self._loop_index_mapping = {}  # Clear previous mapping
-        
-        for orig_idx, (start, end) in enumerate(all_loops):
-            if start >= 0.0 and end > start:
-                # Valid loop - add to valid_loops and create mapping
-                filtered_idx = len(valid_loops)
-                valid_loops.append((start, end))
-                self._loop_index_mapping[orig_idx] = filtered_idx
+        # WHY: The detected grid is passed as is, so the stretch workers cut every
+        #      stem at the same samples the player uses.
+        valid_loops, valid_indices = self._get_stretch_loop_grid()
+
+        # Map original loop index -> filtered index
+        self._loop_index_mapping = {
+            int(orig_idx): filtered_idx
+            for filtered_idx, orig_idx in enumerate(valid_indices)
+        }
         
-        if not valid_loops:
+        if len(valid_loops) == 0:
             QMessageBox.warning(
                 self,
                 "No Valid Loops",
@@ -2234,12 +2350,14 @@ class PlayerWidget(QWidget):
         self.stretch_progress_bar.setFormat("Starting...")
         self.btn_start_stretch_processing.setEnabled(False)
         
+        # Selected and visible loops (and their neighbours) are playable first
+        self._update_stretch_hints()
         stretch_manager.start_batch(
             stem_files=self.stem_files,
             loop_segments=valid_loops,
             original_bpm=original_bpm,
             target_bpm=float(self.time_stretch_target_bpm),
-            sample_rate=44100
+            sample_rate=valid_loops.sample_rate
         )
         
         self.ctx.logger().info(
@@ -2269,8 +2387,7 @@ class PlayerWidget(QWidget):
         # Validate that all expected loops are available (if manager exists)
         if self.stretch_manager and self.stem_files:
             missing_loops = []
-            all_loops = self._get_all_loop_segments()
-            valid_loops = [(start, end) for start, end in all_loops if start >= 0.0]
+            valid_loops, _ = self._get_stretch_loop_grid()
             
             # Check each valid loop and stem combination
             for loop_idx in range(len(valid_loops)):
@@ -2340,69 +2457,36 @@ class PlayerWidget(QWidget):
         # Find the length of the longest stretched loop
         if not stretched_loops:
             return np.zeros((2, 0), dtype=np.float32)
-        
+
         max_length = max(len(audio) for audio in stretched_loops.values())
-        
-        # Initialize output (stereo)
-        mixed = np.zeros((2, max_length), dtype=np.float32)
-        
-        # Check if any stem is solo
-        any_solo = any(
-            settings.is_solo 
-            for settings in self.player.stem_settings.values()
+
+        # Gains from player settings (mute/solo/volume/master)
+        settings = self.player.stem_settings
+        names = list(settings)
+        gains_by_name = dict(
+            zip(
+                names,
+                compute_stem_gains(
+                    [settings[name] for name in names], self.player.master_volume
+                ),
+            )
         )
-        
-        # Mix stretched loops
+
+        # (channels, samples) views - no padding or stereo copies
+        stems, gains = [], []
         for stem_name, stretched_audio in stretched_loops.items():
-            # Get stem settings from player
-            if stem_name not in self.player.stem_settings:
+            if stem_name not in gains_by_name:
                 continue
-                
-            settings = self.player.stem_settings[stem_name]
-            
-            # Skip if muted
-            if settings.is_muted:
-                continue
-            
-            # Skip if not solo and another stem is solo
-            if any_solo and not settings.is_solo:
-                continue
-            
-            # Ensure stereo
             if stretched_audio.ndim == 1:
-                audio_stereo = np.stack([stretched_audio, stretched_audio], axis=1)
+                view = np.broadcast_to(stretched_audio, (2, len(stretched_audio)))
             else:
-                audio_stereo = stretched_audio
-            
-            # Ensure same length (pad if necessary)
-            if len(audio_stereo) < max_length:
-                padding = max_length - len(audio_stereo)
-                audio_stereo = np.pad(audio_stereo, ((0, padding), (0, 0)), mode='constant')
-            elif len(audio_stereo) > max_length:
-                audio_stereo = audio_stereo[:max_length]
-            
-            # Transpose to (channels, samples) format
-            audio_stereo = audio_stereo.T
-            
-            # Apply volume
-            audio_stereo = audio_stereo * settings.volume
-            
-            # Add to mix
-            mixed += audio_stereo
-        
-        # Apply master volume
-        mixed = mixed * self.player.master_volume
-        
-        # Soft clipping to prevent harsh distortion
-        peak = np.max(np.abs(mixed))
-        if peak > 1.0:
-            # Normalize to prevent clipping, with some headroom
-            mixed = mixed * (0.95 / peak)
-        
-        # Final safety clip
-        mixed = np.clip(mixed, -1.0, 1.0)
-        
-        return mixed
+                view = stretched_audio.T
+            stems.append(view)
+            gains.append(gains_by_name[stem_name])
+
+        # WHY: Same kernel as AudioPlayer._mix_stems (in-place accumulation,
+        #      look-ahead limiter only where the mix exceeds the ceiling)
+        return mix_stems(stems, gains, 0, max_length, self.player.sample_rate)
 
     def _play_stretched_loop_segment(self, loop_index: int, repeat: bool = False):
         """
@@ -2450,6 +2534,9 @@ class PlayerWidget(QWidget):
                     return
             filtered_loop_index = loop_index
         
+        # The loop the user wants to hear jumps the stretch queue
+        self._update_stretch_hints(playing_loop=loop_index)
+
         # Get stretched loops for all stems
         stretched_loops = {}
         target_bpm = self.time_stretch_target_bpm
@@ -2573,12 +2660,12 @@ class PlayerWidget(QWidget):
         
         # Determine loop type for display
         all_loops = self._get_all_loop_segments()
-        is_leading_loop = loop_index < len(self.detected_intro_loops)
+        is_leading_loop = loop_index < len(self.detected_intro_grid)
         loop_type = "Leading Loop" if is_leading_loop else "Main Loop"
         relative_index = (
             loop_index + 1
             if is_leading_loop
-            else (loop_index - len(self.detected_intro_loops) + 1)
+            else (loop_index - len(self.detected_intro_grid) + 1)
         )
         
         # Stop position timer
@@ -2638,6 +2725,22 @@ class PlayerWidget(QWidget):
                 return Path(self.stem_files[stem_name])
         return None
 
+    def _read_stem_for_waveform(
+        self, stem_name: str, stem_path: Path
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Get stem audio (samples, channels) for waveform rendering
+
+        WHY: The player already holds every stem at its own sample rate (memory-
+        mapped when a stem store is used) - reading that view avoids decoding
+        and resampling the file a second time. Falls back to the file when the
+        player has not loaded the stem.
+        """
+        audio = self.player.stems.get(stem_name)
+        if audio is not None:
+            return audio.T, self.player.sample_rate
+        return sf.read(stem_path, dtype="float32")
+
     def _mix_stems_to_array(self) -> Tuple[np.ndarray, int]:
         """
         Mix all loaded stems into a single audio array
@@ -2666,7 +2769,7 @@ class PlayerWidget(QWidget):
         mixed_audio = None
 
         for stem_name, stem_path in self.stem_files.items():
-            audio_data, file_sr = sf.read(stem_path, dtype="float32")
+            audio_data, file_sr = self._read_stem_for_waveform(stem_name, stem_path)
 
             # Ensure mono
             if audio_data.ndim == 2:
@@ -3002,12 +3105,41 @@ class PlayerWidget(QWidget):
             self.player, stem_files, self.ctx.logger()
         )
 
+        # Dialog is closed once the first stem is playable
+        playable = {"ready": False}
+
         # Connect signals
         def on_progress(percent: int, message: str):
+            if playable["ready"]:
+                return
             progress.setLabelText(f"{message}\n{percent}%")
             progress.setValue(max(0, min(100, percent)))
             QApplication.processEvents()  # Keep UI responsive
 
+        def on_stem_ready(stem_name: str, ready: int, total: int):
+            """
+            Allow playback as soon as the first stem is decoded
+
+            WHY: Late stems join the running mix when they finish, so waiting
+                 for all of them only delays the user
+            """
+            if ready < total:
+                self.info_label.setText(
+                    f"Loading stems: {ready}/{total} ready (playback available)"
+                )
+            if playable["ready"]:
+                return
+
+            playable["ready"] = True
+            progress.close()
+
+            self.btn_play.setEnabled(True)
+            self.position_slider.setEnabled(True)
+
+            duration = self.player.get_duration()
+            self.duration_label.setText(self._format_time(duration))
+            self.position_slider.setRange(0, int(duration * 1000))  # milliseconds
+
         def on_finished(success: bool):
             progress.close()
             self._load_stems_worker = None
@@ -3051,6 +3183,9 @@ class PlayerWidget(QWidget):
                         "⚠ Playback unavailable (sounddevice not installed)"
                     )
             else:
+                # Playback may have started on the first ready stem
+                self.player.stop()
+
                 # Reset UI state on failure
                 self.stem_files.clear()
                 self.stems_list.clear()
@@ -3071,6 +3206,9 @@ class PlayerWidget(QWidget):
             progress.close()
             self._load_stems_worker = None
 
+            # Playback may have started on the first ready stem
+            self.player.stop()
+
             # Reset UI state on error
             self.stem_files.clear()
             self.stems_list.clear()
@@ -3088,6 +3226,7 @@ class PlayerWidget(QWidget):
             self._update_button_states()
 
         self._load_stems_worker.signals.progress.connect(on_progress)
+        self._load_stems_worker.signals.stem_ready.connect(on_stem_ready)
         self._load_stems_worker.signals.finished.connect(on_finished)
         self._load_stems_worker.signals.error.connect(on_error)
 
@@ -3809,8 +3948,8 @@ class PlayerWidget(QWidget):
 
     def _on_position_update(self, position: float, duration: float):
         """Callback from player for position updates"""
-        # Update in GUI thread
-        # This is called from playback thread, so we use a timer for updates
+        # position_timer reads the audio-clock position (get_position) and
+        # updates the slider itself; nothing else to do here
         pass
 
     def _on_state_changed(self, state: PlaybackState):
@@ -3831,7 +3970,7 @@ class PlayerWidget(QWidget):
             self.btn_pause.setEnabled(False)
             self.btn_stop.setEnabled(False)
             self.position_timer.stop()
-            # Reset position display to 0 (avoid get_position() lock acquisition)
+            # Reset position display to 0
             self.position_slider.blockSignals(True)
             self.position_slider.setValue(0)
             self.position_slider.blockSignals(False)
@@ -3953,4 +4092,5 @@ class PlayerWidget(QWidget):
         """Handle widget close"""
         # Stop playback and cleanup
         self.player.stop()
+        self._release_stretch_manager()
         super().closeEvent(event)
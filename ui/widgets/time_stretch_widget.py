@@ -28,6 +28,7 @@ from ui.app_context import AppContext
 from ui.theme import ThemeManager
 from core.time_stretcher import calculate_stretch_factor, get_stretch_factor_description
 from core.background_stretch_manager import BackgroundStretchManager, get_optimal_worker_count
+from utils.loop_grid import seconds_to_samples
 
 
 class TimeStretchWidget(QWidget):
@@ -512,8 +513,8 @@ class TimeStretchWidget(QWidget):
                 start_sec, end_sec = loop_segments[self.current_preview_loop]
                 audio_full, sr = sf.read(str(stem_path), always_2d=False)
 
-                start_sample = int(start_sec * sr)
-                end_sample = int(end_sec * sr)
+                start_sample = seconds_to_samples(start_sec, sr)
+                end_sample = seconds_to_samples(end_sec, sr)
                 start_sample = max(0, min(start_sample, len(audio_full)))
                 end_sample = max(start_sample, min(end_sample, len(audio_full)))
 
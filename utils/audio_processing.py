@@ -9,7 +9,7 @@ import soundfile as sf
 import librosa
 import resampy
 from pathlib import Path
-from typing import Tuple, Optional, List
+from typing import Iterable, Tuple, Optional, List
 from utils.logger import get_logger
 
 logger = get_logger()
@@ -27,6 +27,14 @@ except ImportError:
 # Global DeepRhythm predictor (lazy loaded)
 _deeprhythm_predictor = None
 
+# Frames read and written per step by streamed exports
+# WHY: ~1.5s at 44.1 kHz - large enough for efficient encoder writes, small
+#      enough that exporting an hour-long session uses constant memory
+EXPORT_BLOCK_FRAMES = 1 << 16
+
+# How far before the target a chunk split may move to reach a zero-crossing
+CHUNK_SPLIT_SEARCH_SECONDS = 0.050
+
 
 def trim_leading_silence(
     audio_data: np.ndarray,
@@ -260,15 +268,56 @@ def export_audio_chunks(
         logger.error("export_audio_chunks: Empty audio data")
         return []
 
-    # Transpose audio to (samples, channels) for soundfile
-    # Input is (channels, samples), soundfile expects (samples, channels)
-    if audio_data.ndim > 1:
-        audio_transposed = audio_data.T
-    else:
-        audio_transposed = audio_data.reshape(-1, 1)  # Mono -> (samples, 1)
+    if audio_data.ndim == 1:
+        audio_data = audio_data.reshape(1, -1)  # Mono -> (1, samples)
+
+    frames = audio_data.shape[1]
+    return export_audio_chunks_streamed(
+        (
+            audio_data[:, start:start + EXPORT_BLOCK_FRAMES]
+            for start in range(0, frames, EXPORT_BLOCK_FRAMES)
+        ),
+        audio_data.shape[0],
+        sample_rate,
+        output_path,
+        chunk_length_seconds,
+        file_format=file_format,
+        bit_depth=bit_depth,
+    )
+
+
+def export_audio_chunks_streamed(
+    blocks: Iterable[np.ndarray],
+    channels: int,
+    sample_rate: int,
+    output_path: Path,
+    chunk_length_seconds: float,
+    file_format: str = "WAV",
+    bit_depth: int = 24,
+) -> List[Path]:
+    """
+    Export a stream of audio blocks as chunks split at zero-crossings.
 
-    total_samples = audio_transposed.shape[0]
-    chunk_samples = int(chunk_length_seconds * sample_rate)
+    Same output as export_audio_chunks, but the audio is never held in full:
+    blocks are consumed once, in order, and written into the open chunk
+    file. Only the 50ms look-back window before the next split target is
+    held back, so the split point can still move to a zero-crossing. Memory
+    use is bounded by the block size, not the track length.
+
+    Args:
+        blocks: Audio blocks (channels, n) in order (e.g. a mix generator)
+        channels: Number of channels of every block
+        sample_rate: Sample rate in Hz
+        output_path: Base output path; chunks are saved as "output_01.wav", ...
+        chunk_length_seconds: Target length of each chunk in seconds
+        file_format: Audio format ('WAV' or 'FLAC')
+        bit_depth: Bit depth (16, 24, or 32)
+
+    Returns:
+        List of Path objects for all created chunk files
+    """
+    chunk_samples = max(1, int(chunk_length_seconds * sample_rate))
+    max_search_samples = int(CHUNK_SPLIT_SEARCH_SECONDS * sample_rate)
 
     # Prepare output path
     output_dir = output_path.parent
@@ -280,36 +329,80 @@ def export_audio_chunks(
     subtype_map = {16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}
     subtype = subtype_map.get(bit_depth, "PCM_24")
 
-    chunk_paths = []
-    current_pos = 0
-    chunk_num = 1
-
     logger.info(
-        f"Splitting audio into chunks: {total_samples / sample_rate:.1f}s total, "
-        f"{chunk_length_seconds}s per chunk, {file_format} {bit_depth}bit"
+        f"Splitting audio into chunks: {chunk_length_seconds}s per chunk, "
+        f"{file_format} {bit_depth}bit"
     )
 
-    while current_pos < total_samples:
-        # Calculate ideal end position for this chunk
-        ideal_end = min(current_pos + chunk_samples, total_samples)
+    chunk_paths = []
+    chunk_num = 1
+    chunk_file = None  # Open SoundFile of the current chunk
+    chunk_failed = False
+    written = 0  # Samples written to the current chunk
+    total_samples = 0
+    # Samples (samples, channels) not yet written, starting at the chunk's `written`
+    pending = np.zeros((0, channels), dtype=np.float32)
+
+    def write(data: np.ndarray):
+        nonlocal chunk_file, chunk_failed, written
+        if chunk_failed or len(data) == 0:
+            written += len(data)
+            return
+        chunk_path = output_dir / f"{base_name}_{chunk_num:02d}{extension}"
+        try:
+            if chunk_file is None:
+                chunk_file = sf.SoundFile(
+                    str(chunk_path),
+                    "w",
+                    samplerate=sample_rate,
+                    channels=channels,
+                    subtype=subtype,
+                    format=file_format,
+                )
+            chunk_file.write(data)
+        except Exception as e:
+            logger.error(f"Failed to export chunk {chunk_num}: {e}")
+            # Continue with next chunk even if one fails
+            chunk_failed = True
+        written += len(data)
+
+    def finish_chunk():
+        nonlocal chunk_file, chunk_failed, written, chunk_num
+        if chunk_file is not None:
+            chunk_file.close()
+            if not chunk_failed:
+                chunk_path = Path(chunk_file.name)
+                logger.info(
+                    f"Exported chunk {chunk_num}: {chunk_path.name} "
+                    f"({written / sample_rate:.2f}s, {written} samples)"
+                )
+                chunk_paths.append(chunk_path)
+        chunk_file = None
+        chunk_failed = False
+        written = 0
+        chunk_num += 1
 
-        # Find zero-crossing near ideal end (but not past it!)
-        if ideal_end < total_samples:
-            # Not the last chunk - try to find zero-crossing
-            zc_end = find_nearest_zero_crossing(
-                audio_transposed,
-                ideal_end,
+    for block in blocks:
+        total_samples += block.shape[1]
+        pending = np.concatenate([pending, block.T])
+
+        # Split wherever the sample at the ideal end is available
+        while len(pending) > chunk_samples - written:
+            ideal_end = chunk_samples - written  # Relative to pending[0]
+            window_start = max(0, ideal_end - max_search_samples)
+            zc_local = find_nearest_zero_crossing(
+                pending[window_start:ideal_end + 1],
+                ideal_end - window_start,
                 sample_rate,
-                max_search_duration=0.050,  # 50ms search window
+                max_search_duration=CHUNK_SPLIT_SEARCH_SECONDS,
             )
 
-            if zc_end and zc_end > current_pos:
+            if zc_local and window_start + zc_local + written > 0:
                 # Found a zero-crossing - use it
-                actual_end = zc_end
-                zc_offset_ms = (ideal_end - actual_end) / sample_rate * 1000
+                actual_end = window_start + zc_local
                 logger.debug(
-                    f"Chunk {chunk_num}: Using zero-crossing at {actual_end} "
-                    f"({zc_offset_ms:+.1f}ms from ideal)"
+                    f"Chunk {chunk_num}: Using zero-crossing "
+                    f"({(ideal_end - actual_end) / sample_rate * 1000:+.1f}ms from ideal)"
                 )
             else:
                 # No zero-crossing found - use ideal position
@@ -317,39 +410,24 @@ def export_audio_chunks(
                 logger.debug(
                     f"Chunk {chunk_num}: No zero-crossing found, using ideal position"
                 )
-        else:
-            # Last chunk - use remaining audio
-            actual_end = total_samples
 
-        # Extract chunk
-        chunk_data = audio_transposed[current_pos:actual_end]
-        chunk_duration = len(chunk_data) / sample_rate
+            # Each chunk starts exactly where the previous one ended
+            write(pending[:actual_end])
+            finish_chunk()
+            pending = pending[actual_end:]
 
-        # Generate filename with two-digit numbering
-        # WHY: Consistent two-digit format (_01, _02, etc.) for better sorting and organization
-        chunk_path = output_dir / f"{base_name}_{chunk_num:02d}{extension}"
+        # Everything before the next look-back window is final
+        final = max(0, min(len(pending), chunk_samples - written - max_search_samples))
+        write(pending[:final])
+        pending = pending[final:]
 
-        # Save chunk
-        try:
-            sf.write(
-                str(chunk_path),
-                chunk_data,
-                sample_rate,
-                subtype=subtype,
-                format=file_format,
-            )
-            logger.info(
-                f"Exported chunk {chunk_num}: {chunk_path.name} "
-                f"({chunk_duration:.2f}s, {len(chunk_data)} samples)"
-            )
-            chunk_paths.append(chunk_path)
-        except Exception as e:
-            logger.error(f"Failed to export chunk {chunk_num}: {e}")
-            # Continue with next chunk even if one fails
+    # Last chunk - remaining audio
+    write(pending)
+    finish_chunk()
 
-        # Move to next chunk (starts exactly where this one ended)
-        current_pos = actual_end
-        chunk_num += 1
+    if total_samples == 0:
+        logger.error("export_audio_chunks_streamed: Empty audio data")
+        return []
 
     logger.info(f"Successfully exported {len(chunk_paths)} chunks")
     return chunk_paths
@@ -580,6 +658,40 @@ def detect_bpm(
         return 120.0, None
 
 
+def peak_normalization_gain(audio_data: np.ndarray, target_dbfs: float = -1.0) -> float:
+    """
+    Compute the linear gain that brings the audio peak to a target level in dBFS.
+
+    WHY: Lets exporters apply normalization gain in place per chunk (see
+    core.export_writer.LoopExportWriter) instead of materializing a normalized
+    copy of the whole track.
+
+    Args:
+        audio_data: Audio array (samples,) for mono or (samples, channels) for stereo
+        target_dbfs: Target peak level in dBFS (default: -1.0)
+
+    Returns:
+        Linear gain factor (1.0 for empty or silent audio)
+
+    Example:
+        >>> gain = peak_normalization_gain(audio, target_dbfs=-1.0)
+        >>> np.allclose(audio * gain, normalize_peak_to_dbfs(audio, -1.0))
+        True
+    """
+    if len(audio_data) == 0:
+        return 1.0
+
+    # Peak without an abs() temporary: max(|x|) == max(max(x), -min(x))
+    peak = max(float(audio_data.max()), -float(audio_data.min()))
+
+    if peak == 0:
+        return 1.0
+
+    current_dbfs = 20 * np.log10(peak)
+    gain_db = target_dbfs - current_dbfs
+    return float(10 ** (gain_db / 20.0))
+
+
 def normalize_peak_to_dbfs(
     audio_data: np.ndarray, target_dbfs: float = -1.0
 ) -> np.ndarray:
@@ -15,6 +15,7 @@ import numpy as np
 import soundfile as sf
 
 from utils.logger import get_logger
+from utils.loop_grid import LoopGrid
 from utils.beat_service_client import (
     analyze_beats,
     is_beat_service_available,
@@ -479,6 +480,54 @@ def calculate_loops_from_downbeats(
     return loops, intro_loops
 
 
+def calculate_loop_grid_from_downbeats(
+    downbeat_times: np.ndarray,
+    bars_per_loop: int,
+    audio_duration: float,
+    sample_rate: int,
+    song_start_downbeat_index: Optional[int] = None,
+    intro_handling: str = "pad",
+) -> Tuple[LoopGrid, LoopGrid]:
+    """
+    Calculate loop segments as sample-accurate grids.
+
+    Same segmentation as calculate_loops_from_downbeats(), but boundaries are
+    converted to integer samples exactly once so that playback, stretching and
+    export all cut every stem at identical sample positions.
+
+    Args:
+        downbeat_times: Array of downbeat positions in seconds
+        bars_per_loop: Number of bars per loop (typically 2, 4, or 8)
+        audio_duration: Total audio duration in seconds
+        sample_rate: Reference sample rate for the grids
+        song_start_downbeat_index: Optional index of downbeat marking song start
+        intro_handling: "pad" or "skip" (see calculate_loops_from_downbeats)
+
+    Returns:
+        Tuple of (loop_grid, intro_grid) at sample_rate
+
+    Example:
+        >>> loops, intro = calculate_loop_grid_from_downbeats(
+        ...     np.array([0.0, 2.0, 4.0]), bars_per_loop=1, audio_duration=6.0,
+        ...     sample_rate=44100
+        ... )
+        >>> loops[1]
+        (88200, 176400)
+    """
+    loops, intro_loops = calculate_loops_from_downbeats(
+        downbeat_times,
+        bars_per_loop,
+        audio_duration,
+        song_start_downbeat_index=song_start_downbeat_index,
+        intro_handling=intro_handling,
+    )
+
+    return (
+        LoopGrid.from_seconds(loops, sample_rate),
+        LoopGrid.from_seconds(intro_loops, sample_rate),
+    )
+
+
 def detect_transients(
     audio_data: np.ndarray,
     sample_rate: int,
@@ -0,0 +1,306 @@
+"""
+Loop Grid - Sample-accurate loop boundaries shared by all loop consumers
+
+PURPOSE: Represent loop segments as integer sample indices instead of float seconds,
+         so every boundary is computed once and every stem is cut at identical samples.
+
+CONTEXT: Beat detection produces loop boundaries in seconds. Previously each consumer
+         (StretchWorker, AudioPlayer, export) converted them with int(t * sr), which
+         truncates differently depending on float rounding and causes off-by-one drift
+         between stems. LoopGrid performs the seconds → samples conversion once
+         (round-to-nearest) and converts between sample rates with exact integer math.
+
+USAGE:
+    >>> grid = LoopGrid.from_seconds([(0.0, 2.0), (2.0, 4.0)], sample_rate=44100)
+    >>> grid[1]
+    (88200, 176400)
+    >>> grid.to_rate(48000)[1]
+    (96000, 192000)
+    >>> loop_audio = grid.slice(audio, 1)  # View, no copy
+"""
+
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+
+def seconds_to_samples(seconds: Union[float, np.ndarray], sample_rate: int):
+    """
+    Convert seconds to sample indices (round to nearest).
+
+    Args:
+        seconds: Time in seconds (scalar or array)
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        int for scalar input, int64 array for array input
+
+    Example:
+        >>> seconds_to_samples(0.1, 44100)
+        4410
+    """
+    samples = np.rint(np.asarray(seconds, dtype=np.float64) * sample_rate).astype(
+        np.int64
+    )
+    return int(samples) if samples.ndim == 0 else samples
+
+
+def rescale_samples(
+    samples: Union[int, np.ndarray], from_rate: int, to_rate: int
+):
+    """
+    Convert sample indices between sample rates using exact integer arithmetic.
+
+    WHY: (n * to_rate) / from_rate in floating point can land on either side of
+         an integer for different stems. Integer round-half-up is deterministic.
+
+    Args:
+        samples: Sample index (scalar or int array) at from_rate
+        from_rate: Source sample rate in Hz
+        to_rate: Target sample rate in Hz
+
+    Returns:
+        int for scalar input, int64 array for array input
+
+    Example:
+        >>> rescale_samples(44100, 44100, 48000)
+        48000
+    """
+    if from_rate == to_rate:
+        return samples
+
+    arr = np.asarray(samples, dtype=np.int64)
+    # Round half up: floor((n * to + from // 2) / from), valid for negative n too
+    scaled = (arr * to_rate + from_rate // 2) // from_rate
+    return int(scaled) if scaled.ndim == 0 else scaled
+
+
+class LoopGrid:
+    """
+    Array-backed loop boundaries in integer samples at a reference sample rate.
+
+    Features:
+    - Compact (N, 2) int64 storage of [start, end) sample indices
+    - Vectorised conversion to other sample rates (to_rate)
+    - Slicing of audio buffers without float round-trips (slice)
+    - Filtering while keeping the mapping to original loop indices (select)
+
+    Boundaries may be negative (intro loops padded with silence before sample 0).
+    """
+
+    __slots__ = ("sample_rate", "_bounds")
+
+    def __init__(
+        self,
+        starts: Sequence[int],
+        ends: Sequence[int],
+        sample_rate: int,
+    ):
+        """
+        Initialize loop grid.
+
+        Args:
+            starts: Loop start sample indices (inclusive)
+            ends: Loop end sample indices (exclusive)
+            sample_rate: Reference sample rate of the indices in Hz
+        """
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1)
+
+        if starts.shape != ends.shape:
+            raise ValueError(
+                f"starts and ends must have the same length: {len(starts)} != {len(ends)}"
+            )
+        if sample_rate <= 0:
+            raise ValueError(f"Invalid sample rate: {sample_rate}")
+
+        self.sample_rate = int(sample_rate)
+        self._bounds = np.stack([starts, ends], axis=1)
+        self._bounds.setflags(write=False)
+
+    # ------------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def from_seconds(
+        cls, segments: Sequence[Tuple[float, float]], sample_rate: int
+    ) -> "LoopGrid":
+        """
+        Build grid from (start_sec, end_sec) tuples.
+
+        Args:
+            segments: List of (start_time, end_time) in seconds
+            sample_rate: Reference sample rate in Hz
+
+        Returns:
+            LoopGrid with boundaries rounded to the nearest sample
+        """
+        if len(segments) == 0:
+            return cls([], [], sample_rate)
+
+        bounds = seconds_to_samples(np.asarray(segments, dtype=np.float64), sample_rate)
+        return cls(bounds[:, 0], bounds[:, 1], sample_rate)
+
+    @classmethod
+    def empty(cls, sample_rate: int) -> "LoopGrid":
+        """Create grid without loops"""
+        return cls([], [], sample_rate)
+
+    @classmethod
+    def concatenate(cls, grids: Sequence["LoopGrid"], sample_rate: int) -> "LoopGrid":
+        """
+        Join grids end to end (e.g., intro loops followed by main loops).
+
+        Args:
+            grids: Grids to join, in order
+            sample_rate: Reference sample rate of the result; grids at other
+                         rates are converted with to_rate()
+
+        Returns:
+            New LoopGrid containing the loops of all grids
+        """
+        bounds = [grid.to_rate(sample_rate).bounds for grid in grids]
+        if not bounds:
+            return cls.empty(sample_rate)
+
+        joined = np.concatenate(bounds, axis=0)
+        return cls(joined[:, 0], joined[:, 1], sample_rate)
+
+    # ------------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------------
+
+    @property
+    def starts(self) -> np.ndarray:
+        """Start sample indices (read-only view)"""
+        return self._bounds[:, 0]
+
+    @property
+    def ends(self) -> np.ndarray:
+        """End sample indices (read-only view)"""
+        return self._bounds[:, 1]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Loop lengths in samples"""
+        return self._bounds[:, 1] - self._bounds[:, 0]
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """(N, 2) array of [start, end) sample indices (read-only view)"""
+        return self._bounds
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        start, end = self._bounds[index]
+        return int(start), int(end)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for start, end in self._bounds.tolist():
+            yield start, end
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LoopGrid):
+            return NotImplemented
+        return self.sample_rate == other.sample_rate and np.array_equal(
+            self._bounds, other._bounds
+        )
+
+    def __repr__(self) -> str:
+        return f"LoopGrid({len(self)} loops @ {self.sample_rate} Hz)"
+
+    # ------------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------------
+
+    def to_rate(self, sample_rate: int) -> "LoopGrid":
+        """
+        Convert grid to another sample rate (vectorised, exact integer rounding).
+
+        Args:
+            sample_rate: Target sample rate in Hz
+
+        Returns:
+            New LoopGrid at target rate (self if rate is unchanged)
+        """
+        if sample_rate == self.sample_rate:
+            return self
+
+        bounds = rescale_samples(self._bounds, self.sample_rate, sample_rate)
+        return LoopGrid(bounds[:, 0], bounds[:, 1], sample_rate)
+
+    def to_seconds(self) -> List[Tuple[float, float]]:
+        """
+        Convert grid back to (start_sec, end_sec) tuples (for display only).
+
+        Returns:
+            List of (start_time, end_time) in seconds
+        """
+        seconds = self._bounds / float(self.sample_rate)
+        return [(float(start), float(end)) for start, end in seconds]
+
+    def select(self, indices: Union[Sequence[int], np.ndarray]) -> "LoopGrid":
+        """
+        Create grid with a subset of loops.
+
+        Args:
+            indices: Loop indices or boolean mask
+
+        Returns:
+            New LoopGrid containing the selected loops
+        """
+        bounds = self._bounds[np.asarray(indices)]
+        return LoopGrid(bounds[:, 0], bounds[:, 1], self.sample_rate)
+
+    def valid_indices(self) -> np.ndarray:
+        """
+        Indices of loops that can be cut from audio (start >= 0 and end > start).
+
+        WHY: Intro loops padded with silence have negative starts and cannot be
+             time-stretched or sliced directly.
+
+        Returns:
+            int64 array of original loop indices
+        """
+        mask = (self.starts >= 0) & (self.ends > self.starts)
+        return np.flatnonzero(mask)
+
+    def clip(self, total_samples: int) -> "LoopGrid":
+        """
+        Clamp boundaries to [0, total_samples].
+
+        Args:
+            total_samples: Length of the audio in samples (at grid rate)
+
+        Returns:
+            New LoopGrid with clamped boundaries
+        """
+        bounds = np.clip(self._bounds, 0, total_samples)
+        bounds[:, 1] = np.maximum(bounds[:, 1], bounds[:, 0])
+        return LoopGrid(bounds[:, 0], bounds[:, 1], self.sample_rate)
+
+    def slice(
+        self, audio: np.ndarray, index: int, axis: int = 0, sample_rate: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Slice one loop from an audio buffer (view, no copy).
+
+        Args:
+            audio: Audio buffer
+            index: Loop index
+            axis: Sample axis (0 for (samples, channels), 1 for (channels, samples))
+            sample_rate: Sample rate of `audio` if different from the grid rate
+
+        Returns:
+            View into `audio` covering [start, end) of the loop
+        """
+        start, end = self[index]
+        if sample_rate is not None and sample_rate != self.sample_rate:
+            start = rescale_samples(start, self.sample_rate, sample_rate)
+            end = rescale_samples(end, self.sample_rate, sample_rate)
+
+        slicer = [slice(None)] * audio.ndim
+        slicer[axis] = slice(max(0, start), max(0, end))
+        return audio[tuple(slicer)]